@@ -8,6 +8,7 @@ import asyncio
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -182,6 +183,15 @@ class AdminTools:
         else:
             print(f"❌ Failed to reset grid status for client {client_id}")
 
+    def rebuild_rollups(self, client_id: Optional[int] = None):
+        """Recompute daily P&L rollups from trade history"""
+        scope = f"client {client_id}" if client_id else "all clients"
+        try:
+            rows = self.trade_repo.rebuild_rollups(client_id)
+            print(f"✅ Rebuilt daily rollups for {scope}: {rows} rows")
+        except Exception as e:
+            print(f"❌ Rollup rebuild failed: {e}")
+
     def show_performance_summary(self, days: int = 7):
         """Show service performance summary"""
         print(f"\n📈 PERFORMANCE SUMMARY (Last {days} days)")
@@ -190,15 +200,11 @@ class AdminTools:
         # Get all active clients
         active_clients = self.client_repo.get_all_active_clients()
 
-        total_trades = 0
-        total_profit = 0.0
-        total_volume = 0.0
-
-        for client_id in active_clients:
-            stats = self.trade_repo.get_client_trade_stats(client_id)
-            total_trades += stats["total_trades"]
-            total_profit += stats["total_profit"]
-            total_volume += stats["total_volume"]
+        # One query over the daily rollups for the whole window
+        totals = self.trade_repo.rollups.get_system_totals(days)
+        total_trades = totals["trades"]
+        total_profit = totals["pnl"]
+        total_volume = totals["volume"]
 
         print(f"   📊 Total Trades: {total_trades}")
         print(f"   💰 Total Profit: ${total_profit:,.2f}")
@@ -240,6 +246,14 @@ def main():
         const=7,
         help="Show performance summary",
     )
+    parser.add_argument(
+        "--rebuild-rollups",
+        type=int,
+        metavar="CLIENT_ID",
+        nargs="?",
+        const=0,
+        help="Rebuild daily P&L rollups from trades (all clients by default)",
+    )
     parser.add_argument("--health", action="store_true", help="Run health check")
 
     args = parser.parse_args()
@@ -271,6 +285,9 @@ def main():
     elif args.performance is not None:
         admin.show_performance_summary(args.performance)
 
+    elif args.rebuild_rollups is not None:
+        admin.rebuild_rollups(args.rebuild_rollups or None)
+
     elif args.health:
         from health_check import HealthCheck
 
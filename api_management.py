@@ -12,7 +12,7 @@ from pathlib import Path
 
 from config import Config
 from repositories.client_repository import ClientRepository
-from utils.crypto import CryptoUtils
+from utils.crypto import CryptoUtils, invalidate_api_keys
 
 INVALID_ID = "❌ Invalid Telegram ID"
 CANCELLED_OPERATION = "❌ Operation cancelled"
@@ -145,7 +145,9 @@ class APIKeyManager:
 
                     print(f"✅ API keys removed from {count} clients")
 
-                return True
+            # None clears every cached key pair
+            invalidate_api_keys(telegram_id)
+            return True
 
         except Exception as e:
             self.logger.error(f"Error removing API keys: {e}")
@@ -198,6 +200,7 @@ class APIKeyManager:
                 """,
                     (encrypted_api_key, encrypted_secret_key, telegram_id),
                 )
+            invalidate_api_keys(telegram_id)
 
             print(f"✅ API keys successfully added for client {telegram_id}")
             return True
@@ -314,7 +317,8 @@ class APIKeyManager:
                     conn.execute("DELETE FROM clients")
                     print("✅ All clients deleted")
 
-                return True
+            invalidate_api_keys()
+            return True
 
         except Exception as e:
             self.logger.error(f"Error purging database: {e}")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Grid Backtest CLI for GridTrader Pro
+====================================
+
+Runs GridManager against stored candles for every combination of symbols,
+grid spacings, levels per side and replacement profit margins, in
+parallel worker processes.
+
+Usage:
+    python backtest.py --symbols ADAUSDT --start 2024-01-01 --fetch
+    python backtest.py --symbols ADAUSDT ETHUSDT --start 2024-01-01 \\
+        --spacing 0.015 0.025 0.035 --margin 0.015 0.025 --json results.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+from config import Config
+from services.backtester import BacktestParams, prepare_history, run_backtests
+from services.candle_store import INTERVAL_MINUTES
+
+
+def build_param_sets(args) -> List[BacktestParams]:
+    return [
+        BacktestParams(
+            symbol=symbol,
+            start=args.start,
+            end=args.end,
+            interval=args.interval,
+            capital=args.capital,
+            grid_spacing=spacing,
+            levels_per_side=levels,
+            profit_margin=margin,
+            label=f"{symbol} spacing={spacing} levels={levels} margin={margin}",
+        )
+        for symbol, spacing, levels, margin in itertools.product(
+            args.symbols, args.spacing, args.levels, args.margin
+        )
+    ]
+
+
+async def fetch_history(args) -> Dict[str, int]:
+    """Backfill stored candles from Binance public market data"""
+    from binance.client import Client
+
+    from services.exchange_gateway import get_exchange_gateway
+
+    exchange = get_exchange_gateway(Client())
+    return await prepare_history(args.symbols, args.interval, args.start, exchange)
+
+
+def print_results(results: List[Dict]):
+    print("\n📊 GRID BACKTEST RESULTS")
+    print("=" * 96)
+    print(
+        f"{'symbol':<10}{'spacing':>9}{'levels':>8}{'margin':>8}{'fills':>7}"
+        f"{'FIFO profit':>13}{'return %':>10}{'hold %':>9}{'days':>7}{'speedup':>11}"
+    )
+    for result in results:
+        params = result["params"]
+        if not result["success"]:
+            print(f"{params['symbol']:<10} ❌ {result['error']}")
+            continue
+        summary = result["summary"]
+        profit = result["fifo_performance"].get("total_profit", 0.0)
+        print(
+            f"{params['symbol']:<10}{summary['grid_spacing']:>9.4f}"
+            f"{summary['levels_per_side']:>8}{summary['profit_margin']:>8.3f}"
+            f"{summary['fills']:>7}{profit:>13.2f}{summary['return_pct']:>10.2f}"
+            f"{summary['buy_and_hold_pct']:>9.2f}{summary['simulated_days']:>7.1f}"
+            f"{summary['speedup']:>10}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GridTrader Pro grid backtester")
+    parser.add_argument("--symbols", nargs="+", required=True)
+    parser.add_argument("--start", required=True, help="ISO date (UTC)")
+    parser.add_argument("--end", help="ISO date (UTC), default: last stored candle")
+    parser.add_argument("--interval", choices=sorted(INTERVAL_MINUTES), default="1h")
+    parser.add_argument("--capital", type=float, default=1000.0)
+    parser.add_argument(
+        "--spacing", type=float, nargs="+", default=[None], help="Grid spacings"
+    )
+    parser.add_argument(
+        "--levels",
+        type=int,
+        nargs="+",
+        default=[Config.GRID_LEVELS_PER_SIDE],
+        help="Levels per side",
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        nargs="+",
+        default=[Config.REPLACEMENT_PROFIT_MARGIN],
+        help="Replacement SELL profit margins",
+    )
+    parser.add_argument("--workers", type=int, default=Config.BACKTEST_WORKERS)
+    parser.add_argument(
+        "--fetch", action="store_true", help="Backfill candles from Binance first"
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    if args.fetch:
+        counts = asyncio.run(fetch_history(args))
+        for symbol, count in counts.items():
+            print(f"📂 {symbol}: {count} stored {args.interval} candles")
+
+    param_sets = build_param_sets(args)
+    print(f"🧪 Running {len(param_sets)} backtests on {args.workers} workers...")
+    results = run_backtests(param_sets, args.workers)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"\n✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
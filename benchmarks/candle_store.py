@@ -0,0 +1,245 @@
+# benchmarks/candle_store.py
+#!/usr/bin/env python3
+"""
+Candle Store Benchmark
+======================
+
+Replays indicator refreshes against a simulated exchange and compares the
+previous approach (download the whole lookback window through
+get_historical_klines on every refresh) with the incremental candle store.
+
+Phases, per approach:
+- cold start: empty data directory, first refresh of every symbol
+- steady state: one refresh per symbol every kline TTL for --hours
+- warm restart: new process after --downtime hours, existing files on disk
+
+Reported per phase: REST requests, candles downloaded and CPU time spent
+turning the response into indicators.
+
+Usage:
+    python -m benchmarks.candle_store
+    python -m benchmarks.candle_store --symbols 20 --hours 48 --downtime 6
+    python -m benchmarks.candle_store --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.candle_store import INTERVAL_MINUTES, CandleStore
+from services.indicator_engine import compute_indicators
+from services.market_data_cache import KLINE_TTL
+
+
+class SimulatedClock:
+    def __init__(self, start: float):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SimulatedExchange:
+    """Deterministic get_historical_klines with request accounting"""
+
+    def __init__(self, clock: SimulatedClock):
+        self.clock = clock
+        self.requests = 0
+        self.candles = 0
+
+    async def get_historical_klines(self, symbol, interval, start_str, end_str=None):
+        step = INTERVAL_MINUTES[interval] * 60_000
+        now_ms = int(self.clock() * 1000)
+        if isinstance(start_str, str):
+            start = now_ms - int(start_str.split()[0]) * 60_000
+        else:
+            start = int(start_str)
+        end = now_ms if end_str is None else min(int(end_str), now_ms)
+
+        first = -(-start // step) * step
+        klines = [self._kline(symbol, t, step) for t in range(first, end + 1, step)]
+        self.requests += max(1, math.ceil(len(klines) / 1000))
+        self.candles += len(klines)
+        return klines
+
+    @staticmethod
+    def _kline(symbol: str, open_time: int, step: int) -> List:
+        seed = zlib.crc32(f"{symbol}{open_time}".encode())
+        base = 100 + 10 * math.sin(open_time / step / 24)
+        close = base * (1 + ((seed % 2001) - 1000) / 100_000)
+        volume = 1000 + seed % 500
+        return [
+            open_time,
+            f"{base:.4f}",
+            f"{max(base, close) * 1.002:.4f}",
+            f"{min(base, close) * 0.998:.4f}",
+            f"{close:.4f}",
+            f"{volume:.2f}",
+            open_time + step - 1,
+            f"{volume * close:.2f}",
+            seed % 300,
+            "0",
+            "0",
+            "0",
+        ]
+
+
+class Phase:
+    def __init__(self, exchange: SimulatedExchange):
+        self.exchange = exchange
+        self.start_requests = exchange.requests
+        self.start_candles = exchange.candles
+        self.refreshes = 0
+        self.cpu_seconds = 0.0
+
+    def result(self, name: str) -> Dict:
+        return {
+            "phase": name,
+            "refreshes": self.refreshes,
+            "requests": self.exchange.requests - self.start_requests,
+            "candles_downloaded": self.exchange.candles - self.start_candles,
+            "cpu_ms": round(self.cpu_seconds * 1000, 2),
+        }
+
+
+async def refresh_rest(exchange, symbols, interval, lookback, phase: Phase):
+    """Previous approach: the full lookback window every refresh"""
+    minutes = lookback * INTERVAL_MINUTES[interval]
+    for symbol in symbols:
+        klines = await exchange.get_historical_klines(
+            symbol, interval, f"{minutes} minutes ago UTC"
+        )
+        start = time.perf_counter()
+        compute_indicators(symbol, interval, klines, now=exchange.clock())
+        phase.cpu_seconds += time.perf_counter() - start
+        phase.refreshes += 1
+
+
+async def refresh_store(store, exchange, symbols, interval, lookback, phase: Phase):
+    """Candle store: only candles after the last stored one"""
+    for symbol in symbols:
+        start = time.perf_counter()
+        records = await store.get_candles(symbol, interval, lookback, exchange)
+        compute_indicators(symbol, interval, records, now=exchange.clock())
+        phase.cpu_seconds += time.perf_counter() - start
+        phase.refreshes += 1
+
+
+async def run_approach(
+    approach: str,
+    symbols: List[str],
+    interval: str,
+    lookback: int,
+    hours: float,
+    downtime: float,
+    directory: str,
+) -> List[Dict]:
+    clock = SimulatedClock(1_700_000_000.0)
+    exchange = SimulatedExchange(clock)
+    ttl = KLINE_TTL.get(interval, 60)
+
+    def new_store():
+        return CandleStore(directory, clock=clock)
+
+    store = new_store()
+
+    async def refresh(phase: Phase):
+        if approach == "rest":
+            await refresh_rest(exchange, symbols, interval, lookback, phase)
+        else:
+            await refresh_store(store, exchange, symbols, interval, lookback, phase)
+
+    results = []
+
+    phase = Phase(exchange)
+    await refresh(phase)
+    results.append(phase.result("cold_start"))
+
+    phase = Phase(exchange)
+    for _ in range(int(hours * 3600 / ttl)):
+        clock.now += ttl
+        await refresh(phase)
+    results.append(phase.result("steady_state"))
+
+    # Restart: new process (empty memory), same data directory
+    clock.now += downtime * 3600
+    store = new_store()
+    phase = Phase(exchange)
+    await refresh(phase)
+    results.append(phase.result("warm_restart"))
+
+    for result in results:
+        result["approach"] = approach
+    return results
+
+
+def print_results(results: List[Dict], args):
+    print("\n📊 CANDLE STORE BENCHMARK")
+    print(
+        f"{args.symbols} symbols, {args.interval} x {args.lookback} candles, "
+        f"{args.hours}h steady state, {args.downtime}h downtime"
+    )
+    print("=" * 72)
+    print(
+        f"{'phase':<14}{'approach':<10}{'refreshes':>10}{'requests':>10}"
+        f"{'candles':>12}{'cpu (ms)':>12}"
+    )
+    for r in results:
+        print(
+            f"{r['phase']:<14}{r['approach']:<10}{r['refreshes']:>10}"
+            f"{r['requests']:>10}{r['candles_downloaded']:>12}{r['cpu_ms']:>12.2f}"
+        )
+
+    by_key = {(r["phase"], r["approach"]): r for r in results}
+    print()
+    for phase in ("cold_start", "steady_state", "warm_restart"):
+        rest = by_key[(phase, "rest")]["candles_downloaded"]
+        store = by_key[(phase, "store")]["candles_downloaded"]
+        ratio = f"{rest / store:.1f}x fewer" if store else "no download"
+        print(f"{phase:<14} candles downloaded: {rest} -> {store} ({ratio})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Candle store benchmark")
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--interval", choices=sorted(INTERVAL_MINUTES), default="1h")
+    parser.add_argument("--lookback", type=int, default=100)
+    parser.add_argument("--hours", type=float, default=24, help="Steady state")
+    parser.add_argument("--downtime", type=float, default=6, help="Before restart")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+
+    args = parser.parse_args()
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+
+    results = []
+    for approach in ("rest", "store"):
+        with tempfile.TemporaryDirectory() as directory:
+            results.extend(
+                asyncio.run(
+                    run_approach(
+                        approach,
+                        symbols,
+                        args.interval,
+                        args.lookback,
+                        args.hours,
+                        args.downtime,
+                        directory,
+                    )
+                )
+            )
+
+    print_results(results, args)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json}")
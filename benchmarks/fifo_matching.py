@@ -0,0 +1,223 @@
+# benchmarks/fifo_matching.py
+#!/usr/bin/env python3
+"""
+FIFO Matching Micro-benchmark
+=============================
+
+Times the shared FIFO core (deque of __slots__ lots) against the previous
+list-of-dicts matcher that consumed lots with list.pop(0), over synthetic
+trade streams of 10k to 1M trades.
+
+Scenarios:
+- grid: buys and sells alternate around a random walk, inventory stays small
+- accumulate: mostly buys with periodic large sells, inventory grows into
+  thousands of lots (the case where pop(0) turns quadratic)
+
+Usage:
+    python -m benchmarks.fifo_matching
+    python -m benchmarks.fifo_matching --sizes 10000 100000 --scenario accumulate
+    python -m benchmarks.fifo_matching --json results.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.fifo_core import FEE_RATE, FIFOMatcher
+
+Trade = Tuple[str, str, float, float, float]
+
+
+def generate_trades(count: int, scenario: str = "grid", seed: int = 42) -> List[Trade]:
+    """Synthetic (symbol, side, quantity, price, total_value) stream"""
+    rng = random.Random(seed)
+    symbols = ["ADAUSDT", "ETHUSDT", "SOLUSDT"]
+    prices = {"ADAUSDT": 0.5, "ETHUSDT": 3000.0, "SOLUSDT": 150.0}
+    trades: List[Trade] = []
+
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        price = prices[symbol] * (1 + rng.uniform(-0.01, 0.01))
+        prices[symbol] = price
+        quantity = round(rng.uniform(0.5, 2.0), 4)
+
+        if scenario == "accumulate":
+            # One large sell per ~50 trades of a symbol
+            if rng.random() < 0.02:
+                side, quantity = "SELL", quantity * 40
+            else:
+                side = "BUY"
+        else:
+            side = "BUY" if rng.random() < 0.5 else "SELL"
+
+        trades.append((symbol, side, quantity, price, quantity * price))
+
+    return trades
+
+
+def run_legacy_matcher(trades: List[Trade]) -> float:
+    """The previous list-of-dicts matcher (list.pop(0) per consumed lot)"""
+    symbol_data: Dict[str, Dict] = {}
+    profitable_trades = 0
+
+    for symbol, side, quantity, price, total_value in trades:
+        if symbol not in symbol_data:
+            symbol_data[symbol] = {
+                "inventory": [],
+                "realized_profit": 0.0,
+                "total_fees": 0.0,
+                "trades_count": 0,
+            }
+        data = symbol_data[symbol]
+        data["trades_count"] += 1
+        fee = total_value * FEE_RATE
+        data["total_fees"] += fee
+
+        if side == "BUY":
+            data["inventory"].append(
+                {
+                    "quantity": quantity,
+                    "cost_per_unit": price,
+                    "from_initialization": False,
+                }
+            )
+            continue
+
+        remaining_sell_quantity = quantity
+        trade_profit = 0.0
+        while remaining_sell_quantity > 0 and data["inventory"]:
+            oldest_purchase = data["inventory"][0]
+            match_quantity = min(remaining_sell_quantity, oldest_purchase["quantity"])
+            trade_profit += (
+                match_quantity * price
+                - match_quantity * oldest_purchase["cost_per_unit"]
+                - (fee * match_quantity / quantity)
+            )
+            remaining_sell_quantity -= match_quantity
+            oldest_purchase["quantity"] -= match_quantity
+            if oldest_purchase["quantity"] <= 0:
+                data["inventory"].pop(0)
+
+        data["realized_profit"] += trade_profit
+        if trade_profit > 0:
+            profitable_trades += 1
+
+    return sum(data["realized_profit"] for data in symbol_data.values())
+
+
+def run_core_matcher(trades: List[Trade]) -> float:
+    """The shared FIFO core"""
+    matcher = FIFOMatcher(fee_rate=FEE_RATE)
+    for symbol, side, quantity, price, total_value in trades:
+        matcher.apply(symbol, side, quantity, price, total_value)
+    return sum(data["realized_profit"] for data in matcher.symbols.values())
+
+
+def time_run(func, trades: List[Trade]) -> Tuple[float, float]:
+    start = time.perf_counter()
+    result = func(trades)
+    return time.perf_counter() - start, result
+
+
+def run_benchmark(
+    sizes: List[int], scenario: str, legacy_max: int, seed: int
+) -> List[Dict]:
+    results = []
+
+    for size in sizes:
+        trades = generate_trades(size, scenario, seed)
+
+        core_seconds, core_profit = time_run(run_core_matcher, trades)
+
+        legacy_seconds: Optional[float] = None
+        legacy_profit: Optional[float] = None
+        if size <= legacy_max:
+            legacy_seconds, legacy_profit = time_run(run_legacy_matcher, trades)
+
+        results.append(
+            {
+                "scenario": scenario,
+                "trades": size,
+                "core_seconds": round(core_seconds, 4),
+                "core_trades_per_sec": round(size / core_seconds)
+                if core_seconds
+                else None,
+                "legacy_seconds": round(legacy_seconds, 4)
+                if legacy_seconds is not None
+                else None,
+                "speedup": round(legacy_seconds / core_seconds, 2)
+                if legacy_seconds and core_seconds
+                else None,
+                "profit_delta": abs(core_profit - legacy_profit)
+                if legacy_profit is not None
+                else None,
+            }
+        )
+
+    return results
+
+
+def print_results(results: List[Dict]):
+    print("\n📊 FIFO MATCHING BENCHMARK")
+    print("=" * 78)
+    print(
+        f"{'scenario':<11}{'trades':>10}{'core (s)':>11}{'trades/s':>12}"
+        f"{'legacy (s)':>12}{'speedup':>9}{'Δ profit':>13}"
+    )
+    for r in results:
+        legacy = (
+            f"{r['legacy_seconds']:.4f}"
+            if r["legacy_seconds"] is not None
+            else "skipped"
+        )
+        speedup = f"{r['speedup']:.2f}x" if r["speedup"] else "-"
+        delta = f"{r['profit_delta']:.2e}" if r["profit_delta"] is not None else "-"
+        print(
+            f"{r['scenario']:<11}{r['trades']:>10}{r['core_seconds']:>11.4f}"
+            f"{r['core_trades_per_sec']:>12}{legacy:>12}{speedup:>9}{delta:>13}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FIFO matching micro-benchmark")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Trade stream sizes",
+    )
+    parser.add_argument(
+        "--scenario",
+        choices=["grid", "accumulate", "all"],
+        default="all",
+        help="Synthetic trade pattern",
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=200_000,
+        help="Skip the legacy matcher above this many trades",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    scenarios = ["grid", "accumulate"] if args.scenario == "all" else [args.scenario]
+    results = []
+    for scenario in scenarios:
+        results.extend(run_benchmark(args.sizes, scenario, args.legacy_max, args.seed))
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json}")
@@ -0,0 +1,167 @@
+# benchmarks/manager_creation.py
+#!/usr/bin/env python3
+"""
+GridManager Creation Benchmark
+==============================
+
+Measures how long it takes to build a GridManager per client and how much
+resident memory each one adds, for 1, 100 and 1,000 clients.
+
+Modes:
+- shared: every manager uses the process-wide ServiceContainer (current)
+- isolated: every manager gets a fresh ServiceContainer, i.e. its own
+  repositories, FIFOService, analytics and compound manager (the previous
+  per-client construction)
+
+Each (mode, clients) run happens in a fresh subprocess against a temporary
+database, so RSS numbers are not polluted by earlier runs. Managers are
+built with an offline stand-in for the Binance client; construction makes
+no exchange requests.
+
+Usage:
+    python -m benchmarks.manager_creation
+    python -m benchmarks.manager_creation --clients 1 100 --modes shared
+    python -m benchmarks.manager_creation --json results.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+class OfflineClient:
+    """Stand-in Binance client (GridManager only stores it at construction)"""
+
+
+def current_rss_bytes() -> int:
+    """Resident set size from /proc (Linux), peak RSS elsewhere"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_worker(mode: str, clients: int) -> Dict:
+    """Build `clients` managers in this process and report timings / RSS"""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    import logging
+
+    logging.disable(logging.CRITICAL)
+
+    from database.db_setup import DatabaseSetup
+    from services.grid_manager import GridManager
+    from services.service_container import ServiceContainer, get_service_container
+
+    DatabaseSetup().initialize()
+
+    managers = []
+    latencies: List[float] = []
+    threads_before = threading.active_count()
+    rss_before = current_rss_bytes()
+
+    for client_id in range(1, clients + 1):
+        services = ServiceContainer() if mode == "isolated" else None
+        start = time.perf_counter()
+        managers.append(GridManager(OfflineClient(), client_id, services=services))
+        latencies.append(time.perf_counter() - start)
+
+    rss_after = current_rss_bytes()
+    ordered = sorted(latencies)
+    return {
+        "mode": mode,
+        "clients": clients,
+        "first_ms": round(latencies[0] * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3),
+        "total_s": round(sum(latencies), 3),
+        "rss_delta_mb": round((rss_after - rss_before) / 1024**2, 2),
+        "rss_per_client_kb": round((rss_after - rss_before) / clients / 1024, 1),
+        "threads_added": threading.active_count() - threads_before,
+        "shared_services": get_service_container().get_stats()["services"],
+    }
+
+
+def run_isolated_process(mode: str, clients: int) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, DATABASE_PATH=str(Path(directory) / "bench.db"))
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.manager_creation",
+                "--worker",
+                mode,
+                str(clients),
+            ],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_results(results: List[Dict]):
+    print("\n📊 GRID MANAGER CREATION BENCHMARK")
+    print("=" * 78)
+    print(
+        f"{'mode':<10}{'clients':>8}{'first (ms)':>12}{'mean (ms)':>11}"
+        f"{'p95 (ms)':>10}{'total (s)':>11}{'KB/client':>11}{'threads':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<10}{r['clients']:>8}{r['first_ms']:>12.2f}"
+            f"{r['mean_ms']:>11.3f}{r['p95_ms']:>10.3f}{r['total_s']:>11.3f}"
+            f"{r['rss_per_client_kb']:>11.1f}{r['threads_added']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GridManager creation benchmark")
+    parser.add_argument(
+        "--clients", type=int, nargs="+", default=[1, 100, 1000], help="Client counts"
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["shared", "isolated"],
+        default=["shared", "isolated"],
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--worker", nargs=2, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker[0], int(args.worker[1]))))
+        sys.exit(0)
+
+    results = [
+        run_isolated_process(mode, clients)
+        for mode in args.modes
+        for clients in args.clients
+    ]
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json}")
@@ -0,0 +1,489 @@
+# benchmarks/orchestrator_load.py
+#!/usr/bin/env python3
+"""
+Orchestrator Load Benchmark
+===========================
+
+Measures how grid cycle time, event-loop lag, SQLite write latency and
+memory scale with the number of clients, for 10, 100 and 1,000 clients
+with 1 to 3 grids each.
+
+Each client count runs in a fresh subprocess against a temporary database.
+Clients trade on the in-process ExchangeSimulator (synthetic 1h price
+paths for ADA, ETH and SOL, configurable REST latency, no rate limits)
+whose replay clock the benchmark moves by hand:
+- setup: GridOrchestrator builds every manager through its client factory
+  and starts the grids
+- cycles: the clock advances one candle, then update_all_grids() runs
+  while dashboards are rendered concurrently (ClientHandler status, FIFO
+  metrics and message)
+- bursts: the clock advances over a candle with a wide wick that fills
+  most grid levels at once, then one update_all_grids() records them
+
+The JSON report has p50/p95/p99 latencies (cycles, bursts, dashboards,
+event-loop lag, SQLite commits), throughput and RSS per client count,
+plus the git commit, so reports can be compared across commits.
+
+Usage:
+    python -m benchmarks.orchestrator_load
+    python -m benchmarks.orchestrator_load --clients 10 100 --grids 2
+    python -m benchmarks.orchestrator_load --json after.json --compare before.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# symbol -> starting price of the synthetic path
+SYMBOL_PRICES = {"ADAUSDT": 0.5, "ETHUSDT": 2500.0, "SOLUSDT": 150.0}
+CAPITAL_PER_GRID = 400.0
+HOUR_MS = 3_600_000
+
+
+def percentiles(samples: List[float]) -> Dict:
+    """Nearest-rank p50/p95/p99 of second samples, in milliseconds
+
+    The p-th percentile is the smallest sample with at least p% of samples
+    at or below it, so p95/p99 of a few samples is the maximum.
+    """
+    if not samples:
+        samples = [0.0]
+    ordered = sorted(samples)
+
+    def rank(pct: float) -> float:
+        index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": rank(50),
+        "p95_ms": rank(95),
+        "p99_ms": rank(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_price_paths(warmup: int, cycles: int, bursts: int, burst_move: float):
+    """Seeded random-walk 1h candles; the last `bursts` candles are wide wicks"""
+    import numpy as np
+
+    from services.candle_store import CANDLE_DTYPE
+
+    rng = np.random.default_rng(42)
+    count = warmup + cycles + bursts + 1
+    paths = {}
+    for symbol, price in SYMBOL_PRICES.items():
+        closes = price * np.exp(np.cumsum(rng.normal(0, 0.004, count)))
+        opens = np.r_[price, closes[:-1]]
+        wick = np.abs(rng.normal(0, 0.003, count))
+        wick[warmup + cycles : warmup + cycles + bursts] = burst_move
+
+        candles = np.zeros(count, dtype=CANDLE_DTYPE)
+        candles["open_time"] = np.arange(count, dtype=np.int64) * HOUR_MS
+        candles["open"] = opens
+        candles["close"] = closes
+        candles["high"] = np.maximum(opens, closes) * (1 + wick)
+        candles["low"] = np.minimum(opens, closes) * (1 - wick)
+        candles["volume"] = 1000.0
+        candles["close_time"] = candles["open_time"] + HOUR_MS - 1
+        candles["quote_volume"] = candles["volume"] * closes
+        candles["trades"] = 100
+        paths[symbol] = candles
+    return paths
+
+
+# ========================================
+# WORKER (one client count per process)
+# ========================================
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes a sleeping task"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        import asyncio
+
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        import asyncio
+
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+
+
+async def render_dashboard(handler, client_id: int) -> float:
+    """ClientHandler dashboard without the Telegram round trip"""
+    start = time.perf_counter()
+    client = handler.client_repo.get_client(client_id)
+    grid_status = await handler._get_grid_status(client_id)
+    fifo_metrics = handler._get_fifo_metrics(client_id)
+    handler._build_dashboard_message(client, grid_status, fifo_metrics)
+    handler._build_dashboard_keyboard(client, grid_status)
+    return time.perf_counter() - start
+
+
+async def run_worker(clients: int, args) -> Dict:
+    """Build `clients` clients in this process and drive the orchestrator"""
+    import asyncio
+    import logging
+    import random
+
+    logging.disable(logging.CRITICAL)
+
+    from benchmarks.manager_creation import current_rss_bytes
+    from config import Config
+
+    directory = Path(args.directory)
+    Config.DATABASE_PATH = str(directory / "bench.db")
+    Config.CANDLE_STORE_DIR = str(directory / "candles")
+    Config.SYMBOL_RULES_SNAPSHOT = str(directory / "exchange_rules.json")
+    Config.TELEGRAM_BOT_TOKEN = None
+    Config.MIN_TICK_INTERVAL = 0  # every update_all_grids() is a real tick
+
+    from database.db_setup import DatabaseSetup
+    from database.connection_pool import get_db_pool
+    from database.write_queue import get_write_queue
+    from handlers.client_handler import ClientHandler
+    from services.backtester import VirtualClock
+    from services.exchange_simulator import ExchangeSimulator, rebase_paths
+    from services.grid_orchestrator import GridOrchestrator
+    from services.simulated_exchange import NetworkProfile
+
+    DatabaseSetup(Config.DATABASE_PATH).initialize()
+    rss = {"start": current_rss_bytes()}
+
+    warmup = Config.INDICATOR_LOOKBACK_CANDLES + 10
+    start_ms = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    paths = rebase_paths(
+        build_price_paths(warmup, args.cycles, args.bursts, args.burst_move),
+        start_ms,
+        warmup,
+    )
+    clock = VirtualClock(start_ms / 1000)
+    simulator = ExchangeSimulator(
+        paths,
+        network=NetworkProfile(
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=42
+        ),
+        balances={"USDT": CAPITAL_PER_GRID * args.grids * 1.25},
+        clock=clock,
+    )
+
+    orchestrator = GridOrchestrator()
+    simulator.attach(orchestrator)
+    client_repo = orchestrator.client_repo
+    for client_id in range(1, clients + 1):
+        client = client_repo.create_client(client_id, f"bench_{client_id}")
+        client.binance_api_key = f"sim-key-{client_id}"
+        client.binance_secret_key = f"sim-secret-{client_id}"
+        client_repo.update_client(client)
+
+    lag = LoopLagMonitor()
+    lag.start()
+
+    # Setup: managers, then grids
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(orchestrator.create_advanced_manager(cid) for cid in range(1, clients + 1))
+    )
+    managers_s = time.perf_counter() - started
+    rss["after_managers"] = current_rss_bytes()
+
+    symbols = list(SYMBOL_PRICES)
+
+    async def start_grids(client_id: int, manager) -> int:
+        manager.fifo_service.notifications_enabled = False
+        count = 1 + (client_id - 1) % args.grids
+        started_grids = 0
+        for symbol in symbols[:count]:
+            result = await manager.start_single_advanced_grid(symbol, CAPITAL_PER_GRID)
+            started_grids += bool(result.get("success"))
+        return started_grids
+
+    started = time.perf_counter()
+    grid_counts = await asyncio.gather(
+        *(
+            start_grids(cid, manager)
+            for cid, manager in orchestrator.advanced_managers.items()
+        )
+    )
+    grids_s = time.perf_counter() - started
+    grids = sum(grid_counts)
+    rss["after_grids"] = current_rss_bytes()
+
+    # Steady cycles with concurrent dashboard renders
+    handler = ClientHandler()
+    rng = random.Random(42)
+    client_ids = list(orchestrator.advanced_managers) or [1]
+    cycle_samples: List[float] = []
+    updated = 0
+    dashboard_samples: List[float] = []
+
+    async def timed_update() -> float:
+        nonlocal updated
+        start = time.perf_counter()
+        result = await orchestrator.update_all_grids()
+        updated += result.get("updated_grids", 0)
+        return time.perf_counter() - start
+
+    candle = warmup
+    for _ in range(args.cycles):
+        candle += 1
+        clock.advance_to((start_ms + (candle - warmup) * HOUR_MS) / 1000)
+        cycle, *renders = await asyncio.gather(
+            timed_update(),
+            *(
+                render_dashboard(handler, rng.choice(client_ids))
+                for _ in range(args.renders)
+            ),
+        )
+        cycle_samples.append(cycle)
+        dashboard_samples.extend(renders)
+
+    # Fill bursts
+    burst_samples: List[float] = []
+    burst_fills = 0
+    for _ in range(args.bursts):
+        candle += 1
+        filled_before = simulator.get_stats()["orders_filled"]
+        clock.advance_to((start_ms + (candle - warmup) * HOUR_MS) / 1000)
+        burst_samples.append(await timed_update())
+        burst_fills += simulator.get_stats()["orders_filled"] - filled_before
+
+    await get_write_queue(Config.DATABASE_PATH).flush()
+    await lag.stop()
+    rss["end"] = current_rss_bytes()
+
+    writes = get_write_queue(Config.DATABASE_PATH).get_stats()
+    pool = get_db_pool(Config.DATABASE_PATH).get_stats()
+    exchange = simulator.get_stats()
+    exchange.pop("calls_by_method")
+
+    cycle_total = sum(cycle_samples)
+    burst_total = sum(burst_samples)
+    return {
+        "clients": clients,
+        "managers": len(orchestrator.advanced_managers),
+        "grids": grids,
+        "setup": {
+            "managers_s": round(managers_s, 3),
+            "grids_s": round(grids_s, 3),
+            "grids_per_s": round(grids / grids_s, 1) if grids_s else 0.0,
+        },
+        "cycle": percentiles(cycle_samples),
+        "cycle_throughput": {
+            "clients_per_s": round(updated / cycle_total, 1) if cycle_total else 0.0,
+        },
+        "burst": {
+            **percentiles(burst_samples),
+            "fills": burst_fills,
+            "fills_per_s": round(burst_fills / burst_total, 1) if burst_total else 0.0,
+        },
+        "dashboard": percentiles(dashboard_samples),
+        "loop_lag": percentiles(lag.samples),
+        "sqlite": {
+            "commit": _latency_summary(writes["commit_latency"]),
+            "ack": _latency_summary(writes["ack_latency"]),
+            "write_wait": _latency_summary(pool["connection_wait"]["write"]),
+            "batches": writes.get("batches", 0),
+        },
+        "rss_mb": {key: round(value / 1024**2, 1) for key, value in rss.items()},
+        "rss_per_client_kb": round((rss["end"] - rss["start"]) / clients / 1024, 1),
+        "exchange": exchange,
+    }
+
+
+def _latency_summary(histogram: Dict) -> Dict:
+    return {
+        key: histogram[key]
+        for key in ("count", "avg_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    }
+
+
+# ========================================
+# DRIVER
+# ========================================
+
+
+def run_isolated_process(clients: int, args) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.orchestrator_load",
+            "--worker",
+            str(clients),
+            directory,
+            "--grids",
+            str(args.grids),
+            "--cycles",
+            str(args.cycles),
+            "--bursts",
+            str(args.bursts),
+            "--burst-move",
+            str(args.burst_move),
+            "--renders",
+            str(args.renders),
+            "--latency-ms",
+            str(args.latency_ms),
+            "--jitter-ms",
+            str(args.jitter_ms),
+        ]
+        env = dict(os.environ, DATABASE_PATH=str(Path(directory) / "bench.db"))
+        output = subprocess.run(
+            command,
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_results(results: List[Dict], baseline: Optional[Dict] = None):
+    print("\n📊 ORCHESTRATOR LOAD BENCHMARK")
+    print("=" * 100)
+    print(
+        f"{'clients':>8}{'grids':>7}{'cycle p50':>11}{'cycle p95':>11}"
+        f"{'cycle p99':>11}{'burst p95':>11}{'fills/s':>9}{'dash p95':>10}"
+        f"{'lag p99':>9}{'commit p95':>12}{'RSS MB':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['clients']:>8}{r['grids']:>7}{r['cycle']['p50_ms']:>11.1f}"
+            f"{r['cycle']['p95_ms']:>11.1f}{r['cycle']['p99_ms']:>11.1f}"
+            f"{r['burst']['p95_ms']:>11.1f}{r['burst']['fills_per_s']:>9.1f}"
+            f"{r['dashboard']['p95_ms']:>10.1f}{r['loop_lag']['p99_ms']:>9.1f}"
+            f"{r['sqlite']['commit']['p95_ms']:>12.1f}{r['rss_mb']['end']:>9.1f}"
+        )
+
+    if not baseline:
+        return
+    previous = {r["clients"]: r for r in baseline.get("results", [])}
+    print(f"\n🔁 Change vs {baseline.get('commit') or 'baseline'} (p95, RSS)")
+    for r in results:
+        old = previous.get(r["clients"])
+        if old is None:
+            continue
+        changes = {
+            "cycle": (old["cycle"]["p95_ms"], r["cycle"]["p95_ms"]),
+            "burst": (old["burst"]["p95_ms"], r["burst"]["p95_ms"]),
+            "dashboard": (old["dashboard"]["p95_ms"], r["dashboard"]["p95_ms"]),
+            "rss": (old["rss_mb"]["end"], r["rss_mb"]["end"]),
+        }
+        print(
+            f"{r['clients']:>8}  "
+            + "  ".join(
+                f"{name} {_change(before, after)}"
+                for name, (before, after) in changes.items()
+            )
+        )
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GridOrchestrator load benchmark")
+    parser.add_argument(
+        "--clients", type=int, nargs="+", default=[10, 100, 1000], help="Client counts"
+    )
+    parser.add_argument(
+        "--grids", type=int, choices=[1, 2, 3], default=3, help="Max grids per client"
+    )
+    parser.add_argument("--cycles", type=int, default=10, help="Steady update cycles")
+    parser.add_argument("--bursts", type=int, default=3, help="Fill burst cycles")
+    parser.add_argument(
+        "--burst-move", type=float, default=0.08, help="Burst candle wick (fraction)"
+    )
+    parser.add_argument(
+        "--renders", type=int, default=5, help="Dashboard renders per cycle"
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Earlier JSON report")
+    parser.add_argument("--worker", nargs=2, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        import asyncio
+
+        sys.path.insert(0, str(PROJECT_ROOT))
+        args.directory = args.worker[1]
+        result = asyncio.run(run_worker(int(args.worker[0]), args))
+        print(json.dumps(result))
+        sys.exit(0)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = {
+        "benchmark": "orchestrator_load",
+        "commit": git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "params": {
+            key: getattr(args, key)
+            for key in (
+                "grids",
+                "cycles",
+                "bursts",
+                "burst_move",
+                "renders",
+                "latency_ms",
+                "jitter_ms",
+            )
+        },
+        "results": [run_isolated_process(clients, args) for clients in args.clients],
+    }
+
+    print_results(report["results"], baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results written to {args.json}")
@@ -17,6 +17,15 @@ class Config:
     # Telegram Configuration
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
     ADMIN_TELEGRAM_ID = int(os.getenv("ADMIN_TELEGRAM_ID", "0"))
+    TELEGRAM_QUEUE_SIZE = 500  # outbound messages waiting to be sent
+    TELEGRAM_SENDER_WORKERS = 4  # concurrent sendMessage calls
+    TELEGRAM_GLOBAL_RATE = 30.0  # messages/second per bot (Telegram limit)
+    TELEGRAM_CHAT_RATE = 1.0  # messages/second per chat
+    TELEGRAM_CHAT_BURST = 3  # short burst allowed per chat
+    TELEGRAM_SEND_TIMEOUT = 10  # seconds per sendMessage request
+    NOTIFICATION_DIGEST_WINDOW = float(
+        os.getenv("NOTIFICATION_DIGEST_WINDOW", "30")
+    )  # seconds fills/replacements are coalesced per symbol (0 = per event)
 
     # Environment
     ENVIRONMENT = os.getenv("ENVIRONMENT", "production")
@@ -24,9 +33,21 @@ class Config:
 
     # Database
     DATABASE_PATH = os.getenv("DATABASE_PATH", "data/gridtrader_clients.db")
+    SQLITE_READERS = int(os.getenv("SQLITE_READERS", "4"))  # pooled read connections
+    SQLITE_BUSY_TIMEOUT = 5.0  # seconds to wait on a locked database
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024  # bytes of the file memory-mapped
+    SQLITE_CACHE_SIZE_KB = 16384  # page cache per connection
+    SQLITE_STATEMENT_CACHE = 256  # prepared statements kept per connection
+    DB_WRITE_BATCH_MS = float(os.getenv("DB_WRITE_BATCH_MS", "5"))  # commit window
+    DB_WRITE_BATCH_MAX = 256  # write intents per transaction
+    SYMBOL_RULES_SNAPSHOT = "data/exchange_rules_snapshot.json"
+    SYMBOL_RULES_TTL = 3600  # seconds before exchange rules refresh in background
+    SYMBOL_RULES_RETRY = 30  # minimum seconds between exchangeInfo downloads
 
     # Security
     ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "change-this-in-production-32chars")
+    API_KEY_CACHE_TTL = 300  # seconds a decrypted key pair stays in memory
+    API_KEY_CACHE_SIZE = 256  # clients with cached decrypted keys
 
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -73,6 +94,8 @@ class Config:
 
     # Grid Trading Defaults
     DEFAULT_GRID_LEVELS = 8
+    GRID_LEVELS_PER_SIDE = 5  # BUY levels below and SELL levels above the center
+    REPLACEMENT_PROFIT_MARGIN = 0.025  # SELL replacement target above the buy fill
     MIN_CAPITAL = 200.0  # Minimum capital to start trading
 
     # Risk Management
@@ -81,6 +104,49 @@ class Config:
     # Performance Settings
     UPDATE_INTERVAL = 30  # seconds between grid updates
     PRICE_CACHE_TIMEOUT = 5  # seconds to cache prices
+    TICKER_CACHE_TIMEOUT = 30  # seconds to cache 24h ticker stats
+    MARKET_DATA_BULK_TICKER = (
+        os.getenv("MARKET_DATA_BULK_TICKER", "true").lower() == "true"
+    )
+    INDICATOR_LOOKBACK_CANDLES = 100  # candles per indicator series (RSI warm-up)
+    INDICATOR_MAX_STALE = 900  # seconds a stale snapshot is served while refreshing
+    CANDLE_STORE_DIR = "data/candles"  # append-only kline files per symbol/interval
+
+    # Exchange Gateway
+    EXCHANGE_EXECUTOR_WORKERS = int(os.getenv("EXCHANGE_EXECUTOR_WORKERS", "16"))
+    EXCHANGE_MAX_CONCURRENT_PER_CLIENT = 4  # in-flight REST calls per client
+    EXCHANGE_CALL_TIMEOUT = 15.0  # seconds before a call is abandoned
+
+    # Grid Update Scheduling
+    GRID_UPDATE_CONCURRENCY = int(os.getenv("GRID_UPDATE_CONCURRENCY", "10"))
+    CLIENT_UPDATE_DEADLINE = 20.0  # seconds per client before it is skipped
+    MIN_TICK_INTERVAL = 15  # ticks closer than this are treated as duplicates
+
+    # Fill Detection
+    USER_DATA_STREAM_MODE = os.getenv("USER_DATA_STREAM_MODE", "live")  # live|recorded|off
+    USER_DATA_STREAM_REPLAY_FILE = os.getenv(
+        "USER_DATA_STREAM_REPLAY_FILE", "data/recorded_user_events.jsonl"
+    )
+    FILL_RECONCILIATION_INTERVAL = 300  # REST reconciliation while stream is healthy
+    RECONCILIATION_HISTORY_LIMIT = 100  # get_all_orders window per symbol
+
+    # FIFO Ledger
+    FIFO_PROFIT_MODE = os.getenv("FIFO_PROFIT_MODE", "ledger")  # ledger|replay|verify
+    FIFO_VERIFY_TOLERANCE = 0.01  # USD difference tolerated vs. full replay
+
+    # Backtesting
+    BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", "4"))  # parallel runs
+    BACKTEST_FEE_RATE = 0.001  # simulated taker/maker fee per fill
+
+    # Exchange Simulator (load testing)
+    SIMULATOR_PRICE_PATHS = os.getenv("SIMULATOR_PRICE_PATHS", "data/price_paths")
+    SIMULATOR_SPEED = float(os.getenv("SIMULATOR_SPEED", "1.0"))  # replay x wall
+    SIMULATOR_LATENCY_MS = 50.0  # base REST round trip
+    SIMULATOR_LATENCY_JITTER_MS = 30.0  # uniform extra latency
+    SIMULATOR_ERROR_RATE = 0.0  # share of requests failing with injected errors
+    SIMULATOR_WEIGHT_LIMIT = 6000  # request weight per minute (per IP, Binance)
+    SIMULATOR_ORDER_LIMIT_10S = 100  # new orders per 10s and account
+    SIMULATOR_START_BALANCE = 1000.0  # USDT per simulated account
 
     # Client Limits
     MAX_CONCURRENT_GRIDS = 5  # Maximum grids per client
@@ -89,6 +155,9 @@ class Config:
     # Monitoring
     PERFORMANCE_LOG_INTERVAL = 300  # Log performance every 5 minutes
     BACKUP_INTERVAL = 86400  # Backup database daily (seconds)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")  # local scrape only
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))  # Prometheus /metrics
 
     # DEFAULT_ORDER_SIZE removed - calculated dynamically
     BASE_ORDER_SIZE = 50.0  # Starting point only, not used in calculations
@@ -0,0 +1,434 @@
+# database/connection_pool.py
+"""
+SQLite Connection Pool - Shared writer / reader connections
+===========================================================
+
+Repositories used to open a fresh sqlite3 or aiosqlite connection for every
+query, paying connect + schema parse + cold page cache each time and losing
+sqlite3's prepared statement cache with the connection.
+
+One pool per database file:
+- 1 writer connection guarded by a lock (SQLite allows one writer anyway)
+- N reader connections, usable concurrently under WAL
+- WAL journal, synchronous=NORMAL, mmap_size and cache_size tuning
+- Prepared statements reused through each connection's statement cache
+- Per-statement latency histograms (keyed by verb + table)
+
+Usage:
+    db = get_db_pool()
+    with db.read() as conn:
+        rows = conn.execute("SELECT ...", params).fetchall()
+    with db.write() as conn:  # commits on success, rolls back on error
+        conn.execute("INSERT ...", params)
+
+    rows = await db.fetchall_async("SELECT ...", params)
+    await db.run_write(lambda conn: conn.execute("UPDATE ...", params))
+
+Async helpers run the whole unit of work on the pool's thread executor, so
+no connection or lock is ever held across an await.
+"""
+
+import asyncio
+import functools
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config import Config
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_STATEMENT_PATTERNS = (
+    re.compile(r"^\s*(SELECT)\b.*?\bFROM\s+(\w+)", re.IGNORECASE | re.DOTALL),
+    re.compile(
+        r"^\s*(INSERT)(?:\s+OR\s+\w+)?\s+INTO\s+(\w+)", re.IGNORECASE | re.DOTALL
+    ),
+    re.compile(r"^\s*(UPDATE)\s+(\w+)", re.IGNORECASE),
+    re.compile(r"^\s*(DELETE)\s+FROM\s+(\w+)", re.IGNORECASE),
+)
+
+_pools: Dict[str, "SQLitePool"] = {}
+_pools_lock = threading.Lock()
+
+
+def statement_key(sql: str) -> str:
+    """Histogram key for a statement, e.g. 'SELECT trades'"""
+    for pattern in _STATEMENT_PATTERNS:
+        match = pattern.match(sql)
+        if match:
+            return f"{match.group(1).upper()} {match.group(2)}"
+    words = sql.split(None, 1)
+    return words[0].upper() if words else "EMPTY"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+
+    __slots__ = ("buckets", "counts", "count", "total_ms", "max_ms")
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        index = 0
+        for bound in self.buckets:
+            if ms <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, pct: float) -> float:
+        """Upper bucket bound containing the given percentile"""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return (
+                    float(self.buckets[index])
+                    if index < len(self.buckets)
+                    else self.max_ms
+                )
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PooledCursor:
+    """sqlite3 cursor wrapper that records statement latency"""
+
+    __slots__ = ("_pool", "_cursor", "_key", "_elapsed", "_pending")
+
+    def __init__(self, pool: "SQLitePool", cursor: sqlite3.Cursor):
+        self._pool = pool
+        self._cursor = cursor
+        self._key = None
+        self._elapsed = 0.0
+        self._pending = False
+
+    def execute(self, sql: str, params=()) -> "PooledCursor":
+        self._finish(0.0)
+        start = time.perf_counter()
+        self._cursor.execute(sql, params)
+        elapsed = time.perf_counter() - start
+
+        key = statement_key(sql)
+        if self._cursor.description is None:
+            self._pool._observe(key, elapsed)
+        else:
+            # Row-returning statement: include fetch time in the sample
+            self._key, self._elapsed, self._pending = key, elapsed, True
+        return self
+
+    def executemany(self, sql: str, seq_of_params) -> "PooledCursor":
+        self._finish(0.0)
+        start = time.perf_counter()
+        self._cursor.executemany(sql, seq_of_params)
+        self._pool._observe(statement_key(sql), time.perf_counter() - start)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._finish(time.perf_counter() - start)
+        return row
+
+    def fetchmany(self, size: int = None):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size or self._cursor.arraysize)
+        self._finish(time.perf_counter() - start)
+        return rows
+
+    def fetchall(self) -> List:
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._finish(time.perf_counter() - start)
+        return rows
+
+    def __iter__(self) -> Iterator:
+        start = time.perf_counter()
+        yield from self._cursor
+        self._finish(time.perf_counter() - start)
+
+    def _finish(self, extra: float):
+        if self._pending:
+            self._pending = False
+            self._pool._observe(self._key, self._elapsed + extra)
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._finish(0.0)
+        self._cursor.close()
+
+
+class PooledConnection:
+    """Per-checkout view of a pooled sqlite3 connection"""
+
+    __slots__ = ("_pool", "_conn", "row_factory")
+
+    def __init__(self, pool: "SQLitePool", conn: sqlite3.Connection):
+        self._pool = pool
+        self._conn = conn
+        # Applied per cursor so one caller's row factory never leaks to the next
+        self.row_factory = None
+
+    def cursor(self) -> PooledCursor:
+        cursor = self._conn.cursor()
+        if self.row_factory is not None:
+            cursor.row_factory = self.row_factory
+        return PooledCursor(self._pool, cursor)
+
+    def execute(self, sql: str, params=()) -> PooledCursor:
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql: str, seq_of_params) -> PooledCursor:
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._conn.in_transaction
+
+    @property
+    def total_changes(self) -> int:
+        return self._conn.total_changes
+
+
+class SQLitePool:
+    """One writer and N reader connections to a single database file"""
+
+    def __init__(self, db_path: Optional[str] = None, readers: Optional[int] = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.reader_count = max(1, readers or Config.SQLITE_READERS)
+        self.logger = logging.getLogger(__name__)
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._writer = self._connect()
+        self._writer_lock = threading.RLock()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(self.reader_count):
+            self._readers.put(self._connect())
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.reader_count + 1, thread_name_prefix="sqlite"
+        )
+
+        self._stats_lock = threading.Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.wait_histograms = {
+            "read": LatencyHistogram(),
+            "write": LatencyHistogram(),
+        }
+        self.stats = {"reads": 0, "writes": 0, "rollbacks": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.SQLITE_BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=Config.SQLITE_STATEMENT_CACHE,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA mmap_size = {int(Config.SQLITE_MMAP_SIZE)}")
+        conn.execute(f"PRAGMA cache_size = -{int(Config.SQLITE_CACHE_SIZE_KB)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    # ========================================
+    # SYNC ACCESS
+    # ========================================
+
+    @contextmanager
+    def read(self) -> Iterator[PooledConnection]:
+        """Borrow a reader connection (blocks while all readers are busy)"""
+        start = time.perf_counter()
+        conn = self._readers.get()
+        self._observe_wait("read", time.perf_counter() - start)
+        try:
+            with self._stats_lock:
+                self.stats["reads"] += 1
+            yield PooledConnection(self, conn)
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    @contextmanager
+    def write(self) -> Iterator[PooledConnection]:
+        """Hold the writer; commits on success, rolls back on error"""
+        start = time.perf_counter()
+        with self._writer_lock:
+            self._observe_wait("write", time.perf_counter() - start)
+            with self._stats_lock:
+                self.stats["writes"] += 1
+            try:
+                yield PooledConnection(self, self._writer)
+                if self._writer.in_transaction:
+                    self._writer.commit()
+            except BaseException:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+                with self._stats_lock:
+                    self.stats["rollbacks"] += 1
+                raise
+
+    def fetchall(self, sql: str, params=()) -> List:
+        with self.read() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def fetchone(self, sql: str, params=()):
+        with self.read() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def execute(self, sql: str, params=()) -> int:
+        """Run one write statement; returns lastrowid"""
+        with self.write() as conn:
+            return conn.execute(sql, params).lastrowid
+
+    def executemany(self, sql: str, seq_of_params) -> int:
+        with self.write() as conn:
+            return conn.executemany(sql, seq_of_params).rowcount
+
+    # ========================================
+    # ASYNC ACCESS
+    # ========================================
+
+    async def run_read(self, func: Callable[[PooledConnection], Any], *args) -> Any:
+        """Run func(conn, *args) on a reader, off the event loop"""
+        return await self._run(self._call_read, func, *args)
+
+    async def run_write(self, func: Callable[[PooledConnection], Any], *args) -> Any:
+        """Run func(conn, *args) in one write transaction, off the event loop"""
+        return await self._run(self._call_write, func, *args)
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a blocking function that uses this pool, off the event loop"""
+        return await self._run(func, *args)
+
+    async def fetchall_async(self, sql: str, params=()) -> List:
+        return await self._run(self.fetchall, sql, params)
+
+    async def fetchone_async(self, sql: str, params=()):
+        return await self._run(self.fetchone, sql, params)
+
+    async def execute_async(self, sql: str, params=()) -> int:
+        return await self._run(self.execute, sql, params)
+
+    async def executemany_async(self, sql: str, seq_of_params) -> int:
+        return await self._run(self.executemany, sql, seq_of_params)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args)
+        )
+
+    def _call_read(self, func, *args):
+        with self.read() as conn:
+            return func(conn, *args)
+
+    def _call_write(self, func, *args):
+        with self.write() as conn:
+            return func(conn, *args)
+
+    # ========================================
+    # METRICS
+    # ========================================
+
+    def _observe(self, key: str, seconds: float):
+        with self._stats_lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.observe(seconds * 1000)
+
+    def _observe_wait(self, kind: str, seconds: float):
+        with self._stats_lock:
+            self.wait_histograms[kind].observe(seconds * 1000)
+
+    def get_stats(self) -> Dict:
+        """Pool usage plus per-statement latency histograms"""
+        with self._stats_lock:
+            return {
+                "db_path": self.db_path,
+                "readers": self.reader_count,
+                "readers_idle": self._readers.qsize(),
+                **self.stats,
+                "connection_wait": {
+                    kind: histogram.to_dict()
+                    for kind, histogram in self.wait_histograms.items()
+                },
+                "queries": {
+                    key: histogram.to_dict()
+                    for key, histogram in sorted(self.histograms.items())
+                },
+            }
+
+    def close(self):
+        """Close all connections (pool must not be used afterwards)"""
+        self._executor.shutdown(wait=True)
+        with self._writer_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+
+def get_db_pool(db_path: Optional[str] = None) -> SQLitePool:
+    """Shared pool for a database file (one per path per process)"""
+    path = str(Path(db_path or Config.DATABASE_PATH).resolve())
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = SQLitePool(db_path or Config.DATABASE_PATH)
+        return pool
+
+
+def get_all_pool_stats() -> Dict:
+    """Stats for every pool in the process"""
+    return {path: pool.get_stats() for path, pool in list(_pools.items())}
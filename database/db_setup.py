@@ -9,6 +9,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 from config import Config
+from repositories.daily_stats_repository import create_rollup_tables
 
 
 class DatabaseSetup:
@@ -125,6 +126,8 @@ class DatabaseSetup:
                 stopped_at DATETIME,
                 total_trades INTEGER DEFAULT 0,
                 total_profit REAL DEFAULT 0.0,
+                state_json TEXT,
+                updated_at DATETIME,
                 UNIQUE(client_id, symbol),
                 FOREIGN KEY (client_id) REFERENCES clients (telegram_id)
             )
@@ -169,6 +172,9 @@ class DatabaseSetup:
             )
         """)
 
+        # Per-client, per-symbol daily rollups (maintained with each trade insert)
+        create_rollup_tables(conn)
+
         conn.execute("""
              CREATE TABLE IF NOT EXISTS adaptive_grids (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
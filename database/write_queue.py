@@ -0,0 +1,336 @@
+# database/write_queue.py
+"""
+Write Queue - Single-writer group commit
+========================================
+
+Trade inserts, grid order updates, cost basis rows, network events and user
+activity each used to take the SQLite write lock and fsync on their own.
+During fill bursts dozens of these queue up behind each other.
+
+One writer task per database file:
+- Callers submit write intents (func(conn, *args)) through an asyncio queue
+- The writer waits a few milliseconds, drains the queue and applies the
+  whole batch in one BEGIN IMMEDIATE ... COMMIT
+- Intents run in submission order, so writes for a client never reorder
+- Each intent runs inside a SAVEPOINT; a failing intent is rolled back and
+  reported without aborting the rest of the batch
+- write() returns an awaitable acknowledgement that resolves after COMMIT;
+  durable=True commits that batch with synchronous=FULL
+- submit() is fire-and-forget; failures are logged
+
+Usage:
+    writes = get_write_queue()
+    writes.submit(insert_event, event, client_id=client_id)
+    trade_id = await writes.write(insert_trade, trade, client_id=7, durable=True)
+
+Outside a running event loop (or from a loop other than the writer's) the
+intent is applied directly through the connection pool instead.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+from database.connection_pool import LatencyHistogram, SQLitePool, get_db_pool
+
+_queues: Dict[str, "WriteQueue"] = {}
+_queues_lock = threading.Lock()
+
+
+def execute_statement(conn, sql: str, params=()) -> int:
+    """Write intent for a single statement; returns lastrowid"""
+    return conn.execute(sql, params).lastrowid
+
+
+class WriteIntent:
+    """One queued unit of write work"""
+
+    __slots__ = ("func", "args", "client_id", "durable", "future", "enqueued_at")
+
+    def __init__(
+        self,
+        func: Callable,
+        args: tuple,
+        client_id: Optional[int],
+        durable: bool,
+        future: Optional[asyncio.Future],
+    ):
+        self.func = func
+        self.args = args
+        self.client_id = client_id
+        self.durable = durable
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class WriteQueue:
+    """Batches write intents into group commits on the pool's writer"""
+
+    def __init__(
+        self,
+        pool: SQLitePool,
+        batch_window_ms: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ):
+        self.pool = pool
+        self.batch_window = (
+            Config.DB_WRITE_BATCH_MS if batch_window_ms is None else batch_window_ms
+        ) / 1000
+        self.max_batch = max(1, max_batch or Config.DB_WRITE_BATCH_MAX)
+        self.logger = logging.getLogger(__name__)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.commit_latency = LatencyHistogram()
+        self.ack_latency = LatencyHistogram()
+        self.stats = {
+            "intents": 0,
+            "direct_writes": 0,
+            "batches": 0,
+            "durable_batches": 0,
+            "failed_intents": 0,
+            "failed_batches": 0,
+            "max_batch_size": 0,
+            "max_queue_depth": 0,
+        }
+
+    # ========================================
+    # SUBMISSION
+    # ========================================
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        client_id: Optional[int] = None,
+        durable: bool = False,
+    ):
+        """Queue a write without waiting for it (errors are logged)"""
+        queue = self._bound_queue()
+        if queue is None:
+            try:
+                self._apply_direct(func, args, durable)
+            except Exception as e:
+                self.logger.error(f"❌ Direct write failed (client {client_id}): {e}")
+            return
+
+        self._enqueue(queue, WriteIntent(func, args, client_id, durable, None))
+
+    async def write(
+        self,
+        func: Callable,
+        *args,
+        client_id: Optional[int] = None,
+        durable: bool = False,
+    ) -> Any:
+        """Queue a write and wait until its batch has committed"""
+        queue = self._bound_queue()
+        if queue is None:
+            return await self.pool.run(self._apply_direct, func, args, durable)
+
+        future = self._loop.create_future()
+        self._enqueue(queue, WriteIntent(func, args, client_id, durable, future))
+        return await future
+
+    def submit_statement(
+        self, sql: str, params=(), client_id: Optional[int] = None
+    ):
+        self.submit(execute_statement, sql, params, client_id=client_id)
+
+    async def write_statement(
+        self,
+        sql: str,
+        params=(),
+        client_id: Optional[int] = None,
+        durable: bool = False,
+    ) -> int:
+        return await self.write(
+            execute_statement, sql, params, client_id=client_id, durable=durable
+        )
+
+    async def flush(self):
+        """Wait until everything queued so far has committed"""
+        if self._bound_queue() is not None:
+            await self.write(_noop)
+
+    async def close(self):
+        """Flush and stop the writer task"""
+        if self._task is None or self._task.done():
+            return
+        if self._loop is asyncio.get_running_loop():
+            await self.flush()
+            self._queue.put_nowait(None)
+            await self._task
+        self._task = None
+
+    def _enqueue(self, queue: asyncio.Queue, intent: WriteIntent):
+        queue.put_nowait(intent)
+        self.stats["intents"] += 1
+        depth = queue.qsize()
+        if depth > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = depth
+
+    def _bound_queue(self) -> Optional[asyncio.Queue]:
+        """Queue of the running loop's writer task, started on first use"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+        if self._loop is not loop:
+            if (
+                self._task is not None
+                and not self._task.done()
+                and not self._loop.is_closed()
+            ):
+                # Writer belongs to another live loop (e.g. a nested asyncio.run)
+                return None
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = None
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    # ========================================
+    # WRITER TASK
+    # ========================================
+
+    async def _run(self):
+        queue = self._queue
+        running = True
+        while running:
+            intent = await queue.get()
+            if intent is None:
+                break
+
+            if self.batch_window > 0 and queue.qsize() < self.max_batch:
+                await asyncio.sleep(self.batch_window)
+
+            batch = [intent]
+            while len(batch) < self.max_batch and not queue.empty():
+                intent = queue.get_nowait()
+                if intent is None:
+                    running = False
+                    break
+                batch.append(intent)
+
+            await self._commit(batch)
+
+    async def _commit(self, batch: List[WriteIntent]):
+        start = time.perf_counter()
+        try:
+            outcomes = await self.pool.run_write(self._apply_batch, batch)
+        except Exception as e:
+            self.stats["failed_batches"] += 1
+            self.logger.error(f"❌ Write batch of {len(batch)} failed: {e}")
+            outcomes = [(False, e)] * len(batch)
+
+        done = time.perf_counter()
+        self.commit_latency.observe((done - start) * 1000)
+        self.stats["batches"] += 1
+        if len(batch) > self.stats["max_batch_size"]:
+            self.stats["max_batch_size"] = len(batch)
+
+        for intent, (ok, value) in zip(batch, outcomes):
+            self.ack_latency.observe((done - intent.enqueued_at) * 1000)
+            if not ok:
+                self.stats["failed_intents"] += 1
+            future = intent.future
+            if future is None:
+                if not ok:
+                    self.logger.error(
+                        f"❌ Queued write {getattr(intent.func, '__name__', '?')} "
+                        f"failed (client {intent.client_id}): {value}"
+                    )
+            elif not future.done():
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _apply_batch(self, conn, batch: List[WriteIntent]) -> List[tuple]:
+        """Runs on the pool's writer thread inside pool.write()"""
+        durable = any(intent.durable for intent in batch)
+        if durable:
+            self.stats["durable_batches"] += 1
+            conn.execute("PRAGMA synchronous = FULL")
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            outcomes = []
+            for intent in batch:
+                conn.execute("SAVEPOINT write_intent")
+                try:
+                    result = intent.func(conn, *intent.args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_intent")
+                    conn.execute("RELEASE write_intent")
+                    outcomes.append((False, e))
+                else:
+                    conn.execute("RELEASE write_intent")
+                    outcomes.append((True, result))
+            conn.commit()
+            return outcomes
+        finally:
+            if durable:
+                conn.execute("PRAGMA synchronous = NORMAL")
+
+    def _apply_direct(self, func: Callable, args: tuple, durable: bool) -> Any:
+        """Apply one intent as its own transaction (no writer task available)"""
+        self.stats["direct_writes"] += 1
+        intent = WriteIntent(func, args, None, durable, None)
+        with self.pool.write() as conn:
+            ((ok, value),) = self._apply_batch(conn, [intent])
+        if not ok:
+            raise value
+        return value
+
+    # ========================================
+    # METRICS
+    # ========================================
+
+    def get_stats(self) -> Dict:
+        batches = self.stats["batches"]
+        queued = self.stats["intents"]
+        return {
+            "db_path": self.pool.db_path,
+            **self.stats,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_batch_size": round(queued / batches, 2) if batches else 0.0,
+            "batch_window_ms": self.batch_window * 1000,
+            "commit_latency": self.commit_latency.to_dict(),
+            "ack_latency": self.ack_latency.to_dict(),
+        }
+
+
+def _noop(conn):
+    return None
+
+
+def get_write_queue(db_path: Optional[str] = None) -> WriteQueue:
+    """Shared write queue for a database file (one per path per process)"""
+    path = str(Path(db_path or Config.DATABASE_PATH).resolve())
+    with _queues_lock:
+        writes = _queues.get(path)
+        if writes is None:
+            writes = _queues[path] = WriteQueue(get_db_pool(db_path))
+        return writes
+
+
+def get_all_write_queue_stats() -> Dict:
+    """Stats for every write queue in the process"""
+    return {path: writes.get_stats() for path, writes in list(_queues.items())}
+
+
+async def close_all_write_queues():
+    """Flush pending writes and stop every writer task (call on shutdown)"""
+    for writes in list(_queues.values()):
+        await writes.close()
@@ -10,8 +10,7 @@ while maintaining all existing features and structure.
 from binance.client import Client
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-from repositories.trade_repository import TradeRepository
-from services.fifo_service import FIFOService
+from services.service_container import get_service_container
 from services.usdt_initializer import EnhancedGridInitializationOrchestrator
 from utils.base_handler import BaseClientHandler
 from utils.crypto import CryptoUtils
@@ -22,7 +21,7 @@ class ClientHandler(BaseClientHandler):
 
     def __init__(self):
         super().__init__()
-        self.fifo_service = FIFOService()
+        self.fifo_service = get_service_container().fifo_service
         self.crypto_utils = CryptoUtils()
 
         # Trading configuration
@@ -633,10 +632,9 @@ Ready to launch?"""
             client_binance_client = Client(decrypted_api_key, decrypted_secret)
 
             # Create orchestrator
-            enhanced_trade_repo = TradeRepository()
-            enhanced_fifo_service = FIFOService()
+            services = get_service_container()
             orchestrator = EnhancedGridInitializationOrchestrator(
-                client_binance_client, enhanced_trade_repo, enhanced_fifo_service
+                client_binance_client, services.trade_repo, services.fifo_service
             )
 
             # Execute initialization
@@ -22,9 +22,13 @@ from telegram.ext import (
 
 from config import Config
 from database.db_setup import DatabaseSetup
+from database.write_queue import close_all_write_queues
 from handlers.client_handler import ClientHandler
 from services.grid_orchestrator import GridOrchestrator
+from services.metrics_exporter import start_metrics_exporter
+from services.notification_digest import get_notification_digest
 from services.telegram_notifier import TelegramNotifier
+from services.telegram_outbox import close_all_outboxes
 from utils.network_recovery import NetworkRecovery
 
 
@@ -140,8 +144,8 @@ class BadTradingService:
                 # Log status
                 self._log_grid_status()
 
-                # Wait for next cycle
-                await asyncio.sleep(30)
+                # Wait for next cycle (this loop is the single grid tick owner)
+                await asyncio.sleep(Config.UPDATE_INTERVAL)
 
             except Exception as e:
                 self.logger.error(f"Error in grid management loop: {e}")
@@ -237,9 +241,12 @@ class BadTradingService:
                 )
                 active_clients = cursor.fetchone()[0]
 
+            recovery = self.grid_orchestrator.recovery_report or {}
+
             message = f"""🚀 GridTrader Pro Started
 ⚡ System: OPERATIONAL
 👥 Clients: {active_clients}
+♻️ Grids restored: {recovery.get("grids_restored", 0)} in {recovery.get("recovery_seconds", 0.0):.2f}s
 📱 Bot: ✅ ENABLED
 🕐 {datetime.now().strftime("%H:%M:%S")}
 🤖 Ready for trading!"""
@@ -291,6 +298,12 @@ class BadTradingService:
         self.logger.info("🛑 Stopping GridTrader Pro Service...")
         self.running = False
 
+        # Close user data streams (their websocket threads keep the process alive)
+        try:
+            await self.grid_orchestrator.shutdown()
+        except Exception as e:
+            self.logger.error(f"Error shutting down grid managers: {e}")
+
         # Stop Telegram bot
         if self.telegram_app:
             try:
@@ -301,6 +314,19 @@ class BadTradingService:
             except Exception as e:
                 self.logger.error(f"Error stopping Telegram bot: {e}")
 
+        # Send open digests, then deliver queued Telegram messages
+        try:
+            await get_notification_digest().flush()
+            await close_all_outboxes()
+        except Exception as e:
+            self.logger.error(f"Error flushing Telegram messages: {e}")
+
+        # Commit anything still waiting in the database write queues
+        try:
+            await close_all_write_queues()
+        except Exception as e:
+            self.logger.error(f"Error flushing database writes: {e}")
+
         self.logger.info("✅ GridTrader Pro Service stopped")
 
     async def start_async(self):
@@ -312,6 +338,18 @@ class BadTradingService:
             self._init_database()
             await self._startup_checks()
 
+            if Config.METRICS_ENABLED:
+                try:
+                    start_metrics_exporter(self.grid_orchestrator)
+                except OSError as e:
+                    self.logger.error(f"❌ Metrics endpoint failed to start: {e}")
+
+            # Resume checkpointed grids without re-placing their orders
+            try:
+                await self.grid_orchestrator.restore_active_grids()
+            except Exception as e:
+                self.logger.error(f"❌ Grid restore failed: {e}")
+
             self.setup_telegram_bot()
 
             # Send startup notification
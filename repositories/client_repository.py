@@ -7,8 +7,9 @@ from datetime import datetime
 from typing import Optional
 
 from config import Config
+from database.connection_pool import get_db_pool
 from models.client import Client, ClientStatus, GridStatus
-from utils.crypto import CryptoUtils
+from utils.crypto import CryptoUtils, get_api_key_cache
 
 
 class ClientRepository:
@@ -16,7 +17,9 @@ class ClientRepository:
 
     def __init__(self, db_path: str = None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
         self.crypto_utils = CryptoUtils()
+        self.key_cache = get_api_key_cache()
         self.logger = logging.getLogger(__name__)
 
     def create_client(
@@ -28,7 +31,7 @@ class ClientRepository:
         )
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 conn.execute(
                     """
                     INSERT INTO clients (
@@ -67,7 +70,7 @@ class ClientRepository:
     def get_client(self, telegram_id: int) -> Optional[Client]:
         """Get client by telegram ID - COMPLETELY FIXED FIELD MAPPING"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     """
                     SELECT telegram_id, username, first_name, status, grid_status,
@@ -200,7 +203,7 @@ class ClientRepository:
                         client.binance_secret_key
                     )
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 conn.execute(
                     """
                     UPDATE clients SET
@@ -228,6 +231,13 @@ class ClientRepository:
                     ),
                 )
 
+            # Anything other than passing stored ciphertext back means new keys
+            if (
+                encrypted_api_key != client.binance_api_key
+                or encrypted_secret_key != client.binance_secret_key
+            ):
+                self.key_cache.invalidate(client.telegram_id)
+
             self.logger.info(f"✅ Updated client {client.telegram_id} successfully")
             return True
 
@@ -236,7 +246,7 @@ class ClientRepository:
             return False
 
     def get_decrypted_api_keys(self, client: Client) -> tuple:
-        """Get decrypted API keys for a client"""
+        """Get decrypted API keys for a client (cached with TTL)"""
         try:
             if not client.binance_api_key or not client.binance_secret_key:
                 self.logger.debug(
@@ -244,9 +254,22 @@ class ClientRepository:
                 )
                 return None, None
 
+            cached = self.key_cache.get(
+                client.telegram_id, client.binance_api_key, client.binance_secret_key
+            )
+            if cached:
+                return cached
+
             self.logger.debug(f"Decrypting API keys for client {client.telegram_id}")
             api_key = self.crypto_utils.decrypt(client.binance_api_key)
             secret_key = self.crypto_utils.decrypt(client.binance_secret_key)
+            self.key_cache.put(
+                client.telegram_id,
+                client.binance_api_key,
+                client.binance_secret_key,
+                api_key,
+                secret_key,
+            )
 
             self.logger.debug(
                 f"✅ Successfully decrypted API keys for client {client.telegram_id}"
@@ -262,7 +285,7 @@ class ClientRepository:
     def get_all_active_clients(self) -> list:
         """Get all active clients"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     """
                     SELECT telegram_id FROM clients 
@@ -280,7 +303,7 @@ class ClientRepository:
     def client_exists(self, telegram_id: int) -> bool:
         """Check if client exists"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     "SELECT 1 FROM clients WHERE telegram_id = ?", (telegram_id,)
                 )
@@ -291,7 +314,7 @@ class ClientRepository:
     def debug_client_data(self, telegram_id: int):
         """Debug method to check client data structure"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 # Get column names
                 cursor = conn.execute("PRAGMA table_info(clients)")
                 columns = [(row[1], row[2]) for row in cursor.fetchall()]
@@ -0,0 +1,326 @@
+# repositories/daily_stats_repository.py
+"""
+Daily Stats Repository - Incrementally maintained P&L rollups
+=============================================================
+
+Dashboards and reports aggregated the whole trades table on every request
+(COUNT / SUM / GROUP BY over every trade a client ever made), so report
+latency grew with trading history.
+
+Rollups are kept up to date as trades are written instead:
+- daily_symbol_stats: one row per client, symbol and day with trade,
+  buy and sell counts, buy/sell volume and estimated fees
+- daily_stats: system-wide totals per day (existing table)
+
+apply_trade() upserts both on the connection that inserts the trade, so
+a rollup row commits or rolls back together with its trade. P&L follows
+the reports' definition (sell value minus buy value). Rollup rows are
+kept when old trades are cleaned up; rebuild() recomputes them from the
+trades table (one-shot backfill, or after trades were deleted).
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from config import Config
+from database.connection_pool import get_db_pool
+from services.fifo_core import FEE_RATE
+
+ROLLUP_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS daily_symbol_stats (
+        client_id INTEGER NOT NULL,
+        symbol TEXT NOT NULL,
+        date TEXT NOT NULL,
+        trades INTEGER DEFAULT 0,
+        buy_count INTEGER DEFAULT 0,
+        sell_count INTEGER DEFAULT 0,
+        buy_volume REAL DEFAULT 0.0,
+        sell_volume REAL DEFAULT 0.0,
+        fees REAL DEFAULT 0.0,
+        updated_at DATETIME,
+        PRIMARY KEY (client_id, date, symbol)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_daily_symbol_stats_date "
+    "ON daily_symbol_stats(date)",
+)
+
+
+def create_rollup_tables(conn):
+    """Create the per-client rollup table (daily_stats is created by db_setup)"""
+    for statement in ROLLUP_SCHEMA:
+        conn.execute(statement)
+
+
+def apply_trade(
+    conn,
+    client_id: int,
+    symbol: str,
+    side: str,
+    total_value: float,
+    executed_at=None,
+):
+    """Add one trade to the rollups, inside the caller's write transaction
+
+    executed_at must be the value stored in trades.executed_at (None when
+    the insert used CURRENT_TIMESTAMP) so rebuild() buckets it the same way.
+    """
+    is_buy = 1 if side == "BUY" else 0
+    buy_volume = total_value if is_buy else 0.0
+    sell_volume = 0.0 if is_buy else total_value
+
+    conn.execute(
+        """
+        INSERT INTO daily_symbol_stats (
+            client_id, symbol, date, trades, buy_count, sell_count,
+            buy_volume, sell_volume, fees, updated_at
+        ) VALUES (?, ?, DATE(COALESCE(?, CURRENT_TIMESTAMP)), 1, ?, ?, ?, ?, ?,
+                  CURRENT_TIMESTAMP)
+        ON CONFLICT(client_id, date, symbol) DO UPDATE SET
+            trades = trades + 1,
+            buy_count = buy_count + excluded.buy_count,
+            sell_count = sell_count + excluded.sell_count,
+            buy_volume = buy_volume + excluded.buy_volume,
+            sell_volume = sell_volume + excluded.sell_volume,
+            fees = fees + excluded.fees,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        (
+            client_id,
+            symbol,
+            executed_at,
+            is_buy,
+            1 - is_buy,
+            buy_volume,
+            sell_volume,
+            total_value * FEE_RATE,
+        ),
+    )
+
+    conn.execute(
+        """
+        INSERT INTO daily_stats (
+            date, active_clients, total_trades, total_volume, total_profit
+        ) VALUES (DATE(COALESCE(?, CURRENT_TIMESTAMP)), 1, 1, ?, ?)
+        ON CONFLICT(date) DO UPDATE SET
+            active_clients = (
+                SELECT COUNT(DISTINCT client_id) FROM daily_symbol_stats
+                WHERE date = excluded.date
+            ),
+            total_trades = total_trades + 1,
+            total_volume = total_volume + excluded.total_volume,
+            total_profit = total_profit + excluded.total_profit
+        """,
+        (executed_at, total_value, sell_volume - buy_volume),
+    )
+
+
+class DailyStatsRepository:
+    """Read and rebuild the daily P&L rollups"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
+        self.logger = logging.getLogger(__name__)
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        try:
+            with self.db.write() as conn:
+                create_rollup_tables(conn)
+        except Exception as e:
+            self.logger.error(f"❌ Daily stats schema check failed: {e}")
+
+    # ========================================
+    # REPORTS
+    # ========================================
+
+    def get_client_totals(self, client_id: int) -> Dict:
+        """Lifetime counts and volumes for one client"""
+        row = self.db.fetchone(
+            """
+            SELECT
+                COALESCE(SUM(trades), 0),
+                COALESCE(SUM(buy_count), 0),
+                COALESCE(SUM(sell_count), 0),
+                COALESCE(SUM(buy_volume), 0.0),
+                COALESCE(SUM(sell_volume), 0.0),
+                COALESCE(SUM(fees), 0.0)
+            FROM daily_symbol_stats
+            WHERE client_id = ?
+            """,
+            (client_id,),
+        )
+        return self._totals(row)
+
+    def get_daily(self, client_id: int, days: int = 30) -> List[Dict]:
+        """Per-day trades, P&L and volume for the last `days` days"""
+        rows = self.db.fetchall(
+            """
+            SELECT
+                date,
+                SUM(trades),
+                SUM(sell_volume - buy_volume),
+                SUM(buy_volume + sell_volume),
+                SUM(fees)
+            FROM daily_symbol_stats
+            WHERE client_id = ? AND date >= DATE('now', ?)
+            GROUP BY date
+            ORDER BY date DESC
+            """,
+            (client_id, f"-{int(days)} days"),
+        )
+        return [
+            {
+                "date": row[0],
+                "trades": row[1],
+                "pnl": row[2],
+                "volume": row[3],
+                "fees": row[4],
+            }
+            for row in rows
+        ]
+
+    def get_by_symbol(self, client_id: int) -> Dict:
+        """Lifetime trades, P&L and volume per symbol"""
+        rows = self.db.fetchall(
+            """
+            SELECT
+                symbol,
+                SUM(trades),
+                SUM(sell_volume - buy_volume),
+                SUM(buy_volume + sell_volume),
+                SUM(fees)
+            FROM daily_symbol_stats
+            WHERE client_id = ?
+            GROUP BY symbol
+            """,
+            (client_id,),
+        )
+        return {
+            row[0]: {
+                "trades": row[1],
+                "pnl": row[2],
+                "volume": row[3],
+                "fees": row[4],
+            }
+            for row in rows
+        }
+
+    def get_system_totals(self, days: int = 7) -> Dict:
+        """Totals across all clients for the last `days` days"""
+        row = self.db.fetchone(
+            """
+            SELECT
+                COALESCE(SUM(trades), 0),
+                COALESCE(SUM(buy_count), 0),
+                COALESCE(SUM(sell_count), 0),
+                COALESCE(SUM(buy_volume), 0.0),
+                COALESCE(SUM(sell_volume), 0.0),
+                COALESCE(SUM(fees), 0.0),
+                COUNT(DISTINCT client_id)
+            FROM daily_symbol_stats
+            WHERE date >= DATE('now', ?)
+            """,
+            (f"-{int(days)} days",),
+        )
+        return {**self._totals(row), "clients": row[6]}
+
+    @staticmethod
+    def _totals(row) -> Dict:
+        trades, buy_count, sell_count, buy_volume, sell_volume, fees = row[:6]
+        return {
+            "trades": trades,
+            "buy_count": buy_count,
+            "sell_count": sell_count,
+            "buy_volume": buy_volume,
+            "sell_volume": sell_volume,
+            "volume": buy_volume + sell_volume,
+            "pnl": sell_volume - buy_volume,
+            "fees": fees,
+        }
+
+    # ========================================
+    # REBUILD
+    # ========================================
+
+    def rebuild(self, client_id: Optional[int] = None) -> int:
+        """Recompute rollups from the trades table; returns rows written
+
+        With client_id only that client's rows are replaced. The system-wide
+        daily_stats totals are always recomputed from the per-client rows.
+        """
+        where, params = "", ()
+        if client_id:
+            where, params = "WHERE client_id = ?", (client_id,)
+        trade_filter = f"{where} AND" if where else "WHERE"
+
+        with self.db.write() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"DELETE FROM daily_symbol_stats {where}", params)
+                cursor = conn.execute(
+                    f"""
+                    INSERT INTO daily_symbol_stats (
+                        client_id, symbol, date, trades, buy_count, sell_count,
+                        buy_volume, sell_volume, fees, updated_at
+                    )
+                    SELECT
+                        client_id,
+                        symbol,
+                        DATE(executed_at),
+                        COUNT(*),
+                        SUM(CASE WHEN side = 'BUY' THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN side = 'BUY' THEN 0 ELSE 1 END),
+                        SUM(CASE WHEN side = 'BUY' THEN total_value ELSE 0 END),
+                        SUM(CASE WHEN side = 'BUY' THEN 0 ELSE total_value END),
+                        SUM(total_value) * ?,
+                        CURRENT_TIMESTAMP
+                    FROM trades
+                    {trade_filter} executed_at IS NOT NULL
+                    GROUP BY client_id, symbol, DATE(executed_at)
+                    """,
+                    (FEE_RATE, *params),
+                )
+                written = cursor.rowcount
+
+                conn.execute(
+                    """
+                    UPDATE daily_stats SET
+                        active_clients = 0,
+                        total_trades = 0,
+                        total_volume = 0.0,
+                        total_profit = 0.0
+                    """
+                )
+                conn.execute(
+                    """
+                    INSERT INTO daily_stats (
+                        date, active_clients, total_trades, total_volume,
+                        total_profit
+                    )
+                    SELECT
+                        date,
+                        COUNT(DISTINCT client_id),
+                        SUM(trades),
+                        SUM(buy_volume + sell_volume),
+                        SUM(sell_volume - buy_volume)
+                    FROM daily_symbol_stats
+                    WHERE TRUE
+                    GROUP BY date
+                    ON CONFLICT(date) DO UPDATE SET
+                        active_clients = excluded.active_clients,
+                        total_trades = excluded.total_trades,
+                        total_volume = excluded.total_volume,
+                        total_profit = excluded.total_profit
+                    """
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        scope = f"client {client_id}" if client_id else "all clients"
+        self.logger.info(f"✅ Daily rollups rebuilt for {scope}: {written} rows")
+        return written
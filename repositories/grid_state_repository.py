@@ -0,0 +1,182 @@
+# repositories/grid_state_repository.py
+"""
+Grid State Repository - Checkpoints of live grids
+=================================================
+
+GridManager.active_grids only lived in memory, so a restart lost every
+level and order_id mapping and grids had to be re-forced (cancel and
+re-place every order).
+
+Each active grid is checkpointed into grid_instances: the summary columns
+plus state_json, the full GridConfig.to_dict() including levels and order
+ids. Writes go through the write queue. Stopping a grid marks the row
+inactive, and startup restores every active row.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+from config import Config
+from database.connection_pool import get_db_pool
+from database.write_queue import get_write_queue
+
+
+class GridStateRepository:
+    """Persist and load grid checkpoints (grid_instances.state_json)"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
+        self.writes = get_write_queue(self.db_path)
+        self.logger = logging.getLogger(__name__)
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """Create grid_instances if needed and add the checkpoint columns"""
+        try:
+            with self.db.write() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS grid_instances (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        client_id INTEGER NOT NULL,
+                        symbol TEXT NOT NULL,
+                        status TEXT DEFAULT 'inactive',
+                        center_price REAL,
+                        grid_spacing REAL,
+                        grid_levels INTEGER,
+                        order_size REAL,
+                        started_at DATETIME,
+                        stopped_at DATETIME,
+                        total_trades INTEGER DEFAULT 0,
+                        total_profit REAL DEFAULT 0.0,
+                        state_json TEXT,
+                        updated_at DATETIME,
+                        UNIQUE(client_id, symbol)
+                    )
+                """)
+
+                columns = {
+                    row[1]
+                    for row in conn.execute("PRAGMA table_info(grid_instances)")
+                }
+                if "state_json" not in columns:
+                    conn.execute(
+                        "ALTER TABLE grid_instances ADD COLUMN state_json TEXT"
+                    )
+                if "updated_at" not in columns:
+                    conn.execute(
+                        "ALTER TABLE grid_instances ADD COLUMN updated_at DATETIME"
+                    )
+
+        except Exception as e:
+            self.logger.error(f"❌ Grid state schema check failed: {e}")
+
+    # ========================================
+    # CHECKPOINTS
+    # ========================================
+
+    def save_checkpoint(
+        self, client_id: int, symbol: str, state: Dict, state_json: str
+    ):
+        """Queue an upsert of the grid's current state (fire-and-forget)"""
+        self.writes.submit_statement(
+            """
+            INSERT INTO grid_instances (
+                client_id, symbol, status, center_price, grid_spacing,
+                grid_levels, order_size, started_at, stopped_at, state_json,
+                updated_at
+            ) VALUES (?, ?, 'active', ?, ?, ?, ?, CURRENT_TIMESTAMP, NULL, ?,
+                      CURRENT_TIMESTAMP)
+            ON CONFLICT(client_id, symbol) DO UPDATE SET
+                status = 'active',
+                center_price = excluded.center_price,
+                grid_spacing = excluded.grid_spacing,
+                grid_levels = excluded.grid_levels,
+                order_size = excluded.order_size,
+                started_at = CASE WHEN grid_instances.status = 'active'
+                             THEN grid_instances.started_at
+                             ELSE excluded.started_at END,
+                stopped_at = NULL,
+                state_json = excluded.state_json,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (
+                client_id,
+                symbol,
+                state.get("center_price"),
+                state.get("grid_spacing"),
+                state.get("grid_levels"),
+                state.get("base_order_size", state.get("order_size")),
+                state_json,
+            ),
+            client_id=client_id,
+        )
+
+    def mark_stopped(self, client_id: int, symbol: str):
+        """Queue marking a grid inactive so it is not restored"""
+        self.writes.submit_statement(
+            """
+            UPDATE grid_instances
+            SET status = 'inactive', stopped_at = CURRENT_TIMESTAMP,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE client_id = ? AND symbol = ?
+            """,
+            (client_id, symbol),
+            client_id=client_id,
+        )
+
+    # ========================================
+    # RESTORE
+    # ========================================
+
+    def get_active_checkpoints(self, client_id: Optional[int] = None) -> List[Dict]:
+        """Saved GridConfig dicts of active grids (all clients, or one)"""
+        try:
+            sql = """
+                SELECT client_id, symbol, state_json, updated_at
+                FROM grid_instances
+                WHERE status = 'active' AND state_json IS NOT NULL
+            """
+            params = ()
+            if client_id is not None:
+                sql += " AND client_id = ?"
+                params = (client_id,)
+
+            checkpoints = []
+            for row in self.db.fetchall(sql, params):
+                try:
+                    state = json.loads(row[2])
+                except ValueError as e:
+                    self.logger.error(
+                        f"❌ Corrupt grid checkpoint {row[0]}/{row[1]}: {e}"
+                    )
+                    continue
+                state["_checkpointed_at"] = row[3]
+                checkpoints.append(state)
+            return checkpoints
+
+        except Exception as e:
+            self.logger.error(f"❌ Error loading grid checkpoints: {e}")
+            return []
+
+    def get_active_client_ids(self) -> List[int]:
+        """Clients with at least one checkpointed active grid"""
+        try:
+            rows = self.db.fetchall("""
+                SELECT DISTINCT client_id FROM grid_instances
+                WHERE status = 'active' AND state_json IS NOT NULL
+            """)
+            return [row[0] for row in rows]
+
+        except Exception as e:
+            self.logger.error(f"❌ Error loading clients with active grids: {e}")
+            return []
+
+    async def get_active_checkpoints_async(
+        self, client_id: Optional[int] = None
+    ) -> List[Dict]:
+        return await self.db.run(self.get_active_checkpoints, client_id)
+
+    async def get_active_client_ids_async(self) -> List[int]:
+        return await self.db.run(self.get_active_client_ids)
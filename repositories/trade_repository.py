@@ -9,14 +9,14 @@ Addresses the critical performance bottleneck identified in your system.
 
 import asyncio
 import logging
-import sqlite3
 import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
-import aiosqlite
-
 from config import Config
+from database.connection_pool import get_db_pool
+from database.write_queue import get_write_queue
+from repositories.daily_stats_repository import DailyStatsRepository, apply_trade
 
 
 class TradeRepository:
@@ -34,13 +34,16 @@ class TradeRepository:
 
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
+        self.writes = get_write_queue(self.db_path)
         self.logger = logging.getLogger(__name__)
+        self.rollups = DailyStatsRepository(self.db_path)
         self._ensure_schema()
 
     def _ensure_schema(self):
         """Ensure database schema supports all features"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.cursor()
 
                 # Check if trades table has required columns
@@ -71,17 +74,17 @@ class TradeRepository:
     ):
         """Log a grid order placement asynchronously (non-blocking)"""
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO grid_orders (
-                        client_id, symbol, side, quantity, price, 
-                        order_id, grid_level, status, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, 'PLACED', CURRENT_TIMESTAMP)
-                """,
-                    (client_id, symbol, side, quantity, price, order_id, grid_level),
-                )
-                await conn.commit()
+            # Fire-and-forget: the write queue group-commits it with other writes
+            self.writes.submit_statement(
+                """
+                INSERT INTO grid_orders (
+                    client_id, symbol, side, quantity, price, 
+                    order_id, grid_level, status, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, 'PLACED', CURRENT_TIMESTAMP)
+            """,
+                (client_id, symbol, side, quantity, price, order_id, grid_level),
+                client_id=client_id,
+            )
 
         except Exception as e:
             self.logger.error(f"❌ Error logging grid order async: {e}")
@@ -104,9 +107,9 @@ class TradeRepository:
         try:
             total_value = quantity * price
 
-            async with aiosqlite.connect(self.db_path) as conn:
-                # Log the trade (non-blocking)
-                await conn.execute(
+            def log_execution(conn):
+                # Log the trade
+                conn.execute(
                     """
                     INSERT INTO trades (
                         client_id, symbol, side, quantity, price, 
@@ -115,9 +118,10 @@ class TradeRepository:
                 """,
                     (client_id, symbol, side, quantity, price, total_value, order_id),
                 )
+                apply_trade(conn, client_id, symbol, side, total_value)
 
-                # Update grid order status (non-blocking)
-                await conn.execute(
+                # Update grid order status
+                conn.execute(
                     """
                     UPDATE grid_orders 
                     SET status = 'FILLED', filled_at = CURRENT_TIMESTAMP
@@ -126,7 +130,8 @@ class TradeRepository:
                     (order_id,),
                 )
 
-                await conn.commit()
+            # Both statements commit together; wait for the durable ack
+            await self.writes.write(log_execution, client_id=client_id, durable=True)
 
             self.logger.debug(
                 f"✅ Async trade logged: {side} {quantity:.4f} {symbol} @ ${price:.4f}"
@@ -162,14 +167,13 @@ class TradeRepository:
             executed_timestamp = executed_at or time.time()
             executed_datetime = datetime.fromtimestamp(executed_timestamp)
 
-            async with aiosqlite.connect(self.db_path) as conn:
+            def insert_trade(conn):
                 # Check if enhanced schema is available
-                async with conn.execute("PRAGMA table_info(trades)") as cursor:
-                    columns = [col[1] async for col in cursor]
+                columns = [col[1] for col in conn.execute("PRAGMA table_info(trades)")]
 
                 if "is_initialization" in columns:
                     # Use enhanced schema
-                    cursor = await conn.execute(
+                    cursor = conn.execute(
                         """
                         INSERT INTO trades 
                         (client_id, symbol, side, quantity, price, total_value, 
@@ -190,7 +194,7 @@ class TradeRepository:
                     )
                 else:
                     # Fallback to basic schema
-                    cursor = await conn.execute(
+                    cursor = conn.execute(
                         """
                         INSERT INTO trades 
                         (client_id, symbol, side, quantity, price, total_value, 
@@ -209,16 +213,22 @@ class TradeRepository:
                         ),
                     )
 
-                db_trade_id = cursor.lastrowid
-                await conn.commit()
-
-                self.logger.info(
-                    f"✅ Async trade created: ID={db_trade_id}, {side} {quantity:.4f} {symbol} @ ${price:.4f}"
+                apply_trade(
+                    conn, client_id, symbol, side, total_value, executed_datetime
                 )
-                if is_initialization:
-                    self.logger.info("   🏁 Marked as initialization trade")
+                return cursor.lastrowid
+
+            db_trade_id = await self.writes.write(
+                insert_trade, client_id=client_id, durable=True
+            )
+
+            self.logger.info(
+                f"✅ Async trade created: ID={db_trade_id}, {side} {quantity:.4f} {symbol} @ ${price:.4f}"
+            )
+            if is_initialization:
+                self.logger.info("   🏁 Marked as initialization trade")
 
-                return str(db_trade_id)
+            return str(db_trade_id)
 
         except Exception as e:
             self.logger.error(f"❌ Error creating trade async: {e}")
@@ -240,7 +250,7 @@ class TradeRepository:
     ):
         """Log a grid order placement (blocking - use only for critical operations)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 conn.execute(
                     """
                     INSERT INTO grid_orders (
@@ -273,7 +283,7 @@ class TradeRepository:
         try:
             total_value = quantity * price
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 # Log the trade
                 conn.execute(
                     """
@@ -284,6 +294,7 @@ class TradeRepository:
                 """,
                     (client_id, symbol, side, quantity, price, total_value, order_id),
                 )
+                apply_trade(conn, client_id, symbol, side, total_value)
 
                 # Update grid order status
                 conn.execute(
@@ -433,52 +444,50 @@ class TradeRepository:
         Non-blocking version for dashboard and analytics operations.
         """
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                # Build query
-                base_query = """
-                    SELECT id, client_id, symbol, side, quantity, price, total_value, 
-                           executed_at, order_id,
-                           COALESCE(is_initialization, 0) as is_initialization
-                    FROM trades 
-                    WHERE client_id = ?
-                """
-                params = [client_id]
-
-                # Add symbol filter
-                if symbol:
-                    base_query += " AND symbol = ?"
-                    params.append(symbol)
-
-                # Add initialization filter
-                if not include_initialization:
-                    base_query += " AND COALESCE(is_initialization, 0) = 0"
-
-                # Add ordering and limit
-                base_query += " ORDER BY executed_at ASC"
-                if limit:
-                    base_query += f" LIMIT {limit}"
-
-                async with conn.execute(base_query, params) as cursor:
-                    rows = await cursor.fetchall()
-
-                # Convert to dictionaries
-                trades = []
-                for row in rows:
-                    trade = {
-                        "id": row[0],
-                        "client_id": row[1],
-                        "symbol": row[2],
-                        "side": row[3],
-                        "quantity": row[4],
-                        "price": row[5],
-                        "total_value": row[6],
-                        "executed_at": row[7],
-                        "order_id": row[8],
-                        "is_initialization": bool(row[9]),
-                    }
-                    trades.append(trade)
+            # Build query
+            base_query = """
+                SELECT id, client_id, symbol, side, quantity, price, total_value, 
+                       executed_at, order_id,
+                       COALESCE(is_initialization, 0) as is_initialization
+                FROM trades 
+                WHERE client_id = ?
+            """
+            params = [client_id]
+
+            # Add symbol filter
+            if symbol:
+                base_query += " AND symbol = ?"
+                params.append(symbol)
+
+            # Add initialization filter
+            if not include_initialization:
+                base_query += " AND COALESCE(is_initialization, 0) = 0"
+
+            # Add ordering and limit
+            base_query += " ORDER BY executed_at ASC"
+            if limit:
+                base_query += f" LIMIT {limit}"
+
+            rows = await self.db.fetchall_async(base_query, params)
+
+            # Convert to dictionaries
+            trades = []
+            for row in rows:
+                trade = {
+                    "id": row[0],
+                    "client_id": row[1],
+                    "symbol": row[2],
+                    "side": row[3],
+                    "quantity": row[4],
+                    "price": row[5],
+                    "total_value": row[6],
+                    "executed_at": row[7],
+                    "order_id": row[8],
+                    "is_initialization": bool(row[9]),
+                }
+                trades.append(trade)
 
-                return trades
+            return trades
 
         except Exception as e:
             self.logger.error(f"❌ Error getting client trades async: {e}")
@@ -489,48 +498,46 @@ class TradeRepository:
     ) -> Dict:
         """Get enhanced trade statistics with initialization tracking (async)"""
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                base_query = """
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        COUNT(CASE WHEN side = 'BUY' THEN 1 END) as buy_trades,
-                        COUNT(CASE WHEN side = 'SELL' THEN 1 END) as sell_trades,
-                        SUM(CASE WHEN side = 'BUY' THEN total_value ELSE 0 END) as total_bought,
-                        SUM(CASE WHEN side = 'SELL' THEN total_value ELSE 0 END) as total_sold,
-                        AVG(total_value) as avg_trade_size,
-                        MIN(executed_at) as first_trade,
-                        MAX(executed_at) as last_trade,
-                        COUNT(CASE WHEN COALESCE(is_initialization, 0) = 1 THEN 1 END) as initialization_trades
-                    FROM trades 
-                    WHERE client_id = ?
-                """
-
-                params = [client_id]
-                if symbol:
-                    base_query += " AND symbol = ?"
-                    params.append(symbol)
-
-                async with conn.execute(base_query, params) as cursor:
-                    row = await cursor.fetchone()
-
-                if row:
-                    stats = {
-                        "total_trades": row[0] or 0,
-                        "buy_trades": row[1] or 0,
-                        "sell_trades": row[2] or 0,
-                        "total_bought": row[3] or 0.0,
-                        "total_sold": row[4] or 0.0,
-                        "avg_trade_size": row[5] or 0.0,
-                        "first_trade": row[6],
-                        "last_trade": row[7],
-                        "initialization_trades": row[8] or 0,
-                        "simple_profit": (row[4] or 0.0) - (row[3] or 0.0),
-                        "has_initialization": (row[8] or 0) > 0,
-                    }
+            base_query = """
+                SELECT 
+                    COUNT(*) as total_trades,
+                    COUNT(CASE WHEN side = 'BUY' THEN 1 END) as buy_trades,
+                    COUNT(CASE WHEN side = 'SELL' THEN 1 END) as sell_trades,
+                    SUM(CASE WHEN side = 'BUY' THEN total_value ELSE 0 END) as total_bought,
+                    SUM(CASE WHEN side = 'SELL' THEN total_value ELSE 0 END) as total_sold,
+                    AVG(total_value) as avg_trade_size,
+                    MIN(executed_at) as first_trade,
+                    MAX(executed_at) as last_trade,
+                    COUNT(CASE WHEN COALESCE(is_initialization, 0) = 1 THEN 1 END) as initialization_trades
+                FROM trades 
+                WHERE client_id = ?
+            """
+
+            params = [client_id]
+            if symbol:
+                base_query += " AND symbol = ?"
+                params.append(symbol)
+
+            row = await self.db.fetchone_async(base_query, params)
+
+            if row:
+                stats = {
+                    "total_trades": row[0] or 0,
+                    "buy_trades": row[1] or 0,
+                    "sell_trades": row[2] or 0,
+                    "total_bought": row[3] or 0.0,
+                    "total_sold": row[4] or 0.0,
+                    "avg_trade_size": row[5] or 0.0,
+                    "first_trade": row[6],
+                    "last_trade": row[7],
+                    "initialization_trades": row[8] or 0,
+                    "simple_profit": (row[4] or 0.0) - (row[3] or 0.0),
+                    "has_initialization": (row[8] or 0) > 0,
+                }
 
-                    return stats
-                else:
-                    return self._empty_statistics()
+                return stats
+            else:
+                return self._empty_statistics()
 
         except Exception as e:
             self.logger.error(f"❌ Error getting trade statistics async: {e}")
@@ -553,7 +560,7 @@ class TradeRepository:
         For backward compatibility - consider using async version for better performance
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 # Build query
                 base_query = """
                     SELECT id, client_id, symbol, side, quantity, price, total_value, 
@@ -611,7 +618,7 @@ class TradeRepository:
         Returns trades ordered by execution time for accurate FIFO processing
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     """
                     SELECT id, symbol, side, quantity, price, total_value, executed_at,
@@ -649,7 +656,7 @@ class TradeRepository:
     def get_initialization_trades(self, client_id: int) -> List[Dict]:
         """Get all initialization trades for a client"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     """
                     SELECT id, symbol, side, quantity, price, total_value, executed_at, order_id
@@ -690,38 +697,10 @@ class TradeRepository:
     def get_client_trade_stats(self, client_id: int) -> Dict:
         """Get comprehensive trade statistics for a client (original method)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Basic stats
-                cursor = conn.execute(
-                    """
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        SUM(total_value) as total_volume,
-                        AVG(total_value) as avg_trade_size
-                    FROM trades 
-                    WHERE client_id = ?
-                """,
-                    (client_id,),
-                )
-
-                basic_stats = cursor.fetchone()
-
-                # Calculate profit (simplified: sell_total - buy_total)
-                cursor = conn.execute(
-                    """
-                    SELECT 
-                        SUM(CASE WHEN side = 'SELL' THEN total_value ELSE 0 END) as sell_total,
-                        SUM(CASE WHEN side = 'BUY' THEN total_value ELSE 0 END) as buy_total,
-                        COUNT(CASE WHEN side = 'SELL' THEN 1 END) as sell_count,
-                        COUNT(CASE WHEN side = 'BUY' THEN 1 END) as buy_count
-                    FROM trades 
-                    WHERE client_id = ?
-                """,
-                    (client_id,),
-                )
-
-                profit_stats = cursor.fetchone()
+            # Counts and volumes come from the daily rollups
+            totals = self.rollups.get_client_totals(client_id)
 
+            with self.db.read() as conn:
                 # Recent trades
                 cursor = conn.execute(
                     """
@@ -748,15 +727,13 @@ class TradeRepository:
                 ]
 
                 # Calculate metrics
-                total_trades = basic_stats[0] or 0
-                total_volume = basic_stats[1] or 0.0
-                avg_trade_size = basic_stats[2] or 0.0
+                total_trades = totals["trades"]
+                total_volume = totals["volume"]
+                avg_trade_size = total_volume / total_trades if total_trades else 0.0
+                sell_count = totals["sell_count"]
 
-                sell_total = profit_stats[0] or 0.0
-                buy_total = profit_stats[1] or 0.0
-                sell_count = profit_stats[2] or 0
-
-                total_profit = sell_total - buy_total
+                # Simplified profit: sell_total - buy_total
+                total_profit = totals["pnl"]
                 win_rate = (sell_count / total_trades * 100) if total_trades > 0 else 0
 
                 return {
@@ -791,70 +768,27 @@ class TradeRepository:
             return self._empty_statistics()
 
     def get_daily_performance(self, client_id: int, days: int = 30) -> List[Dict]:
-        """Get daily performance over specified period"""
+        """Get daily performance over specified period (from daily rollups)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT 
-                        DATE(executed_at) as trade_date,
-                        COUNT(*) as trades_count,
-                        SUM(CASE WHEN side = 'SELL' THEN total_value ELSE -total_value END) as daily_pnl,
-                        SUM(total_value) as daily_volume
-                    FROM trades 
-                    WHERE client_id = ? 
-                    AND executed_at >= datetime('now', '-{} days')
-                    GROUP BY DATE(executed_at)
-                    ORDER BY trade_date DESC
-                """.format(days),
-                    (client_id,),
-                )
-
-                return [
-                    {
-                        "date": row[0],
-                        "trades": row[1],
-                        "pnl": row[2],
-                        "volume": row[3],
-                    }
-                    for row in cursor.fetchall()
-                ]
+            return self.rollups.get_daily(client_id, days)
 
         except Exception as e:
             self.logger.error(f"Error getting daily performance: {e}")
             return []
 
     def get_symbol_performance(self, client_id: int) -> Dict:
-        """Get performance breakdown by trading symbol"""
+        """Get performance breakdown by trading symbol (from daily rollups)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT 
-                        symbol,
-                        COUNT(*) as trades,
-                        SUM(CASE WHEN side = 'SELL' THEN total_value ELSE -total_value END) as pnl,
-                        SUM(total_value) as volume
-                    FROM trades 
-                    WHERE client_id = ?
-                    GROUP BY symbol
-                """,
-                    (client_id,),
-                )
-
-                return {
-                    row[0]: {
-                        "trades": row[1],
-                        "pnl": row[2],
-                        "volume": row[3],
-                    }
-                    for row in cursor.fetchall()
-                }
+            return self.rollups.get_by_symbol(client_id)
 
         except Exception as e:
             self.logger.error(f"Error getting symbol performance: {e}")
             return {}
 
+    def rebuild_rollups(self, client_id: Optional[int] = None) -> int:
+        """Recompute daily rollups from the trades table"""
+        return self.rollups.rebuild(client_id)
+
     # ==============================================
     # DATABASE MANAGEMENT (keeping existing methods)
     # ==============================================
@@ -862,7 +796,7 @@ class TradeRepository:
     def verify_database_schema(self) -> Dict:
         """Verify that database schema supports all features"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.cursor()
 
                 # Check trades table
@@ -944,7 +878,7 @@ class TradeRepository:
     def delete_test_trades(self, client_id: int) -> bool:
         """Delete test trades for a specific client (for testing only)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 cursor = conn.execute(
                     "DELETE FROM trades WHERE client_id = ?",
                     (client_id,),
@@ -955,7 +889,8 @@ class TradeRepository:
                     f"🗑️ Deleted {deleted_count} test trades for client {client_id}"
                 )
 
-                return True
+            self.rollups.rebuild(client_id)
+            return True
 
         except Exception as e:
             self.logger.error(f"❌ Error deleting test trades: {e}")
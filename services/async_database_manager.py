@@ -6,14 +6,25 @@ Addresses the critical performance bottleneck of blocking SQLite operations
 
 import asyncio
 import logging
-import sqlite3
 import time
-from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 
-import aiosqlite
-
 from config import Config
+from database.connection_pool import get_db_pool
+from repositories.daily_stats_repository import apply_trade
+from utils.metrics import get_metrics_registry
+
+_metrics = get_metrics_registry()
+MONITORED_QUERY_SECONDS = _metrics.histogram(
+    "gridbot_db_monitored_query_seconds",
+    "Queries timed by DatabasePerformanceMonitor",
+    ("query",),
+)
+MONITORED_QUERY_FAILURES = _metrics.counter(
+    "gridbot_db_monitored_query_failures_total",
+    "Queries that failed under DatabasePerformanceMonitor",
+    ("query",),
+)
 
 
 class AsyncDatabaseManager:
@@ -24,24 +35,19 @@ class AsyncDatabaseManager:
 
     def __init__(self, db_path: str = None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
         self.logger = logging.getLogger(__name__)
-        self._connection_pool = {}
-        self._pool_size = 5
-
-    @asynccontextmanager
-    async def get_connection(self):
-        """Get async database connection"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Enable foreign keys
-            await db.execute("PRAGMA foreign_keys = ON")
-            yield db
 
     async def execute_async(self, query: str, params: tuple = None) -> List[Any]:
         """Execute query asynchronously - non-blocking"""
         try:
-            async with self.get_connection() as db:
-                async with db.execute(query, params or ()) as cursor:
-                    return await cursor.fetchall()
+            if query.lstrip().upper().startswith("SELECT"):
+                return await self.db.fetchall_async(query, params or ())
+
+            def run(conn):
+                return conn.execute(query, params or ()).fetchall()
+
+            return await self.db.run_write(run)
         except Exception as e:
             self.logger.error(f"Async query failed: {e}")
             return []
@@ -49,10 +55,8 @@ class AsyncDatabaseManager:
     async def execute_many_async(self, query: str, params_list: List[tuple]) -> bool:
         """Execute multiple statements asynchronously"""
         try:
-            async with self.get_connection() as db:
-                await db.executemany(query, params_list)
-                await db.commit()
-                return True
+            await self.db.executemany_async(query, params_list)
+            return True
         except Exception as e:
             self.logger.error(f"Async executemany failed: {e}")
             return False
@@ -60,9 +64,10 @@ class AsyncDatabaseManager:
     def execute_sync(self, query: str, params: tuple = None) -> List[Any]:
         """Execute query synchronously - use only for critical operations"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(query, params or ())
-                return cursor.fetchall()
+            if query.lstrip().upper().startswith("SELECT"):
+                return self.db.fetchall(query, params or ())
+            with self.db.write() as conn:
+                return conn.execute(query, params or ()).fetchall()
         except Exception as e:
             self.logger.error(f"Sync query failed: {e}")
             return []
@@ -109,11 +114,13 @@ class AsyncTradeRepository:
             is_initialization,
         )
 
+        def insert(conn):
+            conn.execute(query, params)
+            apply_trade(conn, client_id, symbol, side, total_value)
+
         try:
             # This won't block the main thread
-            async with self.db_manager.get_connection() as db:
-                await db.execute(query, params)
-                await db.commit()
+            await self.db_manager.db.run_write(insert)
 
             self.logger.debug(f"✅ Trade recorded async: {symbol} {side} {quantity}")
             return True
@@ -154,9 +161,9 @@ class AsyncTradeRepository:
         )
 
         try:
-            with sqlite3.connect(self.db_manager.db_path) as conn:
+            with self.db_manager.db.write() as conn:
                 conn.execute(query, params)
-                conn.commit()
+                apply_trade(conn, client_id, symbol, side, total_value)
 
             self.logger.debug(f"✅ Trade recorded sync: {symbol} {side} {quantity}")
             return True
@@ -252,9 +259,7 @@ class AsyncClientRepository:
         query = f"UPDATE clients SET {', '.join(updates)} WHERE telegram_id = ?"
 
         try:
-            async with self.db_manager.get_connection() as db:
-                await db.execute(query, params)
-                await db.commit()
+            await self.db_manager.db.execute_async(query, params)
 
             self.logger.debug(f"✅ Client status updated async: {telegram_id}")
             return True
@@ -275,14 +280,14 @@ class AsyncAnalytics:
         self.logger = logging.getLogger(__name__)
 
     async def get_client_profit_async(self, client_id: int) -> Dict:
-        """Get client profit asynchronously - non-blocking"""
+        """Get client profit asynchronously - non-blocking (from daily rollups)"""
 
         query = """
             SELECT 
-                SUM(CASE WHEN side = 'SELL' THEN total_value ELSE 0 END) as total_sells,
-                SUM(CASE WHEN side = 'BUY' THEN total_value ELSE 0 END) as total_buys,
-                COUNT(*) as total_trades
-            FROM trades WHERE client_id = ?
+                SUM(sell_volume) as total_sells,
+                SUM(buy_volume) as total_buys,
+                SUM(trades) as total_trades
+            FROM daily_symbol_stats WHERE client_id = ?
         """
 
         try:
@@ -358,6 +363,7 @@ class AsyncAnalytics:
 class DatabasePerformanceMonitor:
     """
     Monitor database performance and suggest optimizations
+    Timings also feed the metrics registry (gridbot_db_monitored_query_*)
     """
 
     def __init__(self, db_manager: AsyncDatabaseManager = None):
@@ -374,6 +380,7 @@ class DatabasePerformanceMonitor:
         try:
             result = await self.db_manager.execute_async(query, params)
             execution_time = time.time() - start_time
+            MONITORED_QUERY_SECONDS.observe(execution_time, query=query_name)
 
             # Track query performance
             if query_name not in self.query_times:
@@ -395,6 +402,7 @@ class DatabasePerformanceMonitor:
 
         except Exception as e:
             execution_time = time.time() - start_time
+            MONITORED_QUERY_FAILURES.inc(query=query_name)
             self.logger.error(
                 f"❌ Query '{query_name}' failed after {execution_time:.2f}s: {e}"
             )
@@ -568,7 +576,7 @@ class AsyncMigrationHelper:
     def get_migration_checklist():
         """Get step-by-step migration checklist"""
         return [
-            "✅ Install aiosqlite: pip install aiosqlite",
+            "✅ Route queries through the shared SQLite pool (database/connection_pool.py)",
             "✅ Add AsyncDatabaseManager to your project",
             "✅ Replace trade recording with async version",
             "✅ Update dashboard handlers to use async",
@@ -0,0 +1,296 @@
+# services/backtester.py
+"""
+Backtester - Run the real grid stack against stored candles
+===========================================================
+
+Tuning grid spacing, level count or the replacement profit margin meant
+trying them with live capital.
+
+A backtest drives the production objects - GridManager, GridTradingEngine,
+inventory manager, FIFOService and the FIFO ledger - against a
+SimulatedExchange that replays candles from the CandleStore:
+- A VirtualClock replaces time.time in the worker process, so TTLs,
+  reconciliation throttles, feature updates and order timestamps all follow
+  the replayed candles instead of the wall clock
+- The manager ticks once per candle close (run_tick_phases, like the
+  orchestrator), so a year of hourly candles runs in seconds
+- Each run gets its own temporary database, candle directory and rules
+  snapshot; the result carries the usual FIFO performance dict
+  (calculate_fifo_profit_with_cost_basis) plus a summary
+
+run_backtests() fans parameter sets and symbols out over a spawn-based
+process pool (one fresh interpreter per run). Stored history can be
+backfilled first with prepare_history().
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from config import Config
+from services.candle_store import INTERVAL_MINUTES, CandleStore
+
+BACKTEST_CLIENT_ID = 1
+
+TimeSpec = Union[int, str]
+
+
+@dataclass
+class BacktestParams:
+    """One backtest run: symbol, period and the grid parameters under test"""
+
+    symbol: str
+    start: TimeSpec  # ms timestamp or ISO date, UTC
+    end: Optional[TimeSpec] = None  # None: last stored candle
+    interval: str = "1h"
+    capital: float = 1000.0
+    grid_spacing: Optional[float] = None  # None: GridManager asset default
+    levels_per_side: int = Config.GRID_LEVELS_PER_SIDE
+    profit_margin: float = Config.REPLACEMENT_PROFIT_MARGIN
+    tick_seconds: Optional[int] = None  # None: one tick per candle
+    candle_dir: str = Config.CANDLE_STORE_DIR
+    label: Optional[str] = None
+
+
+class VirtualClock:
+    """Settable wall clock for simulated time"""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance_to(self, timestamp: float):
+        self.now = max(self.now, timestamp)
+
+    def install(self):
+        """Replace time.time for this process (worker processes only)
+
+        Event-loop timeouts use time.monotonic and keep running on real time.
+        """
+        time.time = self
+
+
+def to_ms(value: TimeSpec) -> int:
+    """ms timestamp or ISO date/datetime (UTC) -> ms"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+# ========================================
+# HISTORY
+# ========================================
+
+
+async def prepare_history(
+    symbols: List[str],
+    interval: str,
+    start: TimeSpec,
+    exchange,
+    candle_dir: Optional[str] = None,
+) -> Dict[str, int]:
+    """Backfill stored candles from start for each symbol; returns counts"""
+    store = CandleStore(candle_dir)
+    start_ms = to_ms(start)
+    return {
+        symbol: await store.ensure_history(symbol, interval, start_ms, exchange)
+        for symbol in symbols
+    }
+
+
+# ========================================
+# SINGLE RUN (worker process)
+# ========================================
+
+
+def run_backtest(params: BacktestParams) -> Dict:
+    """Run one backtest in this process (meant for a dedicated worker)"""
+    try:
+        return asyncio.run(_run_backtest(params))
+    except Exception as e:
+        logging.getLogger(__name__).error(f"❌ Backtest {params.label} failed: {e}")
+        return {
+            "label": params.label,
+            "params": asdict(params),
+            "success": False,
+            "error": str(e),
+        }
+
+
+async def _run_backtest(params: BacktestParams) -> Dict:
+    started = time.perf_counter()
+    logger = logging.getLogger(__name__)
+
+    # Warm-up candles before start so indicators have a full lookback
+    step_ms = INTERVAL_MINUTES[params.interval] * 60_000
+    warmup_ms = Config.INDICATOR_LOOKBACK_CANDLES * step_ms
+    start_ms = to_ms(params.start)
+    end_ms = to_ms(params.end) if params.end is not None else None
+    candles = np.array(
+        CandleStore(params.candle_dir).load_range(
+            params.symbol, params.interval, start_ms - warmup_ms, end_ms
+        )
+    )
+    ticks = candles["close_time"][candles["open_time"] >= start_ms]
+    if not len(ticks):
+        raise ValueError(
+            f"No stored {params.interval} candles for {params.symbol} in range"
+        )
+
+    symbol_info = _stored_symbol_info(params.symbol)
+
+    with tempfile.TemporaryDirectory(prefix="backtest_") as directory:
+        _isolate_worker(Path(directory))
+
+        clock = VirtualClock(start_ms / 1000)
+        clock.install()
+
+        # Imported after the overrides so singletons pick up the temp paths
+        from database.db_setup import DatabaseSetup
+        from database.write_queue import get_write_queue
+        from services.grid_manager import GridManager
+        from services.simulated_exchange import SimulatedExchange
+
+        DatabaseSetup(Config.DATABASE_PATH).initialize()
+
+        exchange = SimulatedExchange(
+            {params.symbol: candles},
+            clock,
+            balances={"USDT": params.capital},
+            symbol_info={params.symbol: symbol_info} if symbol_info else None,
+        )
+        manager = GridManager(exchange, BACKTEST_CLIENT_ID)
+        _apply_params(manager, params)
+
+        first_price = exchange.get_price(params.symbol)
+        result = await manager.start_single_advanced_grid(
+            params.symbol, params.capital
+        )
+        if not result.get("success"):
+            raise RuntimeError(result.get("error", "grid did not start"))
+
+        grid_config = manager.active_grids[params.symbol]
+        tick_times = _tick_times(ticks, step_ms, params.tick_seconds)
+        for tick_ms in tick_times:
+            clock.advance_to(tick_ms / 1000)
+            await manager.run_tick_phases()
+
+        await get_write_queue(Config.DATABASE_PATH).flush()
+        performance = manager.fifo_service.calculate_fifo_profit_with_cost_basis(
+            BACKTEST_CLIENT_ID
+        )
+        last_price = exchange.get_price(params.symbol)
+        balances = exchange.get_balances()
+        await manager.shutdown()
+        await get_write_queue(Config.DATABASE_PATH).close()
+
+    base_asset = params.symbol.replace("USDT", "")
+    usdt_total = balances.get("USDT", {}).get("total", 0.0)
+    asset_total = balances.get(base_asset, {}).get("total", 0.0)
+    equity = usdt_total + asset_total * last_price
+    wall_seconds = time.perf_counter() - started
+    simulated_seconds = (tick_times[-1] - start_ms) / 1000
+
+    summary = {
+        "candles": len(ticks),
+        "ticks": len(tick_times),
+        "first_price": first_price,
+        "last_price": last_price,
+        "grid_spacing": grid_config.grid_spacing,
+        "levels_per_side": params.levels_per_side,
+        "profit_margin": params.profit_margin,
+        "final_equity": round(equity, 2),
+        "return_pct": round((equity / params.capital - 1) * 100, 3),
+        "buy_and_hold_pct": round((last_price / first_price - 1) * 100, 3),
+        "fills": exchange.stats["orders_filled"],
+        "fees_paid": round(exchange.stats["fees_paid"], 4),
+        "wall_seconds": round(wall_seconds, 2),
+        "simulated_days": round(simulated_seconds / 86_400, 2),
+        "speedup": round(simulated_seconds / wall_seconds) if wall_seconds else None,
+    }
+    logger.warning(
+        f"✅ Backtest {params.label or params.symbol}: "
+        f"{summary['return_pct']:+.2f}% over {summary['simulated_days']} days "
+        f"({summary['fills']} fills, {summary['wall_seconds']}s)"
+    )
+
+    return {
+        "label": params.label,
+        "params": asdict(params),
+        "success": True,
+        "summary": summary,
+        "fifo_performance": performance,
+        "exchange": exchange.get_stats(),
+    }
+
+
+def _isolate_worker(directory: Path):
+    """Point every persistent path and side channel at the run's temp dir"""
+    Config.DATABASE_PATH = str(directory / "backtest.db")
+    Config.CANDLE_STORE_DIR = str(directory / "candles")
+    Config.SYMBOL_RULES_SNAPSHOT = str(directory / "exchange_rules.json")
+    Config.USER_DATA_STREAM_MODE = "off"
+    Config.TELEGRAM_BOT_TOKEN = None
+
+
+def _stored_symbol_info(symbol: str) -> Optional[Dict]:
+    """Real exchange rules from the rules snapshot, when one exists"""
+    try:
+        with open(Config.SYMBOL_RULES_SNAPSHOT) as f:
+            return json.load(f).get("symbols", {}).get(symbol)
+    except (OSError, ValueError):
+        return None
+
+
+def _apply_params(manager, params: BacktestParams):
+    engine = manager.trading_engine
+    engine.levels_per_side = params.levels_per_side
+    engine.replacement_profit_margin = params.profit_margin
+    manager.fifo_service.notifications_enabled = False
+
+    if params.grid_spacing is not None:
+        asset_config = dict(
+            manager.asset_configs.get(params.symbol, {"allocation": 1.0})
+        )
+        asset_config["grid_spacing_base"] = params.grid_spacing
+        manager.asset_configs[params.symbol] = asset_config
+
+
+def _tick_times(
+    close_times: np.ndarray, step_ms: int, tick_seconds: Optional[int]
+) -> List[int]:
+    if not tick_seconds or tick_seconds * 1000 >= step_ms:
+        return [int(t) for t in close_times]
+    start, end = int(close_times[0]) - step_ms + 1, int(close_times[-1])
+    return list(range(start + tick_seconds * 1000, end + 1, tick_seconds * 1000))
+
+
+# ========================================
+# PARALLEL RUNS
+# ========================================
+
+
+def run_backtests(
+    param_sets: List[BacktestParams], workers: Optional[int] = None
+) -> List[Dict]:
+    """Run parameter sets in parallel, one fresh process per run"""
+    workers = max(1, min(workers or Config.BACKTEST_WORKERS, len(param_sets)))
+    # Runs patch Config and time.time and build process-wide singletons,
+    # so every run gets a fresh interpreter
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=workers, maxtasksperchild=1) as pool:
+        return pool.map(run_backtest, param_sets, chunksize=1)
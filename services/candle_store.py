@@ -0,0 +1,312 @@
+# services/candle_store.py
+"""
+Candle Store - Incremental on-disk kline history
+================================================
+
+Every indicator refresh re-downloaded the full lookback window (100 1h
+candles) through get_historical_klines, although only the newest candle
+had changed since the previous refresh.
+
+One store per process, one file per symbol and interval:
+- data/candles/<SYMBOL>_<interval>.bin holds closed candles as fixed-width
+  NumPy records (CANDLE_DTYPE), sorted by open_time, read through memmap
+- Refreshes only request candles from the last stored open time onward;
+  newly closed candles are appended, the forming candle is kept in memory
+- A cold or short file is backfilled once for the requested window
+- load_range() reads stored history without any I/O for backtesting
+
+Closed candles never change, so the files are append-only in steady state.
+A torn trailing record (crash mid-write) is truncated on open.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+from services.market_data_cache import KLINE_TTL
+
+INTERVAL_MINUTES = {
+    "1m": 1,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "4h": 240,
+    "1d": 1440,
+}
+
+CANDLE_DTYPE = np.dtype(
+    [
+        ("open_time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+        ("close_time", "<i8"),
+        ("quote_volume", "<f8"),
+        ("trades", "<i8"),
+    ]
+)
+
+# get_historical_klines pages through the API 1000 candles at a time
+_KLINES_PER_REQUEST = 1000
+
+_store: Optional["CandleStore"] = None
+
+
+def klines_to_records(klines: List) -> np.ndarray:
+    """Binance kline lists (string prices) -> CANDLE_DTYPE records"""
+    return np.array(
+        [
+            (
+                int(k[0]),
+                float(k[1]),
+                float(k[2]),
+                float(k[3]),
+                float(k[4]),
+                float(k[5]),
+                int(k[6]),
+                float(k[7]),
+                int(k[8]),
+            )
+            for k in klines
+        ],
+        dtype=CANDLE_DTYPE,
+    )
+
+
+class _Series:
+    """Stored and forming candles of one symbol/interval"""
+
+    __slots__ = ("path", "records", "live", "synced_at", "lock")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.records = np.empty(0, dtype=CANDLE_DTYPE)
+        self.live = np.empty(0, dtype=CANDLE_DTYPE)
+        self.synced_at = 0.0
+        self.lock = asyncio.Lock()
+
+
+class CandleStore:
+    """Process-wide append-only candle files with incremental refresh"""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.directory = Path(directory or Config.CANDLE_STORE_DIR)
+        self.clock = clock or time.time
+        self.logger = logging.getLogger(__name__)
+
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self.stats = {
+            "reads": 0,
+            "fresh_hits": 0,
+            "requests": 0,
+            "candles_downloaded": 0,
+            "candles_appended": 0,
+            "backfills": 0,
+            "rewrites": 0,
+            "fetch_errors": 0,
+        }
+
+    # ========================================
+    # PUBLIC API
+    # ========================================
+
+    async def get_candles(
+        self, symbol: str, interval: str, count: int, exchange
+    ) -> np.ndarray:
+        """Newest count candles: stored closed ones plus the forming one"""
+        series = self._get_series(symbol, interval)
+        async with series.lock:
+            if self.clock() - series.synced_at < KLINE_TTL.get(interval, 60):
+                self.stats["fresh_hits"] += 1
+            else:
+                await self._sync(series, symbol, interval, count, exchange)
+
+        self.stats["reads"] += 1
+        if not len(series.live):
+            return series.records[-count:]
+        return np.concatenate((series.records[-count:], series.live))[-count:]
+
+    async def ensure_history(
+        self, symbol: str, interval: str, start_ms: int, exchange
+    ) -> int:
+        """Backfill closed candles from start_ms (backtesting); returns count"""
+        series = self._get_series(symbol, interval)
+        async with series.lock:
+            records = series.records
+            if len(records) and records["open_time"][0] <= start_ms:
+                return len(records)
+
+            end_ms = int(records["open_time"][0]) - 1 if len(records) else None
+            fetched = await self._fetch(symbol, interval, start_ms, exchange, end_ms)
+            self.stats["backfills"] += 1
+            self._merge(series, fetched, keep_live=end_ms is None)
+            return len(series.records)
+
+    def load_range(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> np.ndarray:
+        """Stored closed candles with start_ms <= open_time < end_ms (no I/O)"""
+        records = self._get_series(symbol, interval).records
+        open_times = records["open_time"]
+        lo = 0 if start_ms is None else np.searchsorted(open_times, start_ms)
+        hi = len(records) if end_ms is None else np.searchsorted(open_times, end_ms)
+        return records[lo:hi]
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "series": len(self._series),
+            "stored_candles": sum(len(s.records) for s in self._series.values()),
+            "directory": str(self.directory),
+        }
+
+    # ========================================
+    # SYNC
+    # ========================================
+
+    async def _sync(
+        self, series: _Series, symbol: str, interval: str, count: int, exchange
+    ):
+        """Fetch only what is missing from the window ending now"""
+        step_ms = INTERVAL_MINUTES.get(interval, 60) * 60_000
+        window_start = int(self.clock() * 1000) - count * step_ms
+        records = series.records
+
+        if len(records) >= count - 1 or (
+            len(records) and records["open_time"][0] <= window_start
+        ):
+            # Tail: next candle after the last stored one (capped to the window
+            # so a long downtime does not download history nobody asked for)
+            start_ms = max(int(records["open_time"][-1]) + step_ms, window_start)
+        else:
+            start_ms = window_start
+            self.stats["backfills"] += 1
+
+        try:
+            fetched = await self._fetch(symbol, interval, start_ms, exchange)
+        except Exception as e:
+            self.stats["fetch_errors"] += 1
+            if not len(series.records):
+                raise
+            self.logger.warning(
+                f"⚠️ Candle refresh failed for {symbol} {interval}, "
+                f"serving stored history: {e}"
+            )
+            return
+
+        self._merge(series, fetched)
+        series.synced_at = self.clock()
+
+    async def _fetch(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        exchange,
+        end_ms: Optional[int] = None,
+    ) -> np.ndarray:
+        if end_ms is None:
+            klines = await exchange.get_historical_klines(symbol, interval, start_ms)
+        else:
+            klines = await exchange.get_historical_klines(
+                symbol, interval, start_ms, end_ms
+            )
+        self.stats["requests"] += max(1, -(-len(klines) // _KLINES_PER_REQUEST))
+        self.stats["candles_downloaded"] += len(klines)
+        return klines_to_records(klines)
+
+    def _merge(self, series: _Series, fetched: np.ndarray, keep_live: bool = True):
+        """Store newly closed candles; keep the forming one in memory"""
+        now_ms = int(self.clock() * 1000)
+        closed = fetched[fetched["close_time"] < now_ms]
+        if keep_live:
+            series.live = fetched[fetched["close_time"] >= now_ms]
+
+        records = series.records
+        if not len(closed):
+            return
+        if not len(records) or closed["open_time"][0] > records["open_time"][-1]:
+            # Steady state: only candles newer than the file
+            self._append(series, closed)
+            return
+
+        closed = closed[~np.isin(closed["open_time"], records["open_time"])]
+        if not len(closed):
+            return
+        if closed["open_time"][0] > records["open_time"][-1]:
+            self._append(series, closed)
+        else:
+            merged = np.concatenate((records, closed))
+            self._rewrite(series, np.sort(merged, order="open_time"))
+
+    # ========================================
+    # FILES
+    # ========================================
+
+    def _get_series(self, symbol: str, interval: str) -> _Series:
+        key = (symbol, interval)
+        series = self._series.get(key)
+        if series is None:
+            series = _Series(self.directory / f"{symbol}_{interval}.bin")
+            self._open(series)
+            self._series[key] = series
+        return series
+
+    def _open(self, series: _Series):
+        """Map the file read-only (truncating a torn trailing record)"""
+        try:
+            if not series.path.exists():
+                return
+            size = series.path.stat().st_size
+            torn = size % CANDLE_DTYPE.itemsize
+            if torn:
+                self.logger.warning(
+                    f"⚠️ Truncating {torn} torn bytes from {series.path.name}"
+                )
+                os.truncate(series.path, size - torn)
+                size -= torn
+            if size:
+                series.records = np.memmap(series.path, dtype=CANDLE_DTYPE, mode="r")
+        except Exception as e:
+            self.logger.error(f"❌ Could not open candle file {series.path}: {e}")
+
+    def _append(self, series: _Series, records: np.ndarray):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(series.path, "ab") as f:
+            f.write(records.tobytes())
+        self.stats["candles_appended"] += len(records)
+        self._open(series)
+
+    def _rewrite(self, series: _Series, records: np.ndarray):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = series.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(records.tobytes())
+        os.replace(tmp_path, series.path)
+        self.stats["rewrites"] += 1
+        self._open(series)
+
+
+def get_candle_store() -> CandleStore:
+    """Process-wide candle store"""
+    global _store
+    if _store is None:
+        _store = CandleStore()
+    return _store
@@ -1,12 +1,12 @@
 # services/compound_manager.py
 
 import logging
-import time
 from typing import Dict
 
 import numpy as np
 
 from services.fifo_service import FIFOService
+from utils.ttl_cache import TTLCache
 
 
 class CompoundInterestManager:
@@ -35,8 +35,8 @@ class CompoundInterestManager:
         self.max_kelly_fraction = 0.25  # Never risk more than 25% per trade
 
         # Performance tracking
-        self.client_performance = {}  # Cache for performance data
-        self.last_update = {}  # Track last update times
+        # 1-minute cache of FIFO performance per client
+        self.client_performance = TTLCache("compound_performance", max_size=256, ttl=60)
 
         # Risk management
         self.max_allocation_change_per_day = 0.1  # Max 10% allocation change per day
@@ -312,25 +312,13 @@ class CompoundInterestManager:
     def _get_performance_metrics(self, client_id: int) -> Dict:
         """Get comprehensive performance metrics from FIFO service"""
         try:
-            # Check cache first
-            cache_key = f"perf_{client_id}"
-            if (
-                cache_key in self.client_performance
-                and time.time() - self.last_update.get(cache_key, 0) < 60
-            ):  # 1-minute cache
-                return self.client_performance[cache_key]
-
-            # Get fresh data from FIFO service
-            performance = self.fifo_service.calculate_fifo_profit_with_cost_basis(
-                client_id
+            return self.client_performance.get_or_compute(
+                client_id,
+                lambda: self.fifo_service.calculate_fifo_profit_with_cost_basis(
+                    client_id
+                ),
             )
 
-            # Cache the result
-            self.client_performance[cache_key] = performance
-            self.last_update[cache_key] = time.time()
-
-            return performance
-
         except Exception as e:
             self.logger.error(f"❌ Error getting performance metrics: {e}")
             return {
@@ -343,74 +331,21 @@ class CompoundInterestManager:
             }
 
     async def _get_symbol_trade_history(self, client_id: int, symbol: str) -> list:
-        """Get trade history for specific symbol"""
+        """Get closed (sell) trades for a symbol with FIFO-realized profit"""
         try:
-            # This would integrate with your existing trade repository
-            # For now, we'll use FIFO service data filtered by symbol
-            summary = self.fifo_service.get_cost_basis_summary(client_id)
-            all_trades = self._convert_cost_basis_to_trades(summary, symbol)
-            symbol_trades = [t for t in all_trades if t.get("symbol") == symbol]
-
-            # Calculate profit for each trade (simplified)
-            for trade in symbol_trades:
-                if trade.get("side") == "SELL":
-                    # Estimate profit based on grid spacing (2.5% typical)
-                    trade["profit"] = trade.get("total_value", 0) * 0.025
-                else:
-                    trade["profit"] = 0  # Buy trades don't have realized profit yet
-
-            return symbol_trades
+            trades = await self.fifo_service.get_realized_trades_async(
+                client_id, symbol
+            )
+            return [t for t in trades if t.get("side") == "SELL"]
 
         except Exception as e:
             self.logger.error(f"❌ Error getting symbol trade history: {e}")
             return []
 
-    def _convert_cost_basis_to_trades(self, summary: Dict, symbol: str) -> list:
-        """Convert cost basis summary to trade-like format for Kelly calculation"""
-        trades = []
-        try:
-            if symbol in summary.get("symbols", {}):
-                for record in summary["symbols"][symbol]["records"]:
-                    # Add cost basis as BUY trade
-                    trades.append(
-                        {
-                            "symbol": symbol,
-                            "side": "BUY",
-                            "quantity": record["quantity"],
-                            "price": record["cost_per_unit"],
-                            "profit": 0,
-                            "total_value": record["total_cost"],
-                        }
-                    )
-
-                    # If some quantity was sold, estimate SELL trades
-                    if record["remaining_quantity"] < record["quantity"]:
-                        sold_qty = record["quantity"] - record["remaining_quantity"]
-                        # Assume 2.5% profit for Kelly calculation
-                        sell_price = record["cost_per_unit"] * 1.025
-                        profit = sold_qty * record["cost_per_unit"] * 0.025
-
-                        trades.append(
-                            {
-                                "symbol": symbol,
-                                "side": "SELL",
-                                "quantity": sold_qty,
-                                "price": sell_price,
-                                "profit": profit,
-                                "total_value": sold_qty * sell_price,
-                            }
-                        )
-        except Exception as e:
-            self.logger.error(f"❌ Error converting cost basis to trades: {e}")
-
-        return trades
-
     async def _update_performance_cache(self, client_id: int):
         """Force update of performance cache"""
-        cache_key = f"perf_{client_id}"
-        if cache_key in self.client_performance:
-            del self.client_performance[cache_key]
-        await self._get_performance_metrics(client_id)
+        self.client_performance.pop(client_id)
+        self._get_performance_metrics(client_id)
 
     async def _trigger_rebalancing_check(self, client_id: int):
         """Check if grid allocation should be rebalanced based on performance"""
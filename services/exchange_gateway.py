@@ -0,0 +1,287 @@
+# services/exchange_gateway.py
+"""
+Exchange Gateway - Async wrapper for the python-binance Client
+==============================================================
+
+The python-binance Client is synchronous. Calling it directly inside an
+async def blocks the whole event loop (Telegram bot, other clients' grids)
+for the duration of every REST round trip.
+
+ExchangeGateway dispatches Client calls to a process-wide, sized thread
+pool. Each client gets its own semaphore and per-call timeout, so one slow
+account cannot starve the rest of the process. Order placement and
+cancellation are exempt from the timeout: the worker thread would still
+complete an abandoned call, so the caller must see its real outcome.
+
+Every call feeds the metrics registry: latency, request weight and errors
+per endpoint, plus the IP's used weight from the x-mbx-used-weight-1m
+response header.
+
+Usage:
+    exchange = get_exchange_gateway(binance_client, client_id)
+    ticker = await exchange.get_symbol_ticker(symbol="ETHUSDT")
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from binance.client import Client
+
+from config import Config
+from utils.metrics import get_metrics_registry
+
+# Binance REST request weights: (with symbol, without symbol)
+REQUEST_WEIGHTS = {
+    "get_symbol_ticker": (2, 4),
+    "get_ticker": (2, 80),
+    "get_historical_klines": (2, 2),
+    "get_exchange_info": (20, 20),
+    "get_symbol_info": (20, 20),
+    "get_account": (20, 20),
+    "get_order": (4, 4),
+    "cancel_order": (1, 1),
+    "get_open_orders": (6, 80),
+    "get_all_orders": (20, 20),
+}
+ORDER_WEIGHT = 1
+
+# Calls whose abandoned result would still change exchange state; they wait
+# for the Client's own HTTP timeout instead of EXCHANGE_CALL_TIMEOUT
+UNTIMED_METHODS = frozenset(
+    {
+        "create_order",
+        "order_limit",
+        "order_limit_buy",
+        "order_limit_sell",
+        "order_market",
+        "order_market_buy",
+        "order_market_sell",
+        "cancel_order",
+    }
+)
+
+_metrics = get_metrics_registry()
+REQUEST_SECONDS = _metrics.histogram(
+    "gridbot_exchange_request_seconds",
+    "Exchange REST call latency",
+    ("endpoint",),
+)
+REQUEST_WEIGHT = _metrics.counter(
+    "gridbot_exchange_request_weight_total",
+    "Binance request weight spent",
+    ("endpoint",),
+)
+REQUEST_ERRORS = _metrics.counter(
+    "gridbot_exchange_errors_total",
+    "Failed exchange calls",
+    ("endpoint", "kind"),
+)
+USED_WEIGHT = _metrics.gauge(
+    "gridbot_exchange_used_weight_1m",
+    "Request weight used in the current minute (last response header)",
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_gateways: Dict[int, "ExchangeGateway"] = {}
+
+
+def get_exchange_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for all blocking exchange calls"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=Config.EXCHANGE_EXECUTOR_WORKERS,
+                thread_name_prefix="exchange",
+            )
+        return _executor
+
+
+def request_weight(method_name: str, all_symbols: bool = False) -> int:
+    """Binance weight of one Client call (1 for unlisted endpoints)"""
+    if method_name.startswith("order_"):
+        return ORDER_WEIGHT
+    weights = REQUEST_WEIGHTS.get(method_name)
+    return weights[all_symbols] if weights else 1
+
+
+class ExchangeCallTimeout(Exception):
+    """Raised when an exchange call exceeds its deadline"""
+
+
+class ExchangeGateway:
+    """Per-client async facade over a synchronous Binance Client"""
+
+    def __init__(
+        self,
+        binance_client: Client,
+        client_id: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.binance_client = binance_client
+        self.client_id = client_id
+        self.max_concurrent = (
+            max_concurrent or Config.EXCHANGE_MAX_CONCURRENT_PER_CLIENT
+        )
+        self.timeout = timeout or Config.EXCHANGE_CALL_TIMEOUT
+        self.logger = logging.getLogger(__name__)
+
+        # Semaphores are bound to the loop that first awaits them
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+
+        self.stats = {
+            "calls": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+            "total_wait": 0.0,
+        }
+        self.method_counts: Dict[str, int] = {}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def call(
+        self, method_name: str, *args, timeout: Optional[float] = None, **kwargs
+    ):
+        """Run a Client method on the exchange thread pool"""
+        method = getattr(self.binance_client, method_name)
+        deadline = None if method_name in UNTIMED_METHODS else timeout or self.timeout
+        loop = asyncio.get_running_loop()
+
+        queued_at = time.perf_counter()
+        async with self._get_semaphore():
+            started_at = time.perf_counter()
+            self.stats["total_wait"] += started_at - queued_at
+            self.stats["calls"] += 1
+            self.method_counts[method_name] = (
+                self.method_counts.get(method_name, 0) + 1
+            )
+            self._in_flight += 1
+
+            try:
+                # NOTE: on timeout the worker thread still finishes the request;
+                # the caller just stops waiting for it (hence UNTIMED_METHODS).
+                return await asyncio.wait_for(
+                    loop.run_in_executor(
+                        get_exchange_executor(),
+                        functools.partial(method, *args, **kwargs),
+                    ),
+                    timeout=deadline,
+                )
+
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                REQUEST_ERRORS.inc(endpoint=method_name, kind="timeout")
+                self.logger.warning(
+                    f"⚠️ {method_name} timed out after {deadline:.1f}s (client {self.client_id})"
+                )
+                raise ExchangeCallTimeout(
+                    f"{method_name} timed out after {deadline:.1f}s"
+                )
+
+            except Exception:
+                self.stats["errors"] += 1
+                REQUEST_ERRORS.inc(endpoint=method_name, kind="error")
+                raise
+
+            finally:
+                self._in_flight -= 1
+                latency = time.perf_counter() - started_at
+                self.stats["total_latency"] += latency
+                self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+                self._record_metrics(method_name, latency, "symbol" not in kwargs)
+
+    def _record_metrics(self, method_name: str, latency: float, all_symbols: bool):
+        REQUEST_SECONDS.observe(latency, endpoint=method_name)
+        REQUEST_WEIGHT.inc(
+            request_weight(method_name, all_symbols), endpoint=method_name
+        )
+        response = getattr(self.binance_client, "response", None)
+        used = getattr(response, "headers", {}).get("x-mbx-used-weight-1m")
+        if used is not None:
+            USED_WEIGHT.set(float(used))
+
+    def __getattr__(self, name: str):
+        """Expose Client methods as coroutines: await gateway.get_order(...)"""
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if not callable(getattr(self.binance_client, name, None)):
+            raise AttributeError(name)
+
+        async def _proxy(*args, **kwargs):
+            return await self.call(name, *args, **kwargs)
+
+        _proxy.__name__ = name
+        return _proxy
+
+    def get_stats(self) -> Dict:
+        """Latency and concurrency statistics for this client"""
+        calls = self.stats["calls"]
+        return {
+            "client_id": self.client_id,
+            "calls": calls,
+            "errors": self.stats["errors"],
+            "timeouts": self.stats["timeouts"],
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "avg_latency_ms": (self.stats["total_latency"] / calls * 1000)
+            if calls
+            else 0.0,
+            "max_latency_ms": self.stats["max_latency"] * 1000,
+            "avg_queue_wait_ms": (self.stats["total_wait"] / calls * 1000)
+            if calls
+            else 0.0,
+            "calls_by_method": dict(self.method_counts),
+        }
+
+
+def get_exchange_gateway(
+    binance_client: Optional[Client], client_id: Optional[int] = None
+) -> Optional[ExchangeGateway]:
+    """Return the shared gateway for a Client (one semaphore per account)"""
+    if binance_client is None:
+        return None
+
+    if isinstance(binance_client, ExchangeGateway):
+        return binance_client
+
+    gateway = _gateways.get(id(binance_client))
+    if gateway is None or gateway.binance_client is not binance_client:
+        gateway = ExchangeGateway(binance_client, client_id)
+        _gateways[id(binance_client)] = gateway
+    elif client_id is not None and gateway.client_id is None:
+        gateway.client_id = client_id
+
+    return gateway
+
+
+def drop_exchange_gateway(binance_client: Optional[Client]) -> bool:
+    """Forget the gateway of a discarded Client (credential change, new factory)"""
+    if isinstance(binance_client, ExchangeGateway):
+        binance_client = binance_client.binance_client
+    gateway = _gateways.get(id(binance_client))
+    if gateway is None or gateway.binance_client is not binance_client:
+        return False
+    del _gateways[id(binance_client)]
+    return True
+
+
+def get_all_gateway_stats() -> Dict:
+    """Stats for every live gateway in the process"""
+    return {
+        str(gateway.client_id or key): gateway.get_stats()
+        for key, gateway in list(_gateways.items())
+    }
@@ -0,0 +1,320 @@
+# services/exchange_simulator.py
+"""
+Exchange Simulator - Many simulated Binance accounts on one replayed market
+==========================================================================
+
+Load-testing the orchestrator needed real Binance accounts, so scaling
+could only be profiled with a handful of clients.
+
+ExchangeSimulator is an in-process venue:
+- One SimulatedMarket replays price paths loaded from files: CandleStore
+  .bin files, Binance kline CSV/JSON exports or plain (timestamp, price)
+  series
+- Every client gets its own SimulatedExchange account (balances, orders,
+  matching) implementing the python-binance Client subset the bot uses
+- A NetworkProfile adds latency, injected errors and rate limits; request
+  weight is counted per IP (one window shared by all accounts), orders per
+  account, and usage is reported in x-mbx-* headers on `client.response`
+- A PlaybackClock plays the paths forward from "now" at SIMULATOR_SPEED,
+  so with speed 1 exchange timestamps match the wall clock
+
+GridOrchestrator runs simulated clients through its client factory:
+
+    simulator = ExchangeSimulator("data/price_paths")
+    simulator.attach(orchestrator)
+    await orchestrator.create_advanced_manager(client_id)
+"""
+
+import csv
+import json
+import logging
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from config import Config
+from services.candle_store import CANDLE_DTYPE
+from services.simulated_exchange import (
+    NetworkProfile,
+    SimulatedExchange,
+    SimulatedMarket,
+    UsageWindow,
+)
+
+PRICE_PATH_SUFFIXES = (".bin", ".csv", ".json")
+
+
+class PlaybackClock:
+    """Replay time running `speed` times as fast as the wall clock"""
+
+    def __init__(self, start: float, speed: float = 1.0):
+        self.start = start
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def __call__(self) -> float:
+        return self.start + (time.monotonic() - self._origin) * self.speed
+
+
+# ========================================
+# PRICE PATH FILES
+# ========================================
+
+
+def load_price_path(path: Union[str, Path]) -> np.ndarray:
+    """Candles (CANDLE_DTYPE) from a .bin, .csv or .json price path file
+
+    CSV and JSON rows are either Binance klines (open time, OHLC, volume,
+    close time, ...) or (timestamp, price) points. Points become candles
+    that open at the previous price and close at the point's price.
+    Timestamps may be seconds or milliseconds.
+    """
+    path = Path(path)
+    if path.suffix == ".bin":
+        return np.fromfile(path, dtype=CANDLE_DTYPE)
+
+    if path.suffix == ".json":
+        with open(path) as f:
+            rows = json.load(f)
+    else:
+        with open(path, newline="") as f:
+            rows = [row for row in csv.reader(f) if row and _is_number(row[0])]
+    if not rows:
+        raise ValueError(f"Empty price path: {path}")
+
+    if len(rows[0]) >= 7:
+        records = np.array(
+            [
+                (
+                    _to_ms(row[0]),
+                    float(row[1]),
+                    float(row[2]),
+                    float(row[3]),
+                    float(row[4]),
+                    float(row[5]),
+                    _to_ms(row[6]),
+                    float(row[7]) if len(row) > 7 else 0.0,
+                    int(float(row[8])) if len(row) > 8 else 0,
+                )
+                for row in rows
+            ],
+            dtype=CANDLE_DTYPE,
+        )
+    else:
+        records = _points_to_candles(
+            np.array([_to_ms(row[0]) for row in rows], dtype=np.int64),
+            np.array([float(row[1]) for row in rows]),
+        )
+    return np.sort(records, order="open_time")
+
+
+def load_price_paths(
+    source: Union[str, Path, Iterable[Union[str, Path]]],
+) -> Dict[str, np.ndarray]:
+    """Price paths by symbol from a directory or a list of files
+
+    The symbol is the file name up to the first underscore, so CandleStore
+    files (ADAUSDT_1m.bin) and exports (ETHUSDT.csv) both work.
+    """
+    if isinstance(source, (str, Path)) and Path(source).is_dir():
+        files = sorted(
+            p for p in Path(source).iterdir() if p.suffix in PRICE_PATH_SUFFIXES
+        )
+    elif isinstance(source, (str, Path)):
+        files = [Path(source)]
+    else:
+        files = [Path(p) for p in source]
+
+    paths = {}
+    for file in files:
+        symbol = file.stem.split("_")[0].upper()
+        paths[symbol] = load_price_path(file)
+    if not paths:
+        raise ValueError(f"No price path files in {source}")
+    return paths
+
+
+def rebase_paths(
+    paths: Dict[str, np.ndarray], start_ms: int, history_candles: int
+) -> Dict[str, np.ndarray]:
+    """Shift all paths by one offset so replay starts at start_ms
+
+    The first `history_candles` candles of the longest-warmup symbol lie
+    before start_ms, so indicators have history from the first request.
+    """
+    replay_start = max(
+        int(candles["open_time"][min(history_candles, len(candles) - 1)])
+        for candles in paths.values()
+    )
+    offset = start_ms - replay_start
+    rebased = {}
+    for symbol, candles in paths.items():
+        shifted = candles.copy()
+        shifted["open_time"] += offset
+        shifted["close_time"] += offset
+        rebased[symbol] = shifted
+    return rebased
+
+
+def _points_to_candles(times: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    order = np.argsort(times)
+    times, prices = times[order], prices[order]
+    step = int(np.median(np.diff(times))) if len(times) > 1 else 60_000
+    opens = np.r_[prices[:1], prices[:-1]]
+
+    records = np.zeros(len(times), dtype=CANDLE_DTYPE)
+    records["open_time"] = times
+    records["open"] = opens
+    records["high"] = np.maximum(opens, prices)
+    records["low"] = np.minimum(opens, prices)
+    records["close"] = prices
+    records["close_time"] = times + step - 1
+    return records
+
+
+def _to_ms(value) -> int:
+    timestamp = float(value)
+    return int(timestamp * 1000 if timestamp < 1e11 else timestamp)
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+# ========================================
+# SIMULATOR
+# ========================================
+
+
+class ExchangeSimulator:
+    """One simulated venue serving any number of simulated accounts"""
+
+    def __init__(
+        self,
+        price_paths: Union[str, Path, Dict[str, np.ndarray], None] = None,
+        network: Optional[NetworkProfile] = None,
+        balances: Optional[Dict[str, float]] = None,
+        speed: Optional[float] = None,
+        clock=None,
+        symbol_info: Optional[Dict[str, Dict]] = None,
+        fee_rate: Optional[float] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        if price_paths is None:
+            price_paths = Config.SIMULATOR_PRICE_PATHS
+        if not isinstance(price_paths, dict):
+            price_paths = load_price_paths(price_paths)
+
+        if clock is None:
+            start = time.time()
+            price_paths = rebase_paths(
+                price_paths, int(start * 1000), Config.INDICATOR_LOOKBACK_CANDLES
+            )
+            clock = PlaybackClock(start, speed or Config.SIMULATOR_SPEED)
+
+        self.market = SimulatedMarket(price_paths, clock, symbol_info)
+        self.network = network or NetworkProfile.from_config()
+        self.balances = balances or {"USDT": Config.SIMULATOR_START_BALANCE}
+        self.fee_rate = fee_rate
+
+        # Request weight is limited per IP: every account shares one window
+        self.weight_window = UsageWindow(60, self.network.weight_limit)
+        self.accounts: Dict[int, SimulatedExchange] = {}
+        self._lock = threading.Lock()
+
+        self.logger.info(
+            f"🧪 Exchange simulator: {len(self.market.paths)} symbols, "
+            f"{self.network.latency_ms:.0f}±{self.network.jitter_ms:.0f}ms latency, "
+            f"{self.network.error_rate:.1%} injected errors"
+        )
+
+    def account(
+        self, client_id: int, balances: Optional[Dict[str, float]] = None
+    ) -> SimulatedExchange:
+        """The client's simulated account, opened with `balances` on first use"""
+        with self._lock:
+            exchange = self.accounts.get(client_id)
+            if exchange is None:
+                # Per-account random stream, reproducible when a seed is set
+                network = self.network
+                if network.seed is not None:
+                    network = replace(network, seed=network.seed + client_id)
+                exchange = SimulatedExchange(
+                    self.market,
+                    balances=balances or self.balances,
+                    fee_rate=self.fee_rate,
+                    network=network,
+                    weight_window=self.weight_window,
+                )
+                self.accounts[client_id] = exchange
+            return exchange
+
+    def client_factory(
+        self, client_id: int, api_key: Optional[str] = None, secret_key=None
+    ) -> SimulatedExchange:
+        """GridOrchestrator client factory: credentials are accepted as-is"""
+        exchange = self.account(client_id)
+        exchange.API_KEY, exchange.API_SECRET = api_key, secret_key
+        return exchange
+
+    def attach(self, orchestrator):
+        """Route the orchestrator's clients to simulated accounts
+
+        Simulated accounts have no user data websocket, so the orchestrator's
+        managers run with the stream off and pick up fills by REST
+        reconciliation. The global USER_DATA_STREAM_MODE is left untouched.
+        """
+        orchestrator.set_client_factory(self.client_factory, user_stream_mode="off")
+
+    # ========================================
+    # STATS
+    # ========================================
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            accounts: List[SimulatedExchange] = list(self.accounts.values())
+
+        totals = {
+            key: 0
+            for key in (
+                "requests",
+                "orders_placed",
+                "orders_filled",
+                "orders_canceled",
+                "orders_rejected",
+                "rate_limited",
+                "errors_injected",
+            )
+        }
+        calls_by_method: Dict[str, int] = {}
+        latency_seconds = 0.0
+        open_orders = 0
+        for exchange in accounts:
+            for key in totals:
+                totals[key] += exchange.stats[key]
+            for method, count in list(exchange.method_counts.items()):
+                calls_by_method[method] = calls_by_method.get(method, 0) + count
+            latency_seconds += exchange.stats["latency_seconds"]
+            open_orders += exchange.open_order_count()
+
+        return {
+            "accounts": len(accounts),
+            **totals,
+            "open_orders": open_orders,
+            "avg_latency_ms": round(
+                latency_seconds / max(totals["requests"], 1) * 1000, 2
+            ),
+            "weight_used_1m": self.weight_window.used,
+            "weight_peak_1m": self.weight_window.peak,
+            "weight_limit_1m": self.weight_window.limit,
+            "calls_by_method": calls_by_method,
+            "replay_time": self.market.now_ms(),
+        }
@@ -0,0 +1,230 @@
+# services/fifo_core.py
+"""
+FIFO Core - Lot queue and matching engine
+=========================================
+
+Shared FIFO matching used by FIFOService (replay + incremental ledger),
+GridPerformanceCalculator and CompoundInterestManager.
+
+Lots are __slots__ records in a deque, so consuming the oldest lot is O(1)
+instead of list.pop(0), and each buy allocates one small object instead of
+a dict. Queues keep running quantity / cost totals, so unrealized P&L does
+not need to walk the open lots.
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+FEE_RATE = 0.001  # 0.1% fee estimate used by every FIFO calculation
+
+
+class Lot:
+    """One open purchase lot"""
+
+    __slots__ = ("quantity", "cost_per_unit", "lot_id", "from_initialization")
+
+    def __init__(
+        self,
+        quantity: float,
+        cost_per_unit: float,
+        lot_id: Optional[int] = None,
+        from_initialization: bool = False,
+    ):
+        self.quantity = quantity
+        self.cost_per_unit = cost_per_unit
+        self.lot_id = lot_id
+        self.from_initialization = from_initialization
+
+
+class LotMatch:
+    """Result of consuming lots for one sell"""
+
+    __slots__ = ("matched_quantity", "cost_of_goods_sold", "closed_lots", "partial_lot")
+
+    def __init__(
+        self,
+        matched_quantity: float,
+        cost_of_goods_sold: float,
+        closed_lots: List[Lot],
+        partial_lot: Optional[Lot],
+    ):
+        self.matched_quantity = matched_quantity
+        self.cost_of_goods_sold = cost_of_goods_sold
+        self.closed_lots = closed_lots
+        self.partial_lot = partial_lot
+
+
+class LotQueue:
+    """FIFO queue of open lots for one symbol"""
+
+    __slots__ = ("_lots", "quantity", "cost")
+
+    def __init__(self):
+        self._lots = deque()
+        self.quantity = 0.0
+        self.cost = 0.0
+
+    def __len__(self) -> int:
+        return len(self._lots)
+
+    def __bool__(self) -> bool:
+        return bool(self._lots)
+
+    def __iter__(self) -> Iterator[Lot]:
+        return iter(self._lots)
+
+    def add(
+        self,
+        quantity: float,
+        cost_per_unit: float,
+        lot_id: Optional[int] = None,
+        from_initialization: bool = False,
+    ) -> Lot:
+        lot = Lot(quantity, cost_per_unit, lot_id, from_initialization)
+        self._lots.append(lot)
+        self.quantity += quantity
+        self.cost += quantity * cost_per_unit
+        return lot
+
+    def consume(self, quantity: float) -> LotMatch:
+        """Take up to quantity from the oldest lots"""
+        lots = self._lots
+        remaining = quantity
+        cost_of_goods_sold = 0.0
+        closed_lots = []
+        partial_lot = None
+
+        while remaining > 0 and lots:
+            lot = lots[0]
+            lot_quantity = lot.quantity
+
+            if lot_quantity <= remaining:
+                remaining -= lot_quantity
+                cost_of_goods_sold += lot_quantity * lot.cost_per_unit
+                lot.quantity = 0.0
+                closed_lots.append(lots.popleft())
+            else:
+                cost_of_goods_sold += remaining * lot.cost_per_unit
+                lot.quantity = lot_quantity - remaining
+                remaining = 0.0
+                partial_lot = lot
+
+        matched_quantity = quantity - remaining
+        if lots:
+            self.quantity -= matched_quantity
+            self.cost -= cost_of_goods_sold
+        else:
+            # Reset instead of subtracting so float drift cannot accumulate
+            self.quantity = 0.0
+            self.cost = 0.0
+
+        return LotMatch(matched_quantity, cost_of_goods_sold, closed_lots, partial_lot)
+
+    def unrealized(self, price: float) -> float:
+        """Mark-to-market P&L of the open lots at price"""
+        if not self._lots:
+            return 0.0
+        return price * self.quantity - self.cost
+
+
+class FIFOMatcher:
+    """
+    Per-symbol lot queues with realized P&L
+
+    Fees are estimated as fee_rate of trade value. A sell is charged the
+    share of its fee that was matched against lots, the same allocation
+    FIFOService has always used.
+    """
+
+    __slots__ = ("fee_rate", "queues", "symbols", "_books")
+
+    def __init__(self, fee_rate: float = FEE_RATE):
+        self.fee_rate = fee_rate
+        self.queues: Dict[str, LotQueue] = {}
+        self.symbols: Dict[str, Dict] = {}
+        self._books: Dict[str, Tuple[Dict, LotQueue]] = {}
+
+    def _book(self, symbol: str) -> Tuple[Dict, LotQueue]:
+        book = self._books.get(symbol)
+        if book is None:
+            queue = self.queues[symbol] = LotQueue()
+            data = self.symbols[symbol] = {
+                "realized_profit": 0.0,
+                "total_fees": 0.0,
+                "trades_count": 0,
+                "profitable_trades": 0,
+                "cost_basis_lots": 0,
+                "last_price": None,
+            }
+            book = self._books[symbol] = (data, queue)
+        return book
+
+    def add_initial_lot(
+        self,
+        symbol: str,
+        quantity: float,
+        cost_per_unit: float,
+        lot_id: Optional[int] = None,
+    ):
+        data, queue = self._book(symbol)
+        data["cost_basis_lots"] += 1
+        queue.add(quantity, cost_per_unit, lot_id, True)
+
+    def apply(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        total_value: Optional[float] = None,
+    ) -> float:
+        """Apply one trade; returns realized profit (0.0 for buys)"""
+        book = self._books.get(symbol)
+        data, queue = book if book is not None else self._book(symbol)
+        if total_value is None:
+            total_value = quantity * price
+        fee = total_value * self.fee_rate
+
+        data["trades_count"] += 1
+        data["total_fees"] += fee
+        data["last_price"] = price
+
+        if side == "BUY":
+            queue.add(quantity, price)
+            return 0.0
+
+        if side != "SELL":
+            return 0.0
+
+        match = queue.consume(quantity)
+        matched_quantity = match.matched_quantity
+        if matched_quantity <= 0:
+            return 0.0
+
+        trade_profit = (
+            matched_quantity * price
+            - match.cost_of_goods_sold
+            - fee * matched_quantity / quantity
+        )
+        data["realized_profit"] += trade_profit
+        if trade_profit > 0:
+            data["profitable_trades"] += 1
+        return trade_profit
+
+    def unrealized_profit(self, symbol: str) -> float:
+        """Open lots marked at the last traded price (0 if never traded)"""
+        data = self.symbols.get(symbol)
+        if data is None:
+            return 0.0
+        return self.queues[symbol].unrealized(data["last_price"] or 0)
+
+
+def sell_profit(match: LotMatch, quantity: float, price: float, fee: float) -> float:
+    """Realized profit of a sell, charged the matched share of its fee"""
+    if match.matched_quantity <= 0:
+        return 0.0
+    return (
+        match.matched_quantity * price
+        - match.cost_of_goods_sold
+        - fee * match.matched_quantity / quantity
+    )
@@ -0,0 +1,506 @@
+# services/fifo_ledger.py
+"""
+FIFO Ledger - Incremental lot queue and realized P&L per symbol
+===============================================================
+
+FIFOService used to rebuild profit by replaying every trade and cost basis
+row of a client on each query - after every fill, on every dashboard view,
+for every compound / decision engine check. The ledger persists the open
+lot queue and running totals per symbol and applies each trade once, so a
+profit query reads one state row per symbol.
+
+Trades are applied in insertion order through a per-client cursor over
+trades.id (and fifo_cost_basis.id for initialization lots). Trades written
+by other repositories are picked up on the next sync, and a wiped ledger
+rebuilds itself from history on first use. Initialization lots always
+precede trade lots, as in the full replay; one recorded after its symbol
+already traded makes the next sync replay the client from history.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from config import Config
+from database.connection_pool import get_db_pool
+from services.fifo_core import FEE_RATE, LotQueue, sell_profit
+
+
+class FIFOLedger:
+    """Persisted per-symbol FIFO lot queue with running realized P&L"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
+        self.logger = logging.getLogger(__name__)
+
+        self.stats = {
+            "syncs": 0,
+            "trades_applied": 0,
+            "initial_lots_applied": 0,
+            "rebuilds": 0,
+            "late_initialization_rebuilds": 0,
+            "queries": 0,
+        }
+
+        self._init_ledger_tables()
+
+    def _init_ledger_tables(self):
+        """Create ledger tables (lots, per-symbol state, per-client cursor)"""
+        try:
+            with self.db.write() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS fifo_ledger_lots (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        client_id INTEGER NOT NULL,
+                        symbol TEXT NOT NULL,
+                        quantity REAL NOT NULL,
+                        cost_per_unit REAL NOT NULL,
+                        from_initialization BOOLEAN DEFAULT 0
+                    )
+                """)
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_fifo_ledger_lots_client_symbol
+                    ON fifo_ledger_lots(client_id, symbol, id)
+                """)
+
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS fifo_ledger_state (
+                        client_id INTEGER NOT NULL,
+                        symbol TEXT NOT NULL,
+                        realized_profit REAL DEFAULT 0.0,
+                        total_fees REAL DEFAULT 0.0,
+                        trades_count INTEGER DEFAULT 0,
+                        profitable_trades INTEGER DEFAULT 0,
+                        open_quantity REAL DEFAULT 0.0,
+                        open_cost REAL DEFAULT 0.0,
+                        open_lots INTEGER DEFAULT 0,
+                        cost_basis_lots INTEGER DEFAULT 0,
+                        last_price REAL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (client_id, symbol)
+                    )
+                """)
+
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS fifo_ledger_cursor (
+                        client_id INTEGER PRIMARY KEY,
+                        last_trade_id INTEGER DEFAULT 0,
+                        last_cost_basis_id INTEGER DEFAULT 0,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing FIFO ledger tables: {e}")
+
+    # ========================================
+    # PUBLIC API
+    # ========================================
+
+    def sync_client(self, client_id: int) -> int:
+        """Apply trades recorded since the last sync; returns rows applied"""
+        with self.db.write() as conn:
+            return self._sync(conn, client_id)
+
+    def get_profit(self, client_id: int, symbol: Optional[str] = None) -> Dict:
+        """Profit summary from ledger state (same shape as the full replay)"""
+        # Only take the writer when there is something new to apply
+        with self.db.read() as conn:
+            pending = self._has_pending(conn, client_id)
+        if pending:
+            self.sync_client(client_id)
+
+        with self.db.read() as conn:
+            states = self._read_states(conn, client_id, symbol)
+
+        self.stats["queries"] += 1
+        return self.summarize(states)
+
+    def rebuild_client(self, client_id: int) -> int:
+        """Drop a client's ledger and rebuild it from full history"""
+        with self.db.write() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._clear_client(conn, client_id)
+                applied = self._apply_pending(conn, client_id)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        self.stats["rebuilds"] += 1
+        self.logger.info(
+            f"✅ FIFO ledger rebuilt for client {client_id}: {applied} rows replayed"
+        )
+        return applied
+
+    async def sync_client_async(self, client_id: int) -> int:
+        return await self.db.run(self.sync_client, client_id)
+
+    async def get_profit_async(
+        self, client_id: int, symbol: Optional[str] = None
+    ) -> Dict:
+        return await self.db.run(self.get_profit, client_id, symbol)
+
+    async def rebuild_client_async(self, client_id: int) -> int:
+        return await self.db.run(self.rebuild_client, client_id)
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
+
+    # ========================================
+    # SYNC / APPLY
+    # ========================================
+
+    def _sync(self, conn, client_id: int) -> int:
+        # Cheap check outside the write lock - nothing new is the common case
+        if not self._has_pending(conn, client_id):
+            return 0
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            applied = self._apply_pending(conn, client_id)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        self.stats["syncs"] += 1
+        return applied
+
+    def _read_cursor(self, conn, client_id: int):
+        row = conn.execute(
+            """
+            SELECT last_trade_id, last_cost_basis_id
+            FROM fifo_ledger_cursor WHERE client_id = ?
+        """,
+            (client_id,),
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def _has_pending(self, conn, client_id: int) -> bool:
+        last_trade_id, last_cost_basis_id = self._read_cursor(conn, client_id)
+        row = conn.execute(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM trades WHERE client_id = ? AND id > ?
+            ) OR EXISTS (
+                SELECT 1 FROM fifo_cost_basis
+                WHERE client_id = ? AND is_initialization = 1 AND id > ?
+            )
+        """,
+            (client_id, last_trade_id, client_id, last_cost_basis_id),
+        ).fetchone()
+        return bool(row and row[0])
+
+    def _apply_pending(self, conn, client_id: int) -> int:
+        """Apply new initialization lots, then new trades (write lock held)
+
+        Initialization lots always sit ahead of trade lots, as in the full
+        replay. One recorded after trades of its symbol were applied (e.g. a
+        second FORCE) cannot be slotted in retroactively, so the client's
+        ledger is replayed from history instead.
+        """
+        last_trade_id, last_cost_basis_id = self._read_cursor(conn, client_id)
+        books: Dict[str, Dict] = {}
+        applied = 0
+
+        initial_lots = self._read_initial_lots(conn, client_id, last_cost_basis_id)
+        traded_symbols = {
+            state["symbol"]
+            for state in self._read_states(conn, client_id)
+            if state["trades_count"]
+        }
+        if any(row[1] in traded_symbols for row in initial_lots):
+            self._clear_client(conn, client_id)
+            self.stats["late_initialization_rebuilds"] += 1
+            last_trade_id, last_cost_basis_id = 0, 0
+            initial_lots = self._read_initial_lots(conn, client_id, 0)
+
+        for row_id, symbol, quantity, cost_per_unit in initial_lots:
+            book = self._get_book(conn, books, client_id, symbol)
+            self._add_lot(conn, client_id, book, quantity, cost_per_unit, True)
+            book["state"]["cost_basis_lots"] += 1
+            last_cost_basis_id = row_id
+            applied += 1
+
+        trades = conn.execute(
+            """
+            SELECT id, symbol, side, quantity, price, total_value
+            FROM trades
+            WHERE client_id = ? AND id > ?
+            ORDER BY id ASC
+        """,
+            (client_id, last_trade_id),
+        ).fetchall()
+
+        for row_id, symbol, side, quantity, price, total_value in trades:
+            book = self._get_book(conn, books, client_id, symbol)
+            self._apply_trade(conn, client_id, book, side, quantity, price, total_value)
+            last_trade_id = row_id
+            applied += 1
+
+        for book in books.values():
+            self._save_state(conn, client_id, book["state"])
+
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO fifo_ledger_cursor
+            (client_id, last_trade_id, last_cost_basis_id, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+            (client_id, last_trade_id, last_cost_basis_id),
+        )
+
+        self.stats["initial_lots_applied"] += len(initial_lots)
+        self.stats["trades_applied"] += len(trades)
+        return applied
+
+    def _read_initial_lots(self, conn, client_id: int, after_id: int) -> List:
+        return conn.execute(
+            """
+            SELECT id, symbol, remaining_quantity, cost_per_unit
+            FROM fifo_cost_basis
+            WHERE client_id = ? AND is_initialization = 1 AND id > ?
+            ORDER BY id ASC
+        """,
+            (client_id, after_id),
+        ).fetchall()
+
+    def _clear_client(self, conn, client_id: int):
+        for table in ("fifo_ledger_lots", "fifo_ledger_state", "fifo_ledger_cursor"):
+            conn.execute(f"DELETE FROM {table} WHERE client_id = ?", (client_id,))
+
+    def _apply_trade(
+        self,
+        conn,
+        client_id: int,
+        book: Dict,
+        side: str,
+        quantity: float,
+        price: float,
+        total_value: float,
+    ):
+        state = book["state"]
+        fee = total_value * FEE_RATE
+
+        state["trades_count"] += 1
+        state["total_fees"] += fee
+        state["last_price"] = price
+
+        if side == "BUY":
+            self._add_lot(conn, client_id, book, quantity, price, False)
+
+        elif side == "SELL":
+            trade_profit = self._consume_lots(
+                conn, client_id, book, quantity, price, fee
+            )
+            state["realized_profit"] += trade_profit
+            if trade_profit > 0:
+                state["profitable_trades"] += 1
+
+    def _add_lot(
+        self,
+        conn,
+        client_id: int,
+        book: Dict,
+        quantity: float,
+        cost_per_unit: float,
+        from_initialization: bool,
+    ):
+        cursor = conn.execute(
+            """
+            INSERT INTO fifo_ledger_lots
+            (client_id, symbol, quantity, cost_per_unit, from_initialization)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (
+                client_id,
+                book["state"]["symbol"],
+                quantity,
+                cost_per_unit,
+                1 if from_initialization else 0,
+            ),
+        )
+
+        if book["lots"] is not None:
+            book["lots"].add(quantity, cost_per_unit, cursor.lastrowid)
+
+        state = book["state"]
+        state["open_quantity"] += quantity
+        state["open_cost"] += quantity * cost_per_unit
+        state["open_lots"] += 1
+
+    def _consume_lots(
+        self,
+        conn,
+        client_id: int,
+        book: Dict,
+        quantity: float,
+        price: float,
+        fee: float,
+    ) -> float:
+        """Match a sell against the oldest lots; returns realized profit"""
+        match = self._load_lots(conn, client_id, book).consume(quantity)
+        state = book["state"]
+
+        state["open_lots"] -= len(match.closed_lots)
+        if state["open_lots"] > 0:
+            state["open_quantity"] -= match.matched_quantity
+            state["open_cost"] -= match.cost_of_goods_sold
+        else:
+            state["open_quantity"] = 0.0
+            state["open_cost"] = 0.0
+
+        if match.closed_lots:
+            conn.executemany(
+                "DELETE FROM fifo_ledger_lots WHERE id = ?",
+                [(lot.lot_id,) for lot in match.closed_lots],
+            )
+        if match.partial_lot is not None:
+            conn.execute(
+                "UPDATE fifo_ledger_lots SET quantity = ? WHERE id = ?",
+                (match.partial_lot.quantity, match.partial_lot.lot_id),
+            )
+
+        return sell_profit(match, quantity, price, fee)
+
+    # ========================================
+    # STATE STORAGE
+    # ========================================
+
+    def _get_book(
+        self, conn, books: Dict, client_id: int, symbol: str
+    ) -> Dict:
+        """Per-symbol working set: state row plus lots (loaded on first sell)"""
+        book = books.get(symbol)
+        if book is None:
+            states = self._read_states(conn, client_id, symbol)
+            state = states[0] if states else self._empty_state(symbol)
+            book = books[symbol] = {"state": state, "lots": None}
+        return book
+
+    def _load_lots(
+        self, conn, client_id: int, book: Dict
+    ) -> LotQueue:
+        if book["lots"] is None:
+            queue = LotQueue()
+            for lot_id, quantity, cost_per_unit in conn.execute(
+                """
+                SELECT id, quantity, cost_per_unit FROM fifo_ledger_lots
+                WHERE client_id = ? AND symbol = ?
+                ORDER BY id ASC
+            """,
+                (client_id, book["state"]["symbol"]),
+            ):
+                queue.add(quantity, cost_per_unit, lot_id)
+            book["lots"] = queue
+        return book["lots"]
+
+    def _empty_state(self, symbol: str) -> Dict:
+        return {
+            "symbol": symbol,
+            "realized_profit": 0.0,
+            "total_fees": 0.0,
+            "trades_count": 0,
+            "profitable_trades": 0,
+            "open_quantity": 0.0,
+            "open_cost": 0.0,
+            "open_lots": 0,
+            "cost_basis_lots": 0,
+            "last_price": None,
+        }
+
+    def _read_states(
+        self, conn, client_id: int, symbol: Optional[str] = None
+    ) -> List[Dict]:
+        query = """
+            SELECT symbol, realized_profit, total_fees, trades_count,
+                   profitable_trades, open_quantity, open_cost, open_lots,
+                   cost_basis_lots, last_price
+            FROM fifo_ledger_state
+            WHERE client_id = ?
+        """
+        params = [client_id]
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+
+        columns = list(self._empty_state("").keys())
+        return [
+            dict(zip(columns, row))
+            for row in conn.execute(query + " ORDER BY symbol", params).fetchall()
+        ]
+
+    def _save_state(self, conn, client_id: int, state: Dict):
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO fifo_ledger_state (
+                client_id, symbol, realized_profit, total_fees, trades_count,
+                profitable_trades, open_quantity, open_cost, open_lots,
+                cost_basis_lots, last_price, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+            (
+                client_id,
+                state["symbol"],
+                state["realized_profit"],
+                state["total_fees"],
+                state["trades_count"],
+                state["profitable_trades"],
+                state["open_quantity"],
+                state["open_cost"],
+                state["open_lots"],
+                state["cost_basis_lots"],
+                state["last_price"],
+            ),
+        )
+
+    # ========================================
+    # SUMMARY
+    # ========================================
+
+    def summarize(self, states: List[Dict]) -> Dict:
+        """Build the FIFOService profit dict from per-symbol states"""
+        total_realized_profit = sum(s["realized_profit"] for s in states)
+        total_trades = sum(s["trades_count"] for s in states)
+        profitable_trades = sum(s["profitable_trades"] for s in states)
+        total_fees = sum(s["total_fees"] for s in states)
+
+        # Unrealized P&L of open lots at the last traded price of each symbol
+        total_unrealized_profit = 0.0
+        for state in states:
+            if state["open_lots"] > 0:
+                last_price = state["last_price"] or 0
+                total_unrealized_profit += (
+                    last_price * state["open_quantity"] - state["open_cost"]
+                )
+
+        win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
+        avg_profit_per_trade = (
+            total_realized_profit / total_trades if total_trades > 0 else 0
+        )
+        total_profit = total_realized_profit + total_unrealized_profit
+
+        return {
+            "total_profit": round(total_profit, 2),
+            "realized_profit": round(total_realized_profit, 2),
+            "unrealized_profit": round(total_unrealized_profit, 2),
+            "total_trades": total_trades,
+            "profitable_trades": profitable_trades,
+            "win_rate": round(win_rate, 1),
+            "avg_profit_per_trade": round(avg_profit_per_trade, 2),
+            "total_fees": round(total_fees, 2),
+            "symbol_breakdown": {
+                state["symbol"]: {
+                    "realized_profit": round(state["realized_profit"], 2),
+                    "trades_count": state["trades_count"],
+                    "total_fees": round(state["total_fees"], 2),
+                    "remaining_inventory_items": state["open_lots"],
+                }
+                for state in states
+            },
+            "calculation_method": "incremental_fifo_ledger",
+            "cost_basis_used": any(s["cost_basis_lots"] > 0 for s in states),
+        }
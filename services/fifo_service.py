@@ -13,14 +13,16 @@ FIXES:
 
 import asyncio
 import logging
-import sqlite3
 import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
-import aiosqlite
-
 from config import Config
+from database.connection_pool import get_db_pool
+from database.write_queue import get_write_queue
+from repositories.daily_stats_repository import apply_trade
+from services.fifo_core import FEE_RATE, FIFOMatcher
+from services.fifo_ledger import FIFOLedger
 
 
 class FIFOService:
@@ -34,19 +36,32 @@ class FIFOService:
 
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
+        self.writes = get_write_queue(self.db_path)
         self.logger = logging.getLogger(__name__)
 
         # Initialize cost basis table
         self._init_cost_basis_table()
 
+        # Incremental ledger: profit queries read per-symbol state, not history
+        self.ledger = FIFOLedger(self.db_path)
+        self.profit_mode = Config.FIFO_PROFIT_MODE.lower()
+        self.ledger_verifications = {"runs": 0, "mismatches": 0}
+
         # Add notification support
         try:
-            from services.telegram_notifier import TelegramNotifier
+            from services.notification_digest import get_notification_digest
+            from services.telegram_notifier import get_telegram_notifier
 
-            self.telegram = TelegramNotifier()
+            self.telegram = get_telegram_notifier()
             self.notifications_enabled = self.telegram.enabled
+
+            # Fill notices are coalesced per symbol; alerts use send_critical
+            self.digest = get_notification_digest()
+            self.digest.set_profit_provider(self._digest_profit)
         except (ImportError, Exception):
             self.telegram = None
+            self.digest = None
             self.notifications_enabled = False
 
         # Add startup suppression (prevents spam during service startup)
@@ -78,7 +93,7 @@ class FIFOService:
     def _init_cost_basis_table(self):
         """Initialize cost basis tracking table"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS fifo_cost_basis (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -126,38 +141,37 @@ class FIFOService:
         Non-blocking version for better performance.
         """
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                cursor = await conn.execute(
-                    """
-                    INSERT INTO fifo_cost_basis 
-                    (client_id, symbol, quantity, cost_per_unit, total_cost, 
-                     remaining_quantity, is_initialization, trade_id, notes)
-                    VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)
-                """,
-                    (
-                        client_id,
-                        symbol,
-                        quantity,
-                        cost_per_unit,
-                        total_cost,
-                        quantity,  # Initially, all quantity remains
-                        trade_id,
-                        "Initial cost basis from pure USDT grid initialization",
-                    ),
-                )
-
-                cost_basis_id = cursor.lastrowid
-                await conn.commit()
+            cost_basis_id = await self.writes.write_statement(
+                """
+                INSERT INTO fifo_cost_basis 
+                (client_id, symbol, quantity, cost_per_unit, total_cost, 
+                 remaining_quantity, is_initialization, trade_id, notes)
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)
+            """,
+                (
+                    client_id,
+                    symbol,
+                    quantity,
+                    cost_per_unit,
+                    total_cost,
+                    quantity,  # Initially, all quantity remains
+                    trade_id,
+                    "Initial cost basis from pure USDT grid initialization",
+                ),
+                client_id=client_id,
+                durable=True,
+            )
+            await self._sync_ledger_async(client_id)
 
-                self.logger.info("✅ Initial cost basis recorded async:")
-                self.logger.info(f"   Cost Basis ID: {cost_basis_id}")
-                self.logger.info(f"   Client: {client_id}")
-                self.logger.info(f"   Symbol: {symbol}")
-                self.logger.info(f"   Quantity: {quantity:.4f}")
-                self.logger.info(f"   Cost per Unit: ${cost_per_unit:.4f}")
-                self.logger.info(f"   Total Cost: ${total_cost:.2f}")
+            self.logger.info("✅ Initial cost basis recorded async:")
+            self.logger.info(f"   Cost Basis ID: {cost_basis_id}")
+            self.logger.info(f"   Client: {client_id}")
+            self.logger.info(f"   Symbol: {symbol}")
+            self.logger.info(f"   Quantity: {quantity:.4f}")
+            self.logger.info(f"   Cost per Unit: ${cost_per_unit:.4f}")
+            self.logger.info(f"   Total Cost: ${total_cost:.2f}")
 
-                return str(cost_basis_id)
+            return str(cost_basis_id)
 
         except Exception as e:
             self.logger.error(f"❌ Error recording initial cost basis async: {e}")
@@ -181,62 +195,25 @@ class FIFOService:
         try:
             total_value = quantity * price
 
-            async with aiosqlite.connect(self.db_path) as conn:
-                # STEP 1: ALWAYS record the trade (both BUY and SELL)
-                await conn.execute(
-                    """
-                    INSERT INTO trades (
-                        client_id, symbol, side, quantity, price,
-                        total_value, order_id, executed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                    (
-                        client_id,
-                        symbol,
-                        side,
-                        quantity,
-                        price,
-                        total_value,
-                        order_id,
-                    ),
-                )
-
-                # STEP 2: For BUY orders, ALSO record as cost basis for FIFO tracking
-                if side == "BUY":
-                    # Record cost basis for future FIFO calculations
-                    await conn.execute(
-                        """
-                        INSERT INTO fifo_cost_basis (
-                            client_id, symbol, quantity, cost_per_unit, 
-                            total_cost, remaining_quantity, trade_id, is_initialization
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-                    """,
-                        (
-                            client_id,
-                            symbol.replace(
-                                "USDT", ""
-                            ),  # Remove USDT suffix for cost basis
-                            quantity,
-                            price,
-                            total_value,
-                            quantity,  # Initially, all quantity remains
-                            order_id or f"trade_{int(time.time())}",
-                        ),
-                    )
-
-                    self.logger.debug(
-                        f"✅ BUY trade + cost basis recorded async: {quantity:.4f} {symbol} @ ${price:.4f}"
-                    )
-
-                else:  # SELL orders
-                    # For SELL orders, the trade is recorded but FIFO matching is handled elsewhere
-                    # This ensures we have complete trade history while maintaining FIFO accuracy
-                    self.logger.debug(
-                        f"✅ SELL trade recorded async: {quantity:.4f} {symbol} @ ${price:.4f}"
-                    )
+            # Group-committed with other queued writes; returns once durable
+            await self.writes.write(
+                self._insert_trade_rows,
+                client_id,
+                symbol,
+                side,
+                quantity,
+                price,
+                total_value,
+                order_id,
+                client_id=client_id,
+                durable=True,
+            )
+            self.logger.debug(
+                f"✅ {side} trade recorded async: {quantity:.4f} {symbol} @ ${price:.4f}"
+            )
 
-                await conn.commit()
-                return True
+            await self._sync_ledger_async(client_id)
+            return True
 
         except Exception as e:
             self.logger.error(f"❌ Failed to record trade with FIFO async: {e}")
@@ -263,7 +240,7 @@ class FIFOService:
         the cost basis for all future sell orders
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 cursor = conn.execute(
                     """
                     INSERT INTO fifo_cost_basis 
@@ -284,6 +261,8 @@ class FIFOService:
                 )
 
                 cost_basis_id = cursor.lastrowid
+                conn.commit()
+                self._sync_ledger(client_id)
 
                 self.logger.info("✅ Initial cost basis recorded:")
                 self.logger.info(f"   Cost Basis ID: {cost_basis_id}")
@@ -316,65 +295,73 @@ class FIFOService:
         try:
             total_value = quantity * price
 
-            with sqlite3.connect(self.db_path) as conn:
-                # STEP 1: ALWAYS record the trade (both BUY and SELL)
-                conn.execute(
-                    """
-                    INSERT INTO trades (
-                        client_id, symbol, side, quantity, price,
-                        total_value, order_id, executed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                    (
-                        client_id,
-                        symbol,
-                        side,
-                        quantity,
-                        price,
-                        total_value,
-                        order_id,
-                    ),
+            with self.db.write() as conn:
+                self._insert_trade_rows(
+                    conn, client_id, symbol, side, quantity, price, total_value, order_id
                 )
+            self.logger.debug(
+                f"✅ {side} trade recorded sync: {quantity:.4f} {symbol} @ ${price:.4f}"
+            )
 
-                # STEP 2: For BUY orders, ALSO record as cost basis for FIFO tracking
-                if side == "BUY":
-                    # Record cost basis for future FIFO calculations
-                    conn.execute(
-                        """
-                        INSERT INTO fifo_cost_basis (
-                            client_id, symbol, quantity, cost_per_unit, 
-                            total_cost, remaining_quantity, trade_id, is_initialization
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-                    """,
-                        (
-                            client_id,
-                            symbol.replace(
-                                "USDT", ""
-                            ),  # Remove USDT suffix for cost basis
-                            quantity,
-                            price,
-                            total_value,
-                            quantity,  # Initially, all quantity remains
-                            order_id or f"trade_{int(time.time())}",
-                        ),
-                    )
-
-                    self.logger.debug(
-                        f"✅ BUY trade + cost basis recorded sync: {quantity:.4f} {symbol} @ ${price:.4f}"
-                    )
-
-                else:  # SELL orders
-                    self.logger.debug(
-                        f"✅ SELL trade recorded sync: {quantity:.4f} {symbol} @ ${price:.4f}"
-                    )
-
-                conn.commit()
-                return True
+            self._sync_ledger(client_id)
+            return True
 
         except Exception as e:
             self.logger.error(f"❌ Failed to record trade with FIFO sync: {e}")
             return False
 
+    def _insert_trade_rows(
+        self,
+        conn,
+        client_id: int,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        total_value: float,
+        order_id: str = None,
+    ):
+        """Insert a trade (and its cost basis row for BUYs) on a write connection"""
+        # STEP 1: ALWAYS record the trade (both BUY and SELL)
+        conn.execute(
+            """
+            INSERT INTO trades (
+                client_id, symbol, side, quantity, price,
+                total_value, order_id, executed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+            (
+                client_id,
+                symbol,
+                side,
+                quantity,
+                price,
+                total_value,
+                order_id,
+            ),
+        )
+        apply_trade(conn, client_id, symbol, side, total_value)
+
+        # STEP 2: For BUY orders, ALSO record as cost basis for FIFO tracking
+        if side == "BUY":
+            conn.execute(
+                """
+                INSERT INTO fifo_cost_basis (
+                    client_id, symbol, quantity, cost_per_unit, 
+                    total_cost, remaining_quantity, trade_id, is_initialization
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """,
+                (
+                    client_id,
+                    symbol.replace("USDT", ""),  # Remove USDT suffix for cost basis
+                    quantity,
+                    price,
+                    total_value,
+                    quantity,  # Initially, all quantity remains
+                    order_id or f"trade_{int(time.time())}",
+                ),
+            )
+
     # ==============================================
     # INTELLIGENT ROUTING FOR TRADE RECORDING
     # ==============================================
@@ -421,49 +408,71 @@ class FIFOService:
         """
         Calculate FIFO profit using proper cost basis from initialization (async)
 
-        Non-blocking version for dashboard and analytics operations.
+        Non-blocking version for dashboard and analytics operations. Reads the
+        incremental ledger (one state row per symbol); FIFO_PROFIT_MODE=replay
+        replays full history instead, and verify cross-checks both.
         """
+        if self.profit_mode == "replay":
+            return await self._calculate_fifo_full_replay_async(client_id, symbol)
+
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                # Get all trades for the client/symbol
-                if symbol:
-                    trades_query = """
-                        SELECT symbol, side, quantity, price, total_value, executed_at
-                        FROM trades 
-                        WHERE client_id = ? AND symbol = ?
-                        ORDER BY executed_at ASC
-                    """
-                    params = (client_id, symbol)
-                else:
-                    trades_query = """
-                        SELECT symbol, side, quantity, price, total_value, executed_at
-                        FROM trades 
-                        WHERE client_id = ?
-                        ORDER BY executed_at ASC
-                    """
-                    params = (client_id,)
+            result = await self.ledger.get_profit_async(client_id, symbol)
+        except Exception as e:
+            self.logger.error(f"❌ FIFO ledger query failed, replaying history: {e}")
+            return await self._calculate_fifo_full_replay_async(client_id, symbol)
 
-                async with conn.execute(trades_query, params) as cursor:
-                    trades = await cursor.fetchall()
+        if self.profit_mode == "verify":
+            replay = await self._calculate_fifo_full_replay_async(client_id, symbol)
+            result["verification"] = self._compare_ledger_to_replay(
+                client_id, result, replay
+            )
 
-                # Get cost basis information
-                cost_basis_query = (
-                    """
-                    SELECT symbol, quantity, cost_per_unit, total_cost, remaining_quantity
-                    FROM fifo_cost_basis
+        return result
+
+    async def _calculate_fifo_full_replay_async(
+        self, client_id: int, symbol: Optional[str] = None
+    ) -> Dict:
+        """Replay every trade and initialization lot (reference calculation)"""
+        try:
+            # Get all trades for the client/symbol
+            if symbol:
+                trades_query = """
+                    SELECT symbol, side, quantity, price, total_value, executed_at
+                    FROM trades 
+                    WHERE client_id = ? AND symbol = ?
+                    ORDER BY executed_at ASC, id ASC
+                """
+                params = (client_id, symbol)
+            else:
+                trades_query = """
+                    SELECT symbol, side, quantity, price, total_value, executed_at
+                    FROM trades 
                     WHERE client_id = ?
+                    ORDER BY executed_at ASC, id ASC
                 """
-                    + (" AND symbol = ?" if symbol else "")
-                    + """
-                    ORDER BY created_at ASC
+                params = (client_id,)
+
+            trades = await self.db.fetchall_async(trades_query, params)
+
+            # Get cost basis information
+            cost_basis_query = (
                 """
-                )
+                SELECT symbol, quantity, cost_per_unit, total_cost, remaining_quantity
+                FROM fifo_cost_basis
+                WHERE client_id = ? AND is_initialization = 1
+            """
+                + (" AND symbol = ?" if symbol else "")
+                + """
+                ORDER BY created_at ASC, id ASC
+            """
+            )
 
-                cost_basis_params = (client_id, symbol) if symbol else (client_id,)
-                async with conn.execute(cost_basis_query, cost_basis_params) as cursor:
-                    cost_basis_records = await cursor.fetchall()
+            cost_basis_params = (client_id, symbol) if symbol else (client_id,)
+            cost_basis_records = await self.db.fetchall_async(
+                cost_basis_query, cost_basis_params
+            )
 
-                return self._calculate_enhanced_fifo_profit(trades, cost_basis_records)
+            return self._calculate_enhanced_fifo_profit(trades, cost_basis_records)
 
         except Exception as e:
             self.logger.error(f"❌ Enhanced FIFO calculation error async: {e}")
@@ -500,15 +509,36 @@ class FIFOService:
 
         This prevents the asyncio.run() error when called from an async context.
         """
+        if self.profit_mode == "replay":
+            return self._calculate_fifo_full_replay(client_id, symbol)
+
+        try:
+            result = self.ledger.get_profit(client_id, symbol)
+        except Exception as e:
+            self.logger.error(f"❌ FIFO ledger query failed, replaying history: {e}")
+            return self._calculate_fifo_full_replay(client_id, symbol)
+
+        if self.profit_mode == "verify":
+            replay = self._calculate_fifo_full_replay(client_id, symbol)
+            result["verification"] = self._compare_ledger_to_replay(
+                client_id, result, replay
+            )
+
+        return result
+
+    def _calculate_fifo_full_replay(
+        self, client_id: int, symbol: Optional[str] = None
+    ) -> Dict:
+        """Replay every trade and initialization lot (reference calculation, sync)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 # Get all trades for the client/symbol
                 if symbol:
                     trades_query = """
                         SELECT symbol, side, quantity, price, total_value, executed_at
                         FROM trades 
                         WHERE client_id = ? AND symbol = ?
-                        ORDER BY executed_at ASC
+                        ORDER BY executed_at ASC, id ASC
                     """
                     params = (client_id, symbol)
                 else:
@@ -516,7 +546,7 @@ class FIFOService:
                         SELECT symbol, side, quantity, price, total_value, executed_at
                         FROM trades 
                         WHERE client_id = ?
-                        ORDER BY executed_at ASC
+                        ORDER BY executed_at ASC, id ASC
                     """
                     params = (client_id,)
 
@@ -528,11 +558,11 @@ class FIFOService:
                     """
                     SELECT symbol, quantity, cost_per_unit, total_cost, remaining_quantity
                     FROM fifo_cost_basis
-                    WHERE client_id = ?
+                    WHERE client_id = ? AND is_initialization = 1
                 """
                     + (" AND symbol = ?" if symbol else "")
                     + """
-                    ORDER BY created_at ASC
+                    ORDER BY created_at ASC, id ASC
                 """
                 )
 
@@ -556,101 +586,23 @@ class FIFOService:
         """
         Calculate FIFO profit with proper cost basis accounting
         """
-        # Group by symbol
-        symbol_data = {}
+        matcher = FIFOMatcher(fee_rate=FEE_RATE)
 
         # Initialize with cost basis
         for record in cost_basis_records:
             symbol, quantity, cost_per_unit, total_cost, remaining_quantity = record
-
-            if symbol not in symbol_data:
-                symbol_data[symbol] = {
-                    "inventory": [],  # FIFO queue of purchases
-                    "realized_profit": 0.0,
-                    "total_fees": 0.0,
-                    "trades_count": 0,
-                }
-
-            # Add initial cost basis to inventory
-            symbol_data[symbol]["inventory"].append(
-                {
-                    "quantity": remaining_quantity,
-                    "cost_per_unit": cost_per_unit,
-                    "from_initialization": True,
-                }
-            )
+            matcher.add_initial_lot(symbol, remaining_quantity, cost_per_unit)
 
         # Process all trades
-        total_realized_profit = 0.0
-        total_trades = 0
-        profitable_trades = 0
-
         for trade in trades:
             symbol, side, quantity, price, total_value, executed_at = trade
+            matcher.apply(symbol, side, quantity, price, total_value)
 
-            if symbol not in symbol_data:
-                symbol_data[symbol] = {
-                    "inventory": [],
-                    "realized_profit": 0.0,
-                    "total_fees": 0.0,
-                    "trades_count": 0,
-                }
-
-            total_trades += 1
-            symbol_data[symbol]["trades_count"] += 1
-
-            # Estimate trading fee
-            fee = total_value * 0.001  # 0.1% fee estimate
-            symbol_data[symbol]["total_fees"] += fee
-
-            if side == "BUY":
-                # Add to inventory (FIFO queue)
-                symbol_data[symbol]["inventory"].append(
-                    {
-                        "quantity": quantity,
-                        "cost_per_unit": price,
-                        "from_initialization": False,
-                    }
-                )
-
-            elif side == "SELL":
-                # Calculate profit using FIFO
-                remaining_sell_quantity = quantity
-                trade_profit = 0.0
-
-                while remaining_sell_quantity > 0 and symbol_data[symbol]["inventory"]:
-                    oldest_purchase = symbol_data[symbol]["inventory"][0]
-
-                    # Determine how much to match from this purchase
-                    match_quantity = min(
-                        remaining_sell_quantity, oldest_purchase["quantity"]
-                    )
-
-                    # Calculate profit for this match
-                    cost_of_goods_sold = (
-                        match_quantity * oldest_purchase["cost_per_unit"]
-                    )
-                    revenue = match_quantity * price
-                    match_profit = (
-                        revenue - cost_of_goods_sold - (fee * match_quantity / quantity)
-                    )
-
-                    trade_profit += match_profit
-
-                    # Update quantities
-                    remaining_sell_quantity -= match_quantity
-                    oldest_purchase["quantity"] -= match_quantity
-
-                    # Remove purchase if fully consumed
-                    if oldest_purchase["quantity"] <= 0:
-                        symbol_data[symbol]["inventory"].pop(0)
-
-                # Record realized profit
-                symbol_data[symbol]["realized_profit"] += trade_profit
-                total_realized_profit += trade_profit
-
-                if trade_profit > 0:
-                    profitable_trades += 1
+        symbol_data = matcher.symbols
+        total_realized_profit = sum(d["realized_profit"] for d in symbol_data.values())
+        total_trades = sum(d["trades_count"] for d in symbol_data.values())
+        profitable_trades = sum(d["profitable_trades"] for d in symbol_data.values())
+        total_fees = sum(d["total_fees"] for d in symbol_data.values())
 
         # Calculate final metrics
         win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
@@ -658,25 +610,11 @@ class FIFOService:
             total_realized_profit / total_trades if total_trades > 0 else 0
         )
 
-        # Calculate unrealized profit for remaining inventory
-        total_unrealized_profit = 0.0
-        for symbol, data in symbol_data.items():
-            if data["inventory"]:
-                # Use last trade price as current market price estimate
-                last_price = 0
-                for trade in reversed(trades):
-                    if trade[0] == symbol:  # symbol match
-                        last_price = trade[3]  # price
-                        break
-
-                for holding in data["inventory"]:
-                    unrealized_profit = (
-                        last_price - holding["cost_per_unit"]
-                    ) * holding["quantity"]
-                    total_unrealized_profit += unrealized_profit
-
+        # Unrealized profit of remaining inventory at the last trade price
+        total_unrealized_profit = sum(
+            matcher.unrealized_profit(symbol) for symbol in symbol_data
+        )
         total_profit = total_realized_profit + total_unrealized_profit
-        total_fees = sum(data["total_fees"] for data in symbol_data.values())
 
         return {
             "total_profit": round(total_profit, 2),
@@ -692,7 +630,7 @@ class FIFOService:
                     "realized_profit": round(data["realized_profit"], 2),
                     "trades_count": data["trades_count"],
                     "total_fees": round(data["total_fees"], 2),
-                    "remaining_inventory_items": len(data["inventory"]),
+                    "remaining_inventory_items": len(matcher.queues[symbol]),
                 }
                 for symbol, data in symbol_data.items()
             },
@@ -725,81 +663,132 @@ class FIFOService:
     ) -> Dict:
         """Get summary of cost basis records for a client (async)"""
         try:
-            async with aiosqlite.connect(self.db_path) as conn:
-                if symbol:
-                    query = """
-                        SELECT symbol, quantity, cost_per_unit, total_cost, 
-                               remaining_quantity, created_at, is_initialization
-                        FROM fifo_cost_basis
-                        WHERE client_id = ? AND symbol = ?
-                        ORDER BY created_at ASC
-                    """
-                    params = (client_id, symbol)
-                else:
-                    query = """
-                        SELECT symbol, quantity, cost_per_unit, total_cost, 
-                               remaining_quantity, created_at, is_initialization
-                        FROM fifo_cost_basis
-                        WHERE client_id = ?
-                        ORDER BY created_at ASC
-                    """
-                    params = (client_id,)
+            if symbol:
+                query = """
+                    SELECT symbol, quantity, cost_per_unit, total_cost, 
+                           remaining_quantity, created_at, is_initialization
+                    FROM fifo_cost_basis
+                    WHERE client_id = ? AND symbol = ?
+                    ORDER BY created_at ASC
+                """
+                params = (client_id, symbol)
+            else:
+                query = """
+                    SELECT symbol, quantity, cost_per_unit, total_cost, 
+                           remaining_quantity, created_at, is_initialization
+                    FROM fifo_cost_basis
+                    WHERE client_id = ?
+                    ORDER BY created_at ASC
+                """
+                params = (client_id,)
 
-                async with conn.execute(query, params) as cursor:
-                    records = await cursor.fetchall()
+            records = await self.db.fetchall_async(query, params)
 
-                summary = {
-                    "client_id": client_id,
-                    "total_cost_basis_records": len(records),
-                    "symbols": {},
-                    "total_initial_investment": 0.0,
-                    "has_initialization_records": False,
-                }
+            summary = {
+                "client_id": client_id,
+                "total_cost_basis_records": len(records),
+                "symbols": {},
+                "total_initial_investment": 0.0,
+                "has_initialization_records": False,
+            }
 
-                for record in records:
-                    (
-                        symbol,
-                        quantity,
-                        cost_per_unit,
-                        total_cost,
-                        remaining_quantity,
-                        created_at,
-                        is_initialization,
-                    ) = record
-
-                    if symbol not in summary["symbols"]:
-                        summary["symbols"][symbol] = {
-                            "records": [],
-                            "total_initial_cost": 0.0,
-                            "total_remaining_quantity": 0.0,
-                        }
+            for record in records:
+                (
+                    symbol,
+                    quantity,
+                    cost_per_unit,
+                    total_cost,
+                    remaining_quantity,
+                    created_at,
+                    is_initialization,
+                ) = record
+
+                if symbol not in summary["symbols"]:
+                    summary["symbols"][symbol] = {
+                        "records": [],
+                        "total_initial_cost": 0.0,
+                        "total_remaining_quantity": 0.0,
+                    }
 
-                    summary["symbols"][symbol]["records"].append(
-                        {
-                            "quantity": quantity,
-                            "cost_per_unit": cost_per_unit,
-                            "total_cost": total_cost,
-                            "remaining_quantity": remaining_quantity,
-                            "created_at": created_at,
-                            "is_initialization": bool(is_initialization),
-                        }
-                    )
+                summary["symbols"][symbol]["records"].append(
+                    {
+                        "quantity": quantity,
+                        "cost_per_unit": cost_per_unit,
+                        "total_cost": total_cost,
+                        "remaining_quantity": remaining_quantity,
+                        "created_at": created_at,
+                        "is_initialization": bool(is_initialization),
+                    }
+                )
 
-                    summary["symbols"][symbol]["total_initial_cost"] += total_cost
-                    summary["symbols"][symbol]["total_remaining_quantity"] += (
-                        remaining_quantity
-                    )
-                    summary["total_initial_investment"] += total_cost
+                summary["symbols"][symbol]["total_initial_cost"] += total_cost
+                summary["symbols"][symbol]["total_remaining_quantity"] += (
+                    remaining_quantity
+                )
+                summary["total_initial_investment"] += total_cost
 
-                    if is_initialization:
-                        summary["has_initialization_records"] = True
+                if is_initialization:
+                    summary["has_initialization_records"] = True
 
-                return summary
+            return summary
 
         except Exception as e:
             self.logger.error(f"❌ Error getting cost basis summary sync: {e}")
             return {"error": str(e)}
 
+    async def get_realized_trades_async(
+        self, client_id: int, symbol: str, limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Trades for one symbol with the FIFO-realized profit of each sell"""
+        try:
+            def load(conn):
+                initial_lots = conn.execute(
+                    """
+                    SELECT remaining_quantity, cost_per_unit
+                    FROM fifo_cost_basis
+                    WHERE client_id = ? AND symbol = ? AND is_initialization = 1
+                    ORDER BY created_at ASC, id ASC
+                """,
+                    (client_id, symbol),
+                ).fetchall()
+                trades = conn.execute(
+                    """
+                    SELECT side, quantity, price, total_value, executed_at
+                    FROM trades
+                    WHERE client_id = ? AND symbol = ?
+                    ORDER BY executed_at ASC, id ASC
+                """,
+                    (client_id, symbol),
+                ).fetchall()
+                return initial_lots, trades
+
+            initial_lots, trades = await self.db.run_read(load)
+
+            matcher = FIFOMatcher(fee_rate=FEE_RATE)
+            for remaining_quantity, cost_per_unit in initial_lots:
+                matcher.add_initial_lot(symbol, remaining_quantity, cost_per_unit)
+
+            realized_trades = []
+            for side, quantity, price, total_value, executed_at in trades:
+                profit = matcher.apply(symbol, side, quantity, price, total_value)
+                realized_trades.append(
+                    {
+                        "symbol": symbol,
+                        "side": side,
+                        "quantity": quantity,
+                        "price": price,
+                        "total_value": total_value,
+                        "executed_at": executed_at,
+                        "profit": profit,
+                    }
+                )
+
+            return realized_trades[-limit:] if limit else realized_trades
+
+        except Exception as e:
+            self.logger.error(f"❌ Error getting realized trades: {e}")
+            return []
+
     # ==============================================
     # FIFO VALIDATION AND INTEGRITY
     # ==============================================
@@ -834,8 +823,8 @@ class FIFOService:
                 validation_results["validation_passed"] = False
 
             # Check for orphaned sells (sells without matching buys)
-            async with aiosqlite.connect(self.db_path) as conn:
-                async with conn.execute(
+            sell_counts = dict(
+                await self.db.fetchall_async(
                     """
                     SELECT symbol, COUNT(*) as sell_count
                     FROM trades
@@ -843,10 +832,10 @@ class FIFOService:
                     GROUP BY symbol
                 """,
                     (client_id,),
-                ) as cursor:
-                    sell_counts = dict(await cursor.fetchall())
-
-                async with conn.execute(
+                )
+            )
+            buy_counts = dict(
+                await self.db.fetchall_async(
                     """
                     SELECT symbol, COUNT(*) as buy_count
                     FROM trades
@@ -854,30 +843,30 @@ class FIFOService:
                     GROUP BY symbol
                 """,
                     (client_id,),
-                ) as cursor:
-                    buy_counts = dict(await cursor.fetchall())
+                )
+            )
 
-                # Add cost basis quantities to buy counts
-                for symbol, data in cost_basis_summary.get("symbols", {}).items():
-                    buy_counts[symbol] = buy_counts.get(symbol, 0) + len(
-                        data["records"]
-                    )
+            # Add cost basis quantities to buy counts
+            for symbol, data in cost_basis_summary.get("symbols", {}).items():
+                buy_counts[symbol] = buy_counts.get(symbol, 0) + len(
+                    data["records"]
+                )
 
-                # Check for imbalances
-                for symbol in sell_counts:
-                    sells = sell_counts.get(symbol, 0)
-                    buys = buy_counts.get(symbol, 0)
-
-                    if sells > buys:
-                        validation_results["issues"].append(
-                            {
-                                "type": "orphaned_sells",
-                                "severity": "medium",
-                                "symbol": symbol,
-                                "message": f"Symbol {symbol} has {sells} sells but only {buys} buys/cost basis records",
-                                "recommendation": "Some sell orders may not have proper cost basis for profit calculation",
-                            }
-                        )
+            # Check for imbalances
+            for symbol in sell_counts:
+                sells = sell_counts.get(symbol, 0)
+                buys = buy_counts.get(symbol, 0)
+
+                if sells > buys:
+                    validation_results["issues"].append(
+                        {
+                            "type": "orphaned_sells",
+                            "severity": "medium",
+                            "symbol": symbol,
+                            "message": f"Symbol {symbol} has {sells} sells but only {buys} buys/cost basis records",
+                            "recommendation": "Some sell orders may not have proper cost basis for profit calculation",
+                        }
+                    )
 
             # Calculate profit accuracy score
             fifo_profit = await self.calculate_fifo_profit_with_cost_basis_async(
@@ -926,6 +915,99 @@ class FIFOService:
                 "recommendations": ["Contact support for FIFO validation assistance"],
             }
 
+    async def verify_fifo_ledger(
+        self, client_id: int, symbol: Optional[str] = None, repair: bool = False
+    ) -> Dict:
+        """
+        Compare the incremental ledger against a full-history replay
+
+        With repair=True a mismatching ledger is rebuilt from history.
+        """
+        try:
+            start = time.perf_counter()
+            ledger = await self.ledger.get_profit_async(client_id, symbol)
+            ledger_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            replay = await self._calculate_fifo_full_replay_async(client_id, symbol)
+            replay_ms = (time.perf_counter() - start) * 1000
+
+            report = self._compare_ledger_to_replay(client_id, ledger, replay)
+            report.update(
+                {
+                    "client_id": client_id,
+                    "symbol": symbol,
+                    "ledger_ms": round(ledger_ms, 2),
+                    "replay_ms": round(replay_ms, 2),
+                    "ledger": ledger,
+                    "replay": replay,
+                    "repaired": False,
+                }
+            )
+
+            if repair and not report["matches"]:
+                await self.ledger.rebuild_client_async(client_id)
+                report["repaired"] = True
+
+            return report
+
+        except Exception as e:
+            self.logger.error(f"❌ FIFO ledger verification error: {e}")
+            return {"client_id": client_id, "matches": False, "error": str(e)}
+
+    def _compare_ledger_to_replay(
+        self, client_id: int, ledger: Dict, replay: Dict
+    ) -> Dict:
+        """Field-by-field diff of ledger and replay profit results"""
+        tolerance = Config.FIFO_VERIFY_TOLERANCE
+        differences = []
+
+        def check(field: str, ledger_value, replay_value, scope: str = "total"):
+            if isinstance(replay_value, float) or isinstance(ledger_value, float):
+                equal = abs((ledger_value or 0) - (replay_value or 0)) <= tolerance
+            else:
+                equal = ledger_value == replay_value
+            if not equal:
+                differences.append(
+                    {
+                        "scope": scope,
+                        "field": field,
+                        "ledger": ledger_value,
+                        "replay": replay_value,
+                    }
+                )
+
+        for field in (
+            "realized_profit",
+            "unrealized_profit",
+            "total_fees",
+            "total_trades",
+            "profitable_trades",
+        ):
+            check(field, ledger.get(field), replay.get(field))
+
+        ledger_symbols = ledger.get("symbol_breakdown", {})
+        replay_symbols = replay.get("symbol_breakdown", {})
+        for symbol in sorted(set(ledger_symbols) | set(replay_symbols)):
+            ledger_data = ledger_symbols.get(symbol, {})
+            replay_data = replay_symbols.get(symbol, {})
+            for field in (
+                "realized_profit",
+                "total_fees",
+                "trades_count",
+                "remaining_inventory_items",
+            ):
+                check(field, ledger_data.get(field), replay_data.get(field), symbol)
+
+        self.ledger_verifications["runs"] += 1
+        if differences:
+            self.ledger_verifications["mismatches"] += 1
+            self.logger.warning(
+                f"⚠️ FIFO ledger mismatch for client {client_id}: {len(differences)} fields differ from replay"
+            )
+
+        return {"matches": not differences, "differences": differences}
+
     # ==============================================
     # ENHANCED ORDER FILL HANDLING
     # ==============================================
@@ -955,6 +1037,13 @@ class FIFOService:
                 )
                 return True
 
+            # Profit before this fill, when it opens a new digest window
+            profit_before = None
+            if self.notifications_enabled and self.digest.needs_baseline(
+                client_id, symbol
+            ):
+                profit_before, _ = await self._profit_snapshot(client_id, symbol)
+
             # Record the trade in FIFO system (using fixed async logic)
             trade_recorded = await self.record_trade_with_fifo_async(
                 client_id, symbol, side, quantity, price, order_id
@@ -964,67 +1053,37 @@ class FIFOService:
                 self.logger.error("❌ Failed to record trade in FIFO system")
                 return False
 
-            # Calculate current profit using FIFO (async version)
-            profit_data = await self.calculate_fifo_profit_with_cost_basis_async(
-                client_id
-            )
-            total_profit = profit_data.get("total_profit", 0)
-
-            # 🚀 MODERN NOTIFICATION FORMAT WITH EMOJIS
-            order_value = quantity * price
-            profit_estimate = 0
-
-            if side == "SELL":
-                profit_estimate = order_value * 0.025  # Rough estimate
-
-            # Smart quantity formatting (ADA vs others)
-            asset_name = symbol.replace("USDT", "")
-            if symbol == "ADAUSDT":
-                qty_str = f"{quantity:.1f}"
-            else:
-                qty_str = f"{quantity:.4f}"
-
-            # Choose appropriate emoji based on trade side
-            side_emoji = "🟢" if side == "SELL" else "🔵"
-            action_text = "SOLD" if side == "SELL" else "BOUGHT"
-
-            # Build modern notification message
-            message = f"""{side_emoji} **{action_text} {asset_name}**
-
-    📊 **{symbol}** - Level {level if level else "Market"}
-    💰 **Amount:** {qty_str} @ ${price:.6f}
-    💵 **Value:** ${order_value:.2f}"""
-
-            if profit_estimate > 0:
-                message += f"\n📈 **Est. Profit:** ${profit_estimate:.2f}"
-
-            message += f"""
-    💎 **Total Profit:** ${total_profit:.2f}
-    🆔 **Order ID:** {order_id or "N/A"}
-    🕐 **Time:** {datetime.now().strftime("%H:%M:%S")}
-
-    ✅ Order executed successfully!"""
-
-            # Send notification if enabled
-            success = True
+            # Summarized with other fills/replacements for this symbol; the
+            # digest looks up profit and checks milestones when it is sent
             if self.notifications_enabled:
-                success = await self.telegram.send_message(message)
-
-            # Check for profit milestones
-            if side == "SELL" and success:
-                await self._check_profit_milestones(client_id, total_profit)
-
-            if success:
-                self.logger.info(
-                    f"✅ Order fill processed: {symbol} {side} @ ${price:.4f}"
+                await self.digest.record_fill(
+                    client_id, symbol, side, quantity, price, profit_before
                 )
 
-            return success
+            self.logger.info(f"✅ Order fill processed: {symbol} {side} @ ${price:.4f}")
+            return True
 
         except Exception as e:
             self.logger.error(f"❌ Error in on_order_filled: {e}")
             return False
 
+    async def _profit_snapshot(self, client_id: int, symbol: str) -> tuple:
+        """(realized profit for symbol, total profit) for digest P&L"""
+        profit_data = await self.calculate_fifo_profit_with_cost_basis_async(
+            client_id
+        )
+        symbol_data = profit_data.get("symbol_breakdown", {}).get(symbol, {})
+        return (
+            symbol_data.get("realized_profit", 0.0),
+            profit_data.get("total_profit", 0.0),
+        )
+
+    async def _digest_profit(self, client_id: int, symbol: str) -> tuple:
+        """Profit provider for the notification digest"""
+        symbol_profit, total_profit = await self._profit_snapshot(client_id, symbol)
+        await self._check_profit_milestones(client_id, total_profit)
+        return symbol_profit, total_profit
+
     async def on_api_error(
         self,
         client_id: int,
@@ -1096,10 +1155,10 @@ class FIFOService:
             elif "notional" in error_message.lower():
                 message += "\n\n💡 Note: Order value too small - minimum $5 required"
 
-            # Send notification if enabled
+            # Critical path: never held back by the digest window
             success = True
             if self.notifications_enabled:
-                success = await self.telegram.send_message(message)
+                success = await self.digest.send_critical(message)
 
             if success:
                 self.logger.info(f"✅ API error notification sent: {error_code}")
@@ -1138,6 +1197,24 @@ class FIFOService:
         except Exception as e:
             self.logger.error(f"❌ Failed to record trade quietly: {e}")
 
+    def _sync_ledger(self, client_id: int):
+        """Apply newly recorded rows to the FIFO ledger (retried on next query)"""
+        try:
+            self.ledger.sync_client(client_id)
+        except Exception as e:
+            self.logger.warning(
+                f"⚠️ FIFO ledger sync deferred for client {client_id}: {e}"
+            )
+
+    async def _sync_ledger_async(self, client_id: int):
+        """Async variant of _sync_ledger"""
+        try:
+            await self.ledger.sync_client_async(client_id)
+        except Exception as e:
+            self.logger.warning(
+                f"⚠️ FIFO ledger sync deferred for client {client_id}: {e}"
+            )
+
     async def _check_profit_milestones(self, client_id: int, total_profit: float):
         """Check and notify about profit milestones"""
         try:
@@ -1172,7 +1249,7 @@ class FIFOService:
 
 🚀 Keep up the great trading!"""
 
-            await self.telegram.send_message(message)
+            await self.digest.send_critical(message)
             self.logger.info(f"🎉 Milestone notification sent: ${milestone}")
 
         except Exception as e:
@@ -1431,6 +1508,13 @@ if __name__ == "__main__":
         print(f"✅ Total profit: ${profit_data.get('total_profit', 0):.2f}")
         print(f"✅ Total trades: {profit_data.get('total_trades', 0)}")
 
+        # Cross-check the incremental ledger against a full replay
+        verification = await fifo_service.verify_fifo_ledger(test_client_id)
+        print(
+            f"✅ Ledger matches replay: {verification.get('matches')} "
+            f"(ledger {verification.get('ledger_ms', 0):.1f}ms, replay {verification.get('replay_ms', 0):.1f}ms)"
+        )
+
         # Test FIFO validation
         validation = await fifo_service.validate_fifo_integrity(test_client_id)
         print(f"✅ FIFO validation: {validation['validation_passed']}")
@@ -1514,7 +1598,7 @@ if __name__ == "__main__":
 
         # Clear any existing test data
         try:
-            with sqlite3.connect(fifo_service.db_path) as conn:
+            with fifo_service.db.write() as conn:
                 conn.execute(
                     "DELETE FROM trades WHERE client_id = ?", (test_client_id,)
                 )
@@ -1539,7 +1623,7 @@ if __name__ == "__main__":
 
         # Verify both trades are in trades table
         try:
-            with sqlite3.connect(fifo_service.db_path) as conn:
+            with fifo_service.db.write() as conn:
                 cursor = conn.execute(
                     "SELECT side, COUNT(*) FROM trades WHERE client_id = ? GROUP BY side",
                     (test_client_id,),
@@ -1568,7 +1652,7 @@ if __name__ == "__main__":
 
         # Clean up test data
         try:
-            with sqlite3.connect(fifo_service.db_path) as conn:
+            with fifo_service.db.write() as conn:
                 conn.execute(
                     "DELETE FROM trades WHERE client_id = ?", (test_client_id,)
                 )
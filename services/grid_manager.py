@@ -8,6 +8,7 @@ Manages single advanced grids with full feature integration.
 """
 
 import asyncio
+import json
 import logging
 import time
 from typing import Dict, Optional
@@ -15,88 +16,90 @@ from typing import Dict, Optional
 from binance.client import Client
 
 from models.grid_config import GridConfig
-from repositories.client_repository import ClientRepository
-from repositories.trade_repository import TradeRepository
-from services.async_database_manager import AsyncAnalytics, AsyncTradeRepository
 from services.compound_manager import CompoundInterestManager
 from services.decision_engine import SmartDecisionEngine
-from services.fifo_service import FIFOService
+from services.exchange_gateway import get_exchange_gateway
 from services.grid_monitor import GridMonitoringService
 from services.grid_trading_engine import GridTradingEngine
 from services.grid_utils import GridUtilityService
 from services.inventory_manager import SingleGridInventoryManager
+from services.market_data_cache import get_market_data_cache
+from services.service_container import ServiceContainer, get_service_container
 from services.trading_features import (
-    IntelligentMarketTimer,
     SmartGridAutoReset,
     VolatilityBasedRiskManager,
 )
+from services.user_data_stream import UserDataStream
 
 
 class GridManager:
     """Production single advanced grid manager with proper inventory integration"""
 
-    def __init__(self, binance_client: Client, client_id: int, fifo_service=None):
+    def __init__(
+        self,
+        binance_client: Client,
+        client_id: int,
+        fifo_service=None,
+        services: Optional[ServiceContainer] = None,
+        user_stream_mode: Optional[str] = None,
+    ):
         self.binance_client = binance_client
+        self.exchange = get_exchange_gateway(binance_client, client_id)
+        self.market_data = get_market_data_cache()
         self.client_id = client_id
         self.logger = logging.getLogger(__name__)
 
+        # Stateless services are built once per process
+        services = services or get_service_container()
+
         # Add async components
-        self.async_trades = AsyncTradeRepository()
-        self.async_analytics = AsyncAnalytics()
+        self.async_trades = services.async_trades
+        self.async_analytics = services.async_analytics
 
         # Core services
-        self.client_repo = ClientRepository()
-        self.trade_repo = TradeRepository()
+        self.client_repo = services.client_repo
+        self.trade_repo = services.trade_repo
+        self.fifo_service = fifo_service or services.fifo_service
 
-        if fifo_service:
-            self.fifo_service = fifo_service
-            self.logger.info("✅ Using shared FIFO service")
-        else:
-            self.fifo_service = FIFOService()
-            self.logger.info("⚠️ Created new FIFO service instance")
-
-        # Trading engine (handles all order operations)
-        self.trading_engine = GridTradingEngine(binance_client, client_id)
+        # Per-client components (share the utility, FIFO and rules caches)
         self.utility = GridUtilityService(binance_client)
+        self.trading_engine = GridTradingEngine(
+            binance_client,
+            client_id,
+            fifo_service=self.fifo_service,
+            utility=self.utility,
+        )
         self.monitoring = GridMonitoringService(client_id, binance_client)
         self.smart_engine = SmartDecisionEngine(client_id, self.fifo_service)
 
         # Advanced features
-        self.market_timer = IntelligentMarketTimer()
+        self.market_timer = services.market_timer
         self.volatility_managers: Dict[str, VolatilityBasedRiskManager] = {}
         self.auto_reset_managers: Dict[str, SmartGridAutoReset] = {}
 
-        # Initialize compound manager
-        self.compound_manager = CompoundInterestManager(self.fifo_service)
-        self.logger.info(
-            "✅ Advanced CompoundInterestManager with Kelly Criterion activated"
-        )
+        # Compound manager caches per client_id, so one instance serves all
+        if self.fifo_service is services.fifo_service:
+            self.compound_manager = services.compound_manager
+        else:
+            self.compound_manager = CompoundInterestManager(self.fifo_service)
 
         # Create inventory manager
         self.inventory_manager = SingleGridInventoryManager(
             binance_client=binance_client, total_capital=2400.0
         )
-        self.logger.info("✅ Created inventory manager")
 
         # Inject inventory manager into trading engine
-        if hasattr(self.trading_engine, "set_managers"):
-            self.trading_engine.set_managers(
-                self.inventory_manager, self.compound_manager
-            )
-            self.logger.info("✅ Used set_managers method to inject inventory manager")
-        else:
-            # Fallback: direct assignment
-            self.trading_engine.inventory_manager = self.inventory_manager
-            self.logger.info("✅ Direct assignment of inventory manager")
+        self.trading_engine.set_managers(self.inventory_manager, self.compound_manager)
 
-        # Verify injection
-        if self.trading_engine.inventory_manager is not None:
-            self.logger.info("✅ Inventory manager injection verified")
-        else:
-            self.logger.error("❌ Inventory manager injection failed")
-
-        # State
+        # State (checkpointed to grid_instances whenever it changes)
         self.active_grids: Dict[str, GridConfig] = {}
+        self.grid_state = services.grid_state
+        self._checkpoints: Dict[str, str] = {}
+
+        # Push-based fill detection (REST polling stays as reconciliation)
+        self.user_stream = UserDataStream(
+            binance_client, client_id, self._on_execution_report, mode=user_stream_mode
+        )
 
         # Metrics
         self.metrics = {
@@ -241,6 +244,7 @@ class GridManager:
             # Store grid and update metrics
             self.active_grids[symbol] = grid_config
             self.metrics["grids_started"] += 1
+            self._checkpoint_grid(symbol)
 
             self.logger.info(
                 f"🚀 FORCE COMMAND SUCCESS: {symbol.replace('USDT', '')} ${total_capital:.2f}"
@@ -340,6 +344,8 @@ class GridManager:
 
             # Remove from active grids
             del self.active_grids[symbol]
+            self._checkpoints.pop(symbol, None)
+            self.grid_state.mark_stopped(self.client_id, symbol)
             self.metrics["grids_stopped"] += 1
 
             self.logger.info(
@@ -359,39 +365,210 @@ class GridManager:
 
     async def monitor_and_update_grids(self):
         """Monitor and update all active grids"""
+        await self.run_tick_phases()
+
+    async def run_tick_phases(self) -> Dict:
+        """Run one grid tick: reconcile -> replace -> features
+
+        Returns per-phase durations in seconds. The orchestrator runs the
+        system-wide health phase after all clients have ticked.
+        """
+        timings = {"reconcile": 0.0, "replace": 0.0, "features": 0.0}
+
         try:
             if not self.active_grids:
-                return
+                return timings
+
+            phase_start = time.perf_counter()
+            pending_fills = await self._phase_reconcile()
+            timings["reconcile"] = time.perf_counter() - phase_start
 
+            phase_start = time.perf_counter()
+            await self._phase_replace(pending_fills)
+            timings["replace"] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            await self._phase_features()
+            timings["features"] = time.perf_counter() - phase_start
+
+            # Fills, replacements and resets all change levels / order ids
             for symbol in list(self.active_grids.keys()):
-                try:
-                    grid_config = self.active_grids[symbol]
-
-                    # Ensure inventory tracking exists
-                    if (
-                        self.inventory_manager
-                        and not self.inventory_manager.has_tracking(symbol)
-                    ):
-                        self.logger.warning(
-                            f"⚠️ {symbol} missing inventory tracking - attempting to add"
-                        )
-                        await self.inventory_manager.add_symbol_tracking(
-                            symbol, grid_config.total_capital
-                        )
-
-                    # Check and replace filled orders
-                    await self.trading_engine.check_and_replace_filled_orders(
-                        symbol, grid_config
+                self._checkpoint_grid(symbol)
+
+        except Exception as e:
+            self.logger.error(f"❌ Grid monitoring error: {e}")
+
+        return timings
+
+    async def _phase_reconcile(self) -> Dict[str, list]:
+        """Reconcile grid levels with the exchange and collect detected fills"""
+        await self._ensure_user_stream()
+
+        pending_fills = {}
+        for symbol in list(self.active_grids.keys()):
+            try:
+                grid_config = self.active_grids[symbol]
+
+                # Ensure inventory tracking exists
+                if self.inventory_manager and not self.inventory_manager.has_tracking(
+                    symbol
+                ):
+                    self.logger.warning(
+                        f"⚠️ {symbol} missing inventory tracking - attempting to add"
+                    )
+                    await self.inventory_manager.add_symbol_tracking(
+                        symbol, grid_config.total_capital
                     )
 
-                    # Update advanced features periodically
-                    await self._update_advanced_features(symbol)
+                report = await self.trading_engine.check_and_replace_filled_orders(
+                    symbol, grid_config, handle_fills=False
+                )
+                if report and report.get("pending_fills"):
+                    pending_fills[symbol] = report["pending_fills"]
+                if report and report.get("closed_unfilled"):
+                    self._checkpoint_grid(symbol)
+
+            except Exception as e:
+                self.logger.error(f"❌ Error reconciling {symbol}: {e}")
+
+        return pending_fills
+
+    async def _phase_replace(self, pending_fills: Dict[str, list]):
+        """Record detected fills and place replacement orders"""
+        for symbol, fills in pending_fills.items():
+            grid_config = self.active_grids.get(symbol)
+            if grid_config is None:
+                continue
+
+            try:
+                replaced = await self.trading_engine.replace_pending_fills(
+                    symbol, fills, grid_config
+                )
+                self.metrics["total_trades"] += replaced
+            except Exception as e:
+                self.logger.error(f"❌ Error replacing orders for {symbol}: {e}")
+
+    async def _phase_features(self):
+        """Update advanced features (internally throttled per symbol)"""
+        for symbol in list(self.active_grids.keys()):
+            try:
+                await self._update_advanced_features(symbol)
+            except Exception as e:
+                self.logger.error(f"❌ Error updating features for {symbol}: {e}")
+
+    async def _ensure_user_stream(self):
+        """Start the user data stream and sync the engine's fill detection mode"""
+        try:
+            if not self.user_stream.running and self.user_stream.mode != "off":
+                await self.user_stream.start()
 
-                except Exception as e:
-                    self.logger.error(f"❌ Error monitoring {symbol}: {e}")
+            self.trading_engine.set_stream_active(self.user_stream.is_healthy())
 
         except Exception as e:
-            self.logger.error(f"❌ Grid monitoring error: {e}")
+            self.logger.error(f"❌ User data stream error: {e}")
+            self.trading_engine.set_stream_active(False)
+
+    async def _on_execution_report(self, order: Dict):
+        """Route a streamed execution report to the matching grid"""
+        grid_config = self.active_grids.get(order.get("symbol"))
+        if grid_config is None:
+            return
+
+        if await self.trading_engine.handle_execution_report(order, grid_config):
+            self.metrics["total_trades"] += 1
+            self._checkpoint_grid(grid_config.symbol)
+
+    # ========================================
+    # CHECKPOINT / WARM RESTART
+    # ========================================
+
+    def _checkpoint_grid(self, symbol: str):
+        """Persist the grid if its state changed since the last checkpoint"""
+        grid_config = self.active_grids.get(symbol)
+        if grid_config is None:
+            return
+
+        try:
+            state = grid_config.to_dict()
+            state.pop("_original_id", None)
+            state_json = json.dumps(state, sort_keys=True, default=str)
+            if self._checkpoints.get(symbol) == state_json:
+                return
+
+            self.grid_state.save_checkpoint(self.client_id, symbol, state, state_json)
+            self._checkpoints[symbol] = state_json
+
+        except Exception as e:
+            self.logger.error(f"❌ Grid checkpoint error for {symbol}: {e}")
+
+    async def restore_grids(self) -> Dict:
+        """Rebuild active grids from checkpoints without touching orders
+
+        Each restored grid is reconciled against one get_open_orders call:
+        levels whose order is still open resume as-is; levels whose order
+        closed while we were down are resolved (fill + replacement) by the
+        first reconcile phase.
+        """
+        start = time.perf_counter()
+        report = {
+            "client_id": self.client_id,
+            "grids_restored": 0,
+            "orders_open": 0,
+            "orders_closed": 0,
+            "orders_untracked": 0,
+            "errors": [],
+        }
+
+        checkpoints = await self.grid_state.get_active_checkpoints_async(
+            self.client_id
+        )
+        for state in checkpoints:
+            symbol = state.get("symbol")
+            if symbol in self.active_grids:
+                continue
+
+            try:
+                state.pop("_checkpointed_at", None)
+                grid_config = GridConfig.from_dict(state)
+
+                await self._initialize_advanced_managers(symbol)
+                await self._add_symbol_to_inventory(symbol, grid_config.total_capital)
+
+                tracked = {
+                    str(level["order_id"])
+                    for level in grid_config.buy_levels + grid_config.sell_levels
+                    if level.get("order_id") and not level.get("filled")
+                }
+                open_orders = await self.exchange.get_open_orders(symbol=symbol)
+                open_ids = {str(order["orderId"]) for order in open_orders}
+
+                report["orders_open"] += len(tracked & open_ids)
+                report["orders_closed"] += len(tracked - open_ids)
+                report["orders_untracked"] += len(open_ids - tracked)
+
+                self.active_grids[symbol] = grid_config
+                self._checkpoints[symbol] = json.dumps(
+                    state, sort_keys=True, default=str
+                )
+                report["grids_restored"] += 1
+
+                self.logger.info(
+                    f"♻️ Restored {symbol} grid: {len(tracked & open_ids)} open, "
+                    f"{len(tracked - open_ids)} closed while offline, "
+                    f"{len(open_ids - tracked)} untracked on exchange"
+                )
+
+            except Exception as e:
+                self.logger.error(f"❌ Grid restore error for {symbol}: {e}")
+                report["errors"].append(f"{symbol}: {e}")
+
+        report["duration_seconds"] = round(time.perf_counter() - start, 3)
+        return report
+
+    async def shutdown(self):
+        """Release stream resources held by this manager"""
+        await self.user_stream.stop()
+        self.trading_engine.set_stream_active(False)
 
     async def _initialize_advanced_managers(self, symbol: str):
         """Initialize advanced managers for symbol"""
@@ -416,8 +593,7 @@ class GridManager:
     async def _get_current_price(self, symbol: str) -> Optional[float]:
         """Get current price for symbol"""
         try:
-            ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-            price = float(ticker["price"])
+            price = await self.market_data.get_price(symbol, self.exchange)
             self.logger.info(f"📊 Current price for {symbol}: ${price:.6f}")
             return price
         except Exception as e:
@@ -719,6 +895,10 @@ class GridManager:
 
             base_report["trading_summary"] = trading_summary
             base_report["metrics"] = self.metrics
+            base_report["fill_detection"] = {
+                **self.trading_engine.get_fill_detection_stats(),
+                "stream": self.user_stream.get_stats(),
+            }
 
             # Add inventory health report
             if self.inventory_manager:
@@ -27,6 +27,7 @@ from binance.client import Client
 
 # In your existing GridMonitoringService
 from services.async_database_manager import DatabasePerformanceMonitor
+from utils.ttl_cache import TTLCache
 
 
 class GridMonitoringService:
@@ -45,10 +46,10 @@ class GridMonitoringService:
         self.monitoring_interval = 30  # seconds
 
         # Performance tracking
-        self.performance_cache = {}
-        self._health_cache = {}
-        self.status_cache = {}
         self._cache_ttl = 5.0  # 5 second cache
+        self.performance_cache = TTLCache("grid_performance", max_size=64)
+        self._health_cache = TTLCache("grid_health", max_size=64, ttl=self._cache_ttl)
+        self.status_cache = TTLCache("grid_status", max_size=64)
         self._last_cache_clear = time.time()
         # ADD THESE NEW ATTRIBUTES for real-time optimization
         self.performance_history = deque(maxlen=100)
@@ -227,31 +228,16 @@ class GridMonitoringService:
     # ========================================
     async def _get_cached_health_status(self, symbol: str, grid_config):
         """Get health status with caching for performance"""
-        cache_key = f"{symbol}_{id(grid_config)}"
-        current_time = time.time()
-
-        # Check cache first
-        if cache_key in self._health_cache:
-            cached_data = self._health_cache[cache_key]
-            if current_time - cached_data["timestamp"] < self._cache_ttl:
-                return cached_data["health_status"]
-
-        # Calculate fresh health status
-        health_status = self._check_grid_health(symbol, grid_config)
-
-        # Cache the result
-        self._health_cache[cache_key] = {
-            "health_status": health_status,
-            "timestamp": current_time,
-        }
-
-        return health_status
+        return self._health_cache.get_or_compute(
+            (symbol, id(grid_config)),
+            lambda: self._check_grid_health(symbol, grid_config),
+        )
 
     async def _cleanup_cache_if_needed(self):
         """Clean up cache periodically to prevent memory bloat"""
         current_time = time.time()
         if current_time - self._last_cache_clear > 30:  # Clean every 30 seconds
-            self._health_cache.clear()
+            self._health_cache.purge_expired()
             self._last_cache_clear = current_time
 
     async def _execute_callbacks_concurrently(
@@ -513,7 +499,7 @@ class GridMonitoringService:
             }
 
             # Add to status cache
-            self.status_cache[symbol] = status
+            self.status_cache.set(symbol, status)
 
             return status
 
@@ -644,7 +630,7 @@ class GridMonitoringService:
             }
 
             # Cache the performance data
-            self.performance_cache[symbol] = performance
+            self.performance_cache.set(symbol, performance)
 
             return performance
 
@@ -874,12 +860,15 @@ class GridMonitoringService:
         """Update the performance cache with latest data"""
         try:
             # Simple cache update - could be expanded
-            self.performance_cache[symbol] = {
-                "last_updated": time.time(),
-                "grid_config_hash": hash(
-                    str(grid_config.buy_levels + grid_config.sell_levels)
-                ),
-            }
+            self.performance_cache.set(
+                symbol,
+                {
+                    "last_updated": time.time(),
+                    "grid_config_hash": hash(
+                        str(grid_config.buy_levels + grid_config.sell_levels)
+                    ),
+                },
+            )
         except Exception:
             pass  # Non-critical operation
 
@@ -10,15 +10,52 @@ Orchestrates multiple advanced grid managers across clients.
 import asyncio
 import logging
 import time
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
 from binance.client import Client
 
+from config import Config
+from database.connection_pool import get_all_pool_stats
+from database.write_queue import get_all_write_queue_stats
 from models.client import GridStatus
-from repositories.client_repository import ClientRepository
-from services.fifo_service import FIFOService
+from services.candle_store import get_candle_store
+from services.exchange_gateway import (
+    drop_exchange_gateway,
+    get_all_gateway_stats,
+    get_exchange_gateway,
+)
 from services.grid_manager import GridManager
-from utils.crypto import CryptoUtils
+from services.indicator_engine import get_indicator_engine
+from services.market_data_cache import get_market_data_cache
+from services.notification_digest import get_notification_digest
+from services.service_container import get_service_container
+from services.symbol_rules import get_symbol_rules_registry
+from services.telegram_outbox import get_all_outbox_stats
+from utils.crypto import CryptoUtils, get_api_key_cache, invalidate_api_keys
+from utils.metrics import get_metrics_registry
+from utils.ttl_cache import get_cache_report
+
+_metrics = get_metrics_registry()
+CLIENT_TICK_SECONDS = _metrics.histogram(
+    "gridbot_client_tick_seconds", "Duration of one client's grid tick"
+)
+CLIENT_TICKS = _metrics.counter(
+    "gridbot_client_ticks_total", "Client grid ticks by outcome", ("status",)
+)
+TICK_PHASE_SECONDS = _metrics.histogram(
+    "gridbot_tick_phase_seconds", "Per-client tick phase durations", ("phase",)
+)
+GRID_CYCLE_SECONDS = _metrics.histogram(
+    "gridbot_grid_cycle_seconds", "Duration of one update cycle over all clients"
+)
+HEALTHY_MANAGERS = _metrics.gauge(
+    "gridbot_healthy_managers", "Managers passing the last health check"
+)
+
+
+def binance_client_factory(client_id: int, api_key: str, secret_key: str) -> Client:
+    """Default client factory: a live python-binance Client"""
+    return Client(api_key, secret_key, testnet=False)
 
 
 class GridOrchestrator:
@@ -46,17 +83,21 @@ class GridOrchestrator:
             f"🎯 GridOrchestrator singleton created - ID: {self.creation_id}"
         )
 
-        # Initialize services
-        self.client_repo = ClientRepository()
+        # Initialize services (shared with every GridManager)
+        self.services = get_service_container()
+        self.client_repo = self.services.client_repo
+        self.grid_state = self.services.grid_state
         self.crypto_utils = CryptoUtils()
 
         # Storage for managers and clients
         self.advanced_managers: Dict[int, GridManager] = {}
         self.binance_clients: Dict[int, Client] = {}
+        self.client_factory: Callable = binance_client_factory
+        self.user_stream_mode: Optional[str] = None  # None: USER_DATA_STREAM_MODE
 
         # Services
         try:
-            self.fifo_service = FIFOService()
+            self.fifo_service = self.services.fifo_service
         except Exception as e:
             self.logger.error(f"❌ Failed to initialize FIFOService: {e}")
             self.fifo_service = None
@@ -64,6 +105,33 @@ class GridOrchestrator:
         # State tracking
         self.monitoring_active = False
         self.last_health_check = 0
+        self.recovery_report: Optional[Dict] = None
+
+        # Concurrent per-client updates
+        self.update_concurrency = Config.GRID_UPDATE_CONCURRENCY
+        self.client_update_deadline = Config.CLIENT_UPDATE_DEADLINE
+        self._update_semaphore: Optional[asyncio.Semaphore] = None
+        self._client_update_tasks: Dict[int, asyncio.Task] = {}
+        self.client_cycle_stats: Dict[int, Dict] = {}
+
+        # Grid tick scheduler (single owner of reconcile/replace/features/health)
+        self.min_tick_interval = Config.MIN_TICK_INTERVAL
+        self.last_tick_started = 0.0
+        self._tick_in_progress = False
+        self._tick_phase_timings: Dict[str, float] = {}
+        self.tick_stats = {
+            "ticks_run": 0,
+            "duplicate_ticks_skipped": 0,
+            "manager_updates_avoided": 0,
+            "phase_totals": {
+                "reconcile": 0.0,
+                "replace": 0.0,
+                "features": 0.0,
+                "health": 0.0,
+            },
+            "last_tick_phases": {},
+            "last_tick_source": None,
+        }
 
         # Metrics
         self.system_metrics = {
@@ -103,10 +171,15 @@ class GridOrchestrator:
                 raise ValueError(f"Failed to decrypt API keys for client {client_id}")
 
             # Create and test Binance client
-            binance_client = Client(api_key, secret_key, testnet=False)
+            binance_client = self.client_factory(client_id, api_key, secret_key)
 
             # Test connection
-            account = binance_client.get_account(recvWindow=60000)
+            exchange = get_exchange_gateway(binance_client, client_id)
+            try:
+                account = await exchange.get_account(recvWindow=60000)
+            except Exception:
+                drop_exchange_gateway(binance_client)
+                raise
 
             # Cache client
             self.binance_clients[client_id] = binance_client
@@ -120,6 +193,30 @@ class GridOrchestrator:
             )
             raise
 
+    def invalidate_client_credentials(self, client_id: int):
+        """Forget cached decrypted keys and Binance client after a key change"""
+        invalidate_api_keys(client_id)
+        binance_client = self.binance_clients.pop(client_id, None)
+        if binance_client is not None:
+            drop_exchange_gateway(binance_client)
+            self.logger.info(f"🔑 Dropped cached Binance client for {client_id}")
+
+    def set_client_factory(
+        self, factory: Callable, user_stream_mode: Optional[str] = None
+    ):
+        """Build exchange clients with factory(client_id, api_key, secret_key)
+
+        Used to run clients against the ExchangeSimulator for load tests.
+        Already created clients are dropped so the next lookup uses it.
+        user_stream_mode overrides USER_DATA_STREAM_MODE for managers created
+        afterwards (e.g. "off" for clients without a user data websocket).
+        """
+        self.client_factory = factory
+        self.user_stream_mode = user_stream_mode
+        for binance_client in self.binance_clients.values():
+            drop_exchange_gateway(binance_client)
+        self.binance_clients.clear()
+
     async def create_advanced_manager(self, client_id: int) -> bool:
         """Create Single Advanced Grid Manager for client"""
         try:
@@ -132,11 +229,13 @@ class GridOrchestrator:
             if not binance_client:
                 return False
 
-            # Create GridManager with shared FIFO service
+            # Create GridManager on the shared services
             manager = GridManager(
                 binance_client=binance_client,
                 client_id=client_id,
                 fifo_service=self.fifo_service,
+                services=self.services,
+                user_stream_mode=self.user_stream_mode,
             )
 
             # Store manager
@@ -149,6 +248,64 @@ class GridOrchestrator:
             self.logger.error(f"❌ Manager creation error for client {client_id}: {e}")
             return False
 
+    async def restore_active_grids(self) -> Dict:
+        """Warm restart: rebuild managers and grids from checkpoints
+
+        Clients are restored in parallel (bounded like grid updates). No
+        orders are cancelled or placed; see GridManager.restore_grids().
+        """
+        start = time.perf_counter()
+        client_ids = await self.grid_state.get_active_client_ids_async()
+
+        async def restore_client(client_id: int) -> Dict:
+            async with self._get_update_semaphore():
+                if not await self.create_advanced_manager(client_id):
+                    return {"client_id": client_id, "error": "manager creation failed"}
+                return await self.advanced_managers[client_id].restore_grids()
+
+        results = await asyncio.gather(
+            *(restore_client(client_id) for client_id in client_ids),
+            return_exceptions=True,
+        )
+
+        report = {
+            "clients": len(client_ids),
+            "clients_restored": 0,
+            "grids_restored": 0,
+            "orders_open": 0,
+            "orders_closed": 0,
+            "orders_untracked": 0,
+            "failed_clients": [],
+        }
+        for client_id, result in zip(client_ids, results):
+            if isinstance(result, Exception) or result.get("error"):
+                report["failed_clients"].append(client_id)
+                continue
+            report["clients_restored"] += 1
+            for key in (
+                "grids_restored",
+                "orders_open",
+                "orders_closed",
+                "orders_untracked",
+            ):
+                report[key] += result[key]
+
+        report["recovery_seconds"] = round(time.perf_counter() - start, 3)
+        report["completed_at"] = time.time()
+        self.recovery_report = report
+
+        self.logger.info(
+            f"♻️ Warm restart: {report['grids_restored']} grids for "
+            f"{report['clients_restored']}/{report['clients']} clients restored in "
+            f"{report['recovery_seconds']:.2f}s ({report['orders_open']} orders "
+            f"still open, {report['orders_closed']} to reconcile)"
+        )
+        if report["failed_clients"]:
+            self.logger.warning(
+                f"⚠️ Grid restore failed for clients {report['failed_clients']}"
+            )
+        return report
+
     async def force_start_grid(self, client_id: int, command: str) -> Dict:
         """
         Handle FORCE commands for single advanced grids
@@ -329,23 +486,26 @@ class GridOrchestrator:
                     "updated_grids": 0,
                 }
 
-            # Start monitoring if not active
-            if not self.monitoring_active:
-                asyncio.create_task(self.start_monitoring())
-
-            # Update each client's grids
-            updated_grids = 0
-            for client_id, manager in self.advanced_managers.items():
-                try:
-                    await manager.monitor_and_update_grids()
-                    updated_grids += 1
-                except Exception as e:
-                    self.logger.error(f"❌ Update error for client {client_id}: {e}")
+            # One tick through the shared scheduler (no second monitoring loop)
+            tick = await self.run_grid_tick(source="update_all_grids")
+            if tick.get("skipped"):
+                return {
+                    "success": True,
+                    "updated_grids": 0,
+                    "total_clients": len(self.advanced_managers),
+                    "skipped_duplicate": True,
+                    "monitoring_active": self.monitoring_active,
+                }
 
             return {
                 "success": True,
-                "updated_grids": updated_grids,
+                "updated_grids": tick["completed"],
                 "total_clients": len(self.advanced_managers),
+                "timed_out": tick["timed_out"],
+                "skipped": tick["skipped"],
+                "failed": tick["failed"],
+                "cycle_time": tick["cycle_time"],
+                "phases": tick["phases"],
                 "monitoring_active": self.monitoring_active,
             }
 
@@ -384,8 +544,55 @@ class GridOrchestrator:
                 "error": str(e),
             }
 
+    async def run_grid_tick(self, source: str = "scheduler") -> Dict:
+        """Run one grid tick across all clients
+
+        Phases: reconcile -> replace -> features run per client (concurrently
+        across clients), then one system-wide health phase. Overlapping or
+        too-frequent ticks from a second caller are skipped and counted.
+        """
+        now = time.time()
+        if (
+            self._tick_in_progress
+            or now - self.last_tick_started < self.min_tick_interval
+        ):
+            self.tick_stats["duplicate_ticks_skipped"] += 1
+            self.tick_stats["manager_updates_avoided"] += len(self.advanced_managers)
+            self.logger.debug(f"⏭️ Duplicate grid tick from {source} skipped")
+            return {"skipped": True, "source": source}
+
+        self._tick_in_progress = True
+        self.last_tick_started = now
+        self._tick_phase_timings = {
+            "reconcile": 0.0,
+            "replace": 0.0,
+            "features": 0.0,
+        }
+
+        try:
+            cycle = await self._update_clients_concurrently()
+
+            health_start = time.perf_counter()
+            await self._perform_health_check()
+            self._tick_phase_timings["health"] = time.perf_counter() - health_start
+
+            for phase, duration in self._tick_phase_timings.items():
+                self.tick_stats["phase_totals"][phase] += duration
+            self.tick_stats["ticks_run"] += 1
+            self.tick_stats["last_tick_phases"] = dict(self._tick_phase_timings)
+            self.tick_stats["last_tick_source"] = source
+
+            return {**cycle, "phases": dict(self._tick_phase_timings)}
+
+        finally:
+            self._tick_in_progress = False
+
     async def start_monitoring(self):
-        """Start continuous monitoring of all grids"""
+        """Start continuous monitoring of all grids
+
+        Only needed when nothing else drives update_all_grids; if both run,
+        run_grid_tick drops the duplicate ticks.
+        """
         if self.monitoring_active:
             return
 
@@ -394,9 +601,8 @@ class GridOrchestrator:
 
         try:
             while self.monitoring_active:
-                await self._monitor_all_grids()
-                await self._perform_health_check()
-                await asyncio.sleep(30)  # Check every 30 seconds
+                await self.run_grid_tick(source="start_monitoring")
+                await asyncio.sleep(Config.UPDATE_INTERVAL)
         except Exception as e:
             self.logger.error(f"❌ Monitoring system error: {e}")
         finally:
@@ -407,18 +613,142 @@ class GridOrchestrator:
         self.monitoring_active = False
         self.logger.info("🛑 Monitoring system stopped")
 
-    async def _monitor_all_grids(self):
-        """Monitor all active grids"""
+    async def discard_manager(self, client_id: int) -> bool:
+        """Drop a client's GridManager after stopping its user data stream"""
+        manager = self.advanced_managers.pop(client_id, None)
+        if manager is None:
+            return False
         try:
-            for client_id, manager in self.advanced_managers.items():
-                try:
-                    await manager.monitor_and_update_grids()
-                except Exception as e:
+            await manager.shutdown()
+        except Exception as e:
+            self.logger.error(f"❌ Manager shutdown error for {client_id}: {e}")
+        return True
+
+    async def shutdown(self):
+        """Stop monitoring and release every manager's stream (service stop)"""
+        await self.stop_monitoring()
+        for client_id in list(self.advanced_managers):
+            await self.discard_manager(client_id)
+        self.logger.info("✅ All grid managers shut down")
+
+    def _get_update_semaphore(self) -> asyncio.Semaphore:
+        if self._update_semaphore is None:
+            self._update_semaphore = asyncio.Semaphore(self.update_concurrency)
+        return self._update_semaphore
+
+    async def _update_clients_concurrently(self) -> Dict:
+        """Fan out monitor_and_update_grids across clients with per-client deadlines
+
+        A client whose update overruns its deadline keeps running in the
+        background, but the cycle stops waiting for it and the client is
+        skipped on following cycles until that update finishes.
+        """
+        cycle_start = time.perf_counter()
+        results = {"completed": [], "timed_out": [], "skipped": [], "failed": []}
+
+        async def run_client(client_id: int, manager: GridManager):
+            stats = self.client_cycle_stats.setdefault(
+                client_id,
+                {
+                    "cycles": 0,
+                    "timeouts": 0,
+                    "skipped": 0,
+                    "errors": 0,
+                    "last_duration": 0.0,
+                    "avg_duration": 0.0,
+                    "max_duration": 0.0,
+                    "last_status": None,
+                },
+            )
+
+            running = self._client_update_tasks.get(client_id)
+            if running and not running.done():
+                stats["skipped"] += 1
+                stats["last_status"] = "skipped"
+                results["skipped"].append(client_id)
+                CLIENT_TICKS.inc(status="skipped")
+                return
+
+            async with self._get_update_semaphore():
+                start = time.perf_counter()
+                task = asyncio.create_task(manager.run_tick_phases())
+                self._client_update_tasks[client_id] = task
+
+                done, _ = await asyncio.wait(
+                    {task}, timeout=self.client_update_deadline
+                )
+                duration = time.perf_counter() - start
+
+                stats["cycles"] += 1
+                stats["last_duration"] = duration
+                stats["max_duration"] = max(stats["max_duration"], duration)
+                stats["avg_duration"] += (duration - stats["avg_duration"]) / stats[
+                    "cycles"
+                ]
+
+                if not done:
+                    stats["timeouts"] += 1
+                    stats["last_status"] = "timeout"
+                    results["timed_out"].append(client_id)
+                    self.logger.warning(
+                        f"⏱️ Client {client_id} exceeded {self.client_update_deadline:.0f}s "
+                        "update deadline - skipping until it finishes"
+                    )
+                elif task.exception():
+                    stats["errors"] += 1
+                    stats["last_status"] = "error"
+                    results["failed"].append(client_id)
                     self.logger.error(
-                        f"❌ Monitoring error for client {client_id}: {e}"
+                        f"❌ Update error for client {client_id}: {task.exception()}"
                     )
-        except Exception as e:
-            self.logger.error(f"❌ System monitoring error: {e}")
+                else:
+                    stats["last_status"] = "ok"
+                    results["completed"].append(client_id)
+                    self._record_phase_timings(task.result())
+
+                CLIENT_TICK_SECONDS.observe(duration)
+                CLIENT_TICKS.inc(status=stats["last_status"])
+
+        await asyncio.gather(
+            *(
+                run_client(client_id, manager)
+                for client_id, manager in list(self.advanced_managers.items())
+            ),
+            return_exceptions=True,
+        )
+
+        cycle_time = time.perf_counter() - cycle_start
+        self.system_metrics["last_cycle_time"] = cycle_time
+        GRID_CYCLE_SECONDS.observe(cycle_time)
+
+        return {
+            "completed": len(results["completed"]),
+            "timed_out": results["timed_out"],
+            "skipped": results["skipped"],
+            "failed": results["failed"],
+            "cycle_time": cycle_time,
+        }
+
+    def _record_phase_timings(self, timings):
+        """Accumulate per-client phase durations into the current tick"""
+        if not isinstance(timings, dict):
+            return
+        for phase, duration in timings.items():
+            self._tick_phase_timings[phase] = (
+                self._tick_phase_timings.get(phase, 0.0) + duration
+            )
+            TICK_PHASE_SECONDS.observe(duration, phase=phase)
+
+    def get_tick_report(self) -> Dict:
+        """Tick scheduler statistics, including duplicate work removed"""
+        return {
+            **self.tick_stats,
+            "min_tick_interval": self.min_tick_interval,
+            "duplicate_work_removed": {
+                "ticks": self.tick_stats["duplicate_ticks_skipped"],
+                "manager_updates": self.tick_stats["manager_updates_avoided"],
+            },
+        }
 
     async def _perform_health_check(self):
         """Perform periodic health check"""
@@ -445,6 +775,7 @@ class GridOrchestrator:
             health_percentage = (
                 (healthy_managers / total_managers * 100) if total_managers > 0 else 100
             )
+            HEALTHY_MANAGERS.set(healthy_managers)
 
             self.logger.info(
                 f"💚 System Health: {healthy_managers}/{total_managers} managers ({health_percentage:.1f}%)"
@@ -492,6 +823,21 @@ class GridOrchestrator:
                 "active_managers": len(self.advanced_managers),
                 "monitoring_active": self.monitoring_active,
             },
+            "client_cycle_stats": self.client_cycle_stats,
+            "tick_scheduler": self.get_tick_report(),
+            "exchange_gateways": get_all_gateway_stats(),
+            "market_data_cache": get_market_data_cache().get_stats(),
+            "database_pools": get_all_pool_stats(),
+            "database_write_queues": get_all_write_queue_stats(),
+            "api_key_cache": get_api_key_cache().get_stats(),
+            "telegram_outbox": get_all_outbox_stats(),
+            "notification_digest": get_notification_digest().get_stats(),
+            "symbol_rules": get_symbol_rules_registry().get_stats(),
+            "indicator_engine": get_indicator_engine().get_stats(),
+            "candle_store": get_candle_store().get_stats(),
+            "caches": get_cache_report(),
+            "service_container": self.services.get_stats(),
+            "recovery": self.recovery_report,
             "architecture": {
                 "system_type": "Single Advanced Grid",
                 "capital_efficiency": "100%",
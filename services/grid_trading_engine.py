@@ -9,31 +9,74 @@ Handles advanced grid trading with proper order management.
 
 import logging
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from binance.client import Client
 
+from config import Config
 from models.grid_config import validate_grid_config
+from services.exchange_gateway import get_exchange_gateway
 from services.fifo_service import FIFOService
 from services.grid_utils import GridUtilityService
+from services.market_data_cache import get_market_data_cache
+from services.precision_kernel import get_increment
+from services.service_container import get_service_container
+from utils.metrics import get_metrics_registry
+
+FILL_TO_REPLACEMENT_SECONDS = get_metrics_registry().histogram(
+    "gridbot_fill_to_replacement_seconds",
+    "Exchange fill time to replacement order handled",
+    ("side",),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
 
 
 class GridTradingEngine:
     """Production grid trading engine with enhanced profit capture"""
 
-    def __init__(self, binance_client: Client, client_id: int):
+    def __init__(
+        self,
+        binance_client: Client,
+        client_id: int,
+        fifo_service: Optional[FIFOService] = None,
+        utility: Optional[GridUtilityService] = None,
+    ):
         self.binance_client = binance_client
+        self.exchange = get_exchange_gateway(binance_client, client_id)
+        self.market_data = get_market_data_cache()
         self.client_id = client_id
         self.logger = logging.getLogger(__name__)
 
-        # Core services
-        self.utility = GridUtilityService(binance_client)
-        self.fifo_service = FIFOService()
+        # Core services (GridManager passes its own / the shared instances)
+        self.utility = utility or GridUtilityService(binance_client)
+        self.fifo_service = fifo_service or get_service_container().fifo_service
+
+        # Grid shape (backtests override these per parameter set)
+        self.levels_per_side = Config.GRID_LEVELS_PER_SIDE
+        self.replacement_profit_margin = Config.REPLACEMENT_PROFIT_MARGIN
 
         # Managers (set by GridManager)
         self.inventory_manager = None
         self.compound_manager = None
 
+        # Fill detection: stream events first, REST polling as reconciliation
+        self.stream_active = False
+        self.reconciliation_interval = Config.FILL_RECONCILIATION_INTERVAL
+        self._last_reconciliation: Dict[str, float] = {}
+        self._orders_in_progress = set()
+        self.fill_metrics = {
+            "events_received": 0,
+            "fills_from_stream": 0,
+            "orders_polled": 0,
+            "fills_from_polling": 0,
+            "reconciliation_runs": 0,
+            "duplicate_fills_skipped": 0,
+            "rest_requests": 0,
+            "rest_requests_saved": 0,
+        }
+        self.reconciliation_history_limit = Config.RECONCILIATION_HISTORY_LIMIT
+        self.last_reconciliation_report: Dict[str, Dict] = {}
+
         self.logger.info("🔧 GridTradingEngine initialized")
 
     def set_managers(self, inventory_manager, compound_manager):
@@ -72,7 +115,7 @@ class GridTradingEngine:
 
             try:
                 # Execute the purchase
-                order = self.binance_client.order_market_buy(
+                order = await self.exchange.order_market_buy(
                     symbol=symbol, quantity=asset_quantity
                 )
 
@@ -153,52 +196,37 @@ class GridTradingEngine:
                     f"Could not get exchange info for {grid_config.symbol}"
                 )
 
-            price_precision = exchange_rules.get("price_precision", 2)
-            tick_size = exchange_rules.get("tick_size", 0.01)
+            # SELL levels above and BUY levels below current price,
+            # quantized to the tick/step grid in one pass
+            per_side = self.levels_per_side
+            level_numbers = list(range(1, per_side + 1)) + list(
+                range(-1, -per_side - 1, -1)
+            )
+            raw_prices = []
+            for n in level_numbers:
+                level_spacing = spacing * (1 + abs(n) * 0.1)
+                direction = 1 if n > 0 else -1
+                raw_prices.append(current_price * (1 + direction * level_spacing))
+            quantized = self.utility.quantize_grid_levels(
+                raw_prices, [base_order_size] * len(level_numbers), exchange_rules
+            )
 
-            # SELL LEVELS (5 levels above current price)
             sell_levels = []
-            for i in range(1, 6):
-                level_spacing = spacing * (1 + i * 0.1)
-                raw_price = current_price * (1 + level_spacing)
-                price = self.utility.round_to_tick_size(raw_price, tick_size)
-
-                level_order_size = base_order_size
-                quantity = level_order_size / price
-
-                sell_levels.append(
-                    {
-                        "level": i,
-                        "side": "SELL",
-                        "price": price,
-                        "quantity": quantity,
-                        "order_size_usd": level_order_size,
-                        "order_id": None,
-                        "filled": False,
-                    }
-                )
-
-            # BUY LEVELS (5 levels below current price)
             buy_levels = []
-            for i in range(1, 6):
-                level_spacing = spacing * (1 + i * 0.1)
-                raw_price = current_price * (1 - level_spacing)
-                price = self.utility.round_to_tick_size(raw_price, tick_size)
-
-                level_order_size = base_order_size
-                quantity = level_order_size / price
-
-                buy_levels.append(
-                    {
-                        "level": -i,
-                        "side": "BUY",
-                        "price": price,
-                        "quantity": quantity,
-                        "order_size_usd": level_order_size,
-                        "order_id": None,
-                        "filled": False,
-                    }
-                )
+            for n, (price, quantity) in zip(level_numbers, quantized):
+                level = {
+                    "level": n,
+                    "side": "SELL" if n > 0 else "BUY",
+                    "price": price,
+                    "quantity": quantity,
+                    "order_size_usd": base_order_size,
+                    "order_id": None,
+                    "filled": False,
+                }
+                if n > 0:
+                    sell_levels.append(level)
+                else:
+                    buy_levels.append(level)
 
             # Update grid config
             grid_config.buy_levels = buy_levels
@@ -243,7 +271,7 @@ class GridTradingEngine:
             self.logger.info(f"🎯 Executing grid setup for {symbol}")
 
             # Get account balances
-            account = self.binance_client.get_account()
+            account = await self.exchange.get_account()
             usdt_balance = 0
             asset_balance = 0
 
@@ -372,13 +400,13 @@ class GridTradingEngine:
 
             # Place order
             if level["side"] == "BUY":
-                order = self.binance_client.order_limit_buy(
+                order = await self.exchange.order_limit_buy(
                     symbol=symbol,
                     quantity=quantity_string,
                     price=price_string,
                 )
             else:
-                order = self.binance_client.order_limit_sell(
+                order = await self.exchange.order_limit_sell(
                     symbol=symbol,
                     quantity=quantity_string,
                     price=price_string,
@@ -394,41 +422,229 @@ class GridTradingEngine:
             self.logger.error(f"❌ Order placement failed: {e}")
             return False
 
-    async def check_and_replace_filled_orders(self, symbol: str, grid_config):
-        """Check for filled orders and create replacements"""
+    def set_stream_active(self, active: bool):
+        """Toggle stream-driven fill detection (polling becomes reconciliation only)"""
+        if active != self.stream_active:
+            self.logger.info(
+                f"📡 Fill detection: {'user data stream' if active else 'REST polling'}"
+            )
+        self.stream_active = active
+
+    async def handle_execution_report(self, order: Dict, grid_config) -> bool:
+        """Process a streamed execution report for a grid symbol"""
+        self.fill_metrics["events_received"] += 1
+
         try:
-            all_levels = grid_config.buy_levels + grid_config.sell_levels
+            if order.get("status") != "FILLED":
+                return False
 
-            for level in all_levels:
-                if not level.get("order_id") or level.get("filled"):
-                    continue
+            level = self._find_level_by_order_id(grid_config, order["orderId"])
+            if level is None:
+                return False
+
+            self.logger.info(
+                f"📡 Stream FILLED order {order['orderId']} for {order['symbol']}"
+            )
+            handled = await self._handle_filled_order(
+                order["symbol"], level, order, grid_config
+            )
+            if handled:
+                self.fill_metrics["fills_from_stream"] += 1
+            return handled
+
+        except Exception as e:
+            self.logger.error(f"❌ Error handling execution report: {e}")
+            return False
 
+    def _find_level_by_order_id(self, grid_config, order_id) -> Optional[dict]:
+        """Find the open grid level that owns an order id"""
+        for level in grid_config.buy_levels + grid_config.sell_levels:
+            if level.get("order_id") is not None and str(level["order_id"]) == str(
+                order_id
+            ):
+                return level
+        return None
+
+    async def check_and_replace_filled_orders(
+        self, symbol: str, grid_config, handle_fills: bool = True
+    ) -> Optional[Dict]:
+        """Check for filled orders and create replacements
+
+        While the user data stream is healthy this only runs as a periodic
+        reconciliation to catch events missed during reconnects. With
+        handle_fills=False the detected fills are returned in
+        report["pending_fills"] for a later replace_pending_fills() call.
+        """
+        try:
+            now = time.time()
+            if self.stream_active:
+                last_run = self._last_reconciliation.get(symbol, 0)
+                if now - last_run < self.reconciliation_interval:
+                    return None
+            self._last_reconciliation[symbol] = now
+            self.fill_metrics["reconciliation_runs"] += 1
+
+            report = await self.reconcile_open_orders(
+                symbol, grid_config, handle_fills=handle_fills
+            )
+            self.last_reconciliation_report[symbol] = {
+                key: value for key, value in report.items() if key != "pending_fills"
+            }
+            return report
+
+        except Exception as e:
+            self.logger.error(f"❌ Error checking filled orders for {symbol}: {e}")
+            return None
+
+    async def replace_pending_fills(
+        self, symbol: str, pending_fills: List, grid_config
+    ) -> int:
+        """Process fills deferred by reconciliation and place replacement orders"""
+        replaced = 0
+        for level, order in pending_fills:
+            try:
+                if await self._handle_filled_order(symbol, level, order, grid_config):
+                    self.fill_metrics["fills_from_polling"] += 1
+                    replaced += 1
+            except Exception as e:
+                self.logger.error(
+                    f"❌ Error replacing order {order.get('orderId')}: {e}"
+                )
+        return replaced
+
+    async def reconcile_open_orders(
+        self, symbol: str, grid_config, handle_fills: bool = True
+    ) -> Dict:
+        """Diff grid levels against the exchange with O(1) requests per symbol
+
+        One get_open_orders call covers every resting level. Levels that are no
+        longer open are resolved from a single bounded get_all_orders window,
+        and only orders older than that window fall back to get_order.
+        """
+        report = {
+            "symbol": symbol,
+            "tracked": 0,
+            "open": 0,
+            "filled": [],
+            "closed_unfilled": [],
+            "missing": [],
+            "unknown": [],
+            "pending_fills": [],
+            "requests": 0,
+            "requests_saved": 0,
+            "timestamp": time.time(),
+        }
+
+        tracked = {}
+        for level in grid_config.buy_levels + grid_config.sell_levels:
+            if level.get("order_id") and not level.get("filled"):
+                tracked[str(level["order_id"])] = level
+
+        report["tracked"] = len(tracked)
+        if not tracked:
+            return report
+
+        self.fill_metrics["orders_polled"] += len(tracked)
+
+        # 1. Everything still resting on the book
+        open_orders = await self.exchange.get_open_orders(symbol=symbol)
+        report["requests"] += 1
+
+        open_ids = {str(order["orderId"]) for order in open_orders}
+        report["open"] = len(open_ids & tracked.keys())
+        report["unknown"] = sorted(open_ids - tracked.keys())
+
+        closed_ids = [order_id for order_id in tracked if order_id not in open_ids]
+
+        # 2. Resolve closed levels from one bounded history window
+        history = {}
+        if closed_ids:
+            oldest_id = min(int(order_id) for order_id in closed_ids)
+            try:
+                window = await self.exchange.get_all_orders(
+                    symbol=symbol,
+                    orderId=oldest_id,
+                    limit=self.reconciliation_history_limit,
+                )
+                report["requests"] += 1
+                history = {str(order["orderId"]): order for order in window}
+            except Exception as e:
+                self.logger.error(f"❌ Order history lookup failed for {symbol}: {e}")
+
+        for order_id in closed_ids:
+            level = tracked[order_id]
+            order = history.get(order_id)
+
+            if order is None:
+                # Outside the history window - fall back to a single lookup
                 try:
-                    # Check order status
-                    order = self.binance_client.get_order(
+                    order = await self.exchange.get_order(
                         symbol=symbol, orderId=level["order_id"]
                     )
+                    report["requests"] += 1
+                except Exception as e:
+                    self.logger.error(f"❌ Error checking order {order_id}: {e}")
+                    report["missing"].append(order_id)
+                    continue
 
-                    if order["status"] == "FILLED":
-                        self.logger.info(
-                            f"🔍 Processing FILLED order {order['orderId']} for {symbol}"
-                        )
-                        await self._handle_filled_order(
-                            symbol, level, order, grid_config
-                        )
+            if order["status"] == "FILLED":
+                report["filled"].append(order_id)
+                if not handle_fills:
+                    report["pending_fills"].append((level, order))
+                    continue
 
-                except Exception as e:
-                    self.logger.error(
-                        f"❌ Error checking order {level.get('order_id')}: {e}"
-                    )
+                self.logger.info(
+                    f"🔍 Processing FILLED order {order['orderId']} for {symbol}"
+                )
+                if await self._handle_filled_order(symbol, level, order, grid_config):
+                    self.fill_metrics["fills_from_polling"] += 1
+            elif order["status"] in ("NEW", "PARTIALLY_FILLED"):
+                # Raced with get_open_orders; still working
+                report["open"] += 1
+            else:
+                # Resolved: stop tracking so later cycles skip the history call
+                report["closed_unfilled"].append(order_id)
+                level["order_id"] = None
+                level["closed_status"] = order["status"]
+                self.logger.warning(
+                    f"⚠️ {symbol} level {level.get('level')} order {order_id} is {order['status']}"
+                )
 
-        except Exception as e:
-            self.logger.error(f"❌ Error checking filled orders for {symbol}: {e}")
+        report["requests_saved"] = max(report["tracked"] - report["requests"], 0)
+        self.fill_metrics["rest_requests"] += report["requests"]
+        self.fill_metrics["rest_requests_saved"] += report["requests_saved"]
+
+        if report["missing"] or report["unknown"] or report["closed_unfilled"]:
+            self.logger.warning(
+                f"⚠️ {symbol} reconciliation: {len(report['missing'])} missing, "
+                f"{len(report['unknown'])} unknown, "
+                f"{len(report['closed_unfilled'])} closed unfilled"
+            )
+
+        return report
+
+    def get_fill_detection_stats(self) -> Dict:
+        """Counters comparing stream events with REST polling"""
+        return {
+            **self.fill_metrics,
+            "mode": "stream" if self.stream_active else "polling",
+            "reconciliation_interval": self.reconciliation_interval,
+            "last_reports": self.last_reconciliation_report,
+        }
 
     async def _handle_filled_order(
         self, symbol: str, level: dict, order: dict, grid_config
-    ):
+    ) -> bool:
         """🚀 ENHANCED: Handle filled order with actual price capture for profit optimization"""
+        # Stream and reconciliation can both see the same fill
+        order_key = (symbol, str(order["orderId"]))
+        if order_key in self._orders_in_progress or str(
+            level.get("order_id")
+        ) != str(order["orderId"]):
+            self.fill_metrics["duplicate_fills_skipped"] += 1
+            return False
+
+        self._orders_in_progress.add(order_key)
         try:
             side = order["side"]
             quantity = float(order["executedQty"])
@@ -471,9 +687,18 @@ class GridTradingEngine:
 
             # 🚀 Create enhanced replacement order with profit optimization
             await self._create_replacement_order(symbol, level, side, grid_config)
+            filled_at = float(level["fill_timestamp"] or time.time() * 1000) / 1000
+            FILL_TO_REPLACEMENT_SECONDS.observe(
+                max(0.0, time.time() - filled_at), side=side
+            )
+            return True
 
         except Exception as e:
             self.logger.error(f"❌ Error handling filled order: {e}")
+            return False
+
+        finally:
+            self._orders_in_progress.discard(order_key)
 
     async def _create_replacement_order(
         self, symbol: str, level: dict, original_side: str, grid_config
@@ -524,9 +749,15 @@ class GridTradingEngine:
                 )
                 return
 
-            # Format quantity with proper precision
-            quantity_precision = exchange_rules.get("quantity_precision", 4)
-            formatted_quantity = round(optimal_quantity, quantity_precision)
+            # Floor to stepSize so a SELL never exceeds the reserved inventory
+            step = get_increment(exchange_rules["step_size"])
+            quantity_steps = step.count_down(optimal_quantity)
+            if quantity_steps <= 0:
+                self.logger.warning(
+                    f"⚠️ Replacement quantity for {symbol} is below one step"
+                )
+                return
+            formatted_quantity = step.value(quantity_steps)
 
             # Validate inventory availability
             if replacement_side == "BUY":
@@ -555,7 +786,7 @@ class GridTradingEngine:
 
             if replacement_side == "SELL":
                 # 🎯 QUICK PROFIT CAPTURE: Place sell at filled price + small profit margin
-                profit_margin = 0.025  # 2.5% profit target (configurable)
+                profit_margin = self.replacement_profit_margin
                 replacement_price = actual_fill_price * (1 + profit_margin)
 
                 self.logger.info(
@@ -572,23 +803,18 @@ class GridTradingEngine:
                     f"({grid_spacing * level_number * 100:.1f}% below market)"
                 )
 
-            # Round to proper precision
-            tick_size = exchange_rules.get("tick_size", 0.01)
-            replacement_price = self.utility.round_to_tick_size(
-                replacement_price, tick_size
-            )
-
-            # Format strings for Binance API
-            quantity_string = f"{formatted_quantity:.{quantity_precision}f}".rstrip(
-                "0"
-            ).rstrip(".")
-            price_string = f"{replacement_price:.6f}".rstrip("0").rstrip(".")
+            # Integer tick/step counts, formatted exactly like grid levels
+            tick = get_increment(exchange_rules["tick_size"])
+            price_ticks = max(tick.count(replacement_price), 1)
+            replacement_price = tick.value(price_ticks)
 
-            # Ensure minimum precision
-            if "." not in quantity_string and quantity_precision > 0:
-                quantity_string = f"{formatted_quantity:.1f}"
-            if "." not in price_string:
-                price_string = f"{replacement_price:.2f}"
+            price_string = tick.format(
+                price_ticks, ".00" if exchange_rules["price_precision"] > 0 else ""
+            )
+            quantity_string = step.format(
+                quantity_steps,
+                ".0" if exchange_rules["quantity_precision"] > 0 else "",
+            )
 
             # Reserve inventory
             if not self.inventory_manager.reserve_for_order(
@@ -600,13 +826,13 @@ class GridTradingEngine:
             # Place replacement order
             try:
                 if replacement_side == "BUY":
-                    order = self.binance_client.order_limit_buy(
+                    order = await self.exchange.order_limit_buy(
                         symbol=symbol,
                         quantity=quantity_string,
                         price=price_string,
                     )
                 else:
-                    order = self.binance_client.order_limit_sell(
+                    order = await self.exchange.order_limit_sell(
                         symbol=symbol,
                         quantity=quantity_string,
                         price=price_string,
@@ -664,8 +890,7 @@ class GridTradingEngine:
     async def _get_current_price(self, symbol: str) -> Optional[float]:
         """Get current market price"""
         try:
-            ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-            return float(ticker["price"])
+            return await self.market_data.get_price(symbol, self.exchange)
         except Exception as e:
             self.logger.error(f"❌ Error getting price for {symbol}: {e}")
             return None
@@ -679,7 +904,7 @@ class GridTradingEngine:
             for level in grid_config.buy_levels:
                 if level.get("order_id") and not level.get("filled"):
                     try:
-                        self.binance_client.cancel_order(
+                        await self.exchange.cancel_order(
                             symbol=symbol, orderId=level["order_id"]
                         )
                         level["order_id"] = None
@@ -693,7 +918,7 @@ class GridTradingEngine:
             for level in grid_config.sell_levels:
                 if level.get("order_id") and not level.get("filled"):
                     try:
-                        self.binance_client.cancel_order(
+                        await self.exchange.cancel_order(
                             symbol=symbol, orderId=level["order_id"]
                         )
                         level["order_id"] = None
@@ -752,39 +977,17 @@ class GridTradingEngine:
         new_price: float,
         quantity: float,
     ):
-        """Send Telegram notification for successful order replacement"""
+        """Count the replacement in this symbol's notification digest"""
         try:
             # Import here to avoid circular imports
-            from services.telegram_notifier import TelegramNotifier
+            from services.notification_digest import get_notification_digest
 
-            notifier = TelegramNotifier()
-            if not notifier.enabled:
+            digest = get_notification_digest()
+            if not digest.enabled:
                 return
 
-            # Calculate expected profit for SELL orders
-            expected_profit = ""
-            if replacement_side == "SELL" and fill_price:
-                profit_per_unit = new_price - fill_price
-                total_expected_profit = profit_per_unit * quantity
-                expected_profit = f" (Expected profit: ${total_expected_profit:.2f})"
-
-            # Build notification message
-            asset_name = symbol.replace("USDT", "")
-            level_info = (
-                f"Level {abs(level.get('level', 0))}" if level.get("level") else "Grid"
-            )
-
-            message = f"""🔄 **ORDER REPLACED**
-
-    📊 **{asset_name}/USDT** - {level_info}
-    🟢 **Filled:** {original_side} @ ${fill_price:.6f}
-    🔵 **New:** {replacement_side} @ ${new_price:.6f}
-    📦 **Quantity:** {quantity:.4f} {asset_name}
-    🆔 **Order ID:** {order["orderId"]}{expected_profit}
-
-    ✅ Replacement successful!"""
-
-            await notifier.send_message(message)
+            # Folded into one summary with the fills that caused it
+            await digest.record_replacement(self.client_id, symbol)
 
         except Exception as e:
             # Don't let notification errors affect trading
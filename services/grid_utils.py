@@ -10,10 +10,19 @@ The issue was in the rstrip("0") logic which was too aggressive.
 """
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
 from binance.client import Client
 
+from services.exchange_gateway import get_exchange_gateway
+from services.precision_kernel import (
+    get_increment,
+    min_count_for_notional,
+    quantize_grid,
+)
+from services.symbol_rules import get_symbol_rules_registry
+from utils.ttl_cache import TTLCache
+
 
 class GridUtilityService:
     """
@@ -23,10 +32,12 @@ class GridUtilityService:
 
     def __init__(self, binance_client: Optional[Client] = None):
         self.binance_client = binance_client
+        self.exchange = get_exchange_gateway(binance_client)
         self.logger = logging.getLogger(__name__)
 
-        # Cache for exchange info to avoid repeated API calls
-        self._exchange_info_cache: Dict[str, Dict] = {}
+        # Parsed rules; raw exchange info comes from the shared registry
+        self._exchange_info_cache = TTLCache("exchange_rules_parsed", max_size=512)
+        self._exchange_info_version = 0
 
     # ========================================
     # PRICE AND QUANTITY VALIDATION METHODS
@@ -47,14 +58,9 @@ class GridUtilityService:
             if tick_size <= 0:
                 return round(price, 6)  # Fallback
 
-            # Round to nearest tick
-            rounded = round(price / tick_size) * tick_size
-
-            # Ensure we don't round to zero
-            if rounded <= 0:
-                rounded = tick_size
-
-            return rounded
+            # Round to nearest tick, never down to zero
+            tick = get_increment(tick_size)
+            return tick.value(max(tick.count(price), 1))
 
         except Exception as e:
             self.logger.error(f"Tick size rounding error: {e}")
@@ -73,13 +79,13 @@ class GridUtilityService:
             Valid price formatted for Binance
         """
         try:
-            # Round to tick size
-            rounded = round(price / tick_size) * tick_size
+            tick = get_increment(tick_size)
+            rounded = tick.round(price)
 
-            # Format with correct precision
-            formatted = round(rounded, precision)
-
-            return formatted
+            # Only coarser precision than the tick needs another rounding
+            if precision < tick.decimals:
+                return round(rounded, precision)
+            return rounded
 
         except Exception:
             return round(price, precision)
@@ -100,17 +106,13 @@ class GridUtilityService:
             Valid quantity formatted for Binance
         """
         try:
-            # Round to step size
-            rounded = round(quantity / step_size) * step_size
+            # Round to step size, ensuring minimum quantity
+            step = get_increment(step_size)
+            rounded = step.value(max(step.count(quantity), step.count_up(min_qty)))
 
-            # Ensure minimum quantity
-            if rounded < min_qty:
-                rounded = min_qty
-
-            # Format with correct precision
-            formatted = round(rounded, precision)
-
-            return formatted
+            if precision < step.decimals:
+                return round(rounded, precision)
+            return rounded
 
         except Exception:
             return max(round(quantity, precision), min_qty)
@@ -126,14 +128,7 @@ class GridUtilityService:
             Number of decimal places needed
         """
         try:
-            if step_size >= 1:
-                return 0
-
-            # Convert to string and count decimal places
-            step_str = f"{step_size:.10f}".rstrip("0")
-            if "." in step_str:
-                return len(step_str.split(".")[1])
-            return 0
+            return get_increment(step_size).decimals
 
         except Exception:
             return 8  # Safe fallback
@@ -155,33 +150,35 @@ class GridUtilityService:
         if not self.binance_client:
             return self._get_fallback_rules(symbol)
 
-        # Check cache first
-        if symbol in self._exchange_info_cache:
-            return self._exchange_info_cache[symbol]
-
         try:
-            # Get exchange info from Binance
-            exchange_info = self.binance_client.get_exchange_info()
+            registry = get_symbol_rules_registry()
+            symbol_info = await registry.get(symbol, self.exchange)
 
-            for symbol_info in exchange_info["symbols"]:
-                if symbol_info["symbol"] == symbol:
-                    rules = self._parse_symbol_rules(symbol_info)
+            # Parsed rules are only valid for the registry load they came from
+            if registry.version != self._exchange_info_version:
+                self._exchange_info_cache.clear()
+                self._exchange_info_version = registry.version
 
-                    # Cache the result
-                    self._exchange_info_cache[symbol] = rules
+            rules = self._exchange_info_cache.get(symbol)
+            if rules is not None:
+                return rules
 
-                    self.logger.info(f"✅ Exchange rules for {symbol}:")
-                    self.logger.info(
-                        f"   💲 Price: tick_size={rules['tick_size']}, precision={rules['price_precision']}"
-                    )
-                    self.logger.info(
-                        f"   📦 Quantity: step_size={rules['step_size']}, precision={rules['quantity_precision']}"
-                    )
-                    self.logger.info(f"   💰 Min notional: ${rules['min_notional']}")
+            if symbol_info is None:
+                raise ValueError(f"Symbol {symbol} not found")
 
-                    return rules
+            rules = self._parse_symbol_rules(symbol_info)
+            self._exchange_info_cache.set(symbol, rules)
 
-            raise ValueError(f"Symbol {symbol} not found")
+            self.logger.info(f"✅ Exchange rules for {symbol}:")
+            self.logger.info(
+                f"   💲 Price: tick_size={rules['tick_size']}, precision={rules['price_precision']}"
+            )
+            self.logger.info(
+                f"   📦 Quantity: step_size={rules['step_size']}, precision={rules['quantity_precision']}"
+            )
+            self.logger.info(f"   💰 Min notional: ${rules['min_notional']}")
+
+            return rules
 
         except Exception as e:
             self.logger.error(f"❌ Failed to get exchange rules for {symbol}: {e}")
@@ -403,47 +400,39 @@ class GridUtilityService:
         """
         Validate and fix order parameters
 
+        Price and quantity are handled as integer tick/step counts, so the
+        notional check and the strings involve no float rounding.
+
         Returns:
             Dict with valid_quantity, valid_price, and validation status
         """
         try:
-            # Validate price
-            valid_price = self.make_valid_price(
-                price, rules["tick_size"], rules["price_precision"]
-            )
+            tick = get_increment(rules["tick_size"])
+            step = get_increment(rules["step_size"])
+
+            # Validate price and quantity
+            price_ticks = max(tick.count(price), 1)
+            quantity_steps = max(step.count(quantity), step.count_up(rules["min_qty"]))
 
-            # Validate quantity
-            valid_quantity = self.make_valid_quantity(
-                quantity,
-                rules["step_size"],
-                rules["quantity_precision"],
-                rules["min_qty"],
+            # Adjust quantity up to meet minimum notional
+            quantity_steps = max(
+                quantity_steps,
+                min_count_for_notional(price_ticks, tick, step, rules["min_notional"]),
             )
 
-            # Check notional value
-            notional_value = valid_quantity * valid_price
-
-            if notional_value < rules["min_notional"]:
-                # Adjust quantity to meet minimum notional
-                required_quantity = rules["min_notional"] / valid_price
-                valid_quantity = self.make_valid_quantity(
-                    required_quantity,
-                    rules["step_size"],
-                    rules["quantity_precision"],
-                    rules["min_qty"],
-                )
-                notional_value = valid_quantity * valid_price
+            valid_price = tick.value(price_ticks)
+            valid_quantity = step.value(quantity_steps)
 
             return {
                 "valid": True,
                 "valid_price": valid_price,
                 "valid_quantity": valid_quantity,
-                "notional_value": notional_value,
-                "price_string": self.format_price_string(
-                    valid_price, rules["price_precision"]
+                "notional_value": valid_quantity * valid_price,
+                "price_string": tick.format(
+                    price_ticks, ".00" if rules["price_precision"] > 0 else ""
                 ),
-                "quantity_string": self.format_quantity_string(
-                    valid_quantity, rules["quantity_precision"]
+                "quantity_string": step.format(
+                    quantity_steps, ".0" if rules["quantity_precision"] > 0 else ""
                 ),
             }
 
@@ -456,6 +445,27 @@ class GridUtilityService:
                 "valid_quantity": quantity,
             }
 
+    def quantize_grid_levels(
+        self,
+        prices: Sequence[float],
+        order_sizes_usd: Sequence[float],
+        rules: Dict,
+    ) -> List[tuple]:
+        """
+        Round every level of a grid in one vectorized pass
+
+        Returns:
+            List of (price, quantity) pairs on the tick/step grid
+        """
+        valid_prices, valid_quantities = quantize_grid(
+            prices,
+            order_sizes_usd,
+            rules["tick_size"],
+            rules["step_size"],
+            rules.get("min_qty"),
+        )
+        return list(zip(valid_prices.tolist(), valid_quantities.tolist()))
+
     # ========================================
     # CACHE MANAGEMENT
     # ========================================
@@ -467,7 +477,7 @@ class GridUtilityService:
 
     def get_cached_symbols(self) -> list:
         """Get list of symbols in cache"""
-        return list(self._exchange_info_cache.keys())
+        return self._exchange_info_cache.keys()
 
 
 # ========================================
@@ -0,0 +1,305 @@
+# services/indicator_engine.py
+"""
+Indicator Engine - Shared RSI / volatility / trend / volume per symbol
+======================================================================
+
+MarketAnalysisService fetched 1h klines three times per analysis (price
+trend, RSI, volatility) plus a 48h window for volume, and every client's
+VolatilityBasedRiskManager fetched them again for its own volatility.
+
+One engine per process:
+- One candle series per (symbol, interval), LOOKBACK candles long, read
+  from the incremental candle store
+- RSI (Wilder smoothing), realized volatility, 12/12 trend and 24/24
+  volume ratio computed together from that series with NumPy
+- Wilder averages are kept at the last closed candle and stepped forward
+  only over candles that closed since, so RSI keeps its full history
+- Stale-while-revalidate: after the TTL the previous snapshot is still
+  served (up to INDICATOR_MAX_STALE) while one background task refreshes
+  it, so a TTL rollover never sends every client to the exchange at once
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config import Config
+from services.candle_store import INTERVAL_MINUTES, get_candle_store
+from services.market_data_cache import KLINE_TTL
+
+RSI_PERIOD = 14
+VOLATILITY_WINDOW = 24  # candles of returns
+TREND_WINDOW = 12  # recent vs previous candles
+VOLUME_WINDOW = 24  # recent vs previous candles
+
+_engine: Optional["IndicatorEngine"] = None
+
+
+class IndicatorSnapshot:
+    """Indicators for one symbol/interval at one point in time
+
+    Fields are None when the series is too short for that indicator.
+    """
+
+    __slots__ = (
+        "symbol",
+        "interval",
+        "candles",
+        "close",
+        "rsi",
+        "volatility",
+        "daily_volatility",
+        "annualized_volatility",
+        "trend",
+        "volume_ratio",
+        "computed_at",
+        # Wilder state as of the last closed candle
+        "avg_gain",
+        "avg_loss",
+        "state_open_time",
+        "state_close",
+    )
+
+    def __init__(self, symbol: str, interval: str):
+        self.symbol = symbol
+        self.interval = interval
+        self.candles = 0
+        self.close: Optional[float] = None
+        self.rsi: Optional[float] = None
+        self.volatility: Optional[float] = None
+        self.daily_volatility: Optional[float] = None
+        self.annualized_volatility: Optional[float] = None
+        self.trend: Optional[float] = None
+        self.volume_ratio: Optional[float] = None
+        self.computed_at = 0.0
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self.state_open_time: Optional[float] = None
+        self.state_close: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "symbol": self.symbol,
+            "interval": self.interval,
+            "candles": self.candles,
+            "close": self.close,
+            "rsi": self.rsi,
+            "volatility": self.volatility,
+            "daily_volatility": self.daily_volatility,
+            "annualized_volatility": self.annualized_volatility,
+            "trend": self.trend,
+            "volume_ratio": self.volume_ratio,
+            "age_seconds": round(time.time() - self.computed_at, 1),
+        }
+
+
+def _wilder(seed: float, values: np.ndarray, period: int = RSI_PERIOD) -> float:
+    """Apply avg = avg * (1 - 1/period) + value / period over values at once"""
+    if not len(values):
+        return seed
+    decay = 1.0 - 1.0 / period
+    weights = decay ** np.arange(len(values) - 1, -1, -1)
+    return float(seed * decay ** len(values) + np.dot(weights, values) / period)
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 50.0 if avg_gain == 0 else 100.0
+    return float(100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+
+def compute_indicators(
+    symbol: str,
+    interval: str,
+    klines: Union[List, np.ndarray],
+    previous: Optional[IndicatorSnapshot] = None,
+    now: Optional[float] = None,
+) -> IndicatorSnapshot:
+    """Build a snapshot from raw klines (reusing previous Wilder state)"""
+    snapshot = IndicatorSnapshot(symbol, interval)
+    snapshot.computed_at = time.time() if now is None else now
+    if not len(klines):
+        return snapshot
+
+    if isinstance(klines, np.ndarray):
+        # CANDLE_DTYPE records from the candle store
+        open_times = klines["open_time"].astype(np.float64)
+        closes = klines["close"]
+        volumes = klines["volume"]
+        close_times = klines["close_time"].astype(np.float64)
+    else:
+        # Raw kline lists: open_time, close, volume, close_time
+        series = np.asarray(
+            [(k[0], k[4], k[5], k[6]) for k in klines], dtype=np.float64
+        )
+        open_times, closes, volumes, close_times = series.T
+    snapshot.candles = len(closes)
+    snapshot.close = float(closes[-1])
+
+    # ---- RSI: Wilder averages over closed candles, live candle on top ----
+    deltas = np.diff(closes)
+    gains = np.clip(deltas, 0.0, None)
+    losses = np.clip(-deltas, 0.0, None)
+    closed = int(np.searchsorted(close_times, snapshot.computed_at * 1000))
+
+    state = None
+    if closed and previous is not None and previous.avg_gain is not None:
+        matches = np.nonzero(open_times == previous.state_open_time)[0]
+        if len(matches) and closes[matches[0]] == previous.state_close:
+            # Step only over candles that closed since the previous snapshot
+            start = matches[0]
+            state = (
+                _wilder(previous.avg_gain, gains[start : closed - 1]),
+                _wilder(previous.avg_loss, losses[start : closed - 1]),
+            )
+
+    if state is None and closed - 1 >= RSI_PERIOD:
+        state = (
+            _wilder(float(gains[:RSI_PERIOD].mean()), gains[RSI_PERIOD : closed - 1]),
+            _wilder(float(losses[:RSI_PERIOD].mean()), losses[RSI_PERIOD : closed - 1]),
+        )
+
+    if state is not None:
+        snapshot.avg_gain, snapshot.avg_loss = state
+        snapshot.state_open_time = float(open_times[closed - 1])
+        snapshot.state_close = float(closes[closed - 1])
+        avg_gain, avg_loss = state
+        if closed < len(closes):
+            # Forming candle counts for the live value but not the state
+            avg_gain = _wilder(avg_gain, gains[closed - 1 :])
+            avg_loss = _wilder(avg_loss, losses[closed - 1 :])
+        snapshot.rsi = max(0.0, min(100.0, _rsi(avg_gain, avg_loss)))
+
+    # ---- Realized volatility of simple returns ----
+    recent = closes[-(VOLATILITY_WINDOW + 1) :]
+    if len(recent) > 10 and np.all(recent[:-1] > 0):
+        returns = recent[1:] / recent[:-1] - 1.0
+        periods_per_day = 1440 / INTERVAL_MINUTES.get(interval, 60)
+        snapshot.volatility = float(np.std(returns))
+        snapshot.daily_volatility = snapshot.volatility * float(
+            np.sqrt(periods_per_day)
+        )
+        snapshot.annualized_volatility = snapshot.daily_volatility * float(
+            np.sqrt(365)
+        )
+
+    # ---- Trend: recent vs previous window average ----
+    if len(closes) >= 2 * TREND_WINDOW:
+        recent_avg = closes[-TREND_WINDOW:].mean()
+        older_avg = closes[-2 * TREND_WINDOW : -TREND_WINDOW].mean()
+        snapshot.trend = (
+            float((recent_avg - older_avg) / older_avg) if older_avg else 0.0
+        )
+
+    # ---- Volume ratio: recent vs previous window average ----
+    if len(volumes) >= 2 * VOLUME_WINDOW:
+        recent_avg = volumes[-VOLUME_WINDOW:].mean()
+        older_avg = volumes[-2 * VOLUME_WINDOW : -VOLUME_WINDOW].mean()
+        snapshot.volume_ratio = float(recent_avg / older_avg) if older_avg else 1.0
+
+    return snapshot
+
+
+class IndicatorEngine:
+    """Process-wide indicator snapshots with stale-while-revalidate refresh"""
+
+    def __init__(
+        self,
+        lookback: Optional[int] = None,
+        max_stale: Optional[float] = None,
+    ):
+        self.candles = get_candle_store()
+        self.lookback = lookback or Config.INDICATOR_LOOKBACK_CANDLES
+        self.max_stale = Config.INDICATOR_MAX_STALE if max_stale is None else max_stale
+        self.logger = logging.getLogger(__name__)
+
+        self._snapshots: Dict[Tuple[str, str], IndicatorSnapshot] = {}
+        self._refreshes: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {
+            "hits": 0,
+            "stale_served": 0,
+            "blocking_loads": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    async def get(
+        self, symbol: str, exchange, interval: str = "1h"
+    ) -> IndicatorSnapshot:
+        """Current indicators (never more than one refresh per symbol at a time)"""
+        key = (symbol, interval)
+        snapshot = self._snapshots.get(key)
+        now = time.time()
+
+        if snapshot is not None:
+            age = now - snapshot.computed_at
+            if age < KLINE_TTL.get(interval, 60):
+                self.stats["hits"] += 1
+                return snapshot
+            if age < self.max_stale:
+                self.stats["stale_served"] += 1
+                self._refresh_task(key, exchange)
+                return snapshot
+
+        self.stats["blocking_loads"] += 1
+        return await asyncio.shield(self._refresh_task(key, exchange))
+
+    def peek(self, symbol: str, interval: str = "1h") -> Optional[IndicatorSnapshot]:
+        """Last snapshot without any I/O"""
+        return self._snapshots.get((symbol, interval))
+
+    def _refresh_task(self, key: Tuple[str, str], exchange) -> asyncio.Task:
+        task = self._refreshes.get(key)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._refresh(key, exchange))
+            self._refreshes[key] = task
+        return task
+
+    async def _refresh(self, key: Tuple[str, str], exchange) -> IndicatorSnapshot:
+        symbol, interval = key
+        try:
+            klines = await self.candles.get_candles(
+                symbol, interval, self.lookback, exchange
+            )
+
+            start = time.perf_counter()
+            previous = self._snapshots.get(key)
+            snapshot = compute_indicators(symbol, interval, klines, previous)
+            self.stats["refreshes"] += 1
+
+            self._snapshots[key] = snapshot
+            self.logger.debug(
+                f"📈 Indicators for {symbol} {interval}: {len(klines)} candles in "
+                f"{(time.perf_counter() - start) * 1000:.2f}ms"
+            )
+            return snapshot
+
+        except Exception as e:
+            self.stats["refresh_errors"] += 1
+            self.logger.warning(f"⚠️ Indicator refresh failed for {symbol}: {e}")
+            previous = self._snapshots.get(key)
+            if previous is not None:
+                return previous
+            raise
+
+        finally:
+            self._refreshes.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "series": len(self._snapshots),
+            "refreshing": len(self._refreshes),
+            "lookback_candles": self.lookback,
+        }
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Process-wide indicator engine"""
+    global _engine
+    if _engine is None:
+        _engine = IndicatorEngine()
+    return _engine
@@ -12,6 +12,9 @@ from typing import Dict, List, Tuple
 
 from binance.client import Client
 
+from services.exchange_gateway import get_exchange_gateway
+from services.market_data_cache import get_market_data_cache
+
 
 class AssetInventory:
     """Track inventory for a single trading pair"""
@@ -52,6 +55,8 @@ class SingleGridInventoryManager:
 
     def __init__(self, binance_client: Client, total_capital: float = 2400.0):
         self.binance_client = binance_client
+        self.exchange = get_exchange_gateway(binance_client)
+        self.market_data = get_market_data_cache()
         self.total_capital = total_capital
         self.logger = logging.getLogger(__name__)
         self.inventories: Dict[str, AssetInventory] = {}
@@ -365,8 +370,7 @@ class SingleGridInventoryManager:
     async def _get_current_price(self, symbol: str) -> float:
         """Get current market price"""
         try:
-            ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-            return float(ticker["price"])
+            return await self.market_data.get_price(symbol, self.exchange)
         except Exception as e:
             self.logger.error(f"❌ Error getting price for {symbol}: {e}")
             return 0.0
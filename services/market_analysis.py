@@ -2,13 +2,16 @@
 """Fixed Market Analysis Service with Better Error Handling"""
 
 import logging
-import time
 from datetime import datetime
 from typing import Dict, Optional
 
-import numpy as np
 from binance.client import Client
 
+from services.exchange_gateway import get_exchange_gateway
+from services.indicator_engine import IndicatorSnapshot, get_indicator_engine
+from services.market_data_cache import get_market_data_cache
+from utils.ttl_cache import TTLCache
+
 
 class MarketCondition:
     """Market condition classification"""
@@ -23,12 +26,16 @@ class MarketAnalysisService:
 
     def __init__(self, binance_client: Client):
         self.binance_client = binance_client
+        self.exchange = get_exchange_gateway(binance_client)
+        self.market_data = get_market_data_cache()
         self.logger = logging.getLogger(__name__)
 
         # Cache for market data
         self.price_cache = {}
-        self.analysis_cache = {}
         self.cache_timeout = 300  # 5 minutes
+        self.analysis_cache = TTLCache(
+            "market_analysis", max_size=256, ttl=self.cache_timeout
+        )
 
         # Fear & Greed Index (if available)
         self.fear_greed_cache = None
@@ -41,64 +48,64 @@ class MarketAnalysisService:
     async def get_market_condition(self, symbol: str) -> Dict:
         """Get market condition with robust fallback handling"""
         try:
-            # Check cache first
-            cache_key = f"{symbol}_{int(time.time() // self.cache_timeout)}"
-            if cache_key in self.analysis_cache:
-                return self.analysis_cache[cache_key]
+            # Concurrent callers for one symbol share a single analysis
+            return await self.analysis_cache.get_or_load(
+                symbol, lambda: self._analyze_market_condition(symbol)
+            )
 
-            self.logger.info(f"🔍 Analyzing market condition for {symbol}")
+        except Exception as e:
+            self.logger.error(f"❌ Market analysis failed for {symbol}: {e}")
+            # Return safe neutral condition
+            return self._get_fallback_condition(symbol)
 
-            # Get basic price data (most reliable)
-            price_data = await self._get_price_data_safe(symbol)
+    async def _analyze_market_condition(self, symbol: str) -> Dict:
+        """Fresh analysis (cached per symbol for cache_timeout)"""
+        self.logger.info(f"🔍 Analyzing market condition for {symbol}")
 
-            # Get technical indicators with fallbacks
-            rsi = await self._calculate_rsi_safe(symbol)
-            volatility = await self._calculate_volatility_safe(symbol)
-            volume_profile = await self._analyze_volume_safe(symbol)
+        # One 24h ticker and one shared candle series per analysis
+        ticker = await self._get_ticker_safe(symbol)
+        indicators = await self._get_indicators_safe(symbol)
 
-            # Skip Fear & Greed for now to avoid external API issues
-            fear_greed = None
+        price_data = self._get_price_data_safe(symbol, ticker, indicators)
+        rsi = indicators.rsi if indicators and indicators.rsi is not None else 50.0
+        volatility = self._get_volatility_safe(indicators)
+        volume_profile = self._analyze_volume_safe(ticker, indicators)
 
-            # Combine all indicators
-            market_score = self._calculate_market_score_safe(
-                price_data, rsi, volatility, volume_profile, fear_greed
-            )
+        # Skip Fear & Greed for now to avoid external API issues
+        fear_greed = None
 
-            # Determine condition
-            if market_score >= self.BULLISH_THRESHOLD:
-                condition = MarketCondition.BULLISH
-            elif market_score <= self.BEARISH_THRESHOLD:
-                condition = MarketCondition.BEARISH
-            else:
-                condition = MarketCondition.NEUTRAL
-
-            result = {
-                "symbol": symbol,
-                "condition": condition,
-                "score": market_score,
-                "confidence": self._calculate_confidence(market_score),
-                "indicators": {
-                    "rsi": rsi,
-                    "volatility": volatility,
-                    "volume_ratio": volume_profile.get("ratio", 1.0),
-                    "price_trend": price_data.get("trend", 0.0),
-                    "fear_greed": fear_greed,
-                },
-                "timestamp": datetime.now().isoformat(),
-            }
+        # Combine all indicators
+        market_score = self._calculate_market_score_safe(
+            price_data, rsi, volatility, volume_profile, fear_greed
+        )
 
-            # Cache the result
-            self.analysis_cache[cache_key] = result
+        # Determine condition
+        if market_score >= self.BULLISH_THRESHOLD:
+            condition = MarketCondition.BULLISH
+        elif market_score <= self.BEARISH_THRESHOLD:
+            condition = MarketCondition.BEARISH
+        else:
+            condition = MarketCondition.NEUTRAL
 
-            self.logger.info(
-                f"📊 Market analysis for {symbol}: {condition} (score: {market_score:.2f})"
-            )
-            return result
+        result = {
+            "symbol": symbol,
+            "condition": condition,
+            "score": market_score,
+            "confidence": self._calculate_confidence(market_score),
+            "indicators": {
+                "rsi": rsi,
+                "volatility": volatility,
+                "volume_ratio": volume_profile.get("ratio", 1.0),
+                "price_trend": price_data.get("trend", 0.0),
+                "fear_greed": fear_greed,
+            },
+            "timestamp": datetime.now().isoformat(),
+        }
 
-        except Exception as e:
-            self.logger.error(f"❌ Market analysis failed for {symbol}: {e}")
-            # Return safe neutral condition
-            return self._get_fallback_condition(symbol)
+        self.logger.info(
+            f"📊 Market analysis for {symbol}: {condition} (score: {market_score:.2f})"
+        )
+        return result
 
     def _get_fallback_condition(self, symbol: str) -> Dict:
         """Return safe fallback market condition"""
@@ -119,32 +126,42 @@ class MarketAnalysisService:
             "error": "Market analysis unavailable, using neutral condition",
         }
 
-    async def _get_price_data_safe(self, symbol: str) -> Dict:
-        """Get price data with error handling"""
+    async def _get_ticker_safe(self, symbol: str) -> Optional[Dict]:
+        """24h ticker from the shared market data cache"""
         try:
-            # Get 24h price data
-            ticker = self.binance_client.get_ticker(symbol=symbol)
-            current_price = float(ticker["lastPrice"])
-            price_change_24h = float(ticker["priceChangePercent"])
+            return await self.market_data.get_ticker_24h(symbol, self.exchange)
+        except Exception as e:
+            self.logger.error(f"❌ Ticker error for {symbol}: {e}")
+            return None
 
-            # Try to get historical data for trend analysis
-            try:
-                klines = self.binance_client.get_historical_klines(
-                    symbol, Client.KLINE_INTERVAL_1HOUR, "24 hours ago UTC"
-                )
+    async def _get_indicators_safe(self, symbol: str) -> Optional[IndicatorSnapshot]:
+        """Shared RSI / volatility / trend / volume snapshot"""
+        try:
+            return await get_indicator_engine().get(
+                symbol, self.exchange, Client.KLINE_INTERVAL_1HOUR
+            )
+        except Exception as e:
+            self.logger.warning(f"Historical data unavailable for {symbol}: {e}")
+            return None
 
-                if klines and len(klines) >= 12:
-                    prices = [float(kline[4]) for kline in klines]  # Close prices
+    def _get_price_data_safe(
+        self,
+        symbol: str,
+        ticker: Optional[Dict],
+        indicators: Optional[IndicatorSnapshot],
+    ) -> Dict:
+        """Get price data with error handling"""
+        try:
+            if ticker is None:
+                raise ValueError("24h ticker unavailable")
 
-                    # Calculate trend
-                    recent_avg = np.mean(prices[-12:])  # Last 12 hours
-                    older_avg = np.mean(prices[-24:-12])  # Previous 12 hours
-                    trend = (recent_avg - older_avg) / older_avg if older_avg > 0 else 0
-                else:
-                    trend = price_change_24h / 100
+            current_price = float(ticker["lastPrice"])
+            price_change_24h = float(ticker["priceChangePercent"])
 
-            except Exception as e:
-                self.logger.warning(f"Historical data unavailable for {symbol}: {e}")
+            # Trend from the candle series, 24h change when it is too short
+            if indicators is not None and indicators.trend is not None:
+                trend = indicators.trend
+            else:
                 trend = price_change_24h / 100
 
             return {
@@ -163,130 +180,23 @@ class MarketAnalysisService:
                 "valid": False,
             }
 
-    async def _calculate_rsi_safe(self, symbol: str, period: int = 14) -> float:
-        """Calculate RSI with error handling"""
-        try:
-            # Get historical data for RSI calculation
-            klines = self.binance_client.get_historical_klines(
-                symbol, Client.KLINE_INTERVAL_1HOUR, f"{period * 2} hours ago UTC"
-            )
-
-            if not klines or len(klines) < period:
-                self.logger.warning(
-                    f"Insufficient data for RSI calculation: {len(klines) if klines else 0} klines"
-                )
-                return 50.0  # Neutral RSI
-
-            closes = [float(kline[4]) for kline in klines]
-
-            if len(closes) < 2:
-                return 50.0
-
-            # Calculate price changes
-            deltas = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
-
-            # Separate gains and losses
-            gains = [delta if delta > 0 else 0 for delta in deltas]
-            losses = [-delta if delta < 0 else 0 for delta in deltas]
-
-            if len(gains) < period or len(losses) < period:
-                return 50.0
-
-            # Calculate average gains and losses
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = np.mean(losses[-period:])
-
-            # Calculate RSI
-            if avg_loss == 0:
-                return 100.0
-
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-
-            # Validate RSI range
-            rsi = max(0, min(100, rsi))
-
-            return float(rsi)
-
-        except Exception as e:
-            self.logger.warning(f"❌ RSI calculation error for {symbol}: {e}")
-            return 50.0  # Neutral RSI on error
-
-    async def _calculate_volatility_safe(self, symbol: str) -> float:
-        """Calculate volatility with error handling"""
-        try:
-            # Get 24h klines
-            klines = self.binance_client.get_historical_klines(
-                symbol, Client.KLINE_INTERVAL_1HOUR, "24 hours ago UTC"
-            )
-
-            if not klines or len(klines) < 2:
-                self.logger.warning(
-                    f"Insufficient data for volatility calculation: {len(klines) if klines else 0} klines"
-                )
-                return 0.25  # Default moderate volatility
-
-            # Calculate hourly returns
-            closes = [float(kline[4]) for kline in klines]
-
-            if len(closes) < 2:
-                return 0.25
-
-            returns = []
-            for i in range(1, len(closes)):
-                if closes[i - 1] > 0:
-                    ret = (closes[i] - closes[i - 1]) / closes[i - 1]
-                    returns.append(ret)
-
-            if len(returns) == 0:
-                return 0.25
-
-            # Calculate standard deviation (volatility)
-            volatility = np.std(returns) * np.sqrt(24)  # Annualized
-
-            # Cap volatility at reasonable bounds
-            volatility = max(0.0, min(2.0, volatility))
-
-            return float(volatility)
-
-        except Exception as e:
-            self.logger.warning(f"❌ Volatility calculation error for {symbol}: {e}")
+    def _get_volatility_safe(self, indicators: Optional[IndicatorSnapshot]) -> float:
+        """Daily volatility of hourly returns, capped to reasonable bounds"""
+        if indicators is None or indicators.daily_volatility is None:
             return 0.25  # Default moderate volatility
+        return max(0.0, min(2.0, indicators.daily_volatility))
 
-    async def _analyze_volume_safe(self, symbol: str) -> Dict:
+    def _analyze_volume_safe(
+        self, ticker: Optional[Dict], indicators: Optional[IndicatorSnapshot]
+    ) -> Dict:
         """Analyze volume with error handling"""
         try:
-            # Get 24h volume data
-            ticker = self.binance_client.get_ticker(symbol=symbol)
-            current_volume = float(ticker["volume"])
-
-            # Try to get historical volume for comparison
-            try:
-                klines = self.binance_client.get_historical_klines(
-                    symbol, Client.KLINE_INTERVAL_1HOUR, "48 hours ago UTC"
-                )
+            current_volume = float(ticker["volume"]) if ticker else 0
 
-                if klines and len(klines) >= 24:
-                    # Calculate volume ratio (current 24h vs previous 24h)
-                    recent_volumes = [float(kline[5]) for kline in klines[-24:]]
-                    older_volumes = [float(kline[5]) for kline in klines[-48:-24]]
-
-                    recent_avg = (
-                        np.mean(recent_volumes) if recent_volumes else current_volume
-                    )
-                    older_avg = (
-                        np.mean(older_volumes) if older_volumes else current_volume
-                    )
-
-                    volume_ratio = recent_avg / older_avg if older_avg > 0 else 1.0
-                else:
-                    volume_ratio = 1.0  # Default neutral ratio
-
-            except Exception as e:
-                self.logger.warning(
-                    f"Historical volume data unavailable for {symbol}: {e}"
-                )
-                volume_ratio = 1.0
+            # Current 24h vs previous 24h candle volume
+            volume_ratio = 1.0  # Default neutral ratio
+            if indicators is not None and indicators.volume_ratio is not None:
+                volume_ratio = indicators.volume_ratio
 
             # Determine volume trend
             if volume_ratio > 1.5:
@@ -306,7 +216,7 @@ class MarketAnalysisService:
             }
 
         except Exception as e:
-            self.logger.warning(f"❌ Volume analysis error for {symbol}: {e}")
+            self.logger.warning(f"❌ Volume analysis error: {e}")
             return {"current_volume": 0, "ratio": 1.0, "trend": "stable"}
 
     def _calculate_market_score_safe(
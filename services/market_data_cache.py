@@ -0,0 +1,233 @@
+# services/market_data_cache.py
+"""
+Market Data Cache - Process-wide ticker / kline cache
+=====================================================
+
+Prices and klines are public data, identical for every client. Without a
+shared cache each GridManager, GridTradingEngine, inventory manager,
+market analysis and volatility manager fetched them separately, once per
+client.
+
+Features:
+- TTL per data kind (price, 24h ticker, klines per interval)
+- Request coalescing: concurrent callers share one in-flight fetch
+- Optional bulk price refresh: one ticker call refreshes all tracked symbols
+- Hit / miss / coalesced counters to measure REST weight saved
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+
+# Kline TTLs by interval (seconds) - roughly a fraction of the candle length
+KLINE_TTL = {
+    "1m": 10,
+    "5m": 30,
+    "15m": 60,
+    "1h": 60,
+    "4h": 300,
+    "1d": 900,
+}
+
+
+class MarketDataCache:
+    """Shared TTL cache with in-flight request coalescing"""
+
+    def __init__(
+        self,
+        price_ttl: Optional[float] = None,
+        ticker_ttl: Optional[float] = None,
+        bulk_ticker: Optional[bool] = None,
+    ):
+        self.price_ttl = price_ttl or Config.PRICE_CACHE_TIMEOUT
+        self.ticker_ttl = ticker_ttl or Config.TICKER_CACHE_TIMEOUT
+        self.bulk_ticker = (
+            Config.MARKET_DATA_BULK_TICKER if bulk_ticker is None else bulk_ticker
+        )
+        self.logger = logging.getLogger(__name__)
+
+        # key -> (expires_at, value)
+        self._entries: Dict[Tuple, Tuple[float, object]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.tracked_symbols = set()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "bulk_refreshes": 0,
+        }
+        self.kind_stats: Dict[str, Dict[str, int]] = {}
+
+    # ========================================
+    # PUBLIC API
+    # ========================================
+
+    async def get_price(self, symbol: str, exchange) -> Optional[float]:
+        """Latest price for a symbol (shared across clients)"""
+        self.tracked_symbols.add(symbol)
+
+        if self.bulk_ticker:
+            cached = self._get_fresh(("price", symbol), "price")
+            if cached is not None:
+                return cached
+            await self._load(
+                ("price_bulk",), "price", lambda: self._refresh_bulk_prices(exchange)
+            )
+            price = self._peek(("price", symbol))
+            if price is not None:
+                return price
+            # Symbol missing from the bulk response - fall through to single fetch
+
+        return await self._get_or_load(
+            ("price", symbol),
+            "price",
+            self.price_ttl,
+            lambda: self._fetch_single_price(symbol, exchange),
+        )
+
+    async def get_ticker_24h(self, symbol: str, exchange) -> Dict:
+        """24h rolling ticker statistics"""
+        return await self._get_or_load(
+            ("ticker24h", symbol),
+            "ticker24h",
+            self.ticker_ttl,
+            lambda: exchange.get_ticker(symbol=symbol),
+        )
+
+    async def get_klines(
+        self, symbol: str, interval: str, start_str: str, exchange
+    ) -> List:
+        """Historical klines keyed by symbol, interval and lookback"""
+        ttl = KLINE_TTL.get(interval, 60)
+        return await self._get_or_load(
+            ("klines", symbol, interval, start_str),
+            "klines",
+            ttl,
+            lambda: exchange.get_historical_klines(symbol, interval, start_str),
+        )
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached entries for one symbol (or everything)"""
+        if symbol is None:
+            self._entries.clear()
+            return
+        for key in list(self._entries):
+            if len(key) > 1 and key[1] == symbol:
+                self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """Hit-rate metrics for measuring REST weight saved"""
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        served_from_cache = self.stats["hits"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "lookups": lookups,
+            "hit_rate": (served_from_cache / lookups * 100) if lookups else 0.0,
+            "requests_saved": served_from_cache,
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "tracked_symbols": sorted(self.tracked_symbols),
+            "by_kind": self.kind_stats,
+        }
+
+    # ========================================
+    # INTERNALS
+    # ========================================
+
+    def _count(self, kind: str, field: str):
+        self.stats[field] += 1
+        kind_stats = self.kind_stats.setdefault(
+            kind, {"hits": 0, "misses": 0, "coalesced": 0}
+        )
+        if field in kind_stats:
+            kind_stats[field] += 1
+
+    def _peek(self, key: Tuple):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.time():
+            return entry[1]
+        return None
+
+    def _get_fresh(self, key: Tuple, kind: str):
+        value = self._peek(key)
+        if value is not None:
+            self._count(kind, "hits")
+        return value
+
+    async def _get_or_load(self, key: Tuple, kind: str, ttl: float, loader):
+        value = self._get_fresh(key, kind)
+        if value is not None:
+            return value
+
+        value = await self._load(key, kind, loader)
+        self._entries[key] = (time.time() + ttl, value)
+        return value
+
+    async def _load(self, key: Tuple, kind: str, loader):
+        """Run loader once per key; concurrent callers await the same future"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count(kind, "coalesced")
+            return await asyncio.shield(future)
+
+        self._count(kind, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            self.stats["fetches"] += 1
+            value = await loader()
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.stats["fetch_errors"] += 1
+            future.set_exception(e)
+            # Mark retrieved so a failed fetch with no waiters doesn't log noise
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch_single_price(self, symbol: str, exchange) -> float:
+        ticker = await exchange.get_symbol_ticker(symbol=symbol)
+        return float(ticker["price"])
+
+    async def _refresh_bulk_prices(self, exchange):
+        """One ticker request for every tracked symbol"""
+        symbols = sorted(self.tracked_symbols)
+        if len(symbols) == 1:
+            tickers = [await exchange.get_symbol_ticker(symbol=symbols[0])]
+        else:
+            tickers = await exchange.get_symbol_ticker(
+                symbols=json.dumps(symbols, separators=(",", ":"))
+            )
+
+        expires_at = time.time() + self.price_ttl
+        for ticker in tickers:
+            self._entries[("price", ticker["symbol"])] = (
+                expires_at,
+                float(ticker["price"]),
+            )
+        self.stats["bulk_refreshes"] += 1
+        return len(tickers)
+
+
+_market_data_cache: Optional[MarketDataCache] = None
+
+
+def get_market_data_cache() -> MarketDataCache:
+    """Process-wide market data cache"""
+    global _market_data_cache
+    if _market_data_cache is None:
+        _market_data_cache = MarketDataCache()
+    return _market_data_cache
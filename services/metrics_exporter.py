@@ -0,0 +1,215 @@
+# services/metrics_exporter.py
+"""
+Metrics Exporter - Scrape-time collectors for the metrics registry
+=================================================================
+
+Connection pools, write queues, Telegram outboxes and caches already keep
+their own counters and latency histograms for get_stats() and the admin
+panel; instrumenting them a second time would double the hot-path cost.
+
+register_system_collectors() turns those stats into metric families when
+/metrics is scraped:
+- gridbot_sqlite_*: per-statement query latency, connection waits,
+  write-queue commit/ack latency and queue depth (label: db file name)
+- gridbot_notifier_*: outbox queue depth, send latency and outcomes per bot,
+  open digest windows
+- gridbot_cache_*: lookups, entries and hit ratio per cache, including the
+  market data and decrypted API key caches
+- gridbot_exchange_in_flight and orchestrator manager/grid gauges
+
+start_metrics_exporter() registers the collectors and starts the HTTP
+endpoint (main.py, when METRICS_ENABLED).
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from database.connection_pool import get_all_pool_stats
+from database.write_queue import get_all_write_queue_stats
+from services.exchange_gateway import get_all_gateway_stats
+from services.market_data_cache import get_market_data_cache
+from services.notification_digest import get_notification_digest
+from services.telegram_outbox import get_all_outbox_stats
+from utils.crypto import get_api_key_cache
+from utils.metrics import MetricFamily, get_metrics_registry, start_metrics_server
+from utils.ttl_cache import get_cache_report
+
+OUTBOX_OUTCOMES = ("sent", "failed", "dropped", "merged", "rate_limited")
+CACHE_RESULTS = {"hits": "hit", "misses": "miss", "coalesced": "coalesced"}
+
+
+def _db_label(db_path: str) -> str:
+    return Path(db_path).name
+
+
+# ========================================
+# COLLECTORS
+# ========================================
+
+
+def collect_sqlite_metrics() -> List[MetricFamily]:
+    queries = MetricFamily(
+        "gridbot_sqlite_query_seconds", "histogram", "SQLite latency per statement"
+    )
+    waits = MetricFamily(
+        "gridbot_sqlite_connection_wait_seconds",
+        "histogram",
+        "Wait for a pooled SQLite connection",
+    )
+    operations = MetricFamily(
+        "gridbot_sqlite_operations_total", "counter", "Pooled SQLite operations"
+    )
+    for pool in get_all_pool_stats().values():
+        db = _db_label(pool["db_path"])
+        for statement, stats in pool["queries"].items():
+            queries.add_latency_stats({"db": db, "statement": statement}, stats)
+        for kind, stats in pool["connection_wait"].items():
+            waits.add_latency_stats({"db": db, "kind": kind}, stats)
+        for op in ("reads", "writes", "rollbacks"):
+            operations.add({"db": db, "op": op}, pool[op])
+
+    commits = MetricFamily(
+        "gridbot_sqlite_write_commit_seconds",
+        "histogram",
+        "Write queue batch commit latency",
+    )
+    acks = MetricFamily(
+        "gridbot_sqlite_write_ack_seconds",
+        "histogram",
+        "Time from write submission to durable acknowledgement",
+    )
+    depth = MetricFamily(
+        "gridbot_sqlite_write_queue_depth", "gauge", "Pending write intents"
+    )
+    failures = MetricFamily(
+        "gridbot_sqlite_write_failures_total", "counter", "Failed write intents"
+    )
+    for writes in get_all_write_queue_stats().values():
+        labels = {"db": _db_label(writes["db_path"])}
+        commits.add_latency_stats(labels, writes["commit_latency"])
+        acks.add_latency_stats(labels, writes["ack_latency"])
+        depth.add(labels, writes["queue_depth"])
+        failures.add(labels, writes["failed_intents"])
+
+    return [queries, waits, operations, commits, acks, depth, failures]
+
+
+def collect_notifier_metrics() -> List[MetricFamily]:
+    depth = MetricFamily(
+        "gridbot_notifier_queue_depth", "gauge", "Messages waiting in the outbox"
+    )
+    capacity = MetricFamily(
+        "gridbot_notifier_queue_capacity", "gauge", "Outbox queue capacity"
+    )
+    send = MetricFamily(
+        "gridbot_notifier_send_seconds", "histogram", "Telegram send latency"
+    )
+    messages = MetricFamily(
+        "gridbot_notifier_messages_total", "counter", "Outbox messages by outcome"
+    )
+    for bot, outbox in get_all_outbox_stats().items():
+        labels = {"bot": bot}
+        depth.add(labels, outbox["queue_depth"])
+        capacity.add(labels, outbox["queue_capacity"])
+        send.add_latency_stats(labels, outbox["send_latency"])
+        for outcome in OUTBOX_OUTCOMES:
+            messages.add({**labels, "outcome": outcome}, outbox[outcome])
+
+    digest = MetricFamily(
+        "gridbot_notifier_digest_open_windows",
+        "gauge",
+        "Notification digest windows still collecting messages",
+    )
+    digest.add({}, get_notification_digest().get_stats()["open_windows"])
+
+    return [depth, capacity, send, messages, digest]
+
+
+def collect_cache_metrics() -> List[MetricFamily]:
+    lookups = MetricFamily(
+        "gridbot_cache_lookups_total", "counter", "Cache lookups by result"
+    )
+    entries = MetricFamily("gridbot_cache_entries", "gauge", "Cached entries")
+    ratio = MetricFamily(
+        "gridbot_cache_hit_ratio", "gauge", "Share of lookups served from cache"
+    )
+    evictions = MetricFamily(
+        "gridbot_cache_evictions_total", "counter", "Entries evicted by LRU bound"
+    )
+
+    rows: List[Dict] = get_cache_report(include_memory=False)
+    market = get_market_data_cache().get_stats()
+    rows.append({"name": "market_data", **market})
+    api_keys = get_api_key_cache().get_stats()
+    rows.append({"name": "api_keys", "entries": api_keys["size"], **api_keys})
+
+    for row in rows:
+        labels = {"cache": row["name"]}
+        for field, result in CACHE_RESULTS.items():
+            if field in row:
+                lookups.add({**labels, "result": result}, row[field])
+        entries.add(labels, row["entries"])
+        total = sum(row.get(field, 0) for field in CACHE_RESULTS)
+        served = row.get("hits", 0) + row.get("coalesced", 0)
+        ratio.add(labels, served / total if total else 0.0)
+        if "evictions" in row:
+            evictions.add(labels, row["evictions"])
+
+    return [lookups, entries, ratio, evictions]
+
+
+def collect_exchange_metrics() -> List[MetricFamily]:
+    in_flight = MetricFamily(
+        "gridbot_exchange_in_flight", "gauge", "Exchange calls currently running"
+    )
+    gateways = MetricFamily(
+        "gridbot_exchange_gateways", "gauge", "Live per-client exchange gateways"
+    )
+    stats = get_all_gateway_stats()
+    in_flight.add({}, sum(gateway["in_flight"] for gateway in stats.values()))
+    gateways.add({}, len(stats))
+    return [in_flight, gateways]
+
+
+def orchestrator_collector(orchestrator):
+    def collect() -> List[MetricFamily]:
+        managers = MetricFamily(
+            "gridbot_active_managers", "gauge", "Clients with a live GridManager"
+        )
+        grids = MetricFamily("gridbot_active_grids", "gauge", "Running grids")
+        monitoring = MetricFamily(
+            "gridbot_monitoring_active", "gauge", "Grid update loop running"
+        )
+        active = list(orchestrator.advanced_managers.values())
+        managers.add({}, len(active))
+        grids.add({}, sum(len(manager.active_grids) for manager in active))
+        monitoring.add({}, orchestrator.monitoring_active)
+        return [managers, grids, monitoring]
+
+    return collect
+
+
+# ========================================
+# STARTUP
+# ========================================
+
+
+def register_system_collectors(orchestrator=None):
+    """Register the scrape-time collectors (idempotent)"""
+    registry = get_metrics_registry()
+    registry.register_collector("sqlite", collect_sqlite_metrics)
+    registry.register_collector("notifier", collect_notifier_metrics)
+    registry.register_collector("caches", collect_cache_metrics)
+    registry.register_collector("exchange", collect_exchange_metrics)
+    if orchestrator is not None:
+        registry.register_collector(
+            "orchestrator", orchestrator_collector(orchestrator)
+        )
+
+
+def start_metrics_exporter(
+    orchestrator=None, host: Optional[str] = None, port: Optional[int] = None
+):
+    """Register collectors and serve /metrics"""
+    register_system_collectors(orchestrator)
+    return start_metrics_server(host, port)
@@ -0,0 +1,266 @@
+# services/notification_digest.py
+"""
+Notification Digest - Coalesced fill and replacement messages
+=============================================================
+
+Every fill used to produce two Telegram messages (the FIFO fill notice and
+the "ORDER REPLACED" notice), each with a freshly recomputed total profit.
+A burst of 20 fills meant 40 sends and 20 full profit calculations.
+
+Events are grouped per (client, symbol) for NOTIFICATION_DIGEST_WINDOW
+seconds, then sent as one summary with buy/sell counts, volumes, the
+number of replacements and the net realized P&L over the window. Profit
+is looked up once when the window opens and once when it closes.
+
+Critical alerts (API errors, emergency stops, milestones) go through
+send_critical() and are never delayed. A window of 0 sends one summary per
+event.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from config import Config
+from services.telegram_notifier import TelegramNotifier, get_telegram_notifier
+
+# (client_id, symbol) -> (symbol realized profit, client total profit)
+ProfitProvider = Callable[[int, str], Awaitable[Tuple[float, float]]]
+
+_digest: Optional["NotificationDigest"] = None
+
+
+class SymbolDigest:
+    """Aggregated activity for one client/symbol window"""
+
+    __slots__ = (
+        "client_id",
+        "symbol",
+        "buys",
+        "sells",
+        "buy_quantity",
+        "sell_quantity",
+        "buy_value",
+        "sell_value",
+        "replacements",
+        "profit_before",
+        "opened_at",
+        "last_event_at",
+    )
+
+    def __init__(self, client_id: int, symbol: str):
+        self.client_id = client_id
+        self.symbol = symbol
+        self.buys = 0
+        self.sells = 0
+        self.buy_quantity = 0.0
+        self.sell_quantity = 0.0
+        self.buy_value = 0.0
+        self.sell_value = 0.0
+        self.replacements = 0
+        self.profit_before: Optional[float] = None
+        self.opened_at = datetime.now()
+        self.last_event_at = self.opened_at
+
+    @property
+    def events(self) -> int:
+        return self.buys + self.sells + self.replacements
+
+
+class NotificationDigest:
+    """Per client/symbol aggregation in front of TelegramNotifier"""
+
+    def __init__(
+        self,
+        notifier: Optional[TelegramNotifier] = None,
+        window: Optional[float] = None,
+    ):
+        self.notifier = notifier or get_telegram_notifier()
+        self.window = Config.NOTIFICATION_DIGEST_WINDOW if window is None else window
+        self.profit_provider: Optional[ProfitProvider] = None
+        self.logger = logging.getLogger(__name__)
+
+        self._buckets: Dict[Tuple[int, str], SymbolDigest] = {}
+        self._timers: Dict[Tuple[int, str], asyncio.Task] = {}
+        self.stats = {
+            "events": 0,
+            "digests_sent": 0,
+            "critical_sent": 0,
+            "messages_saved": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.notifier.enabled
+
+    def set_profit_provider(self, provider: ProfitProvider):
+        self.profit_provider = provider
+
+    def needs_baseline(self, client_id: int, symbol: str) -> bool:
+        """True when the next event opens a new window (capture profit first)"""
+        return (client_id, symbol) not in self._buckets
+
+    # ========================================
+    # EVENTS
+    # ========================================
+
+    async def record_fill(
+        self,
+        client_id: int,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        profit_before: Optional[float] = None,
+    ):
+        bucket = self._bucket(client_id, symbol)
+        if bucket.profit_before is None:
+            bucket.profit_before = profit_before
+
+        if side == "SELL":
+            bucket.sells += 1
+            bucket.sell_quantity += quantity
+            bucket.sell_value += quantity * price
+        else:
+            bucket.buys += 1
+            bucket.buy_quantity += quantity
+            bucket.buy_value += quantity * price
+
+        await self._event_added(client_id, symbol)
+
+    async def record_replacement(self, client_id: int, symbol: str):
+        self._bucket(client_id, symbol).replacements += 1
+        await self._event_added(client_id, symbol)
+
+    async def send_critical(self, message: str) -> bool:
+        """Immediate path: bypasses aggregation"""
+        if not self.enabled:
+            return False
+        self.stats["critical_sent"] += 1
+        return await self.notifier.send_message(message)
+
+    def _bucket(self, client_id: int, symbol: str) -> SymbolDigest:
+        key = (client_id, symbol)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = SymbolDigest(client_id, symbol)
+        bucket.last_event_at = datetime.now()
+        self.stats["events"] += 1
+        return bucket
+
+    async def _event_added(self, client_id: int, symbol: str):
+        key = (client_id, symbol)
+        if self.window <= 0:
+            await self._flush_key(key)
+            return
+
+        if key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().create_task(
+                self._flush_later(key)
+            )
+
+    # ========================================
+    # FLUSHING
+    # ========================================
+
+    async def _flush_later(self, key: Tuple[int, str]):
+        try:
+            await asyncio.sleep(self.window)
+        finally:
+            self._timers.pop(key, None)
+        await self._flush_key(key)
+
+    async def flush(self, client_id: Optional[int] = None):
+        """Send pending digests now (all clients, or one)"""
+        keys = [
+            key
+            for key in list(self._buckets)
+            if client_id is None or key[0] == client_id
+        ]
+        for key in keys:
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            await self._flush_key(key)
+
+    async def _flush_key(self, key: Tuple[int, str]):
+        bucket = self._buckets.pop(key, None)
+        if bucket is None or not bucket.events:
+            return
+
+        try:
+            symbol_profit = total_profit = None
+            if self.profit_provider is not None:
+                try:
+                    symbol_profit, total_profit = await self.profit_provider(
+                        bucket.client_id, bucket.symbol
+                    )
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Digest profit lookup failed: {e}")
+
+            net_pnl = None
+            if symbol_profit is not None and bucket.profit_before is not None:
+                net_pnl = symbol_profit - bucket.profit_before
+
+            if self.enabled:
+                await self.notifier.send_message(
+                    self._format(bucket, net_pnl, total_profit)
+                )
+            self.stats["digests_sent"] += 1
+            # Per-event notifications would have sent one message per event
+            self.stats["messages_saved"] += bucket.events - 1
+
+        except Exception as e:
+            self.logger.error(f"❌ Failed to send notification digest: {e}")
+
+    def _format(
+        self,
+        bucket: SymbolDigest,
+        net_pnl: Optional[float],
+        total_profit: Optional[float],
+    ) -> str:
+        asset_name = bucket.symbol.replace("USDT", "")
+        qty_format = ".1f" if bucket.symbol == "ADAUSDT" else ".4f"
+
+        lines = [f"📊 **{asset_name} Activity**", ""]
+        if bucket.sells:
+            lines.append(
+                f"🟢 **Sold:** {bucket.sells}x • "
+                f"{bucket.sell_quantity:{qty_format}} {asset_name} • "
+                f"${bucket.sell_value:.2f}"
+            )
+        if bucket.buys:
+            lines.append(
+                f"🔵 **Bought:** {bucket.buys}x • "
+                f"{bucket.buy_quantity:{qty_format}} {asset_name} • "
+                f"${bucket.buy_value:.2f}"
+            )
+        if bucket.replacements:
+            lines.append(f"🔄 **Orders Replaced:** {bucket.replacements}")
+        if net_pnl is not None:
+            sign = "+" if net_pnl >= 0 else "-"
+            lines.append(f"📈 **Net P&L:** {sign}${abs(net_pnl):.2f}")
+        if total_profit is not None:
+            lines.append(f"💎 **Total Profit:** ${total_profit:.2f}")
+
+        started = bucket.opened_at.strftime("%H:%M:%S")
+        ended = bucket.last_event_at.strftime("%H:%M:%S")
+        period = started if started == ended else f"{started} – {ended}"
+        lines.append(f"🕐 **Time:** {period}")
+        return "\n".join(lines)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "window_seconds": self.window,
+            "open_windows": len(self._buckets),
+        }
+
+
+def get_notification_digest() -> NotificationDigest:
+    """Shared digest in front of the admin-chat notifier"""
+    global _digest
+    if _digest is None:
+        _digest = NotificationDigest()
+    return _digest
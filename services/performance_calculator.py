@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Dict, List
 
 from repositories.trade_repository import TradeRepository
+from services.fifo_core import FEE_RATE, LotQueue
 
 
 class GridPerformanceCalculator:
@@ -50,11 +51,9 @@ class GridPerformanceCalculator:
     def _get_recent_trades(self, client_id: int, days: int) -> List[Dict]:
         """Get recent trades with proper structure"""
         try:
-            import sqlite3
+            from database.connection_pool import get_db_pool
 
-            from config import Config
-
-            with sqlite3.connect(Config.DATABASE_PATH) as conn:
+            with get_db_pool().read() as conn:
                 cursor = conn.execute(
                     """
                     SELECT symbol, side, quantity, price, total_value, executed_at, order_id
@@ -173,59 +172,50 @@ class GridPerformanceCalculator:
     def _calculate_symbol_performance(self, trades: List[Dict]) -> Dict:
         """Calculate performance for a specific symbol using FIFO accounting"""
 
-        position = {"quantity": 0.0, "cost_basis": 0.0, "realized_profit": 0.0}
-
+        lots = LotQueue()
+        realized_profit = 0.0
         profitable_trades = 0
         total_fees = 0.0
 
         for trade in trades:
             # Estimate trading fee (0.1% per trade)
-            fee = trade["total_value"] * 0.001
+            fee = trade["total_value"] * FEE_RATE
             total_fees += fee
 
             if trade["side"] == "BUY":
-                # Add to position
-                position["quantity"] += trade["quantity"]
-                position["cost_basis"] += trade["total_value"] + fee
+                # Add to position (buy fee is part of the lot's cost)
+                if trade["quantity"] > 0:
+                    lots.add(
+                        trade["quantity"],
+                        (trade["total_value"] + fee) / trade["quantity"],
+                    )
 
             else:  # SELL
-                if position["quantity"] > 0:
-                    # Calculate profit on sold portion
-                    avg_cost_per_unit = position["cost_basis"] / position["quantity"]
-                    sell_quantity = min(trade["quantity"], position["quantity"])
+                if lots:
+                    # Match the sell against the oldest lots
+                    match = lots.consume(trade["quantity"])
 
-                    cost_of_sold = avg_cost_per_unit * sell_quantity
-                    revenue = (trade["price"] * sell_quantity) - fee
-                    trade_profit = revenue - cost_of_sold
+                    revenue = (trade["price"] * match.matched_quantity) - fee
+                    trade_profit = revenue - match.cost_of_goods_sold
 
-                    position["realized_profit"] += trade_profit
+                    realized_profit += trade_profit
 
                     if trade_profit > 0:
                         profitable_trades += 1
 
-                    # Update position
-                    position["quantity"] -= sell_quantity
-                    if position["quantity"] > 0:
-                        position["cost_basis"] -= cost_of_sold
-                    else:
-                        position["cost_basis"] = 0.0
-
         # Calculate unrealized profit for remaining position
-        unrealized_profit = 0.0
-        if position["quantity"] > 0:
-            # Use last trade price as market price estimate
-            last_price = trades[-1]["price"] if trades else 0
-            avg_cost = position["cost_basis"] / position["quantity"]
-            unrealized_profit = (last_price - avg_cost) * position["quantity"]
+        # Use last trade price as market price estimate
+        last_price = trades[-1]["price"] if trades else 0
+        unrealized_profit = lots.unrealized(last_price)
 
         return {
-            "realized_profit": position["realized_profit"],
+            "realized_profit": realized_profit,
             "unrealized_profit": unrealized_profit,
-            "total_profit": position["realized_profit"] + unrealized_profit,
+            "total_profit": realized_profit + unrealized_profit,
             "profitable_trades": profitable_trades,
             "total_fees": total_fees,
-            "remaining_position": position["quantity"],
-            "position_cost_basis": position["cost_basis"],
+            "remaining_position": lots.quantity,
+            "position_cost_basis": lots.cost,
         }
 
     def _calculate_performance_rating(
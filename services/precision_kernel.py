@@ -0,0 +1,147 @@
+# services/precision_kernel.py
+"""
+Precision Kernel - Integer tick/step arithmetic
+===============================================
+
+Order validation used to round through Decimal(str(x)) conversions and
+f"{x:.8f}" formatting on every call, for every grid level and replacement.
+
+An Increment is built once per tickSize/stepSize (cached) and holds the
+size as an exact integer over a power of ten. Prices and quantities become
+integer counts of increments:
+- Rounding is one multiply and a floor
+- Converting back divides an exact integer by a power of ten, so the float
+  is the closest one to the decimal value (no 0.30000000000000004 drift)
+- Strings are built from the integer digits, never from float formatting
+- Notional checks (price x quantity >= minNotional) are integer compares
+
+round_array() / quantize_grid() do the same for whole grids with NumPy.
+"""
+
+import functools
+import math
+from decimal import Decimal
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+Number = Union[float, int, str]
+
+# Absorbs float error in value / size before floor/ceil (1e-9 increments)
+_EPSILON = 1e-9
+
+
+class Increment:
+    """A tickSize or stepSize as integer units / 10**decimals"""
+
+    __slots__ = ("size", "units", "decimals", "scale", "_per_unit")
+
+    def __init__(self, size: Number):
+        exact = Decimal(str(size)).normalize()
+        if exact <= 0:
+            raise ValueError(f"Increment must be positive, got {size}")
+
+        exponent = exact.as_tuple().exponent
+        self.decimals = max(0, -exponent)
+        self.scale = 10**self.decimals
+        self.units = int(exact.scaleb(self.decimals))
+        self.size = self.units / self.scale
+        # Multiplying is cheaper than dividing by the size on every call
+        self._per_unit = self.scale / self.units
+
+    # ========================================
+    # SCALAR
+    # ========================================
+
+    def count(self, value: float) -> int:
+        """Nearest number of increments (half rounds up)"""
+        return math.floor(value * self._per_unit + 0.5)
+
+    def count_down(self, value: float) -> int:
+        return math.floor(value * self._per_unit + _EPSILON)
+
+    def count_up(self, value: float) -> int:
+        return math.ceil(value * self._per_unit - _EPSILON)
+
+    def value(self, count: int) -> float:
+        return count * self.units / self.scale
+
+    def round(self, value: float) -> float:
+        return self.value(self.count(value))
+
+    def format(self, count: int, pad: str = "") -> str:
+        """Decimal string with trailing zeros stripped; pad is appended to
+        whole numbers (e.g. ".00") when the increment has decimals"""
+        digits = str(abs(count * self.units))
+        sign = "-" if count < 0 else ""
+        if not self.decimals:
+            return sign + digits
+
+        digits = digits.rjust(self.decimals + 1, "0")
+        whole = digits[: -self.decimals]
+        fraction = digits[-self.decimals :].rstrip("0")
+        if fraction:
+            return f"{sign}{whole}.{fraction}"
+        return f"{sign}{whole}{pad}"
+
+    # ========================================
+    # VECTORIZED
+    # ========================================
+
+    def count_array(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        return np.floor(values * self._per_unit + 0.5).astype(np.int64)
+
+    def value_array(self, counts: np.ndarray) -> np.ndarray:
+        return counts * self.units / self.scale
+
+    def round_array(self, values) -> np.ndarray:
+        return self.value_array(self.count_array(values))
+
+    def __repr__(self) -> str:
+        return f"Increment({self.format(1)})"
+
+
+@functools.lru_cache(maxsize=512)
+def get_increment(size: Number) -> Increment:
+    """Shared Increment for a tick/step size (symbols reuse a handful)"""
+    return Increment(size)
+
+
+def min_count_for_notional(
+    price_count: int, tick: Increment, step: Increment, min_notional: float
+) -> int:
+    """Smallest quantity count with price x quantity >= min_notional"""
+    if price_count <= 0:
+        return 0
+    # notional = price_count * tick.units * qty_count * step.units / scales
+    scale = tick.scale * step.scale
+    required = math.ceil(min_notional * scale - _EPSILON)
+    per_step = price_count * tick.units * step.units
+    return -(-required // per_step)
+
+
+def quantize_grid(
+    prices: Sequence[float],
+    order_sizes_usd: Sequence[float],
+    tick_size: Number,
+    step_size: Number,
+    min_qty: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Round a whole grid at once
+
+    Prices go to the nearest tick (never below one tick) and quantities to
+    the nearest step of order_size_usd / price (never below min_qty).
+    Returns (prices, quantities) as float arrays.
+    """
+    tick = get_increment(tick_size)
+    step = get_increment(step_size)
+
+    price_counts = np.maximum(tick.count_array(prices), 1)
+    valid_prices = tick.value_array(price_counts)
+
+    sizes = np.asarray(order_sizes_usd, dtype=np.float64)
+    qty_counts = step.count_array(sizes / valid_prices)
+    if min_qty is not None:
+        qty_counts = np.maximum(qty_counts, step.count_up(min_qty))
+    return valid_prices, step.value_array(qty_counts)
@@ -0,0 +1,140 @@
+# services/service_container.py
+"""
+Service Container - Shared services for per-client managers
+===========================================================
+
+Every GridManager built its own repositories, analytics, FIFOService,
+compound manager and market timer, and its GridTradingEngine built another
+FIFOService and GridUtilityService. Most of those hold no per-client state
+but cost a schema check (TradeRepository PRAGMA, FIFOService CREATE TABLE,
+GridStateRepository ALTER check) or a startup thread (FIFOService) each,
+so onboarding was slow and memory grew with every client.
+
+The container builds each stateless service once per process, on first
+use. Per-client objects (exchange gateway, GridTradingEngine, monitoring,
+inventory, user data stream) stay in GridManager and receive the shared
+services from here.
+
+Shared (safe because they key any cached data by client_id):
+    trade_repo, client_repo, grid_state, async_trades, async_analytics,
+    fifo_service, compound_manager, market_timer
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config import Config
+from repositories.client_repository import ClientRepository
+from repositories.grid_state_repository import GridStateRepository
+from repositories.trade_repository import TradeRepository
+from services.async_database_manager import (
+    AsyncAnalytics,
+    AsyncDatabaseManager,
+    AsyncTradeRepository,
+)
+from services.compound_manager import CompoundInterestManager
+from services.fifo_service import FIFOService
+from services.trading_features import IntelligentMarketTimer
+
+_container: Optional["ServiceContainer"] = None
+_container_lock = threading.Lock()
+
+
+class ServiceContainer:
+    """Lazily built process-wide services"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.logger = logging.getLogger(__name__)
+
+        self._instances: Dict[str, object] = {}
+        self._lock = threading.RLock()
+        self.build_seconds: Dict[str, float] = {}
+        self.stats = {"lookups": 0, "builds": 0}
+
+    def _get(self, name: str, factory: Callable[[], object]):
+        self.stats["lookups"] += 1
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                start = time.perf_counter()
+                instance = factory()
+                self.build_seconds[name] = time.perf_counter() - start
+                self._instances[name] = instance
+                self.stats["builds"] += 1
+                self.logger.debug(
+                    f"🧩 Built shared {name} in "
+                    f"{self.build_seconds[name] * 1000:.1f}ms"
+                )
+        return instance
+
+    # ========================================
+    # REPOSITORIES
+    # ========================================
+
+    @property
+    def trade_repo(self):
+        return self._get("trade_repo", lambda: TradeRepository(self.db_path))
+
+    @property
+    def client_repo(self):
+        return self._get("client_repo", lambda: ClientRepository(self.db_path))
+
+    @property
+    def grid_state(self):
+        return self._get("grid_state", lambda: GridStateRepository(self.db_path))
+
+    @property
+    def async_db(self):
+        return self._get("async_db", lambda: AsyncDatabaseManager(self.db_path))
+
+    @property
+    def async_trades(self):
+        return self._get("async_trades", lambda: AsyncTradeRepository(self.async_db))
+
+    @property
+    def async_analytics(self):
+        return self._get("async_analytics", lambda: AsyncAnalytics(self.async_db))
+
+    # ========================================
+    # SERVICES
+    # ========================================
+
+    @property
+    def fifo_service(self):
+        return self._get("fifo_service", lambda: FIFOService(self.db_path))
+
+    @property
+    def compound_manager(self):
+        return self._get(
+            "compound_manager", lambda: CompoundInterestManager(self.fifo_service)
+        )
+
+    @property
+    def market_timer(self):
+        return self._get("market_timer", IntelligentMarketTimer)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "services": sorted(self._instances),
+            "build_ms": {
+                name: round(seconds * 1000, 2)
+                for name, seconds in self.build_seconds.items()
+            },
+        }
+
+
+def get_service_container() -> ServiceContainer:
+    """Process-wide service container"""
+    global _container
+    with _container_lock:
+        if _container is None:
+            _container = ServiceContainer()
+        return _container
@@ -0,0 +1,803 @@
+# services/simulated_exchange.py
+"""
+Simulated Exchange - Candle-replay matching engine with a Client surface
+========================================================================
+
+Grid parameters (spacing, level count, replacement margin) could only be
+evaluated with live capital, because GridManager, GridTradingEngine and
+FIFOService all talk to a python-binance Client.
+
+SimulatedExchange implements the subset of Client the bot calls, backed by
+stored candles (CANDLE_DTYPE records) and an injectable clock:
+- Market data (tickers, klines, exchangeInfo) only sees candles that have
+  closed by clock(), so strategies cannot look ahead
+- Limit orders rest on a per-symbol book; a resting BUY fills at its limit
+  price once a later candle's low reaches it, a SELL once the high does
+- Marketable orders fill immediately at the current price (taker)
+- Balances are locked while orders rest and settled on fill, with
+  BACKTEST_FEE_RATE charged in the quote asset
+- Errors mirror Binance codes (-2010 insufficient balance, -1013 filter
+  failure, -2011 / -2013 unknown order)
+
+Matching is lazy: every request first catches the book up to clock(), so a
+driver only has to move the clock. Calls are thread-safe because the
+ExchangeGateway runs them on its executor threads.
+
+Price paths live in a SimulatedMarket that many accounts can share (see
+services/exchange_simulator.py). An optional NetworkProfile adds REST
+behaviour for load tests: latency, injected errors and Binance-style rate
+limits (request weight per IP, orders per 10s per account) reported in
+x-mbx-* headers on `exchange.response`, like python-binance's Client.
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config import Config
+from services.candle_store import CANDLE_DTYPE, INTERVAL_MINUTES
+from services.exchange_gateway import request_weight
+
+_AGO_UNITS_MS = {
+    "minute": 60_000,
+    "hour": 3_600_000,
+    "day": 86_400_000,
+    "week": 604_800_000,
+}
+
+# (code, HTTP status, message) drawn by error injection
+INJECTED_ERRORS = (
+    (-1001, 500, "Internal error; unable to process your request. Please try again."),
+    (
+        -1007,
+        503,
+        "Timeout waiting for response from backend server. "
+        "Send status unknown; execution status unknown.",
+    ),
+    (-1021, 400, "Timestamp for this request is outside of the recvWindow."),
+)
+
+
+class SimulatedExchangeError(Exception):
+    """Rejected request, formatted like python-binance's BinanceAPIException"""
+
+    def __init__(self, code: int, message: str, status_code: int = 400):
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+        super().__init__(f"APIError(code={code}): {message}")
+
+
+@dataclass
+class NetworkProfile:
+    """REST behaviour of simulated calls (defaults: an ideal exchange)"""
+
+    latency_ms: float = 0.0  # base round trip
+    jitter_ms: float = 0.0  # uniform extra latency
+    error_rate: float = 0.0  # share of requests failing with an injected error
+    error_methods: Optional[Tuple[str, ...]] = None  # None: every method
+    weight_limit: int = 0  # request weight per minute and IP, 0: unlimited
+    order_limit_10s: int = 0  # new orders per 10s and account, 0: unlimited
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, **overrides) -> "NetworkProfile":
+        values = {
+            "latency_ms": Config.SIMULATOR_LATENCY_MS,
+            "jitter_ms": Config.SIMULATOR_LATENCY_JITTER_MS,
+            "error_rate": Config.SIMULATOR_ERROR_RATE,
+            "weight_limit": Config.SIMULATOR_WEIGHT_LIMIT,
+            "order_limit_10s": Config.SIMULATOR_ORDER_LIMIT_10S,
+        }
+        values.update(overrides)
+        return cls(**values)
+
+
+class SimulatedResponse:
+    """Status and headers of the last request (python-binance Client.response)"""
+
+    __slots__ = ("status_code", "headers")
+
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class UsageWindow:
+    """Fixed-window usage counter, like Binance's rate limit intervals
+
+    One instance per limit scope: share it between accounts to model a
+    per-IP limit. Windows follow the wall clock (time.monotonic), not the
+    replay clock, because rate limits are about real request rates.
+    """
+
+    def __init__(self, seconds: int, limit: int):
+        self.seconds = seconds
+        self.limit = limit
+        self.window = -1
+        self.used = 0
+        self.peak = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def add(self, amount: int) -> Tuple[int, Optional[int]]:
+        """Count usage; returns (used in window, retry-after seconds or None)"""
+        now = time.monotonic()
+        with self._lock:
+            window = int(now // self.seconds)
+            if window != self.window:
+                self.window, self.used = window, 0
+            if self.limit and self.used + amount > self.limit:
+                self.rejected += 1
+                return self.used, max(1, math.ceil((window + 1) * self.seconds - now))
+            self.used += amount
+            self.peak = max(self.peak, self.used)
+            return self.used, None
+
+
+def default_symbol_info(symbol: str, price: float, quote_asset: str = "USDT") -> Dict:
+    """exchangeInfo entry with tick/step sizes scaled to the price level"""
+    price = price if price > 0 else 1.0
+    tick_size = 10.0 ** (math.floor(math.log10(price)) - 4)
+    step_size = 10.0 ** (math.floor(math.log10(10.0 / price)) - 2)
+    return {
+        "symbol": symbol,
+        "status": "TRADING",
+        "baseAsset": symbol[: -len(quote_asset)],
+        "quoteAsset": quote_asset,
+        "baseAssetPrecision": 8,
+        "quotePrecision": 8,
+        "quoteAssetPrecision": 8,
+        "filters": [
+            {
+                "filterType": "PRICE_FILTER",
+                "minPrice": f"{tick_size:.8f}",
+                "maxPrice": "1000000.00000000",
+                "tickSize": f"{tick_size:.8f}",
+            },
+            {
+                "filterType": "LOT_SIZE",
+                "minQty": f"{step_size:.8f}",
+                "maxQty": "9000000.00000000",
+                "stepSize": f"{step_size:.8f}",
+            },
+            {"filterType": "MIN_NOTIONAL", "minNotional": "5.00000000"},
+        ],
+    }
+
+
+def resample_candles(records: np.ndarray, step_ms: int) -> np.ndarray:
+    """Aggregate candles into step_ms buckets (the last bucket may be partial)"""
+    if not len(records):
+        return records
+    buckets = records["open_time"] // step_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(records)] - 1
+
+    out = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    out["open_time"] = buckets[starts] * step_ms
+    out["open"] = records["open"][starts]
+    out["high"] = np.maximum.reduceat(records["high"], starts)
+    out["low"] = np.minimum.reduceat(records["low"], starts)
+    out["close"] = records["close"][ends]
+    out["volume"] = np.add.reduceat(records["volume"], starts)
+    out["close_time"] = out["open_time"] + step_ms - 1
+    out["quote_volume"] = np.add.reduceat(records["quote_volume"], starts)
+    out["trades"] = np.add.reduceat(records["trades"], starts)
+    return out
+
+
+class _PricePath:
+    """Replayed candles and exchange rules of one symbol"""
+
+    __slots__ = ("candles", "step_ms", "resampled", "info")
+
+    def __init__(self, candles: np.ndarray, info: Dict):
+        self.candles = candles
+        self.step_ms = int(candles["close_time"][0] - candles["open_time"][0]) + 1
+        self.resampled: Dict[int, np.ndarray] = {}
+        self.info = info
+
+
+class SimulatedMarket:
+    """Price paths and symbol rules shared by every simulated account"""
+
+    def __init__(
+        self,
+        candles: Dict[str, np.ndarray],
+        clock: Callable[[], float],
+        symbol_info: Optional[Dict[str, Dict]] = None,
+        quote_asset: str = "USDT",
+    ):
+        self.clock = clock
+        self.quote_asset = quote_asset
+        self._lock = threading.Lock()
+
+        symbol_info = symbol_info or {}
+        self.paths: Dict[str, _PricePath] = {}
+        for symbol, records in candles.items():
+            if not len(records):
+                raise ValueError(f"No candles for {symbol}")
+            info = symbol_info.get(symbol) or default_symbol_info(
+                symbol, float(records["close"][0]), quote_asset
+            )
+            self.paths[symbol] = _PricePath(records, info)
+
+    def now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    def path(self, symbol: str) -> _PricePath:
+        path = self.paths.get(symbol)
+        if path is None:
+            raise SimulatedExchangeError(-1121, "Invalid symbol.")
+        return path
+
+    def closed_count(self, path: _PricePath, now_ms: int) -> int:
+        """Number of candles closed by now_ms"""
+        return int(np.searchsorted(path.candles["close_time"], now_ms, "right"))
+
+    def current_price(self, path: _PricePath, now_ms: int) -> float:
+        """Close of the latest closed candle (open of the first before any)"""
+        closed = self.closed_count(path, now_ms)
+        if closed == 0:
+            return float(path.candles["open"][0])
+        return float(path.candles["close"][closed - 1])
+
+    def candles_for(self, symbol: str, interval: str) -> np.ndarray:
+        path = self.path(symbol)
+        if interval not in INTERVAL_MINUTES:
+            raise SimulatedExchangeError(-1120, "Invalid interval.")
+        step_ms = INTERVAL_MINUTES[interval] * 60_000
+        if step_ms == path.step_ms:
+            return path.candles
+        if step_ms < path.step_ms or step_ms % path.step_ms:
+            raise SimulatedExchangeError(
+                -1120, f"Interval {interval} is not available from the replay data."
+            )
+        with self._lock:
+            if step_ms not in path.resampled:
+                path.resampled[step_ms] = resample_candles(path.candles, step_ms)
+            return path.resampled[step_ms]
+
+
+class _Book:
+    """One account's resting orders on one symbol"""
+
+    __slots__ = ("path", "matched", "open_orders")
+
+    def __init__(self, path: _PricePath):
+        self.path = path
+        self.matched = 0  # candles already matched against the book
+        self.open_orders: Dict[int, Dict] = {}
+
+
+class SimulatedExchange:
+    """In-process exchange account replaying candles against a clock"""
+
+    def __init__(
+        self,
+        candles: Union[SimulatedMarket, Dict[str, np.ndarray]],
+        clock: Optional[Callable[[], float]] = None,
+        balances: Optional[Dict[str, float]] = None,
+        symbol_info: Optional[Dict[str, Dict]] = None,
+        fee_rate: Optional[float] = None,
+        quote_asset: str = "USDT",
+        network: Optional[NetworkProfile] = None,
+        weight_window: Optional[UsageWindow] = None,
+    ):
+        if isinstance(candles, SimulatedMarket):
+            self.market = candles
+        else:
+            self.market = SimulatedMarket(candles, clock, symbol_info, quote_asset)
+        self.clock = self.market.clock
+        self.fee_rate = Config.BACKTEST_FEE_RATE if fee_rate is None else fee_rate
+        self.quote_asset = self.market.quote_asset
+        self.logger = logging.getLogger(__name__)
+
+        self._books: Dict[str, _Book] = {
+            symbol: _Book(path) for symbol, path in self.market.paths.items()
+        }
+
+        # REST behaviour (None: no latency, errors or limits)
+        self.network = network
+        self.response: Optional[SimulatedResponse] = None
+        if network is not None:
+            self._random = random.Random(network.seed)
+            self._weight = weight_window or UsageWindow(60, network.weight_limit)
+            self._orders_10s = UsageWindow(10, network.order_limit_10s)
+
+        # asset -> [free, locked]
+        self._balances: Dict[str, List[float]] = {
+            asset: [float(amount), 0.0] for asset, amount in (balances or {}).items()
+        }
+        self._orders: Dict[int, Dict] = {}
+        self._locked: Dict[int, tuple] = {}  # order id -> (asset, amount)
+        self._next_order_id = 1
+        self._lock = threading.RLock()
+
+        self.stats = {
+            "requests": 0,
+            "orders_placed": 0,
+            "orders_filled": 0,
+            "orders_canceled": 0,
+            "orders_rejected": 0,
+            "fees_paid": 0.0,
+            "rate_limited": 0,
+            "errors_injected": 0,
+            "latency_seconds": 0.0,
+        }
+        self.method_counts: Dict[str, int] = {}
+
+    # ========================================
+    # MARKET DATA
+    # ========================================
+
+    def get_symbol_ticker(self, symbol: Optional[str] = None, symbols=None, **_):
+        with self._request("get_symbol_ticker", symbol is None):
+            if symbol is not None:
+                return self._price_ticker(symbol)
+            names = json.loads(symbols) if symbols else list(self._books)
+            return [self._price_ticker(name) for name in names]
+
+    def get_ticker(self, symbol: Optional[str] = None, **_):
+        """24h rolling statistics from the closed candles of the last day"""
+        with self._request("get_ticker", symbol is None):
+            if symbol is None:
+                return [self._ticker_24h(name) for name in self._books]
+            return self._ticker_24h(symbol)
+
+    def get_historical_klines(
+        self, symbol: str, interval: str, start_str, end_str=None, limit=None, **_
+    ) -> List[List]:
+        with self._request("get_historical_klines"):
+            now_ms = self._now_ms()
+            records = self.market.candles_for(symbol, interval)
+            start_ms = self._parse_time(start_str, now_ms)
+            end_ms = now_ms if end_str is None else min(
+                self._parse_time(end_str, now_ms), now_ms
+            )
+            open_times = records["open_time"]
+            lo = np.searchsorted(open_times, start_ms)
+            hi = np.searchsorted(records["close_time"], now_ms, side="right")
+            hi = min(hi, np.searchsorted(open_times, end_ms, side="right"))
+            selected = records[lo:hi]
+            if limit:
+                selected = selected[: int(limit)]
+            return [self._kline_row(row) for row in selected]
+
+    def get_exchange_info(self, **_) -> Dict:
+        with self._request("get_exchange_info"):
+            return {
+                "timezone": "UTC",
+                "serverTime": self._now_ms(),
+                "symbols": [path.info for path in self.market.paths.values()],
+            }
+
+    def get_symbol_info(self, symbol: str) -> Optional[Dict]:
+        with self._request("get_symbol_info"):
+            path = self.market.paths.get(symbol)
+            return path.info if path else None
+
+    # ========================================
+    # ACCOUNT / ORDERS
+    # ========================================
+
+    def get_account(self, **_) -> Dict:
+        with self._request("get_account"):
+            return {
+                "canTrade": True,
+                "updateTime": self._now_ms(),
+                "balances": [
+                    {"asset": asset, "free": f"{free:.8f}", "locked": f"{locked:.8f}"}
+                    for asset, (free, locked) in sorted(self._balances.items())
+                ],
+            }
+
+    def order_limit_buy(self, symbol: str, quantity, price, **kwargs) -> Dict:
+        with self._request("order_limit_buy", order=True):
+            return self._place(symbol, "BUY", "LIMIT", float(quantity), float(price))
+
+    def order_limit_sell(self, symbol: str, quantity, price, **kwargs) -> Dict:
+        with self._request("order_limit_sell", order=True):
+            return self._place(symbol, "SELL", "LIMIT", float(quantity), float(price))
+
+    def order_market_buy(self, symbol: str, quantity, **kwargs) -> Dict:
+        with self._request("order_market_buy", order=True):
+            return self._place(symbol, "BUY", "MARKET", float(quantity), None)
+
+    def order_market_sell(self, symbol: str, quantity, **kwargs) -> Dict:
+        with self._request("order_market_sell", order=True):
+            return self._place(symbol, "SELL", "MARKET", float(quantity), None)
+
+    def get_order(self, symbol: str, orderId, **_) -> Dict:
+        with self._request("get_order"):
+            order = self._orders.get(int(orderId))
+            if order is None or order["symbol"] != symbol:
+                raise SimulatedExchangeError(-2013, "Order does not exist.")
+            return dict(order)
+
+    def cancel_order(self, symbol: str, orderId, **_) -> Dict:
+        with self._request("cancel_order"):
+            book = self._book(symbol)
+            order = book.open_orders.pop(int(orderId), None)
+            if order is None:
+                raise SimulatedExchangeError(-2011, "Unknown order sent.")
+            self._release(order)
+            order["status"] = "CANCELED"
+            order["updateTime"] = self._now_ms()
+            self.stats["orders_canceled"] += 1
+            return dict(order)
+
+    def get_open_orders(self, symbol: Optional[str] = None, **_) -> List[Dict]:
+        with self._request("get_open_orders", symbol is None):
+            books = [self._book(symbol)] if symbol else self._books.values()
+            return [
+                dict(order) for book in books for order in book.open_orders.values()
+            ]
+
+    def get_all_orders(
+        self, symbol: str, orderId=None, limit: int = 500, **_
+    ) -> List[Dict]:
+        with self._request("get_all_orders"):
+            self._book(symbol)
+            first_id = int(orderId) if orderId is not None else 0
+            orders = [
+                dict(order)
+                for order_id, order in sorted(self._orders.items())
+                if order_id >= first_id and order["symbol"] == symbol
+            ]
+            return orders[: int(limit)]
+
+    # ========================================
+    # INSPECTION
+    # ========================================
+
+    def get_price(self, symbol: str) -> float:
+        """Current price without counting a request"""
+        return self.market.current_price(self._book(symbol).path, self._now_ms())
+
+    def get_balances(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                asset: {"free": free, "locked": locked, "total": free + locked}
+                for asset, (free, locked) in self._balances.items()
+            }
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "open_orders": self.open_order_count(),
+            "calls_by_method": dict(self.method_counts),
+        }
+
+    def open_order_count(self) -> int:
+        return sum(len(book.open_orders) for book in self._books.values())
+
+    # ========================================
+    # MATCHING
+    # ========================================
+
+    @contextmanager
+    def _request(self, method: str, all_symbols: bool = False, order: bool = False):
+        """Count the call, apply the network profile, catch books up to clock"""
+        with self._lock:
+            self.stats["requests"] += 1
+            self.method_counts[method] = self.method_counts.get(method, 0) + 1
+
+        deferred = None
+        if self.network is not None:
+            weight = request_weight(method, all_symbols)
+            deferred = self._round_trip(method, weight, order)
+
+        with self._lock:
+            self._catch_up()
+            yield
+
+        if deferred is not None:
+            raise deferred
+
+    def _round_trip(
+        self, method: str, weight: int, order: bool
+    ) -> Optional[SimulatedExchangeError]:
+        """Latency, rate limits and error injection (outside the account lock)
+
+        Returns an error to raise after the request executed: an injected
+        -1007 on an order means "execution status unknown", so the order
+        is placed although the caller sees a failure.
+        """
+        network = self.network
+        delay = (network.latency_ms + self._random.uniform(0, network.jitter_ms)) / 1000
+        if delay > 0:
+            time.sleep(delay)
+
+        used, retry_after = self._weight.add(weight)
+        headers = {"x-mbx-used-weight": str(used), "x-mbx-used-weight-1m": str(used)}
+        error = None
+        if retry_after is not None:
+            error = SimulatedExchangeError(
+                -1003,
+                f"Too much request weight used; current limit is "
+                f"{self._weight.limit} request weight per 1 MINUTE.",
+                429,
+            )
+        elif order:
+            orders, retry_after = self._orders_10s.add(1)
+            headers["x-mbx-order-count-10s"] = str(orders)
+            if retry_after is not None:
+                error = SimulatedExchangeError(
+                    -1015,
+                    f"Too many new orders; current limit is "
+                    f"{self._orders_10s.limit} orders per 10 SECOND.",
+                    429,
+                )
+
+        with self._lock:
+            self.stats["latency_seconds"] += delay
+            if error is not None:
+                headers["Retry-After"] = str(retry_after)
+                self.stats["rate_limited"] += 1
+                self.response = SimulatedResponse(429, headers)
+                raise error
+
+            if (
+                network.error_rate
+                and (network.error_methods is None or method in network.error_methods)
+                and self._random.random() < network.error_rate
+            ):
+                code, status, message = self._random.choice(INJECTED_ERRORS)
+                self.stats["errors_injected"] += 1
+                self.response = SimulatedResponse(status, headers)
+                error = SimulatedExchangeError(code, message, status)
+                if code == -1007 and order:
+                    return error
+                raise error
+
+            self.response = SimulatedResponse(200, headers)
+        return None
+
+    def _catch_up(self):
+        now_ms = self._now_ms()
+        for book in self._books.values():
+            closed = self.market.closed_count(book.path, now_ms)
+            if closed <= book.matched:
+                continue
+            if book.open_orders:
+                for candle in book.path.candles[book.matched : closed]:
+                    self._match_candle(book, candle)
+            book.matched = closed
+
+    def _match_candle(self, book: _Book, candle):
+        open_time = int(candle["open_time"])
+        for order_id, order in list(book.open_orders.items()):
+            if order["time"] > open_time:
+                continue  # placed after this candle opened
+            price = float(order["price"])
+            if (order["side"] == "BUY" and candle["low"] <= price) or (
+                order["side"] == "SELL" and candle["high"] >= price
+            ):
+                del book.open_orders[order_id]
+                self._release(order)
+                self._fill(order, price, int(candle["close_time"]))
+
+    def _place(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: Optional[float],
+    ) -> Dict:
+        book = self._book(symbol)
+        current = self.market.current_price(book.path, self._now_ms())
+        self._check_filters(book, quantity, price, current)
+
+        now_ms = self._now_ms()
+        order = {
+            "symbol": symbol,
+            "orderId": self._next_order_id,
+            "orderListId": -1,
+            "clientOrderId": f"sim_{self._next_order_id}",
+            "price": f"{price if price is not None else 0.0:.8f}",
+            "origQty": f"{quantity:.8f}",
+            "executedQty": "0.00000000",
+            "cummulativeQuoteQty": "0.00000000",
+            "status": "NEW",
+            "timeInForce": "GTC",
+            "type": order_type,
+            "side": side,
+            "time": now_ms,
+            "updateTime": now_ms,
+            "isWorking": True,
+            "transactTime": now_ms,
+            "fills": [],
+        }
+
+        marketable = price is None or (
+            current <= price if side == "BUY" else current >= price
+        )
+        self._lock_funds(order, quantity, price if not marketable else current)
+
+        self._next_order_id += 1
+        self._orders[order["orderId"]] = order
+        self.stats["orders_placed"] += 1
+
+        if marketable:
+            self._release(order)
+            self._fill(order, current, now_ms)
+        else:
+            book.open_orders[order["orderId"]] = order
+        return dict(order)
+
+    def _fill(self, order: Dict, price: float, fill_time: int):
+        quantity = float(order["origQty"])
+        quote = quantity * price
+        fee = quote * self.fee_rate
+        base_asset = order["symbol"][: -len(self.quote_asset)]
+
+        if order["side"] == "BUY":
+            self._balance(self.quote_asset)[0] -= quote + fee
+            self._balance(base_asset)[0] += quantity
+        else:
+            self._balance(base_asset)[0] -= quantity
+            self._balance(self.quote_asset)[0] += quote - fee
+
+        order.update(
+            {
+                "executedQty": f"{quantity:.8f}",
+                "cummulativeQuoteQty": f"{quote:.8f}",
+                "status": "FILLED",
+                "updateTime": fill_time,
+                "isWorking": False,
+                "fills": [
+                    {
+                        "price": f"{price:.8f}",
+                        "qty": f"{quantity:.8f}",
+                        "commission": f"{fee:.8f}",
+                        "commissionAsset": self.quote_asset,
+                    }
+                ],
+            }
+        )
+        self.stats["orders_filled"] += 1
+        self.stats["fees_paid"] += fee
+
+    def _lock_funds(self, order: Dict, quantity: float, price: float):
+        if order["side"] == "BUY":
+            asset, amount = self.quote_asset, quantity * price * (1 + self.fee_rate)
+        else:
+            asset, amount = order["symbol"][: -len(self.quote_asset)], quantity
+
+        balance = self._balance(asset)
+        if balance[0] + 1e-9 < amount:
+            self.stats["orders_rejected"] += 1
+            raise SimulatedExchangeError(
+                -2010, "Account has insufficient balance for requested action."
+            )
+        balance[0] -= amount
+        balance[1] += amount
+        self._locked[order["orderId"]] = (asset, amount)
+
+    def _release(self, order: Dict):
+        asset, amount = self._locked.pop(order["orderId"], (None, 0.0))
+        if asset is not None:
+            balance = self._balance(asset)
+            balance[0] += amount
+            balance[1] -= amount
+
+    def _check_filters(
+        self, book: _Book, quantity: float, price: Optional[float], current: float
+    ):
+        """Binance filter checks (market orders skip the price filter)"""
+        filters = {f["filterType"]: f for f in book.path.info.get("filters", [])}
+
+        lot = filters.get("LOT_SIZE")
+        if lot and not _on_step(quantity, float(lot["stepSize"]), float(lot["minQty"])):
+            self.stats["orders_rejected"] += 1
+            raise SimulatedExchangeError(-1013, "Filter failure: LOT_SIZE")
+
+        price_filter = filters.get("PRICE_FILTER")
+        if price is None:
+            price = current
+        elif price_filter and not _on_step(
+            price, float(price_filter["tickSize"]), float(price_filter["minPrice"])
+        ):
+            self.stats["orders_rejected"] += 1
+            raise SimulatedExchangeError(-1013, "Filter failure: PRICE_FILTER")
+
+        notional = filters.get("MIN_NOTIONAL") or filters.get("NOTIONAL")
+        if notional and quantity * price < float(notional["minNotional"]):
+            self.stats["orders_rejected"] += 1
+            raise SimulatedExchangeError(-1013, "Filter failure: MIN_NOTIONAL")
+
+    # ========================================
+    # HELPERS
+    # ========================================
+
+    def _now_ms(self) -> int:
+        return self.market.now_ms()
+
+    def _book(self, symbol: str) -> _Book:
+        book = self._books.get(symbol)
+        if book is None:
+            raise SimulatedExchangeError(-1121, "Invalid symbol.")
+        return book
+
+    def _balance(self, asset: str) -> List[float]:
+        return self._balances.setdefault(asset, [0.0, 0.0])
+
+    def _price_ticker(self, symbol: str) -> Dict:
+        price = self.market.current_price(self._book(symbol).path, self._now_ms())
+        return {"symbol": symbol, "price": f"{price:.8f}"}
+
+    def _ticker_24h(self, symbol: str) -> Dict:
+        now_ms = self._now_ms()
+        candles = self._book(symbol).path.candles
+        hi = int(np.searchsorted(candles["close_time"], now_ms, "right"))
+        lo = int(np.searchsorted(candles["open_time"], now_ms - 86_400_000))
+        window = candles[lo:hi] if hi > lo else candles[:1]
+
+        last = float(window["close"][-1])
+        first = float(window["open"][0])
+        return {
+            "symbol": symbol,
+            "priceChange": f"{last - first:.8f}",
+            "priceChangePercent": f"{(last - first) / first * 100:.3f}",
+            "weightedAvgPrice": f"{float(np.mean(window['close'])):.8f}",
+            "openPrice": f"{first:.8f}",
+            "highPrice": f"{float(window['high'].max()):.8f}",
+            "lowPrice": f"{float(window['low'].min()):.8f}",
+            "lastPrice": f"{last:.8f}",
+            "volume": f"{float(window['volume'].sum()):.8f}",
+            "quoteVolume": f"{float(window['quote_volume'].sum()):.8f}",
+            "openTime": int(window["open_time"][0]),
+            "closeTime": now_ms,
+            "count": int(window["trades"].sum()),
+        }
+
+    @staticmethod
+    def _parse_time(value, now_ms: int) -> int:
+        """Milliseconds, or python-binance strings like "100 minutes ago UTC" """
+        if isinstance(value, (int, float, np.integer)):
+            return int(value)
+        text = str(value).strip()
+        if text.isdigit():
+            return int(text)
+        match = re.match(r"(\d+)\s+(minute|hour|day|week)s?\s+ago", text)
+        if not match:
+            raise SimulatedExchangeError(-1100, f"Unsupported start time: {value}")
+        return now_ms - int(match.group(1)) * _AGO_UNITS_MS[match.group(2)]
+
+    @staticmethod
+    def _kline_row(row) -> List:
+        return [
+            int(row["open_time"]),
+            f"{row['open']:.8f}",
+            f"{row['high']:.8f}",
+            f"{row['low']:.8f}",
+            f"{row['close']:.8f}",
+            f"{row['volume']:.8f}",
+            int(row["close_time"]),
+            f"{row['quote_volume']:.8f}",
+            int(row["trades"]),
+            "0",
+            "0",
+            "0",
+        ]
+
+
+def _on_step(value: float, step: float, minimum: float) -> bool:
+    if value + 1e-12 < minimum:
+        return False
+    if step <= 0:
+        return True
+    steps = value / step
+    return abs(steps - round(steps)) < 1e-6
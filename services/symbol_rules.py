@@ -0,0 +1,206 @@
+# services/symbol_rules.py
+"""
+Symbol Rules Registry - Shared exchange-info snapshot
+=====================================================
+
+GridUtilityService and PrecisionOrderHandler each downloaded the full
+get_exchange_info payload (thousands of symbols) to read one symbol, once
+per GridManager, i.e. once per client.
+
+One registry per process:
+- Loaded with a single exchangeInfo request, indexed by symbol (O(1) lookups)
+- Persisted to SYMBOL_RULES_SNAPSHOT so restarts are warm without a request
+- Stale after SYMBOL_RULES_TTL: lookups keep returning the current rules
+  while one background task refreshes them
+- version increments on every load so consumers can drop parsed caches
+
+Entries are the raw Binance symbol dicts (filters keep their string values,
+e.g. tickSize "0.00010000") trimmed to the fields the bot uses.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import Config
+
+_SYMBOL_FIELDS = (
+    "symbol",
+    "status",
+    "baseAsset",
+    "quoteAsset",
+    "baseAssetPrecision",
+    "quotePrecision",
+    "quoteAssetPrecision",
+    "filters",
+)
+
+_registry: Optional["SymbolRulesRegistry"] = None
+
+
+class SymbolRulesRegistry:
+    """Process-wide exchange rules indexed by symbol"""
+
+    def __init__(
+        self, snapshot_path: Optional[str] = None, ttl: Optional[float] = None
+    ):
+        self.snapshot_path = Path(snapshot_path or Config.SYMBOL_RULES_SNAPSHOT)
+        self.ttl = Config.SYMBOL_RULES_TTL if ttl is None else ttl
+        self.logger = logging.getLogger(__name__)
+
+        self.symbols: Dict[str, Dict] = {}
+        self.fetched_at = 0.0
+        self.version = 0
+        self._exchange = None
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._last_attempt = 0.0
+        self.stats = {
+            "lookups": 0,
+            "misses": 0,
+            "api_loads": 0,
+            "snapshot_loads": 0,
+            "background_refreshes": 0,
+            "load_errors": 0,
+        }
+
+        self._load_snapshot()
+
+    # ========================================
+    # LOOKUPS
+    # ========================================
+
+    async def get(self, symbol: str, exchange=None) -> Optional[Dict]:
+        """Rules for symbol; loads on first use and refreshes in the background"""
+        self.stats["lookups"] += 1
+        if exchange is not None:
+            self._exchange = exchange
+
+        if not self.symbols:
+            await self._load()
+        elif self.is_stale():
+            self._schedule_refresh()
+
+        info = self.symbols.get(symbol)
+        if info is None and self.symbols:
+            self.stats["misses"] += 1
+            # Possibly a new listing (reloads are throttled in _load)
+            await self._load()
+            info = self.symbols.get(symbol)
+        return info
+
+    def get_cached(self, symbol: str) -> Optional[Dict]:
+        """Rules without any I/O (None until the registry is loaded)"""
+        return self.symbols.get(symbol)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at > self.ttl
+
+    # ========================================
+    # LOADING
+    # ========================================
+
+    async def refresh(self, exchange=None):
+        """Force a reload from the exchange"""
+        if exchange is not None:
+            self._exchange = exchange
+        await self._load(force=True)
+
+    def _schedule_refresh(self):
+        if self._exchange is None:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self.stats["background_refreshes"] += 1
+        self._refresh_task = asyncio.get_running_loop().create_task(self._load())
+
+    async def _load(self, force: bool = False):
+        """Single-flight exchangeInfo download, at most one per retry interval"""
+        if self._exchange is None:
+            return
+
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        version = self.version
+        async with self._load_lock:
+            if self.version != version:
+                return  # Another caller loaded while we waited
+
+            now = time.time()
+            if not force and now - self._last_attempt < Config.SYMBOL_RULES_RETRY:
+                return
+            self._last_attempt = now
+
+            try:
+                exchange_info = await self._exchange.get_exchange_info()
+                symbols = {
+                    info["symbol"]: {
+                        field: info[field] for field in _SYMBOL_FIELDS if field in info
+                    }
+                    for info in exchange_info.get("symbols", [])
+                }
+                if not symbols:
+                    raise ValueError("exchangeInfo returned no symbols")
+
+                self._install(symbols, time.time())
+                self.stats["api_loads"] += 1
+                self.logger.info(f"✅ Exchange rules loaded: {len(symbols)} symbols")
+                self._save_snapshot()
+
+            except Exception as e:
+                self.stats["load_errors"] += 1
+                self.logger.error(f"❌ Failed to load exchange rules: {e}")
+
+    def _install(self, symbols: Dict[str, Dict], fetched_at: float):
+        self.symbols = symbols
+        self.fetched_at = fetched_at
+        self.version += 1
+
+    def _load_snapshot(self):
+        try:
+            if not self.snapshot_path.exists():
+                return
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            symbols = snapshot.get("symbols") or {}
+            if symbols:
+                self._install(symbols, float(snapshot.get("fetched_at", 0)))
+                self.stats["snapshot_loads"] += 1
+                self.logger.info(
+                    f"📂 Exchange rules snapshot loaded: {len(symbols)} symbols"
+                )
+        except Exception as e:
+            self.logger.warning(f"⚠️ Ignoring unreadable rules snapshot: {e}")
+
+    def _save_snapshot(self):
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"fetched_at": self.fetched_at, "symbols": self.symbols}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not write rules snapshot: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "symbols": len(self.symbols),
+            "version": self.version,
+            "age_seconds": round(time.time() - self.fetched_at, 1)
+            if self.fetched_at
+            else None,
+            "stale": self.is_stale(),
+        }
+
+
+def get_symbol_rules_registry() -> SymbolRulesRegistry:
+    """Shared registry (one per process)"""
+    global _registry
+    if _registry is None:
+        _registry = SymbolRulesRegistry()
+    return _registry
@@ -1,13 +1,18 @@
 # services/telegram_notifier.py
 """
 Telegram Notifier Service for GridTrader Pro
+
+Messages are handed to the shared TelegramOutbox and sent in the background
+with Telegram's rate limits applied, so callers never wait on the HTTP call.
 """
 
 import logging
-
-import requests
+from typing import Optional
 
 from config import Config
+from services.telegram_outbox import get_telegram_outbox
+
+_default_notifier: Optional["TelegramNotifier"] = None
 
 
 class TelegramNotifier:
@@ -18,38 +23,33 @@ class TelegramNotifier:
         self.chat_id = chat_id or getattr(Config, "ADMIN_TELEGRAM_ID", None)
         self.enabled = bool(self.bot_token and self.chat_id)
         self.logger = logging.getLogger(__name__)
+        self.outbox = get_telegram_outbox(self.bot_token) if self.enabled else None
 
         if self.enabled:
             self.logger.info("✅ Telegram notifier initialized")
         else:
             self.logger.warning("⚠️ Telegram notifier disabled - missing credentials")
 
-    async def send_message(self, message: str, parse_mode: str = "Markdown") -> bool:
-        """Send message to Telegram"""
+    async def send_message(
+        self,
+        message: str,
+        parse_mode: str = "Markdown",
+        merge_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue a message for Telegram (returns once queued, not delivered)
+
+        Messages sharing a merge_key collapse into the latest one while
+        still waiting in the queue.
+        """
         if not self.enabled:
             self.logger.debug("Telegram notifier disabled, skipping message")
             return False
 
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                "chat_id": self.chat_id,
-                "text": message,
-                "parse_mode": parse_mode,
-                "disable_web_page_preview": True,
-            }
-
-            response = requests.post(url, json=payload, timeout=10)
-
-            if response.status_code == 200:
-                self.logger.debug("📱 Telegram message sent successfully")
-                return True
-            else:
-                self.logger.error(f"❌ Telegram send failed: {response.status_code}")
-                return False
-
+            return self.outbox.enqueue(self.chat_id, message, parse_mode, merge_key)
         except Exception as e:
-            self.logger.error(f"❌ Telegram send error: {e}")
+            self.logger.error(f"❌ Telegram enqueue error: {e}")
             return False
 
     async def send_milestone_notification(
@@ -60,3 +60,11 @@ class TelegramNotifier:
     🎯 Milestone: ${milestone}
     👤 Client: {client_id}"""
         await self.send_message(message)
+
+
+def get_telegram_notifier() -> TelegramNotifier:
+    """Shared admin-chat notifier"""
+    global _default_notifier
+    if _default_notifier is None:
+        _default_notifier = TelegramNotifier()
+    return _default_notifier
@@ -0,0 +1,312 @@
+# services/telegram_outbox.py
+"""
+Telegram Outbox - Async rate-limited outbound sender
+====================================================
+
+TelegramNotifier used to call the blocking requests.post (10s timeout) from
+async code on every fill and every order replacement, so a slow Telegram
+API stalled the trading loop.
+
+One outbox per bot token:
+- Persistent aiohttp session (keep-alive, no TLS handshake per message)
+- Bounded queue drained by background sender tasks; enqueue never waits
+- Token buckets matching Telegram's limits: ~30 msg/s per bot and about
+  1 msg/s per chat (short bursts allowed)
+- Full queue drops the oldest message (newest state is most useful)
+- Messages with a merge_key replace a still-queued message with the same
+  chat + key instead of adding another send
+- HTTP 429 honours retry_after and retries once
+- Queue depth, drops, merges and send latency exposed via get_stats()
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from config import Config
+from database.connection_pool import LatencyHistogram
+
+_outboxes: Dict[str, "TelegramOutbox"] = {}
+_outboxes_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Reservation-based token bucket (reserve() returns seconds to wait)"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        # Token is borrowed from the future; wait until it would have refilled
+        return -self.tokens / self.rate
+
+
+class OutboundMessage:
+    """One queued Telegram message"""
+
+    __slots__ = ("chat_id", "text", "parse_mode", "merge_key", "enqueued_at")
+
+    def __init__(
+        self, chat_id, text: str, parse_mode: str, merge_key: Optional[str]
+    ):
+        self.chat_id = chat_id
+        self.text = text
+        self.parse_mode = parse_mode
+        self.merge_key = merge_key
+        self.enqueued_at = time.monotonic()
+
+
+class TelegramOutbox:
+    """Fire-and-forget Telegram sender with per-chat and global rate limits"""
+
+    def __init__(self, bot_token: str):
+        self.bot_token = bot_token
+        self.url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.max_queue = Config.TELEGRAM_QUEUE_SIZE
+        self.worker_count = max(1, Config.TELEGRAM_SENDER_WORKERS)
+        self.logger = logging.getLogger(__name__)
+
+        self.global_bucket = TokenBucket(
+            Config.TELEGRAM_GLOBAL_RATE, Config.TELEGRAM_GLOBAL_RATE
+        )
+        self.chat_buckets: Dict[str, TokenBucket] = {}
+        self._pending: Dict[Tuple[str, str], OutboundMessage] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.send_latency = LatencyHistogram()
+        self.stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "merged": 0,
+            "rate_limited": 0,
+            "max_queue_depth": 0,
+            "rate_wait_seconds": 0.0,
+        }
+
+    # ========================================
+    # ENQUEUE
+    # ========================================
+
+    def enqueue(
+        self,
+        chat_id,
+        text: str,
+        parse_mode: str = "Markdown",
+        merge_key: Optional[str] = None,
+    ) -> bool:
+        """Queue a message without waiting; False if it could not be queued"""
+        queue = self._bound_queue()
+        if queue is None:
+            self.logger.warning("⚠️ Telegram outbox used outside an event loop")
+            return False
+
+        if merge_key is not None:
+            pending = self._pending.get((str(chat_id), merge_key))
+            if pending is not None:
+                pending.text = text
+                pending.parse_mode = parse_mode
+                self.stats["merged"] += 1
+                return True
+
+        if queue.full():
+            oldest = queue.get_nowait()
+            queue.task_done()
+            self._forget(oldest)
+            self.stats["dropped"] += 1
+            self.logger.warning(
+                f"⚠️ Telegram queue full ({self.max_queue}), dropped oldest message"
+            )
+
+        message = OutboundMessage(chat_id, text, parse_mode, merge_key)
+        queue.put_nowait(message)
+        if merge_key is not None:
+            self._pending[(str(chat_id), merge_key)] = message
+
+        self.stats["enqueued"] += 1
+        depth = queue.qsize()
+        if depth > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = depth
+        return True
+
+    def _forget(self, message: OutboundMessage):
+        if message.merge_key is not None:
+            key = (str(message.chat_id), message.merge_key)
+            if self._pending.get(key) is message:
+                del self._pending[key]
+
+    def _bound_queue(self) -> Optional[asyncio.Queue]:
+        """Queue of the running loop, starting sender tasks on first use"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._pending.clear()
+            self._workers = []
+            self._session = None
+
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(loop.create_task(self._worker()))
+        return self._queue
+
+    # ========================================
+    # SENDING
+    # ========================================
+
+    async def _worker(self):
+        queue = self._queue
+        while True:
+            message = await queue.get()
+            # Stop merging into it once a sender has picked it up
+            self._forget(message)
+            try:
+                await self._deliver(message)
+            except Exception as e:
+                self.stats["failed"] += 1
+                self.logger.error(f"❌ Telegram send error: {e}")
+            finally:
+                queue.task_done()
+
+    def _reserve(self, chat_id) -> float:
+        key = str(chat_id)
+        bucket = self.chat_buckets.get(key)
+        if bucket is None:
+            bucket = self.chat_buckets[key] = TokenBucket(
+                Config.TELEGRAM_CHAT_RATE, Config.TELEGRAM_CHAT_BURST
+            )
+        now = time.monotonic()
+        return max(bucket.reserve(now), self.global_bucket.reserve(now))
+
+    async def _deliver(self, message: OutboundMessage):
+        for attempt in range(2):
+            wait = self._reserve(message.chat_id)
+            if wait > 0:
+                self.stats["rate_wait_seconds"] += wait
+                await asyncio.sleep(wait)
+
+            start = time.perf_counter()
+            status, retry_after = await self._post(message)
+            self.send_latency.observe((time.perf_counter() - start) * 1000)
+
+            if status == 200:
+                self.stats["sent"] += 1
+                self.logger.debug("📱 Telegram message sent successfully")
+                return
+            if status == 429 and attempt == 0:
+                self.stats["rate_limited"] += 1
+                self.logger.warning(
+                    f"⚠️ Telegram rate limited chat {message.chat_id}, "
+                    f"retrying in {retry_after}s"
+                )
+                await asyncio.sleep(retry_after)
+                continue
+
+            self.stats["failed"] += 1
+            self.logger.error(f"❌ Telegram send failed: {status}")
+            return
+
+    async def _post(self, message: OutboundMessage) -> Tuple[int, float]:
+        session = self._session
+        if session is None or session.closed:
+            session = self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=Config.TELEGRAM_SEND_TIMEOUT)
+            )
+
+        payload = {
+            "chat_id": message.chat_id,
+            "text": message.text,
+            "parse_mode": message.parse_mode,
+            "disable_web_page_preview": True,
+        }
+        async with session.post(self.url, json=payload) as response:
+            retry_after = 1.0
+            if response.status == 429:
+                try:
+                    body = await response.json()
+                    retry_after = float(
+                        body.get("parameters", {}).get("retry_after", 1)
+                    )
+                except Exception:
+                    pass
+            return response.status, retry_after
+
+    # ========================================
+    # LIFECYCLE / METRICS
+    # ========================================
+
+    async def close(self, timeout: float = 5.0):
+        """Send what is queued (up to timeout), then stop and close the session"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    f"⚠️ Telegram outbox closed with {self._queue.qsize()} unsent"
+                )
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "rate_wait_seconds": round(self.stats["rate_wait_seconds"], 3),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue,
+            "chats": len(self.chat_buckets),
+            "send_latency": self.send_latency.to_dict(),
+        }
+
+
+def get_telegram_outbox(bot_token: Optional[str] = None) -> TelegramOutbox:
+    """Shared outbox for a bot token (one per process)"""
+    token = bot_token or Config.TELEGRAM_BOT_TOKEN
+    with _outboxes_lock:
+        outbox = _outboxes.get(token)
+        if outbox is None:
+            outbox = _outboxes[token] = TelegramOutbox(token)
+        return outbox
+
+
+def get_all_outbox_stats() -> Dict:
+    """Stats for every outbox (keyed by bot id, never the full token)"""
+    return {
+        token.split(":", 1)[0]: outbox.get_stats()
+        for token, outbox in list(_outboxes.items())
+    }
+
+
+async def close_all_outboxes():
+    """Flush and close every outbox (call on shutdown)"""
+    for outbox in list(_outboxes.values()):
+        await outbox.close()
@@ -16,6 +16,11 @@ from binance.client import Client
 
 from config import Config
 from repositories.trade_repository import TradeRepository
+from services.exchange_gateway import get_exchange_gateway
+from services.indicator_engine import get_indicator_engine
+from services.market_data_cache import get_market_data_cache
+from services.precision_kernel import get_increment
+from services.symbol_rules import get_symbol_rules_registry
 
 
 class IntelligentMarketTimer:
@@ -165,13 +170,13 @@ class VolatilityBasedRiskManager:
 
     def __init__(self, binance_client: Client, symbol: str):
         self.binance_client = binance_client
+        self.exchange = get_exchange_gateway(binance_client)
+        self.market_data = get_market_data_cache()
         self.symbol = symbol
         self.logger = logging.getLogger(__name__)
 
         # Volatility settings
         self.volatility_lookback_hours = 24
-        self.volatility_cache = {}
-        self.cache_ttl = 300  # 5 minutes
 
         # Risk parameters (changed to aggressive mode)
         self.low_volatility_threshold = 0.30  # 15% daily volatility
@@ -197,57 +202,25 @@ class VolatilityBasedRiskManager:
         Returns annualized volatility as a decimal (0.20 = 20%)
         """
         try:
-            cache_key = f"{self.symbol}_volatility"
-            now = time.time()
-
-            # Check cache
-            if cache_key in self.volatility_cache:
-                cached_data = self.volatility_cache[cache_key]
-                if now - cached_data["timestamp"] < self.cache_ttl:
-                    return cached_data["volatility"]
-
-            # Get kline data for volatility calculation
-            klines = self.binance_client.get_historical_klines(
-                self.symbol,
-                Client.KLINE_INTERVAL_1HOUR,
-                f"{self.volatility_lookback_hours} hours ago UTC",
+            # Shared candle series / indicators (cached per symbol, not per client)
+            indicators = await get_indicator_engine().get(
+                self.symbol, self.exchange, Client.KLINE_INTERVAL_1HOUR
             )
 
-            if len(klines) < 12:  # Need at least 12 hours of data
+            if indicators.candles < 12:  # Need at least 12 hours of data
                 self.logger.warning(
-                    f"Insufficient data for volatility calculation: {len(klines)} klines"
+                    f"Insufficient data for volatility calculation: "
+                    f"{indicators.candles} klines"
                 )
                 return 0.25  # Default moderate volatility
 
-            # Calculate hourly returns
-            closes = [float(kline[4]) for kline in klines]
-            returns = []
-
-            for i in range(1, len(closes)):
-                if closes[i - 1] > 0:
-                    hourly_return = (closes[i] - closes[i - 1]) / closes[i - 1]
-                    returns.append(hourly_return)
-
-            if len(returns) < 10:
+            annualized_volatility = indicators.annualized_volatility
+            if annualized_volatility is None:
                 return 0.25  # Default if insufficient returns
 
-            # Calculate standard deviation and annualize
-            returns_array = np.array(returns)
-            hourly_volatility = np.std(returns_array)
-
-            # Annualize: hourly → daily → yearly
-            daily_volatility = hourly_volatility * np.sqrt(24)
-            annualized_volatility = daily_volatility * np.sqrt(365)
-
             # Apply bounds checking
             volatility = max(0.05, min(1.0, annualized_volatility))
 
-            # Cache result
-            self.volatility_cache[cache_key] = {
-                "volatility": volatility,
-                "timestamp": now,
-            }
-
             self.logger.debug(
                 f"📊 {self.symbol} volatility: {volatility:.3f} ({volatility * 100:.1f}%)"
             )
@@ -627,88 +600,79 @@ class SmartGridAutoReset:
 class PrecisionOrderHandler:
     def __init__(self, binance_client):
         self.binance_client = binance_client
+        self.exchange = get_exchange_gateway(binance_client)
         self.logger = logging.getLogger(__name__)
 
-        # Cache for exchange info
+        # Parsed rules per symbol; raw exchange info comes from the shared
+        # registry, which refreshes itself (see services/symbol_rules.py)
         self.exchange_info_cache = {}
-        self.cache_timestamp = 0
-        self.cache_duration = 3600  # 1 hour
+        self.cache_version = 0
 
     async def get_real_exchange_info(self, symbol: str) -> dict:
         """Get REAL exchange info from Binance API - no hardcoded overrides"""
         try:
-            import time
+            registry = get_symbol_rules_registry()
+            sym_info = await registry.get(symbol, self.exchange)
 
-            current_time = time.time()
+            if registry.version != self.cache_version:
+                self.exchange_info_cache.clear()
+                self.cache_version = registry.version
 
             # Check cache
-            if (
-                symbol in self.exchange_info_cache
-                and current_time - self.cache_timestamp < self.cache_duration
-            ):
+            if symbol in self.exchange_info_cache:
                 return self.exchange_info_cache[symbol]
 
-            # Fetch fresh data from Binance
-            self.logger.info(f"🔍 Fetching REAL exchange info for {symbol}")
-            exchange_info = self.binance_client.get_exchange_info()
-
-            for sym_info in exchange_info["symbols"]:
-                if sym_info["symbol"] == symbol:
-                    # Extract filters
-                    filters = {}
-                    for filter_info in sym_info.get("filters", []):
-                        filters[filter_info["filterType"]] = filter_info
-
-                    # Build precision rules from REAL API data
-                    price_filter = filters.get("PRICE_FILTER", {})
-                    lot_size = filters.get("LOT_SIZE", {})
-                    min_notional = filters.get("MIN_NOTIONAL", {})
-
-                    rules = {
-                        "symbol": symbol,
-                        "status": sym_info.get("status", "TRADING"),
-                        "baseAsset": sym_info.get("baseAsset"),
-                        "quoteAsset": sym_info.get("quoteAsset"),
-                        "baseAssetPrecision": int(
-                            sym_info.get("baseAssetPrecision", 8)
-                        ),
-                        "quotePrecision": int(sym_info.get("quotePrecision", 8)),
-                        "quoteAssetPrecision": int(
-                            sym_info.get("quoteAssetPrecision", 8)
-                        ),
-                        # PRICE_FILTER
-                        "minPrice": float(price_filter.get("minPrice", "0.00000001")),
-                        "maxPrice": float(price_filter.get("maxPrice", "1000000")),
-                        "tickSize": float(price_filter.get("tickSize", "0.00000001")),
-                        # LOT_SIZE
-                        "minQty": float(lot_size.get("minQty", "0.00000001")),
-                        "maxQty": float(lot_size.get("maxQty", "1000000")),
-                        "stepSize": float(lot_size.get("stepSize", "0.00000001")),
-                        # MIN_NOTIONAL
-                        "minNotional": float(min_notional.get("minNotional", "5.0")),
-                        # Calculate precision from step sizes
-                        "price_precision": self._calculate_precision(
-                            float(price_filter.get("tickSize", "0.01"))
-                        ),
-                        "quantity_precision": self._calculate_precision(
-                            float(lot_size.get("stepSize", "0.00000001"))
-                        ),
-                    }
-
-                    # Cache the result
-                    self.exchange_info_cache[symbol] = rules
-                    self.cache_timestamp = current_time
-
-                    self.logger.info(f"✅ Real exchange info for {symbol}:")
-                    self.logger.info(
-                        f"   📏 Price: tick_size={rules['tickSize']}, precision={rules['price_precision']}"
-                    )
-                    self.logger.info(
-                        f"   📦 Quantity: step_size={rules['stepSize']}, precision={rules['quantity_precision']}"
-                    )
-                    self.logger.info(f"   💰 Min notional: ${rules['minNotional']}")
+            if sym_info is not None:
+                # Extract filters
+                filters = {}
+                for filter_info in sym_info.get("filters", []):
+                    filters[filter_info["filterType"]] = filter_info
+
+                # Build precision rules from REAL API data
+                price_filter = filters.get("PRICE_FILTER", {})
+                lot_size = filters.get("LOT_SIZE", {})
+                min_notional = filters.get("MIN_NOTIONAL", {})
+
+                rules = {
+                    "symbol": symbol,
+                    "status": sym_info.get("status", "TRADING"),
+                    "baseAsset": sym_info.get("baseAsset"),
+                    "quoteAsset": sym_info.get("quoteAsset"),
+                    "baseAssetPrecision": int(sym_info.get("baseAssetPrecision", 8)),
+                    "quotePrecision": int(sym_info.get("quotePrecision", 8)),
+                    "quoteAssetPrecision": int(sym_info.get("quoteAssetPrecision", 8)),
+                    # PRICE_FILTER
+                    "minPrice": float(price_filter.get("minPrice", "0.00000001")),
+                    "maxPrice": float(price_filter.get("maxPrice", "1000000")),
+                    "tickSize": float(price_filter.get("tickSize", "0.00000001")),
+                    # LOT_SIZE
+                    "minQty": float(lot_size.get("minQty", "0.00000001")),
+                    "maxQty": float(lot_size.get("maxQty", "1000000")),
+                    "stepSize": float(lot_size.get("stepSize", "0.00000001")),
+                    # MIN_NOTIONAL
+                    "minNotional": float(min_notional.get("minNotional", "5.0")),
+                    # Calculate precision from step sizes
+                    "price_precision": self._calculate_precision(
+                        float(price_filter.get("tickSize", "0.01"))
+                    ),
+                    "quantity_precision": self._calculate_precision(
+                        float(lot_size.get("stepSize", "0.00000001"))
+                    ),
+                }
+
+                # Cache the result
+                self.exchange_info_cache[symbol] = rules
 
-                    return rules
+                self.logger.info(f"✅ Real exchange info for {symbol}:")
+                self.logger.info(
+                    f"   📏 Price: tick_size={rules['tickSize']}, precision={rules['price_precision']}"
+                )
+                self.logger.info(
+                    f"   📦 Quantity: step_size={rules['stepSize']}, precision={rules['quantity_precision']}"
+                )
+                self.logger.info(f"   💰 Min notional: ${rules['minNotional']}")
+
+                return rules
 
             raise ValueError(f"Symbol {symbol} not found in exchange info")
 
@@ -719,16 +683,9 @@ class PrecisionOrderHandler:
     def _calculate_precision(self, step_size: float) -> int:
         """Calculate decimal precision from step size"""
         try:
-            if step_size >= 1:
-                return 0
+            return get_increment(step_size).decimals
 
-            # Count decimal places
-            step_str = f"{step_size:.10f}".rstrip("0")
-            if "." in step_str:
-                return len(step_str.split(".")[1])
-            return 0
-
-        except:
+        except Exception:
             return 8  # Safe fallback
 
     def _round_to_step_size(self, value: float, step_size: float) -> float:
@@ -737,19 +694,8 @@ class PrecisionOrderHandler:
             if step_size == 0:
                 return value
 
-            # Use high precision decimal arithmetic
-            from decimal import ROUND_HALF_UP, Decimal
-
-            decimal_value = Decimal(str(value))
-            decimal_step = Decimal(str(step_size))
-
-            # Calculate steps and round
-            steps = (decimal_value / decimal_step).quantize(
-                Decimal("1"), rounding=ROUND_HALF_UP
-            )
-            result = float(steps * decimal_step)
-
-            return result
+            # Integer step count (half rounds up), exact decimal result
+            return get_increment(step_size).round(value)
 
         except Exception as e:
             self.logger.error(f"Step size rounding error: {e}")
@@ -805,19 +751,16 @@ class PrecisionOrderHandler:
 
                 actual_notional = valid_quantity * valid_price
 
-            # Format strings with correct precision
-            price_str = f"{valid_price:.{rules['price_precision']}f}".rstrip(
-                "0"
-            ).rstrip(".")
-            quantity_str = f"{valid_quantity:.{rules['quantity_precision']}f}".rstrip(
-                "0"
-            ).rstrip(".")
-
-            # Ensure minimum decimal places for display
-            if "." not in price_str and rules["price_precision"] > 0:
-                price_str += ".00"
-            if "." not in quantity_str and rules["quantity_precision"] > 0:
-                quantity_str += ".00000"
+            # Format strings from the integer tick/step counts
+            tick = get_increment(rules["tickSize"])
+            step = get_increment(rules["stepSize"])
+            price_str = tick.format(
+                tick.count(valid_price), ".00" if rules["price_precision"] > 0 else ""
+            )
+            quantity_str = step.format(
+                step.count(valid_quantity),
+                ".00000" if rules["quantity_precision"] > 0 else "",
+            )
 
             self.logger.info("📊 Valid order calculated:")
             self.logger.info(
@@ -872,14 +815,14 @@ class PrecisionOrderHandler:
 
             # Execute the order
             if side.upper() == "BUY":
-                order = self.binance_client.order_limit_buy(
+                order = await self.exchange.order_limit_buy(
                     symbol=symbol,
                     quantity=valid_order["quantity_str"],
                     price=valid_order["price_str"],
                     recvWindow=60000,
                 )
             else:
-                order = self.binance_client.order_limit_sell(
+                order = await self.exchange.order_limit_sell(
                     symbol=symbol,
                     quantity=valid_order["quantity_str"],
                     price=valid_order["price_str"],
@@ -0,0 +1,306 @@
+# services/user_data_stream.py
+"""
+User Data Stream - Execution Report Event Source
+================================================
+
+Push-based fill detection for grid trading. Instead of polling get_order
+for every open level, each client subscribes to its Binance user data
+stream (listen key) and receives executionReport events as orders fill.
+
+Modes (Config.USER_DATA_STREAM_MODE):
+- live: listen-key websocket via python-binance ThreadedWebsocketManager
+- recorded: local stand-in that replays executionReport events from a JSONL file;
+  the stream reports unhealthy once the replay is dispatched (or if the
+  recording is missing or empty) so REST polling keeps its normal rate
+- off: no stream, GridTradingEngine falls back to REST polling every cycle
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from binance.client import Client
+
+from config import Config
+from services.exchange_gateway import get_exchange_executor
+
+
+def parse_execution_report(event: Dict) -> Optional[Dict]:
+    """Convert a raw executionReport payload into a get_order-shaped dict"""
+    if not isinstance(event, dict) or event.get("e") != "executionReport":
+        return None
+
+    try:
+        return {
+            "symbol": event["s"],
+            "orderId": int(event["i"]),
+            "clientOrderId": event.get("c"),
+            "side": event["S"],
+            "type": event.get("o"),
+            "status": event["X"],
+            "executionType": event.get("x"),
+            "origQty": event.get("q", "0"),
+            "executedQty": event.get("z", "0"),
+            "price": event.get("p", "0"),
+            "lastFilledPrice": event.get("L", "0"),
+            "cummulativeQuoteQty": event.get("Z", "0"),
+            "updateTime": event.get("T", event.get("E", int(time.time() * 1000))),
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class UserDataStream:
+    """Per-client execution report stream feeding fills into the trading engine"""
+
+    def __init__(
+        self,
+        binance_client: Client,
+        client_id: int,
+        on_execution_report: Callable[[Dict], Awaitable[None]],
+        mode: Optional[str] = None,
+        replay_file: Optional[str] = None,
+    ):
+        self.binance_client = binance_client
+        self.client_id = client_id
+        self.on_execution_report = on_execution_report
+        self.mode = (mode or Config.USER_DATA_STREAM_MODE).lower()
+        self.replay_file = replay_file or Config.USER_DATA_STREAM_REPLAY_FILE
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._socket_manager = None
+        self._socket_name = None
+
+        self.running = False
+        self.connected = False
+        self.last_event_time = 0.0
+        self.last_error: Optional[str] = None
+        self.retry_delay = 60
+        self._next_retry = 0.0
+
+        self.stats = {
+            "events_received": 0,
+            "execution_reports": 0,
+            "fills_received": 0,
+            "events_dispatched": 0,
+            "dispatch_errors": 0,
+            "stream_errors": 0,
+        }
+
+    # ========================================
+    # LIFECYCLE
+    # ========================================
+
+    async def start(self) -> bool:
+        """Start the event source and the dispatcher task"""
+        if self.running:
+            return True
+
+        if self.mode == "off":
+            self.logger.info(
+                f"⚠️ User data stream disabled for client {self.client_id} - REST polling only"
+            )
+            return False
+
+        if time.time() < self._next_retry:
+            return False
+
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue()
+            self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+            self.running = True
+
+            if self.mode == "recorded":
+                # Connected only until the dispatcher drains the recording
+                self.connected = True
+                replayed = self.replay_recorded_events(self.replay_file)
+                if not replayed:
+                    raise RuntimeError(f"no recorded user events in {self.replay_file}")
+                self.logger.info(
+                    f"✅ Recorded user data stream for client {self.client_id}: {replayed} events queued"
+                )
+                return True
+
+            # The socket manager runs its own event loop in a thread; building
+            # it on this loop's thread would make it adopt the running loop
+            await self._loop.run_in_executor(
+                get_exchange_executor(), self._start_live_socket
+            )
+            self.connected = True
+            self.logger.info(
+                f"✅ User data stream connected for client {self.client_id}"
+            )
+            return True
+
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats["stream_errors"] += 1
+            self._next_retry = time.time() + self.retry_delay
+            self.logger.error(
+                f"❌ User data stream start failed for client {self.client_id}: {e}"
+            )
+            await self.stop()
+            return False
+
+    def _start_live_socket(self):
+        """Open the listen-key websocket (keepalive handled by the socket manager)
+
+        Runs in a worker thread: the manager takes the thread's current event
+        loop, so it gets a fresh one that its own thread can run.
+        """
+        from binance import ThreadedWebsocketManager
+
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        try:
+            self._socket_manager = ThreadedWebsocketManager(
+                api_key=self.binance_client.API_KEY,
+                api_secret=self.binance_client.API_SECRET,
+            )
+            self._socket_manager.start()
+            self._socket_name = self._socket_manager.start_user_socket(
+                callback=self._on_socket_message
+            )
+        finally:
+            # Pooled threads must not hand this loop to the next manager
+            asyncio.set_event_loop(None)
+
+    async def stop(self):
+        """Stop the websocket and the dispatcher"""
+        self.running = False
+        self.connected = False
+
+        if self._socket_manager:
+            try:
+                # stop() waits on the manager's own loop, keep that off this one
+                await asyncio.get_running_loop().run_in_executor(
+                    get_exchange_executor(), self._socket_manager.stop
+                )
+            except Exception as e:
+                self.logger.warning(f"⚠️ Socket manager stop error: {e}")
+            self._socket_manager = None
+            self._socket_name = None
+
+        if self._dispatch_task and not self._dispatch_task.done():
+            self._dispatch_task.cancel()
+            try:
+                await self._dispatch_task
+            except asyncio.CancelledError:
+                pass
+        self._dispatch_task = None
+
+    def is_healthy(self) -> bool:
+        """True while fills are expected to arrive through the stream"""
+        return self.running and self.connected
+
+    # ========================================
+    # EVENT INTAKE
+    # ========================================
+
+    def _on_socket_message(self, message: Dict):
+        """Websocket callback - runs on the socket manager's thread"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.feed_event, message)
+
+    def feed_event(self, event: Dict):
+        """Queue a raw user data event (must be called on the event loop thread)"""
+        if self._queue is None:
+            return
+
+        self.stats["events_received"] += 1
+        self.last_event_time = time.time()
+
+        if isinstance(event, dict) and event.get("e") == "error":
+            # Socket manager reports disconnects this way; fall back to polling
+            self.connected = False
+            self.last_error = str(event.get("m", "stream error"))
+            self.stats["stream_errors"] += 1
+            self.logger.warning(
+                f"⚠️ User data stream error for client {self.client_id}: {self.last_error}"
+            )
+            return
+
+        if not self.connected and self.running:
+            self.connected = True
+            self.logger.info(
+                f"✅ User data stream recovered for client {self.client_id}"
+            )
+
+        self._queue.put_nowait(event)
+
+    def replay_recorded_events(self, path: str) -> int:
+        """Feed executionReport events from a JSONL recording into the queue"""
+        if not path or not os.path.exists(path):
+            self.logger.warning(f"⚠️ No recorded user events at {path}")
+            return 0
+
+        events: List[Dict] = []
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+
+        for event in events:
+            self.feed_event(event)
+
+        return len(events)
+
+    # ========================================
+    # DISPATCH
+    # ========================================
+
+    async def _dispatch_loop(self):
+        """Drain queued events and hand execution reports to the callback"""
+        while True:
+            event = await self._queue.get()
+            try:
+                order = parse_execution_report(event)
+                if order is None:
+                    continue
+
+                self.stats["execution_reports"] += 1
+                if order["status"] == "FILLED":
+                    self.stats["fills_received"] += 1
+
+                await self.on_execution_report(order)
+                self.stats["events_dispatched"] += 1
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["dispatch_errors"] += 1
+                self.logger.error(f"❌ Execution report dispatch error: {e}")
+            finally:
+                self._queue.task_done()
+                if self.mode == "recorded" and self._queue.empty() and self.connected:
+                    # A recording has no further events: resume normal REST polling
+                    self.connected = False
+                    self.logger.info(
+                        f"⚠️ Recorded user data stream drained for client {self.client_id}"
+                    )
+
+    def get_stats(self) -> Dict:
+        """Stream counters for monitoring"""
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "running": self.running,
+            "connected": self.connected,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "last_event_age": time.time() - self.last_event_time
+            if self.last_event_time
+            else None,
+            "last_error": self.last_error,
+        }
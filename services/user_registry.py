@@ -5,7 +5,6 @@ Handles user registration, admin approval, and access control
 """
 
 import logging
-import sqlite3
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional
@@ -14,6 +13,8 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
 from config import Config
+from database.connection_pool import get_db_pool
+from database.write_queue import get_write_queue
 from services.telegram_notifier import TelegramNotifier
 
 
@@ -30,6 +31,8 @@ class UserRegistryService:
 
     def __init__(self, db_path: str = None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
+        self.writes = get_write_queue(self.db_path)
         self.logger = logging.getLogger(__name__)
         self.notifier = TelegramNotifier()
 
@@ -61,7 +64,7 @@ class UserRegistryService:
     def _database_ready(self) -> bool:
         """Check if the main database structure exists"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.cursor()
                 # Check if the main clients table exists
                 cursor.execute("""
@@ -75,7 +78,7 @@ class UserRegistryService:
     def _ensure_tables(self):
         """Ensure required tables exist - only called when database is ready"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 # Check and add registration columns to clients table
                 self._add_registration_columns_if_missing(conn)
 
@@ -228,7 +231,7 @@ class UserRegistryService:
                 registration_status = "approved" if self.auto_approve else "pending"
 
             # Create the client - simplified registration
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 conn.execute(
                     """
                     INSERT INTO clients (
@@ -292,7 +295,7 @@ class UserRegistryService:
     def client_exists(self, telegram_id: int) -> bool:
         """Check if client exists"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     "SELECT 1 FROM clients WHERE telegram_id = ?", (telegram_id,)
                 )
@@ -303,7 +306,7 @@ class UserRegistryService:
     def get_client_registration_info(self, telegram_id: int) -> Optional[Dict]:
         """Get client registration information"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     """
                     SELECT telegram_id, username, first_name, status, grid_status,
@@ -338,7 +341,7 @@ class UserRegistryService:
     def get_user_count(self) -> int:
         """Get current user count"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute("SELECT COUNT(*) FROM clients")
                 return cursor.fetchone()[0]
         except:
@@ -351,19 +354,18 @@ class UserRegistryService:
         try:
             import json
 
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    """
-                    INSERT INTO user_activity (client_id, activity_type, activity_data)
-                    VALUES (?, ?, ?)
-                """,
-                    (
-                        client_id,
-                        activity_type,
-                        json.dumps(activity_data) if activity_data else None,
-                    ),
-                )
-                conn.commit()
+            self.writes.submit_statement(
+                """
+                INSERT INTO user_activity (client_id, activity_type, activity_data)
+                VALUES (?, ?, ?)
+            """,
+                (
+                    client_id,
+                    activity_type,
+                    json.dumps(activity_data) if activity_data else None,
+                ),
+                client_id=client_id,
+            )
 
         except Exception as e:
             self.logger.error(f"❌ Error logging activity: {e}")
@@ -421,13 +423,14 @@ class AdminService:
     def __init__(self, registry: UserRegistryService = None):
         self.registry = registry or UserRegistryService()
         self.db_path = self.registry.db_path
+        self.db = self.registry.db
         self.logger = logging.getLogger(__name__)
         self.notifier = TelegramNotifier()
 
     def is_admin(self, telegram_id: int) -> bool:
         """Check if user is admin"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute(
                     "SELECT permission_level FROM admin_permissions WHERE telegram_id = ?",
                     (telegram_id,),
@@ -443,7 +446,7 @@ class AdminService:
     ) -> bool:
         """Approve a pending user"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 # Check if user exists and is pending
                 cursor = conn.execute(
                     "SELECT registration_status FROM clients WHERE telegram_id = ?",
@@ -497,7 +500,7 @@ class AdminService:
     ) -> bool:
         """Reject a pending user"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 conn.execute(
                     """
                     UPDATE clients 
@@ -527,7 +530,7 @@ class AdminService:
     def get_pending_users(self) -> List[Dict]:
         """Get all users pending approval"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 cursor = conn.execute("""
                     SELECT telegram_id, username, first_name, registration_date
                     FROM clients 
@@ -552,7 +555,7 @@ class AdminService:
     def get_user_statistics(self) -> Dict:
         """Get user registration statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.read() as conn:
                 stats = {}
 
                 # Total users by status
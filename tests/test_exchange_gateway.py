@@ -0,0 +1,38 @@
+# tests/test_exchange_gateway.py
+import asyncio
+import time
+
+import pytest
+
+from services.exchange_gateway import ExchangeCallTimeout, ExchangeGateway
+
+
+class SlowClient:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.orders = []
+
+    def get_account(self, **kwargs):
+        time.sleep(self.delay)
+        return {}
+
+    def order_limit_buy(self, **kwargs):
+        time.sleep(self.delay)
+        self.orders.append(kwargs)
+        return {"orderId": len(self.orders)}
+
+
+def test_order_placement_is_not_abandoned_on_timeout():
+    client = SlowClient(delay=0.2)
+    gateway = ExchangeGateway(client, client_id=1, timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(ExchangeCallTimeout):
+            await gateway.get_account()
+        order = await gateway.order_limit_buy(
+            symbol="ETHUSDT", quantity="1", price="2000"
+        )
+        assert order == {"orderId": 1}
+
+    asyncio.run(scenario())
+    assert gateway.stats["timeouts"] == 1
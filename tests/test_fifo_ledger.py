@@ -0,0 +1,57 @@
+# tests/test_fifo_ledger.py
+import asyncio
+import sqlite3
+
+from database.db_setup import DatabaseSetup
+from services.fifo_service import FIFOService
+
+CLIENT_ID = 7
+SYMBOL = "ETHUSDT"
+
+
+def record_initialization(db_path: str, price: float, quantity: float = 1.0):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO fifo_cost_basis
+            (client_id, symbol, quantity, cost_per_unit, total_cost,
+             remaining_quantity, is_initialization)
+            VALUES (?, ?, ?, ?, ?, ?, 1)
+        """,
+            (CLIENT_ID, SYMBOL, quantity, price, quantity * price, quantity),
+        )
+
+
+def record_trade(db_path: str, side: str, price: float, quantity: float = 1.0):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO trades (client_id, symbol, side, quantity, price, total_value)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (CLIENT_ID, SYMBOL, side, quantity, price, quantity * price),
+        )
+
+
+def test_late_initialization_lot_matches_full_replay(tmp_path):
+    db_path = str(tmp_path / "ledger.db")
+    DatabaseSetup(db_path).initialize()
+    service = FIFOService(db_path)
+
+    record_initialization(db_path, 1000)
+    record_trade(db_path, "BUY", 2000)
+    record_trade(db_path, "SELL", 2100)
+    service.ledger.sync_client(CLIENT_ID)
+
+    # Second FORCE on the symbol after trades were already synced
+    record_initialization(db_path, 3000)
+    record_trade(db_path, "SELL", 3100)
+
+    report = asyncio.run(service.verify_fifo_ledger(CLIENT_ID))
+
+    assert report["matches"], report
+    assert report["ledger"]["realized_profit"] == report["replay"]["realized_profit"]
+    assert (
+        report["ledger"]["unrealized_profit"] == report["replay"]["unrealized_profit"]
+    )
+    assert service.ledger.stats["late_initialization_rebuilds"] == 1
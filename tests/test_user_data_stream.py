@@ -0,0 +1,74 @@
+# tests/test_user_data_stream.py
+import asyncio
+import threading
+import time
+
+import binance
+
+from services.user_data_stream import UserDataStream
+
+
+class StubSocketManager:
+    """Mimics ThreadedWebsocketManager: adopts the calling thread's event loop"""
+
+    instances = []
+
+    def __init__(self, api_key=None, api_secret=None):
+        self.loop = asyncio.get_event_loop()
+        self.thread = threading.current_thread()
+        self.stopped = False
+        StubSocketManager.instances.append(self)
+
+    def start(self):
+        if self.loop.is_running():
+            raise RuntimeError("This event loop is already running")
+
+    def start_user_socket(self, callback):
+        time.sleep(0.2)  # listen key request
+        return "user_socket"
+
+    def stop(self):
+        self.stopped = True
+
+
+class StubClient:
+    API_KEY = "key"
+    API_SECRET = "secret"
+
+
+def test_live_stream_starts_off_the_running_loop(monkeypatch):
+    monkeypatch.setattr(
+        binance, "ThreadedWebsocketManager", StubSocketManager, raising=False
+    )
+    StubSocketManager.instances.clear()
+
+    async def on_report(order):
+        pass
+
+    async def scenario():
+        stream = UserDataStream(StubClient(), 1, on_report, mode="live")
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        started = await stream.start()
+        beat.cancel()
+
+        assert started
+        assert stream.is_healthy()
+        assert ticks >= 5  # the loop kept running during the listen key request
+
+        manager = StubSocketManager.instances[0]
+        assert manager.thread is not threading.current_thread()
+        assert manager.loop is not asyncio.get_running_loop()
+
+        await stream.stop()
+        assert manager.stopped
+        assert not stream.is_healthy()
+
+    asyncio.run(scenario())
@@ -12,9 +12,10 @@ from typing import List, Optional
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-from repositories.client_repository import ClientRepository
 from services.grid_orchestrator import GridOrchestrator
+from services.service_container import get_service_container
 from services.user_registry import AdminService, UserRegistryService
+from utils.ttl_cache import get_cache_report
 
 
 class BaseClientHandler:
@@ -22,7 +23,7 @@ class BaseClientHandler:
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.client_repo = ClientRepository()
+        self.client_repo = get_service_container().client_repo
         self.grid_orchestrator = GridOrchestrator()
         self.client_states = {}
 
@@ -238,8 +239,9 @@ Your account has been permanently banned from this service."""
             ],
             [
                 InlineKeyboardButton("⚙️ Settings", callback_data="admin_settings"),
-                InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh"),
+                InlineKeyboardButton("🧠 Memory", callback_data="admin_memory"),
             ],
+            [InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh")],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -283,6 +285,9 @@ Choose an admin action:"""
         elif action == "admin_settings":
             await self._show_admin_settings(query)
             return True
+        elif action == "admin_memory":
+            await self._show_cache_memory(query)
+            return True
         elif action == "admin_refresh":
             await self._show_admin_panel(query)
             return True
@@ -476,6 +481,38 @@ Contact system administrator to modify settings."""
             parse_mode="Markdown",
         )
 
+    async def _show_cache_memory(self, query):
+        """Show entries and estimated memory of every in-process cache"""
+        caches = get_cache_report()
+
+        # Plain text: cache names contain underscores
+        message = "🧠 CACHE MEMORY\n\n"
+        for cache in caches:
+            message += f"{cache['name']} (x{cache['instances']})\n"
+            message += (
+                f"   {cache['entries']} entries, "
+                f"{cache['memory_bytes'] / 1024:.1f} KB, "
+                f"hit rate {cache['hit_rate']:.0f}%, "
+                f"{cache['evictions']} evicted\n"
+            )
+
+        total_kb = sum(cache["memory_bytes"] for cache in caches) / 1024
+        message += f"\nTotal: {len(caches)} caches, {total_kb:.1f} KB"
+
+        keyboard = [
+            [
+                InlineKeyboardButton(
+                    "🔙 Back to Admin Panel", callback_data="admin_refresh"
+                )
+            ]
+        ]
+
+        await query.edit_message_text(
+            message,
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode=None,
+        )
+
     # =====================================
     # ENHANCED COMMON CALLBACK HANDLING
     # =====================================
@@ -708,6 +745,7 @@ Contact @admin for technical support."""
             if success:
                 # Clear state
                 del self.client_states[client_id]
+                self.grid_orchestrator.invalidate_client_credentials(client_id)
 
                 await update.message.reply_text(
                     "✅ **API Keys Saved Successfully!**\n\n"
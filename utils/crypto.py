@@ -3,13 +3,139 @@
 """Enhanced encryption utilities with detailed error handling"""
 
 import base64
+import functools
 import logging
+import threading
+import time
 import traceback
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+# Use a fixed salt for consistency
+KDF_SALT = b"gridtrader_salt_2024"
+KDF_ITERATIONS = 100000
+
+
+@functools.lru_cache(maxsize=8)
+def _derive_cipher_suite(encryption_key: str) -> Fernet:
+    """PBKDF2 is deliberately slow (~tens of ms), so derive once per key"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=KDF_SALT,
+        iterations=KDF_ITERATIONS,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(encryption_key.encode()))
+    return Fernet(key)
+
+
+class DecryptedKeyCache:
+    """
+    Bounded LRU of decrypted API key pairs with TTL expiry
+
+    Entries remember the ciphertexts they were decrypted from, so a client
+    whose stored keys changed (even from another process, e.g.
+    api_management.py) misses instead of getting stale keys. Writers in this
+    process should still call invalidate() when they change keys.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        from config import Config
+
+        self.ttl = Config.API_KEY_CACHE_TTL if ttl is None else ttl
+        self.max_size = max(1, max_size or Config.API_KEY_CACHE_SIZE)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "invalidations": 0}
+
+    def get(
+        self, client_id: int, encrypted_api_key: str, encrypted_secret_key: str
+    ) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            entry = self._entries.get(client_id)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            cached_api, cached_secret, api_key, secret_key, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[client_id]
+                self.stats["expired"] += 1
+                return None
+            if (
+                cached_api != encrypted_api_key
+                or cached_secret != encrypted_secret_key
+            ):
+                del self._entries[client_id]
+                self.stats["invalidations"] += 1
+                return None
+
+            self._entries.move_to_end(client_id)
+            self.stats["hits"] += 1
+            return api_key, secret_key
+
+    def put(
+        self,
+        client_id: int,
+        encrypted_api_key: str,
+        encrypted_secret_key: str,
+        api_key: str,
+        secret_key: str,
+    ):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[client_id] = (
+                encrypted_api_key,
+                encrypted_secret_key,
+                api_key,
+                secret_key,
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(client_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, client_id: Optional[int] = None):
+        """Drop one client's keys, or every cached pair when client_id is None"""
+        with self._lock:
+            if client_id is None:
+                self.stats["invalidations"] += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(client_id, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                **self.stats,
+            }
+
+
+_api_key_cache: Optional[DecryptedKeyCache] = None
+_api_key_cache_lock = threading.Lock()
+
+
+def get_api_key_cache() -> DecryptedKeyCache:
+    """Process-wide decrypted API key cache"""
+    global _api_key_cache
+    with _api_key_cache_lock:
+        if _api_key_cache is None:
+            _api_key_cache = DecryptedKeyCache()
+        return _api_key_cache
+
+
+def invalidate_api_keys(client_id: Optional[int] = None):
+    """Call after a client's API keys are changed or removed"""
+    get_api_key_cache().invalidate(client_id)
+
 
 class CryptoUtils:
     """Enhanced encryption utilities for API keys with better error handling"""
@@ -27,23 +153,9 @@ class CryptoUtils:
         self._cipher_suite = self._get_cipher_suite()
 
     def _get_cipher_suite(self):
-        """Generate cipher suite from encryption key"""
+        """Cipher suite for the encryption key (derived once per process)"""
         try:
-            # Use the encryption key to generate Fernet key
-            password = self.encryption_key.encode()
-
-            # Use a fixed salt for consistency
-            salt = b"gridtrader_salt_2024"
-
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-
-            key = base64.urlsafe_b64encode(kdf.derive(password))
-            return Fernet(key)
+            return _derive_cipher_suite(self.encryption_key)
 
         except Exception as e:
             self.logger.error(f"Error initializing encryption: {e}")
@@ -0,0 +1,334 @@
+# utils/metrics.py
+"""
+Metrics - Counters, gauges and histograms with Prometheus exposition
+====================================================================
+
+Operational insight came from emoji log lines (health checks, monitoring
+performance summaries), which cannot be graphed, compared or alerted on.
+
+One process-wide MetricsRegistry:
+- Counter, Gauge and Histogram with labels, updated on hot paths
+  (exchange calls, grid ticks, fill handling)
+- Collectors are called at scrape time and turn existing get_stats()
+  dicts (connection pools, write queues, outboxes, caches) into samples,
+  so those paths are not instrumented twice
+- render() produces the Prometheus text exposition format;
+  start_metrics_server() serves it on METRICS_HOST:METRICS_PORT from a
+  daemon thread (stdlib http.server, no extra dependency)
+
+Keep label values bounded (endpoints, statements, phases - never client
+ids or order ids).
+"""
+
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import Config
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry: Optional["MetricsRegistry"] = None
+_registry_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+
+
+class MetricFamily:
+    """Samples of one metric name, ready for exposition"""
+
+    __slots__ = ("name", "kind", "help", "samples")
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, labels: Dict, value: float, suffix: str = ""):
+        self.samples.append((suffix, labels, value))
+
+    def add_histogram(
+        self,
+        labels: Dict,
+        bounds: Sequence[float],
+        counts: Sequence[int],
+        total: float,
+    ):
+        """Per-bucket (non-cumulative) counts; the last one is the overflow"""
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            self.add({**labels, "le": _format_value(bound)}, cumulative, "_bucket")
+        count = sum(counts)
+        self.add({**labels, "le": "+Inf"}, count, "_bucket")
+        self.add(labels, total, "_sum")
+        self.add(labels, count, "_count")
+
+    def add_latency_stats(self, labels: Dict, stats: Dict):
+        """Add a LatencyHistogram.to_dict() (millisecond buckets)"""
+        buckets = stats.get("buckets", {})
+        bounds = [float(key[3:]) / 1000 for key in buckets if key != "le_inf"]
+        counts = list(buckets.values())
+        total = stats.get("avg_ms", 0.0) * stats.get("count", 0) / 1000
+        self.add_histogram(labels, bounds, counts, total)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, labels, value in self.samples:
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.kind, self.help)
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            self._add_sample(family, dict(zip(self.labelnames, key)), value)
+        return family
+
+    def _add_sample(self, family: MetricFamily, labels: Dict, value):
+        family.add(labels, value)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down per label set"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Histogram(_Metric):
+    """Bucketed observations (seconds) per label set"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def _add_sample(self, family: MetricFamily, labels: Dict, value):
+        counts, total = value
+        family.add_histogram(labels, self.buckets, list(counts), total)
+
+
+class MetricsRegistry:
+    """Process-wide metrics plus scrape-time collectors"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"scrapes": 0, "collector_errors": 0}
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        return self._get_or_create(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        return self._get_or_create(Gauge, name, help_text, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        return self._get_or_create(Histogram, name, help_text, labels, buckets)
+
+    def register_collector(
+        self, name: str, collector: Callable[[], Iterable[MetricFamily]]
+    ):
+        """Add (or replace) a scrape-time collector"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+
+        families = [metric.collect() for metric in metrics]
+        for name, collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                self.stats["collector_errors"] += 1
+                self.logger.warning(f"⚠️ Metrics collector {name} failed: {e}")
+        return families
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric and collector"""
+        self.stats["scrapes"] += 1
+        lines = []
+        for family in self.collect():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "metrics": len(self._metrics),
+            "collectors": sorted(self._collectors),
+        }
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
+
+
+# ========================================
+# HTTP EXPOSITION
+# ========================================
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = get_metrics_registry().render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the service log
+
+
+def start_metrics_server(
+    host: Optional[str] = None, port: Optional[int] = None
+) -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread (idempotent)"""
+    global _server
+    with _registry_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(
+                (host or Config.METRICS_HOST, port or Config.METRICS_PORT),
+                _MetricsHandler,
+            )
+            _server.daemon_threads = True
+            threading.Thread(
+                target=_server.serve_forever, name="metrics-http", daemon=True
+            ).start()
+            address, bound_port = _server.server_address[:2]
+            logging.getLogger(__name__).info(
+                f"📈 Metrics endpoint on http://{address}:{bound_port}/metrics"
+            )
+        return _server
+
+
+def stop_metrics_server():
+    global _server
+    with _registry_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
+
+
+def _format_labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
@@ -5,7 +5,6 @@ Corrected syntax errors and optimized for your existing setup
 """
 
 import logging
-import sqlite3
 import time
 from datetime import datetime
 from typing import Any, Callable, Dict, Optional
@@ -13,6 +12,8 @@ from typing import Any, Callable, Dict, Optional
 import requests
 
 from config import Config
+from database.connection_pool import get_db_pool
+from database.write_queue import get_write_queue
 from utils.network_utils import NetworkUtils
 
 
@@ -24,6 +25,8 @@ class NetworkRecovery:
 
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.db = get_db_pool(self.db_path)
+        self.writes = get_write_queue(self.db_path)
         self.logger = logging.getLogger(__name__)
 
         # Health tracking
@@ -40,7 +43,7 @@ class NetworkRecovery:
     def _init_monitoring_table(self):
         """Initialize network monitoring table"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.write() as conn:
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS network_monitoring (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -149,24 +152,24 @@ class NetworkRecovery:
     def _log_event(
         self, event_type: str, operation: str, details: str, client_id: Optional[int]
     ):
-        """Log events to database - FIXED VERSION"""
+        """Log events to database (queued, group-committed)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    """
-                    INSERT INTO network_monitoring 
-                    (event_type, operation, client_id, details, consecutive_failures, status)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        event_type,
-                        operation,
-                        client_id,
-                        details,
-                        self.consecutive_failures,
-                        "outage" if self.in_outage else "normal",
-                    ),
-                )
+            self.writes.submit_statement(
+                """
+                INSERT INTO network_monitoring 
+                (event_type, operation, client_id, details, consecutive_failures, status)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    event_type,
+                    operation,
+                    client_id,
+                    details,
+                    self.consecutive_failures,
+                    "outage" if self.in_outage else "normal",
+                ),
+                client_id=client_id,
+            )
         except Exception as e:
             self.logger.error(f"Failed to log network event: {e}")
 
@@ -209,7 +212,7 @@ class NetworkRecovery:
 
     async def _test_database_connectivity(self):
         """Test database connectivity"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.read() as conn:
             conn.execute("SELECT 1").fetchone()
         return True
 
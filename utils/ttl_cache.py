@@ -0,0 +1,258 @@
+# utils/ttl_cache.py
+"""
+TTL Cache - Bounded TTL/LRU cache with single-flight loading
+============================================================
+
+Services kept their own dict caches with different expiry rules, and some
+never evicted (MarketAnalysisService added a key per time bucket forever).
+
+TTLCache is the one primitive for in-process caching:
+- Per-entry TTL (monotonic clock), checked on read
+- max_size bound with least-recently-used eviction
+- get_or_load(): concurrent async callers of a missing key share one load
+- hit / miss / coalesced / eviction / expiry counters
+
+Every cache registers itself by name, so get_cache_report() can show entry
+counts and estimated memory per cache (admin panel, system metrics).
+Caches are meant for the event loop thread; they take no locks.
+"""
+
+import asyncio
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+_caches: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+
+
+class TTLCache:
+    """Bounded mapping with per-entry TTL and LRU eviction"""
+
+    def __init__(self, name: str, max_size: int = 1024, ttl: Optional[float] = None):
+        self.name = name
+        self.max_size = max(1, max_size)
+        self.ttl = ttl  # None: entries only leave by LRU eviction
+
+        # key -> (expires_at, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "loads": 0,
+            "load_errors": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        _caches.add(self)
+
+    # ========================================
+    # MAPPING
+    # ========================================
+
+    def get(self, key: Hashable, default=None):
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.stats["misses"] += 1
+            return default
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key: Hashable, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def pop(self, key: Hashable, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._entries.clear()
+
+    def keys(self) -> List[Hashable]:
+        return list(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key, touch=False) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ========================================
+    # LOADING
+    # ========================================
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = None
+    ):
+        """Cached value, or compute() stored under key"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.stats["loads"] += 1
+            self.set(key, value, ttl)
+        return value
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ):
+        """Cached value, or one shared await of loader() for all callers"""
+        value = self._lookup(key)
+        if value is not _MISSING:
+            self.stats["hits"] += 1
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            self.stats["loads"] += 1
+            value = await loader()
+            self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.stats["load_errors"] += 1
+            future.set_exception(e)
+            # Mark retrieved so a failed load with no waiters doesn't log noise
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    # ========================================
+    # STATS
+    # ========================================
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry (reads already skip them)"""
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry[0] <= now]
+        for key in expired:
+            del self._entries[key]
+        self.stats["expirations"] += len(expired)
+        return len(expired)
+
+    def memory_bytes(self) -> int:
+        """Estimated size of keys and values (shared objects counted once)"""
+        seen = set()
+        return sys.getsizeof(self._entries) + sum(
+            _deep_sizeof(key, seen) + _deep_sizeof(entry, seen)
+            for key, entry in list(self._entries.items())
+        )
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        served = self.stats["hits"] + self.stats["coalesced"]
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "in_flight": len(self._inflight),
+            "hit_rate": round(served / lookups * 100, 1) if lookups else 0.0,
+            **self.stats,
+        }
+
+    def _lookup(self, key: Hashable, touch: bool = True):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.stats["expirations"] += 1
+            return _MISSING
+        if touch:
+            self._entries.move_to_end(key)
+        return entry[1]
+
+
+def _deep_sizeof(obj, seen: set) -> int:
+    """sys.getsizeof over containers, object attributes and array buffers"""
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        nbytes = getattr(item, "nbytes", None)
+        if isinstance(nbytes, int):  # NumPy arrays (views don't own the buffer)
+            size += max(sys.getsizeof(item), nbytes)
+            continue
+
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool, type(None))):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(item.__dict__)
+            for slot in getattr(type(item), "__slots__", ()):
+                value = getattr(item, slot, None)
+                if value is not None:
+                    stack.append(value)
+    return size
+
+
+def get_cache_report(include_memory: bool = True) -> List[Dict]:
+    """Live caches grouped by name: instances, entries, memory and hit rate
+
+    include_memory=False skips the deep size walk (metrics scrapes).
+    """
+    report: Dict[str, Dict] = {}
+    for cache in list(_caches):
+        stats = cache.get_stats()
+        row = report.setdefault(
+            cache.name,
+            {
+                "name": cache.name,
+                "instances": 0,
+                "entries": 0,
+                "memory_bytes": 0,
+                "hits": 0,
+                "misses": 0,
+                "coalesced": 0,
+                "evictions": 0,
+                "expirations": 0,
+            },
+        )
+        row["instances"] += 1
+        row["entries"] += stats["entries"]
+        if include_memory:
+            row["memory_bytes"] += cache.memory_bytes()
+        for field in ("hits", "misses", "coalesced", "evictions", "expirations"):
+            row[field] += stats[field]
+
+    for row in report.values():
+        lookups = row["hits"] + row["misses"] + row["coalesced"]
+        served = row["hits"] + row["coalesced"]
+        row["hit_rate"] = round(served / lookups * 100, 1) if lookups else 0.0
+    return sorted(report.values(), key=lambda row: -row["memory_bytes"])